@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Micro benchmark which compares the throughput of
+libcloud.utils.files.read_in_chunks with the previous implementation which
+buffered data in immutable bytes objects.
+
+Usage: python contrib/benchmark_read_in_chunks.py [size in MB]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+import tempfile
+
+from io import FileIO
+
+from libcloud.utils.py3 import b
+from libcloud.utils.py3 import next
+from libcloud.utils.files import read_in_chunks
+
+# S3 multipart upload chunk size
+CHUNK_SIZE = 5 * 1024 * 1024
+
+# Size of the chunks yielded by the source iterator
+SOURCE_CHUNK_SIZE = 8096
+
+
+def read_in_chunks_legacy(iterator, chunk_size=None, fill_size=False,
+                          yield_empty=False):
+    """
+    read_in_chunks implementation before it switched to bytearray buffers.
+    """
+    if isinstance(iterator, FileIO):
+        get_data = iterator.read
+        args = (chunk_size, )
+    else:
+        get_data = next
+        args = (iterator, )
+
+    data = b('')
+    empty = False
+
+    while not empty or len(data) > 0:
+        if not empty:
+            try:
+                chunk = b(get_data(*args))
+                if len(chunk) > 0:
+                    data += chunk
+                else:
+                    empty = True
+            except StopIteration:
+                empty = True
+
+        if len(data) == 0:
+            if empty and yield_empty:
+                yield b('')
+
+            return
+
+        if fill_size:
+            if empty or len(data) >= chunk_size:
+                yield data[:chunk_size]
+                data = data[chunk_size:]
+        else:
+            yield data
+            data = b('')
+
+
+def iterator_source(size):
+    chunk = b('a') * SOURCE_CHUNK_SIZE
+    for _ in range(size // SOURCE_CHUNK_SIZE):
+        yield chunk
+
+
+def file_source(file_path):
+    return FileIO(file_path, 'rb')
+
+
+def measure(func, source, size):
+    start = time.time()
+
+    for _ in func(source, chunk_size=CHUNK_SIZE, fill_size=True):
+        pass
+
+    duration = time.time() - start
+    return (size / (1024.0 * 1024.0)) / duration
+
+
+def main(size_mb):
+    size = size_mb * 1024 * 1024
+    size -= size % SOURCE_CHUNK_SIZE
+
+    fd, file_path = tempfile.mkstemp()
+
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            for chunk in iterator_source(size):
+                fp.write(chunk)
+
+        results = [
+            ('iterator', 'legacy',
+             measure(read_in_chunks_legacy, iterator_source(size), size)),
+            ('iterator', 'current',
+             measure(read_in_chunks, iterator_source(size), size)),
+            ('file', 'legacy',
+             measure(read_in_chunks_legacy, file_source(file_path), size)),
+            ('file', 'current',
+             measure(read_in_chunks, file_source(file_path), size)),
+        ]
+    finally:
+        os.unlink(file_path)
+
+    for source, implementation, throughput in results:
+        print('%-10s %-10s %10.2f MB/s' % (source, implementation,
+                                           throughput))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Micro benchmark which measures the number of AWS signature version 4
+signatures per second with the signing key cache and with the previous
+implementation which derived the signing key and hashed the payload again
+for every request.
+
+Usage: python contrib/benchmark_sigv4.py [number of signatures]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+from libcloud.common.aws import AWSRequestSignerAlgorithmV4
+from libcloud.common.aws import _sign
+
+
+class Driver(object):
+    region_name = 'us-east-1'
+
+
+class Connection(object):
+    driver = Driver()
+    service_name = 's3'
+
+
+class LegacyAWSRequestSignerAlgorithmV4(AWSRequestSignerAlgorithmV4):
+    """
+    Signer which derives the signing key and hashes the payload for every
+    request.
+    """
+
+    def _get_key_to_sign_with(self, dt):
+        return _sign(
+            _sign(
+                _sign(
+                    _sign(('AWS4' + self.access_secret),
+                          dt.strftime('%Y%m%d')),
+                    self.connection.driver.region_name),
+                self.connection.service_name),
+            'aws4_request')
+
+    def _get_canonical_request(self, params, headers, method, path, data):
+        return '\n'.join([
+            method,
+            path,
+            self._get_request_params(params),
+            self._get_canonical_headers(headers),
+            self._get_signed_headers(headers),
+            self._get_payload_hash(method, data)
+        ])
+
+
+def measure(signer_cls, count, method, data):
+    signer = signer_cls(access_key='key', access_secret='secret',
+                        version='2006-03-01', connection=Connection())
+    params = {'prefix': 'logs/2018/', 'max-keys': '1000'}
+
+    start = time.time()
+
+    for _ in range(count):
+        headers = {'Host': 'bucket.s3.amazonaws.com',
+                   'User-Agent': 'libcloud/2.3.0 (Amazon S3)',
+                   'Accept-Encoding': 'gzip,deflate'}
+        signer.get_request_headers(params=params, headers=headers,
+                                   method=method, path='/bucket/object',
+                                   data=data)
+
+    return count / (time.time() - start)
+
+
+def main(count):
+    body = 'a' * (64 * 1024)
+
+    for method, data in [('GET', None), ('PUT', body)]:
+        for name, signer_cls in [('legacy',
+                                  LegacyAWSRequestSignerAlgorithmV4),
+                                 ('current', AWSRequestSignerAlgorithmV4)]:
+            print('%-5s %-10s %10.0f signatures/s' %
+                  (method, name, measure(signer_cls, count, method, data)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Micro benchmark which measures how long it takes to build the "extra"
+dictionaries of EC2 nodes from the recorded DescribeInstances fixture with
+the compiled XPath extractor and with the previous implementation which
+built the namespaced path for every field of every element.
+
+Usage: python contrib/benchmark_xml_extract.py [number of instances]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import copy
+import time
+
+from libcloud.utils.py3 import ET
+from libcloud.utils.xml import findall
+from libcloud.compute.drivers.ec2 import EC2NodeDriver
+from libcloud.compute.drivers.ec2 import NAMESPACE
+from libcloud.compute.drivers.ec2 import RESOURCE_EXTRA_ATTRIBUTES_MAP
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                       'libcloud', 'test', 'compute', 'fixtures', 'ec2',
+                       'describe_instances.xml')
+
+
+def legacy_fixxpath(xpath, namespace=None):
+    if not namespace:
+        return xpath
+
+    return '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+
+
+def legacy_get_extra_dict(element, mapping):
+    extra = {}
+    for attribute, values in mapping.items():
+        transform_func = values['transform_func']
+        value = element.findtext(legacy_fixxpath(xpath=values['xpath'],
+                                                 namespace=NAMESPACE))
+        if value is not None:
+            extra[attribute] = transform_func(value)
+        else:
+            extra[attribute] = None
+
+    return extra
+
+
+def get_instances(count):
+    with open(FIXTURE, 'rb') as fp:
+        root = ET.XML(fp.read())
+
+    instances = findall(element=root,
+                        xpath='reservationSet/item/instancesSet/item',
+                        namespace=NAMESPACE)
+
+    return [copy.deepcopy(instances[index % len(instances)])
+            for index in range(count)]
+
+
+def measure(func, instances):
+    mapping = RESOURCE_EXTRA_ATTRIBUTES_MAP['node']
+    start = time.time()
+
+    for element in instances:
+        func(element, mapping)
+
+    return time.time() - start
+
+
+def main(count):
+    instances = get_instances(count)
+    driver = EC2NodeDriver('key', 'secret')
+
+    legacy = measure(legacy_get_extra_dict, instances)
+    current = measure(driver._get_extra_dict, instances)
+
+    for name, duration in (('legacy', legacy), ('current', current)):
+        print('%-10s %8.3f s %10.0f elements/s' % (name, duration,
+                                                   count / duration))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
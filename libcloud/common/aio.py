@@ -0,0 +1,410 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Base classes for the asyncio driver interface.
+
+:class:`AsyncConnection` performs the requests of a driver connection with
+non-blocking I/O on the event loop (it requires aiohttp). The requests go
+through the hooks of the driver connection (``add_default_params``,
+``add_default_headers``, ``pre_connect_hook``, ...) and the responses are
+parsed by its response class, so thousands of signed API requests can be in
+flight without a thread for each of them.
+
+The driver operations (``list_nodes``, ``upload_object``, ...) of the
+asynchronous drivers are not rewritten on top of it: they run the blocking
+operations of the wrapped driver in an executor, so each operation which is
+in flight occupies a thread of the executor until it completes and the size
+of the executor bounds the number of concurrent operations.
+
+This module requires Python 3.5 or newer.
+"""
+
+import asyncio
+import functools
+import ssl
+import sys
+
+try:
+    import aiohttp
+    have_aiohttp = True
+except ImportError:
+    have_aiohttp = False
+
+import libcloud.security
+
+__all__ = [
+    'AsyncHttpResponse',
+    'AsyncConnection',
+    'AsyncRunner',
+    'AsyncIterator',
+    'AsyncDriver',
+
+    'async_method',
+    'async_iterator'
+]
+
+
+class AsyncHttpResponse(object):
+    """
+    HTTP response of a request which has been performed by
+    :class:`AsyncConnection`.
+
+    The body has been read in full. The attributes are the ones of a
+    ``requests`` response which are used by the response classes.
+    """
+
+    request = None
+
+    def __init__(self, status_code, reason, headers, content, encoding=None):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', 'replace')
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for index in range(0, len(self.content), chunk_size):
+            chunk = self.content[index:index + chunk_size]
+            yield chunk.decode(self.encoding or 'utf-8') \
+                if decode_unicode else chunk
+
+
+class AsyncConnection(object):
+    """
+    Performs the requests of a driver connection with non-blocking I/O.
+
+    The requests are prepared by the wrapped connection, so they go through
+    its hooks (default parameters and headers, data encoding, signing), and
+    the responses are parsed by its ``responseCls``. Only the transport is
+    different: the requests are sent with an aiohttp session on the event
+    loop.
+
+    Raw (streaming) requests are not supported.
+    """
+
+    def __init__(self, connection, loop=None, limit=100):
+        """
+        :param connection: Driver connection which prepares the requests and
+                           parses the responses.
+        :type connection: :class:`libcloud.common.base.Connection`
+
+        :param loop: Event loop to use (defaults to the current event loop).
+        :type loop: :class:`asyncio.AbstractEventLoop`
+
+        :param limit: Maximum number of connections which are open at the
+                      same time.
+        :type limit: ``int``
+        """
+        if not have_aiohttp:
+            raise RuntimeError('aiohttp is not installed. You can install ' +
+                               'it using pip: pip install aiohttp')
+
+        self.connection = connection
+        self.loop = loop
+        self.limit = limit
+        self._session = None
+
+    def request(self, action, params=None, data=None, headers=None,
+                method='GET'):
+        """
+        Request a given `action` (see
+        :meth:`libcloud.common.base.Connection.request`).
+
+        :return: Future which resolves to a response of the ``responseCls``
+                 class of the wrapped connection.
+        :rtype: :class:`asyncio.Future`
+        """
+        connection = self.connection
+        loop = self.loop or asyncio.get_event_loop()
+        result = loop.create_future()
+
+        url, data, headers = connection._prepare_request(
+            action=action, params=params, data=data, headers=headers,
+            method=method)
+
+        # Other requests can be prepared by the same thread before the
+        # response is received
+        request_state = (connection.action, connection.method,
+                         connection.data)
+        url = '%s://%s:%s%s' % ('https' if connection.secure else 'http',
+                                connection.host, connection.port, url)
+
+        def send():
+            if result.cancelled():
+                return
+
+            timeout = aiohttp.ClientTimeout(total=connection.timeout)
+            request = asyncio.ensure_future(
+                self._get_session().request(method, url, data=data,
+                                            headers=headers,
+                                            ssl=self._get_ssl(),
+                                            timeout=timeout), loop=loop)
+            request.add_done_callback(on_response)
+            result.add_done_callback(
+                lambda _: result.cancelled() and request.cancel())
+
+        def on_response(request):
+            if self._set_error(request, result):
+                if not request.cancelled() and request.exception() is None:
+                    # The result has been cancelled in the meantime
+                    request.result().release()
+
+                return
+
+            http_response = request.result()
+            read = asyncio.ensure_future(http_response.read(), loop=loop)
+            read.add_done_callback(functools.partial(on_content,
+                                                     http_response))
+
+        def on_content(http_response, read):
+            http_response.release()
+
+            if self._set_error(read, result):
+                return
+
+            response = AsyncHttpResponse(status_code=http_response.status,
+                                         reason=http_response.reason,
+                                         headers=dict(http_response.headers),
+                                         content=read.result(),
+                                         encoding=http_response.charset)
+
+            connection.action, connection.method, connection.data = \
+                request_state
+
+            try:
+                result.set_result(
+                    connection.responseCls(response=response,
+                                           connection=connection))
+            except Exception:
+                result.set_exception(sys.exc_info()[1])
+            finally:
+                connection.reset_context()
+
+        # The aiohttp session is created by the event loop
+        loop.call_soon(send)
+        return result
+
+    def close(self):
+        """
+        Close the open connections.
+
+        :return: Future which resolves once the connections are closed.
+        :rtype: :class:`asyncio.Future`
+        """
+        session = self._session
+        self._session = None
+
+        if session is None:
+            future = (self.loop or asyncio.get_event_loop()).create_future()
+            future.set_result(None)
+            return future
+
+        return asyncio.ensure_future(session.close(), loop=self.loop)
+
+    def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.limit)
+            self._session = aiohttp.ClientSession(connector=connector)
+
+        return self._session
+
+    def _get_ssl(self):
+        """
+        Return the value of the ``ssl`` argument of the aiohttp requests
+        which matches the libcloud.security settings.
+        """
+        if not libcloud.security.VERIFY_SSL_CERT:
+            return False
+
+        if libcloud.security.CA_CERTS_PATH:
+            return ssl.create_default_context(
+                cafile=libcloud.security.CA_CERTS_PATH)
+
+        return None
+
+    def _set_error(self, future, result):
+        """
+        Propagate the error (or the cancellation) of a future to the result
+        future.
+
+        :return: True if the future has failed.
+        :rtype: ``bool``
+        """
+        if result.done():
+            return True
+
+        if future.cancelled():
+            result.cancel()
+            return True
+
+        error = future.exception()
+
+        if error is not None:
+            self.connection.reset_context()
+            result.set_exception(error)
+            return True
+
+        return False
+
+
+class AsyncRunner(object):
+    """
+    Runs blocking callables in an executor and returns futures.
+    """
+
+    def __init__(self, loop=None, executor=None):
+        """
+        :param loop: Event loop to use (defaults to the current event loop).
+        :type loop: :class:`asyncio.AbstractEventLoop`
+
+        :param executor: Executor in which the blocking calls are performed
+                         (defaults to the default executor of the loop). Its
+                         size bounds the number of operations which are in
+                         flight at the same time.
+        :type executor: :class:`concurrent.futures.Executor`
+        """
+        self.loop = loop
+        self.executor = executor
+
+    def run(self, func, *args, **kwargs):
+        """
+        Run a blocking callable in the executor.
+
+        :return: Future which resolves to the return value of the callable.
+        :rtype: :class:`asyncio.Future`
+        """
+        loop = self.loop or asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor,
+                                    functools.partial(func, *args, **kwargs))
+
+
+class AsyncIterator(object):
+    """
+    Asynchronous iterator over the items of a blocking iterator.
+
+    The blocking iterator is created and advanced in the executor so paging
+    requests don't block the event loop.
+    """
+
+    def __init__(self, runner, func, *args, **kwargs):
+        """
+        :param runner: Runner which performs the blocking calls.
+        :type runner: :class:`AsyncRunner`
+
+        :param func: Callable which returns the blocking iterator.
+        :type func: ``callable``
+        """
+        self.runner = runner
+        self._func = functools.partial(func, *args, **kwargs)
+        self._iterator = None
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return self.runner.run(self._next)
+
+    def _next(self):
+        if self._iterator is None:
+            self._iterator = iter(self._func())
+
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def async_method(name):
+    """
+    Return a method which runs the driver method with the provided name in
+    the executor and returns a future.
+    """
+    def method(self, *args, **kwargs):
+        return self.runner.run(getattr(self.driver, name), *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = 'Asynchronous version of ``%s``.' % (name)
+    return method
+
+
+def async_iterator(name):
+    """
+    Return a method which returns an :class:`AsyncIterator` over the driver
+    method with the provided name.
+    """
+    def method(self, *args, **kwargs):
+        return AsyncIterator(self.runner, getattr(self.driver, name),
+                             *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = 'Asynchronous iterator version of ``%s``.' % (name)
+    return method
+
+
+class AsyncDriver(object):
+    """
+    Base asynchronous driver class which wraps a blocking driver and runs
+    its methods in an executor.
+
+    :ivar connection: Connection which performs requests of the wrapped
+                      driver with non-blocking I/O (requires aiohttp).
+    :type connection: :class:`AsyncConnection`
+    """
+
+    def __init__(self, driver, loop=None, executor=None):
+        """
+        :param driver: Driver which performs the operations.
+        :type driver: :class:`libcloud.common.base.BaseDriver`
+
+        :param loop: Event loop to use (defaults to the current event loop).
+        :type loop: :class:`asyncio.AbstractEventLoop`
+
+        :param executor: Executor in which the blocking calls are performed
+                         (defaults to the default executor of the loop).
+        :type executor: :class:`concurrent.futures.Executor`
+        """
+        self.driver = driver
+        self.runner = AsyncRunner(loop=loop, executor=executor)
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = AsyncConnection(self.driver.connection,
+                                               loop=self.runner.loop)
+
+        return self._connection
+
+    def close(self):
+        """
+        Close the connections which are opened by :attr:`connection`.
+
+        :rtype: :class:`asyncio.Future`
+        """
+        if self._connection is None:
+            future = (self.runner.loop or
+                      asyncio.get_event_loop()).create_future()
+            future.set_result(None)
+            return future
+
+        return self._connection.close()
+
+    def __repr__(self):
+        return ('<%s driver=%r>' % (self.__class__.__name__, self.driver))
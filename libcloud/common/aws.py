@@ -240,6 +240,15 @@ class AWSRequestSignerAlgorithmV2(AWSRequestSigner):
 
 
 class AWSRequestSignerAlgorithmV4(AWSRequestSigner):
+    def __init__(self, access_key, access_secret, version, connection):
+        super(AWSRequestSignerAlgorithmV4, self).__init__(
+            access_key=access_key, access_secret=access_secret,
+            version=version, connection=connection)
+
+        # Derived signing keys only change once per day so they are cached
+        # for the current date, keyed by region and service name
+        self._signing_keys = (None, {})
+
     def get_request_params(self, params, method='GET', path='/'):
         if method == 'GET':
             params['Version'] = self.version
@@ -282,14 +291,29 @@ class AWSRequestSignerAlgorithmV4(AWSRequestSigner):
         return _sign(key=key, msg=string_to_sign, hex=True)
 
     def _get_key_to_sign_with(self, dt):
-        return _sign(
-            _sign(
+        date = dt.strftime('%Y%m%d')
+        region_name = self.connection.driver.region_name
+        service_name = self.connection.service_name
+
+        cached_date, signing_keys = self._signing_keys
+
+        if cached_date != date:
+            signing_keys = {}
+            self._signing_keys = (date, signing_keys)
+
+        key = signing_keys.get((region_name, service_name), None)
+
+        if key is None:
+            key = _sign(
                 _sign(
-                    _sign(('AWS4' + self.access_secret),
-                          dt.strftime('%Y%m%d')),
-                    self.connection.driver.region_name),
-                self.connection.service_name),
-            'aws4_request')
+                    _sign(
+                        _sign(('AWS4' + self.access_secret), date),
+                        region_name),
+                    service_name),
+                'aws4_request')
+            signing_keys[(region_name, service_name)] = key
+
+        return key
 
     def _get_string_to_sign(self, params, headers, dt, method, path, data):
         canonical_request = self._get_canonical_request(params=params,
@@ -310,11 +334,11 @@ class AWSRequestSignerAlgorithmV4(AWSRequestSigner):
                          'aws4_request'])
 
     def _get_signed_headers(self, headers):
-        return ';'.join([k.lower() for k in sorted(headers.keys())])
+        return ';'.join([k.lower() for k in sorted(headers)])
 
     def _get_canonical_headers(self, headers):
-        return '\n'.join([':'.join([k.lower(), str(v).strip()])
-                          for k, v in sorted(headers.items())]) + '\n'
+        return ''.join(['%s:%s\n' % (k.lower(), str(v).strip())
+                        for k, v in sorted(headers.items())]) or '\n'
 
     def _get_payload_hash(self, method, data=None):
         if method in ('POST', 'PUT'):
@@ -330,18 +354,25 @@ class AWSRequestSignerAlgorithmV4(AWSRequestSigner):
 
     def _get_request_params(self, params):
         # For self.method == GET
-        return '&'.join(["%s=%s" %
+        return '&'.join(['%s=%s' %
                          (urlquote(k, safe=''), urlquote(str(v), safe='~'))
                          for k, v in sorted(params.items())])
 
     def _get_canonical_request(self, params, headers, method, path, data):
+        # Reuse the payload hash which has already been calculated for the
+        # request headers instead of hashing the payload again
+        payload_hash = headers.get('X-AMZ-Content-SHA256', None)
+
+        if payload_hash is None:
+            payload_hash = self._get_payload_hash(method, data)
+
         return '\n'.join([
             method,
             path,
             self._get_request_params(params),
             self._get_canonical_headers(headers),
             self._get_signed_headers(headers),
-            self._get_payload_hash(method, data)
+            payload_hash
         ])
 
 
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 import os
 import sys
 import ssl
@@ -21,6 +20,7 @@ import socket
 import copy
 import binascii
 import time
+import threading
 
 from libcloud.utils.py3 import ET
 
@@ -31,11 +31,16 @@ import libcloud
 from libcloud.utils.py3 import httplib
 from libcloud.utils.py3 import urlparse
 from libcloud.utils.py3 import urlencode
+from libcloud.utils.py3 import next
+from libcloud.utils.py3 import b
 
 from libcloud.utils.misc import lowercase_keys, retry
+from libcloud.utils.xml import fixxpath
+from libcloud.utils import jsoncodec
 from libcloud.common.exceptions import exception_from_message
 from libcloud.common.types import LibcloudError, MalformedResponseError
 from libcloud.http import LibcloudConnection, HttpLibResponseProxy
+from libcloud.common.poller import PollingJob, get_default_poller
 
 __all__ = [
     'RETRY_FAILED_HTTP_REQUESTS',
@@ -52,12 +57,23 @@ __all__ = [
     'HTTPResponse',
     'JsonResponse',
     'XmlResponse',
+    'StreamingXmlResponse',
     'RawResponse'
 ]
 
 # Module level variable indicates if the failed HTTP requests should be retried
 RETRY_FAILED_HTTP_REQUESTS = False
 
+# Driver keyword arguments which configure connection pooling and keep-alive
+POOL_KWARGS = ['pool_connections', 'pool_maxsize', 'pool_block',
+               'max_retries', 'keep_alive_timeout', 'shared_session']
+
+# Response encodings which can be parsed as UTF-8 without decoding them first
+UTF8_COMPATIBLE_ENCODINGS = ['utf-8', 'utf8', 'ascii', 'us-ascii']
+
+# Lock which guards lazy creation of per connection state shared by threads
+_CONNECTION_LOCK = threading.RLock()
+
 
 class LazyObject(object):
     """An object that doesn't get initialized until accessed."""
@@ -116,9 +132,11 @@ class Response(object):
     A base Response class to derive from.
     """
 
+    _body = None  # Decoded response body
+    _http_response = None  # Response object the body is decoded from
+
     status = httplib.OK  # Response status code
     headers = {}  # Response headers
-    body = None  # Raw response body
     object = None  # Parsed response body
 
     error = None  # Reason returned by the server.
@@ -143,9 +161,9 @@ class Response(object):
         self.request = response.request
         self.iter_content = response.iter_content
 
-        self.body = response.text.strip() \
-            if response.text is not None and hasattr(response.text, 'strip') \
-            else ''
+        # The body is only decoded when it's accessed, parsers which accept
+        # bytes use the raw content instead (see _get_body_content)
+        self._http_response = response
 
         if not self.success():
             raise exception_from_message(code=self.status,
@@ -154,6 +172,58 @@ class Response(object):
 
         self.object = self.parse_body()
 
+    @property
+    def body(self):
+        """
+        Decoded response body with the surrounding whitespace removed.
+
+        :rtype: ``str``
+        """
+        if self._body is None and self._http_response is not None:
+            text = self._http_response.text
+            self._body = text.strip() \
+                if text is not None and hasattr(text, 'strip') else ''
+
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+        self._http_response = None
+
+    def _get_body_content(self):
+        """
+        Return the response body for parsers which accept UTF-8 encoded bytes.
+
+        The raw content is returned as long as the body hasn't been replaced
+        and the response is UTF-8 encoded, which avoids decoding large bodies
+        to ``str`` only to parse them. The decoded body is returned otherwise.
+
+        :rtype: ``bytes`` or ``str``
+        """
+        response = self._http_response
+
+        if response is None or self._body is not None:
+            return self.body
+
+        encoding = (response.encoding or 'utf-8').lower().replace('_', '-')
+
+        if encoding not in UTF8_COMPATIBLE_ENCODINGS:
+            return self.body
+
+        content = response.content
+        return content if content is not None else self.body
+
+    def _is_body_empty(self):
+        """
+        Return True if the response body is empty or only contains whitespace
+        without decoding it.
+
+        :rtype: ``bool``
+        """
+        content = self._get_body_content()
+        return not content or content.isspace()
+
     def parse_body(self):
         """
         Parse response body.
@@ -197,11 +267,11 @@ class JsonResponse(Response):
     """
 
     def parse_body(self):
-        if len(self.body) == 0 and not self.parse_zero_length_body:
+        if self._is_body_empty() and not self.parse_zero_length_body:
             return self.body
 
         try:
-            body = json.loads(self.body)
+            body = jsoncodec.loads(self._get_body_content())
         except:
             raise MalformedResponseError(
                 'Failed to parse JSON',
@@ -236,6 +306,124 @@ class XmlResponse(Response):
     parse_error = parse_body
 
 
+class StreamingXmlResponse(Response):
+    """
+    XML response which is parsed incrementally while the body is being read
+    from the network.
+
+    Elements which match ``item_xpath`` are yielded one at a time by
+    :meth:`iter_items` and removed from the tree as soon as the next element
+    is requested, so memory usage stays flat regardless of the size of the
+    document. Once all the items have been consumed, ``object`` holds the
+    root element with the rest of the document (e.g. pagination markers).
+    """
+
+    # Size of the chunks which are read from the network and fed to the parser
+    chunk_size = 64 * 1024
+
+    def __init__(self, response, connection, item_xpath, namespace=None):
+        """
+        :param response: HTTP response object with a non consumed body.
+        :type response: :class:`requests.Response`
+
+        :param connection: Parent connection object.
+        :type connection: :class:`.Connection`
+
+        :param item_xpath: Path to the repeated element relative to the root
+                           element (e.g. ``imagesSet/item``).
+        :type item_xpath: ``str``
+
+        :param namespace: XML namespace of the elements in ``item_xpath``.
+        :type namespace: ``str``
+        """
+        self.connection = connection
+        self.headers = lowercase_keys(dict(response.headers))
+        self.error = response.reason
+        self.status = response.status_code
+        self.request = response.request
+        self.iter_content = response.iter_content
+        self.item_xpath = item_xpath
+        self.namespace = namespace
+        self.body = ''
+        self.object = None
+        self._response = response
+
+    def iter_items(self):
+        """
+        Return a generator which yields the elements matching ``item_xpath``.
+
+        Yielded elements are cleared once the next element is requested so
+        they need to be converted before advancing the generator. The body
+        can only be iterated over once.
+
+        :rtype: ``generator`` of :class:`Element`
+        """
+        path = [fixxpath(xpath=part, namespace=self.namespace)
+                for part in self.item_xpath.strip('/').split('/')]
+        depth = len(path)
+        parents = path[:-1]
+        tag = path[-1]
+
+        source = _IterContentReader(
+            self.iter_content(chunk_size=self.chunk_size))
+        stack = []
+
+        try:
+            for event, element in ET.iterparse(source,
+                                               events=('start', 'end')):
+                if event == 'start':
+                    if not stack:
+                        self.object = element
+                    stack.append(element)
+                    continue
+
+                stack.pop()
+
+                if len(stack) != depth or element.tag != tag:
+                    continue
+
+                if [parent.tag for parent in stack[1:]] != parents:
+                    continue
+
+                yield element
+
+                element.clear()
+                stack[-1].remove(element)
+        except ET.ParseError:
+            e = sys.exc_info()[1]
+            raise MalformedResponseError('Failed to parse XML: %s' % (str(e)),
+                                         body=None,
+                                         driver=self.connection.driver)
+        finally:
+            self._response.close()
+
+
+class _IterContentReader(object):
+    """
+    Minimal file-like object which reads from an iterator of byte chunks.
+    """
+
+    def __init__(self, iterator):
+        self._iterator = iterator
+        self._buffer = b('')
+
+    def read(self, size=-1):
+        while not self._buffer:
+            chunk = next(self._iterator, None)
+
+            if chunk is None:
+                return b('')
+
+            self._buffer = chunk
+
+        if size is None or size < 0:
+            size = len(self._buffer)
+
+        data = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return data
+
+
 class RawResponse(Response):
     def __init__(self, connection, response=None):
         """
@@ -294,22 +482,30 @@ class RawResponse(Response):
 class Connection(object):
     """
     A Base Connection class to derive from.
+
+    A single instance can be used by multiple threads at the same time. State
+    which belongs to a single request (action, method, data and context) is
+    stored per thread so concurrent requests don't overwrite each other.
     """
     conn_class = LibcloudConnection
 
     responseCls = Response
     rawResponseCls = RawResponse
+    streamingXmlResponseCls = StreamingXmlResponse
     connection = None
     host = '127.0.0.1'
     port = 443
     timeout = None
     secure = 1
     driver = None
-    action = None
     cache_busting = False
     backoff = None
     retry_delay = None
 
+    # Connection pool and keep-alive options which are passed to the
+    # underlying connection class (see libcloud.http.LibcloudConnection)
+    pool_options = None
+
     allow_insecure = True
 
     def __init__(self, secure=True, host=None, port=None, url=None,
@@ -358,6 +554,107 @@ class Connection(object):
         """
         self.proxy_url = proxy_url
 
+    def __copy__(self):
+        # Copies must not share the per thread request state with the
+        # original connection
+        connection = self.__class__.__new__(self.__class__)
+        connection.__dict__.update(self.__dict__)
+        connection.__dict__.pop('_request_state', None)
+        return connection
+
+    @property
+    def request_state(self):
+        """
+        Thread local object which holds the state of the request which is
+        currently being performed by the calling thread.
+        """
+        state = self.__dict__.get('_request_state', None)
+
+        if state is None:
+            with _CONNECTION_LOCK:
+                state = self.__dict__.setdefault('_request_state',
+                                                 threading.local())
+
+        return state
+
+    @property
+    def action(self):
+        return getattr(self.request_state, 'action', None)
+
+    @action.setter
+    def action(self, value):
+        self.request_state.action = value
+
+    @property
+    def method(self):
+        return getattr(self.request_state, 'method', None)
+
+    @method.setter
+    def method(self, value):
+        self.request_state.method = value
+
+    @property
+    def data(self):
+        return getattr(self.request_state, 'data', None)
+
+    @data.setter
+    def data(self, value):
+        self.request_state.data = value
+
+    @property
+    def context(self):
+        state = self.request_state
+
+        if getattr(state, 'context', None) is None:
+            state.context = {}
+
+        return state.context
+
+    @context.setter
+    def context(self, value):
+        self.request_state.context = value
+
+    def set_pool_options(self, pool_connections=None, pool_maxsize=None,
+                         pool_block=None, max_retries=None,
+                         keep_alive_timeout=None, shared_session=None):
+        """
+        Configure connection pooling and keep-alive for this connection.
+
+        Options which are not provided keep the requests defaults. The
+        options take effect on the next call to connect().
+
+        :param pool_connections: Number of connection pools to cache.
+        :type pool_connections: ``int``
+
+        :param pool_maxsize: Maximum number of connections to keep open in
+                             a pool.
+        :type pool_maxsize: ``int``
+
+        :param pool_block: True to block when no free connection is
+                           available in a pool instead of opening a new one.
+        :type pool_block: ``bool``
+
+        :param max_retries: Number of retries to perform on failed
+                            connections.
+        :type max_retries: ``int``
+
+        :param keep_alive_timeout: Number of seconds after which idle
+                                   connections are closed instead of reused.
+        :type keep_alive_timeout: ``int``
+
+        :param shared_session: True to share a single pooled session with
+                               other connections to the same host.
+        :type shared_session: ``bool``
+        """
+        options = {'pool_connections': pool_connections,
+                   'pool_maxsize': pool_maxsize,
+                   'pool_block': pool_block,
+                   'max_retries': max_retries,
+                   'keep_alive_timeout': keep_alive_timeout,
+                   'shared_session': shared_session}
+        self.pool_options = dict((key, value) for key, value in
+                                 options.items() if value is not None)
+
     def set_context(self, context):
         if not isinstance(context, dict):
             raise TypeError('context needs to be a dictionary')
@@ -445,6 +742,9 @@ class Connection(object):
         if self.proxy_url:
             kwargs.update({'proxy_url': self.proxy_url})
 
+        if self.pool_options:
+            kwargs.update(self.pool_options)
+
         connection = self.conn_class(**kwargs)
         # You can uncoment this line, if you setup a reverse proxy server
         # which proxies to your endpoint, and lets you easily capture
@@ -479,45 +779,18 @@ class Connection(object):
         """
         self.ua.append(token)
 
-    def request(self, action, params=None, data=None, headers=None,
-                method='GET', raw=False, stream=False):
+    def _prepare_request(self, action, params=None, data=None, headers=None,
+                         method='GET'):
         """
-        Request a given `action`.
-
-        Basically a wrapper around the connection
-        object's `request` that does some helpful pre-processing.
-
-        :type action: ``str``
-        :param action: A path. This can include arguments. If included,
-            any extra parameters are appended to the existing ones.
-
-        :type params: ``dict``
-        :param params: Optional mapping of additional parameters to send. If
-            None, leave as an empty ``dict``.
-
-        :type data: ``unicode``
-        :param data: A body of data to send with the request.
-
-        :type headers: ``dict``
-        :param headers: Extra headers to add to the request
-            None, leave as an empty ``dict``.
-
-        :type method: ``str``
-        :param method: An HTTP method such as "GET" or "POST".
+        Apply the request hooks of the connection (default parameters and
+        headers, data encoding, signing) to a request.
 
-        :type raw: ``bool``
-        :param raw: True to perform a "raw" request aka only send the headers
-                     and use the rawResponseCls class. This is used with
-                     storage API when uploading a file.
-
-        :type stream: ``bool``
-        :param stream: True to return an iterator in Response.iter_content
-                    and allow streaming of the response data
-                    (for downloading large files)
-
-        :return: An :class:`Response` instance.
-        :rtype: :class:`Response` instance
+        The action, method and data are stored in the request state of the
+        calling thread so the hooks and the response classes can use them.
 
+        :return: Path with the query string, encoded body and headers of the
+                 request.
+        :rtype: ``tuple``
         """
         if params is None:
             params = {}
@@ -529,9 +802,6 @@ class Connection(object):
         else:
             headers = copy.copy(headers)
 
-        retry_enabled = os.environ.get('LIBCLOUD_RETRY_FAILED_HTTP_REQUESTS',
-                                       False) or RETRY_FAILED_HTTP_REQUESTS
-
         action = self.morph_action_hook(action)
         self.action = action
         self.method = method
@@ -573,9 +843,61 @@ class Connection(object):
         else:
             url = action
 
+        return url, data, headers
+
+    def request(self, action, params=None, data=None, headers=None,
+                method='GET', raw=False, stream=False):
+        """
+        Request a given `action`.
+
+        Basically a wrapper around the connection
+        object's `request` that does some helpful pre-processing.
+
+        :type action: ``str``
+        :param action: A path. This can include arguments. If included,
+            any extra parameters are appended to the existing ones.
+
+        :type params: ``dict``
+        :param params: Optional mapping of additional parameters to send. If
+            None, leave as an empty ``dict``.
+
+        :type data: ``unicode``
+        :param data: A body of data to send with the request.
+
+        :type headers: ``dict``
+        :param headers: Extra headers to add to the request
+            None, leave as an empty ``dict``.
+
+        :type method: ``str``
+        :param method: An HTTP method such as "GET" or "POST".
+
+        :type raw: ``bool``
+        :param raw: True to perform a "raw" request aka only send the headers
+                     and use the rawResponseCls class. This is used with
+                     storage API when uploading a file.
+
+        :type stream: ``bool``
+        :param stream: True to return an iterator in Response.iter_content
+                    and allow streaming of the response data
+                    (for downloading large files)
+
+        :return: An :class:`Response` instance.
+        :rtype: :class:`Response` instance
+
+        """
+        retry_enabled = os.environ.get('LIBCLOUD_RETRY_FAILED_HTTP_REQUESTS',
+                                       False) or RETRY_FAILED_HTTP_REQUESTS
+
+        url, data, headers = self._prepare_request(action=action,
+                                                   params=params, data=data,
+                                                   headers=headers,
+                                                   method=method)
+
         # IF connection has not yet been established
         if self.connection is None:
-            self.connect()
+            with _CONNECTION_LOCK:
+                if self.connection is None:
+                    self.connect()
 
         try:
             # @TODO: Should we just pass File object as body to request method
@@ -641,6 +963,51 @@ class Connection(object):
 
         return response
 
+    def request_xml_items(self, action, item_xpath, namespace=None,
+                          params=None, data=None, headers=None,
+                          method='GET'):
+        """
+        Request a given `action` and parse the XML response incrementally.
+
+        The body is streamed from the network and only a single element which
+        matches ``item_xpath`` is held in memory at a time. This is meant for
+        very large listings (images, objects, etc.).
+
+        Error responses are read in full and handled by ``responseCls`` so
+        the same exceptions are raised as with :meth:`request`.
+
+        :type action: ``str``
+        :param action: A path. This can include arguments.
+
+        :type item_xpath: ``str``
+        :param item_xpath: Path to the repeated element relative to the root
+                           element (e.g. ``imagesSet/item``).
+
+        :type namespace: ``str``
+        :param namespace: XML namespace of the elements in ``item_xpath``.
+
+        :return: A :class:`StreamingXmlResponse` instance.
+        :rtype: :class:`StreamingXmlResponse`
+        """
+        self.request(action=action, params=params, data=data,
+                     headers=headers, method=method, raw=True, stream=True)
+
+        http_response = self.connection.getresponse()
+        response = self.streamingXmlResponseCls(response=http_response,
+                                                connection=self,
+                                                item_xpath=item_xpath,
+                                                namespace=namespace)
+
+        if not response.success():
+            # Error bodies are small, let the regular response class parse
+            # them and raise the provider specific exception
+            error = self.responseCls(response=http_response, connection=self)
+            raise exception_from_message(code=error.status,
+                                         message=error.body,
+                                         headers=error.headers)
+
+        return response
+
     def morph_action_hook(self, action):
         url = urlparse.urljoin(self.request_path.lstrip('/').rstrip('/') +
                                '/', action.lstrip('/'))
@@ -721,6 +1088,11 @@ class PollingConnection(Connection):
     timeout = 200
     request_method = 'request'
 
+    # Used by start_async_request: the poll interval of each job is multiplied
+    # by poll_backoff after every status check up to max_poll_interval
+    poll_backoff = 1.5
+    max_poll_interval = 10
+
     def async_request(self, action, params=None, data=None, headers=None,
                       method='GET', context=None):
         """
@@ -788,6 +1160,72 @@ class PollingConnection(Connection):
 
         return response
 
+    def start_async_request(self, action, params=None, data=None,
+                            headers=None, method='GET', context=None,
+                            callback=None, poller=None):
+        """
+        Perform an 'async' request to the specified path without waiting for
+        the job to complete.
+
+        The initial request is performed synchronously. The job is then
+        handed over to a :class:`JobPoller` which polls it in the background
+        together with all the other outstanding jobs, so many jobs can be
+        waited on at the same time.
+
+        Arguments are the same as for :meth:`async_request`.
+
+        :type callback: ``callable``
+        :param callback: Optional function which is called with the
+                         :class:`PollingJob` once the job has completed.
+
+        :type poller: :class:`JobPoller`
+        :param poller: Poller which tracks the job. The shared default poller
+                       is used if not provided.
+
+        :return: A job whose ``result()`` is the final poll response.
+        :rtype: :class:`PollingJob`
+        """
+        request = getattr(self, self.request_method)
+        kwargs = self.get_request_kwargs(action=action, params=params,
+                                         data=data, headers=headers,
+                                         method=method,
+                                         context=context)
+        response = request(**kwargs)
+        poll_kwargs = self.get_poll_request_kwargs(response=response,
+                                                   context=context,
+                                                   request_kwargs=kwargs)
+
+        job = PollingJob(connection=self, poll_kwargs=poll_kwargs,
+                         timeout=self.timeout,
+                         poll_interval=self.poll_interval,
+                         max_poll_interval=max(self.max_poll_interval,
+                                               self.poll_interval),
+                         backoff=self.poll_backoff)
+
+        if callback is not None:
+            job.add_done_callback(callback)
+
+        poller = poller or get_default_poller()
+        poller.add(job)
+        return job
+
+    def poll_jobs(self, jobs):
+        """
+        Perform the poll requests for the provided jobs.
+
+        Connections whose API can return the status of many jobs with a
+        single request should override this method.
+
+        :param jobs: Jobs to check.
+        :type jobs: ``list`` of :class:`PollingJob`
+
+        :return: Poll responses in the same order as ``jobs``. Each response
+                 is passed to :meth:`has_completed`.
+        :rtype: ``list``
+        """
+        request = getattr(self, self.request_method)
+        return [request(**job.poll_kwargs) for job in jobs]
+
     def get_request_kwargs(self, action, params=None, data=None, headers=None,
                            method='GET', context=None):
         """
@@ -945,6 +1383,11 @@ class BaseDriver(object):
                        support multiple regions.
         :type region: ``str``
 
+        Connection pooling and keep-alive can be tuned with the
+        ``pool_connections``, ``pool_maxsize``, ``pool_block``,
+        ``max_retries``, ``keep_alive_timeout`` and ``shared_session``
+        keyword arguments (see :meth:`Connection.set_pool_options`).
+
         :rtype: ``None``
         """
 
@@ -972,9 +1415,15 @@ class BaseDriver(object):
                             'retry_delay': kwargs.pop('retry_delay', None),
                             'backoff': kwargs.pop('backoff', None),
                             'proxy_url': kwargs.pop('proxy_url', None)})
+        pool_options = dict((key, kwargs.pop(key)) for key in POOL_KWARGS
+                            if key in kwargs)
         self.connection = self.connectionCls(*args, **conn_kwargs)
 
         self.connection.driver = self
+
+        if pool_options:
+            self.connection.set_pool_options(**pool_options)
+
         self.connection.connect()
 
     def _ex_connection_class_kwargs(self):
@@ -116,6 +116,56 @@ class CloudStackConnection(ConnectionUserAndKey, PollingConnection):
             method=method, context=context)
         return result['jobresult']
 
+    def _start_async_request(self, command, action=None, params=None,
+                             data=None, headers=None, method='GET',
+                             context=None, callback=None, poller=None):
+        """
+        Start an asynchronous job without waiting for it to complete.
+
+        :return: A job whose ``result()`` is the job status dictionary. The
+                 outcome of the job is available under ``jobresult``.
+        :rtype: :class:`PollingJob`
+        """
+        if params:
+            context = copy.deepcopy(params)
+        else:
+            context = {}
+
+        context['command'] = command
+        return self.start_async_request(
+            action=action, params=params, data=data, headers=headers,
+            method=method, context=context, callback=callback,
+            poller=poller)
+
+    def poll_jobs(self, jobs):
+        """
+        Check the status of many jobs with a single listAsyncJobs call.
+
+        Jobs which are not included in the listing (e.g. because of paging)
+        are checked individually.
+
+        @inherits: :class:`PollingConnection.poll_jobs`
+        """
+        if len(jobs) < 2:
+            return super(CloudStackConnection, self).poll_jobs(jobs)
+
+        result = self._sync_request(command='listAsyncJobs', method='GET')
+        statuses = dict([(str(job['jobid']), job) for job in
+                         result.get('asyncjobs', [])])
+
+        responses = []
+
+        for job in jobs:
+            job_id = str(job.poll_kwargs['params']['jobid'])
+            response = statuses.get(job_id, None)
+
+            if response is None:
+                response = self._sync_request(**job.poll_kwargs)
+
+            responses.append(response)
+
+        return responses
+
     def get_request_kwargs(self, action, params=None, data='', headers=None,
                            method='GET', context=None):
         command = context['command']
@@ -200,3 +250,11 @@ class CloudStackDriverMixIn(object):
                                               params=params, data=data,
                                               headers=headers, method=method,
                                               context=context)
+
+    def _start_async_request(self, command, action=None, params=None,
+                             data=None, headers=None, method='GET',
+                             context=None, callback=None, poller=None):
+        return self.connection._start_async_request(
+            command=command, action=action, params=params, data=data,
+            headers=headers, method=method, context=context,
+            callback=callback, poller=poller)
@@ -81,6 +81,7 @@ import os
 import socket
 import sys
 
+from libcloud.utils import jsoncodec
 from libcloud.utils.connection import get_response_object
 from libcloud.utils.py3 import b, httplib, urlencode, urlparse, PY3
 from libcloud.common.base import (ConnectionUserAndKey, JsonResponse,
@@ -234,12 +235,12 @@ class GoogleResponse(JsonResponse):
         :return:  JSON dictionary
         :rtype:   ``dict``
         """
-        if len(self.body) == 0 and not self.parse_zero_length_body:
+        if self._is_body_empty() and not self.parse_zero_length_body:
             return self.body
 
         json_error = False
         try:
-            body = json.loads(self.body)
+            body = jsoncodec.loads(self._get_body_content())
         except:
             # If there is both a JSON parsing error and an unsuccessful http
             # response (like a 404), we want to raise the http error and not
@@ -792,7 +793,7 @@ class GoogleBaseConnection(ConnectionUserAndKey, PollingConnection):
 
     def encode_data(self, data):
         """Encode data to JSON"""
-        return json.dumps(data)
+        return jsoncodec.dumps(data)
 
     def request(self, *args, **kwargs):
         """
@@ -17,25 +17,25 @@
 Common utilities for OpenStack
 """
 
+import sys
+
 from libcloud.utils.py3 import ET
 from libcloud.utils.py3 import httplib
+from libcloud.utils import jsoncodec
 
 from libcloud.common.base import ConnectionUserAndKey, Response
 from libcloud.common.types import ProviderError
-from libcloud.compute.types import (LibcloudError, MalformedResponseError)
+from libcloud.common.exceptions import BaseHTTPError
+from libcloud.compute.types import (LibcloudError, MalformedResponseError,
+                                    InvalidCredsError)
 from libcloud.compute.types import KeyPairDoesNotExistError
 from libcloud.common.openstack_identity import get_class_for_auth_version
+from libcloud.common.openstack_identity import OpenStackAuthenticationContext
 
 # Imports for backward compatibility reasons
 from libcloud.common.openstack_identity import (OpenStackServiceCatalog,
                                                 OpenStackIdentityTokenScope)
 
-
-try:
-    import simplejson as json
-except ImportError:
-    import json
-
 AUTH_API_VERSION = '1.1'
 
 # Auth versions which contain token expiration information.
@@ -123,6 +123,12 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
                                     If not specified, a provider specific
                                     default will be used.
     :type ex_force_service_region: ``str``
+
+    :param ex_auth_cache: Cache which is used to share auth tokens and
+                          service catalogs with other connections (and
+                          processes). If not specified, every connection
+                          authenticates on its own.
+    :type ex_auth_cache: :class:`OpenStackAuthenticationCache`
     """
 
     auth_url = None
@@ -148,6 +154,7 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
                  ex_force_service_type=None,
                  ex_force_service_name=None,
                  ex_force_service_region=None,
+                 ex_auth_cache=None,
                  retry_delay=None, backoff=None):
         super(OpenStackBaseConnection, self).__init__(
             user_id, key, secure=secure, timeout=timeout,
@@ -165,6 +172,7 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
         self._ex_force_service_type = ex_force_service_type
         self._ex_force_service_name = ex_force_service_name
         self._ex_force_service_region = ex_force_service_region
+        self._ex_auth_cache = ex_auth_cache
         self._osa = None
 
         if ex_force_auth_token and not ex_force_base_url:
@@ -215,12 +223,50 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
         if method.upper() in ['POST', 'PUT'] and default_content_type:
             headers = {'Content-Type': default_content_type}
 
-        return super(OpenStackBaseConnection, self).request(action=action,
-                                                            params=params,
-                                                            data=data,
-                                                            method=method,
-                                                            headers=headers,
-                                                            raw=raw)
+        kwargs = {'action': action, 'params': params, 'data': data,
+                  'method': method, 'headers': headers, 'raw': raw}
+
+        try:
+            return super(OpenStackBaseConnection, self).request(**kwargs)
+        except (BaseHTTPError, InvalidCredsError):
+            e = sys.exc_info()[1]
+
+            if isinstance(e, BaseHTTPError) and \
+                    e.code != httplib.UNAUTHORIZED:
+                raise
+
+            # The token can be shared with other connections through the
+            # cache and it has been revoked or it has expired. It's removed
+            # from the cache and the request is retried once with a new
+            # token. Raw requests can't be retried since their data may be a
+            # stream.
+            if raw or not self._clear_cached_auth_token():
+                raise
+
+        return super(OpenStackBaseConnection, self).request(**kwargs)
+
+    def _clear_cached_auth_token(self):
+        """
+        Remove the token of this connection from the authentication cache so
+        a new token is retrieved by the next request.
+
+        :return: True if the token has been removed.
+        :rtype: ``bool``
+        """
+        cache = self._ex_auth_cache
+
+        if cache is None or self._ex_force_auth_token or \
+                not self.auth_token:
+            return False
+
+        osa = self.get_auth_class()
+        cache.clear(osa.get_auth_cache_key(), token=self.auth_token)
+
+        osa.auth_token = None
+        osa.auth_token_expires = None
+        self.auth_token = None
+        self.auth_token_expires = None
+        return True
 
     def _get_auth_url(self):
         """
@@ -311,26 +357,64 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
             self._set_up_connection_info(url=self._ex_force_base_url)
             return
 
-        if not osa.is_token_valid():
-            # Token is not available or it has expired. Need to retrieve a
-            # new one.
-            if self._auth_version == '2.0_apikey':
-                kwargs = {'auth_type': 'api_key'}
-            elif self._auth_version == '2.0_password':
-                kwargs = {'auth_type': 'password'}
+        cache = self._ex_auth_cache
+
+        if cache is None:
+            authenticate = not osa.is_token_valid()
+        elif osa.auth_token and not osa.auth_token_expires:
+            # Token without expiration information (auth 1.x) which has
+            # been retrieved or loaded from the cache earlier
+            authenticate = False
+        else:
+            authenticate = not osa.is_token_valid() or \
+                not cache.is_fresh(osa.auth_token_expires)
+
+        if authenticate:
+            # Token is not available, it has expired or it's about to expire
+            # and should be refreshed. Try to get a fresh one from the cache
+            # and retrieve a new one if there is none.
+            context = None
+
+            if cache is not None:
+                context = cache.get(osa.get_auth_cache_key())
+
+            if context is None:
+                if self._auth_version == '2.0_apikey':
+                    kwargs = {'auth_type': 'api_key'}
+                elif self._auth_version == '2.0_password':
+                    kwargs = {'auth_type': 'password'}
+                else:
+                    kwargs = {}
+
+                if osa.is_token_valid():
+                    # Token is still valid, but it needs to be refreshed
+                    kwargs['force'] = True
+
+                osa = osa.authenticate(**kwargs)  # may throw InvalidCreds
+
+                context = OpenStackAuthenticationContext(
+                    token=osa.auth_token, expires=osa.auth_token_expires,
+                    user_info=osa.auth_user_info, urls=osa.urls)
+
+                if cache is not None:
+                    cache.put(osa.get_auth_cache_key(), context)
             else:
-                kwargs = {}
+                osa.auth_token = context.token
+                osa.auth_token_expires = context.expires
+                osa.auth_user_info = context.user_info
+                osa.urls = context.urls
 
-            osa = osa.authenticate(**kwargs)  # may throw InvalidCreds
+            self.auth_token = context.token
+            self.auth_token_expires = context.expires
+            self.auth_user_info = context.user_info
 
-            self.auth_token = osa.auth_token
-            self.auth_token_expires = osa.auth_token_expires
-            self.auth_user_info = osa.auth_user_info
+            # Pull out and parse the service catalog (only once per context)
+            if context.service_catalog is None:
+                context.service_catalog = OpenStackServiceCatalog(
+                    service_catalog=context.urls,
+                    auth_version=self._auth_version)
 
-            # Pull out and parse the service catalog
-            osc = OpenStackServiceCatalog(service_catalog=osa.urls,
-                                          auth_version=self._auth_version)
-            self.service_catalog = osc
+            self.service_catalog = context.service_catalog
 
         url = self._ex_force_base_url or self.get_endpoint()
         self._set_up_connection_info(url=url)
@@ -353,7 +437,7 @@ class OpenStackResponse(Response):
         return content_type_value.find(content_type.lower()) > -1
 
     def parse_body(self):
-        if self.status == httplib.NO_CONTENT or not self.body:
+        if self.status == httplib.NO_CONTENT or self._is_body_empty():
             return None
 
         if self.has_content_type('application/xml'):
@@ -367,7 +451,7 @@ class OpenStackResponse(Response):
 
         elif self.has_content_type('application/json'):
             try:
-                return json.loads(self.body)
+                return jsoncodec.loads(self._get_body_content())
             except:
                 raise MalformedResponseError(
                     'Failed to parse JSON',
@@ -420,7 +504,8 @@ class OpenStackDriverMixin(object):
                  ex_tenant_name=None,
                  ex_force_service_type=None,
                  ex_force_service_name=None,
-                 ex_force_service_region=None, *args, **kwargs):
+                 ex_force_service_region=None,
+                 ex_auth_cache=None, *args, **kwargs):
         self._ex_force_base_url = ex_force_base_url
         self._ex_force_auth_url = ex_force_auth_url
         self._ex_force_auth_version = ex_force_auth_version
@@ -431,6 +516,7 @@ class OpenStackDriverMixin(object):
         self._ex_force_service_type = ex_force_service_type
         self._ex_force_service_name = ex_force_service_name
         self._ex_force_service_region = ex_force_service_region
+        self._ex_auth_cache = ex_auth_cache
 
     def openstack_connection_kwargs(self):
         """
@@ -458,4 +544,6 @@ class OpenStackDriverMixin(object):
             rv['ex_force_service_name'] = self._ex_force_service_name
         if self._ex_force_service_region:
             rv['ex_force_service_region'] = self._ex_force_service_region
+        if self._ex_auth_cache is not None:
+            rv['ex_auth_cache'] = self._ex_auth_cache
         return rv
@@ -18,9 +18,19 @@ Common / shared code for handling authentication against OpenStack identity
 service (Keystone).
 """
 
+import os
 import sys
+import hashlib
 import datetime
+import threading
 
+try:
+    import fcntl
+except ImportError:
+    # File locking is not available on this platform (e.g. Windows)
+    fcntl = None
+
+from libcloud.utils.py3 import b
 from libcloud.utils.py3 import httplib
 from libcloud.utils.iso8601 import parse_date
 
@@ -54,6 +64,16 @@ AUTH_VERSIONS_WITH_EXPIRES = [
 # user from getting "InvalidCredsError" if token is about to expire.
 AUTH_TOKEN_EXPIRES_GRACE_SECONDS = 5
 
+# How many seconds before the expiration a token which is stored in an
+# authentication cache is considered stale and refreshed. Refreshing early
+# means connections which share the cache don't all hit the identity service
+# at the same time when the token is about to expire.
+AUTH_CACHE_REFRESH_SECONDS = 300
+
+# How many seconds a token without expiration information (auth 1.x) is kept
+# in an authentication cache
+AUTH_CACHE_NO_EXPIRY_TTL = 3600
+
 
 __all__ = [
     'OpenStackIdentityVersion',
@@ -67,6 +87,11 @@ __all__ = [
     'OpenStackServiceCatalogEntryEndpoint',
     'OpenStackIdentityEndpointType',
 
+    'OpenStackAuthenticationContext',
+    'OpenStackAuthenticationCache',
+    'OpenStackMemoryAuthenticationCache',
+    'OpenStackFileAuthenticationCache',
+
     'OpenStackIdentityConnection',
     'OpenStackIdentity_1_0_Connection',
     'OpenStackIdentity_1_1_Connection',
@@ -526,6 +551,322 @@ class OpenStackServiceCatalogEntryEndpoint(object):
                  'type=%s' % (self.region, self.url, self.endpoint_type)))
 
 
+class OpenStackAuthenticationContext(object):
+    """
+    Authentication state which is returned by the identity service and can
+    be shared between connections using an authentication cache.
+    """
+
+    def __init__(self, token, expires=None, user_info=None, urls=None):
+        """
+        :param token: Auth token.
+        :type token: ``str``
+
+        :param expires: Token expiration time.
+        :type expires: :class:`datetime.datetime`
+
+        :param user_info: User information returned by the identity service.
+        :type user_info: ``dict``
+
+        :param urls: Raw service catalog returned by the identity service.
+        :type urls: ``dict`` or ``list``
+        """
+        self.token = token
+        self.expires = expires
+        self.user_info = user_info
+        self.urls = urls
+
+        # Parsed service catalog. It's only kept in memory so the catalog is
+        # parsed once per process instead of once per connection.
+        self.service_catalog = None
+
+    def __repr__(self):
+        return ('<OpenStackAuthenticationContext expires=%s>' %
+                (self.expires))
+
+
+class OpenStackAuthenticationCache(object):
+    """
+    Base class for caches which share auth tokens and service catalogs
+    between OpenStack connections.
+
+    Entries are keyed by the tuple returned by
+    :meth:`OpenStackIdentityConnection.get_auth_cache_key` (auth URL,
+    identity version, user, tenant, domain, token scope and a digest of the
+    secret). Tokens without expiration information (auth 1.x) are kept for
+    ``no_expiry_ttl`` seconds.
+    """
+
+    def __init__(self, refresh_seconds=AUTH_CACHE_REFRESH_SECONDS,
+                 no_expiry_ttl=AUTH_CACHE_NO_EXPIRY_TTL):
+        """
+        :param refresh_seconds: Number of seconds before the expiration
+                                after which a cached token is not returned
+                                anymore so a new one is retrieved.
+        :type refresh_seconds: ``int``
+
+        :param no_expiry_ttl: Number of seconds after which a token without
+                              expiration information expires in the cache.
+        :type no_expiry_ttl: ``int``
+        """
+        self.refresh_seconds = refresh_seconds
+        self.no_expiry_ttl = no_expiry_ttl
+
+    def get(self, key):
+        """
+        Return the cached authentication context for the provided key.
+
+        :return: Cached context or ``None`` if there is no context or the
+                 token is about to expire.
+        :rtype: :class:`OpenStackAuthenticationContext`
+        """
+        entry = self._get(key)
+
+        if entry is None or not self.is_fresh(entry[1]):
+            return None
+
+        return entry[0]
+
+    def put(self, key, context):
+        """
+        Store an authentication context in the cache.
+
+        :type context: :class:`OpenStackAuthenticationContext`
+        """
+        expires = context.expires
+
+        if not expires:
+            expires = datetime.datetime.utcnow() + \
+                datetime.timedelta(seconds=self.no_expiry_ttl)
+
+        self._put(key, context, expires)
+
+    def clear(self, key, token=None):
+        """
+        Remove an authentication context from the cache (e.g. after the
+        token has been revoked).
+
+        :param token: Only remove the context if it holds this token (and
+                      not a token which has been stored by another
+                      connection in the meantime).
+        :type token: ``str``
+        """
+        raise NotImplementedError('clear not implemented for this cache')
+
+    def is_fresh(self, expires):
+        """
+        Return True if a token which expires at the provided time doesn't
+        need to be refreshed yet.
+
+        :type expires: :class:`datetime.datetime`
+
+        :rtype: ``bool``
+        """
+        if not expires:
+            return False
+
+        expires = expires - datetime.timedelta(seconds=self.refresh_seconds)
+
+        time_tuple_expires = expires.utctimetuple()
+        time_tuple_now = datetime.datetime.utcnow().utctimetuple()
+
+        return time_tuple_now < time_tuple_expires
+
+    def _get(self, key):
+        """
+        Return the cached context and the time at which it expires in the
+        cache.
+
+        :rtype: ``tuple`` or ``None``
+        """
+        raise NotImplementedError('_get not implemented for this cache')
+
+    def _put(self, key, context, expires):
+        raise NotImplementedError('_put not implemented for this cache')
+
+
+class OpenStackMemoryAuthenticationCache(OpenStackAuthenticationCache):
+    """
+    Authentication cache which is shared by the connections of a single
+    process.
+    """
+
+    def __init__(self, refresh_seconds=AUTH_CACHE_REFRESH_SECONDS,
+                 no_expiry_ttl=AUTH_CACHE_NO_EXPIRY_TTL):
+        super(OpenStackMemoryAuthenticationCache, self).__init__(
+            refresh_seconds=refresh_seconds, no_expiry_ttl=no_expiry_ttl)
+        self._contexts = {}
+        self._lock = threading.Lock()
+
+    def clear(self, key, token=None):
+        with self._lock:
+            entry = self._contexts.get(key, None)
+
+            if entry is not None and (token is None or
+                                      entry[0].token == token):
+                del self._contexts[key]
+
+    def _put(self, key, context, expires):
+        with self._lock:
+            self._contexts[key] = (context, expires)
+
+    def _get(self, key):
+        with self._lock:
+            return self._contexts.get(key, None)
+
+
+class OpenStackFileAuthenticationCache(OpenStackAuthenticationCache):
+    """
+    Authentication cache which stores the contexts in a JSON file so they can
+    be shared by multiple processes on the same host.
+
+    The file is only readable by the current user and access to it is
+    serialized using an advisory lock (on platforms which support fcntl).
+    The file is only read again when it has been modified.
+    """
+
+    def __init__(self, path, refresh_seconds=AUTH_CACHE_REFRESH_SECONDS,
+                 no_expiry_ttl=AUTH_CACHE_NO_EXPIRY_TTL):
+        """
+        :param path: Path to the cache file.
+        :type path: ``str``
+        """
+        super(OpenStackFileAuthenticationCache, self).__init__(
+            refresh_seconds=refresh_seconds, no_expiry_ttl=no_expiry_ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._entries = {}
+        self._contexts = {}
+
+    def clear(self, key, token=None):
+        entry_key = self._get_entry_key(key)
+
+        with self._lock:
+            with self._lock_file(exclusive=True):
+                entries = self._read()
+                entry = entries.get(entry_key, None)
+
+                if entry is not None and (token is None or
+                                          entry['token'] == token):
+                    del entries[entry_key]
+                    self._write(entries)
+
+            self._contexts.pop(entry_key, None)
+
+    def _put(self, key, context, expires):
+        with self._lock:
+            with self._lock_file(exclusive=True):
+                entries = self._read()
+                entries[self._get_entry_key(key)] = {
+                    'token': context.token,
+                    'expires': (context.expires.isoformat()
+                                if context.expires else None),
+                    'cache_expires': expires.isoformat(),
+                    'user_info': context.user_info,
+                    'urls': context.urls
+                }
+                self._write(entries)
+
+            self._contexts[self._get_entry_key(key)] = context
+
+    def _get(self, key):
+        entry_key = self._get_entry_key(key)
+
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return None
+
+            # The file is replaced on every write so the inode changes even
+            # if the modification time resolution is coarse
+            mtime = (stat.st_mtime, stat.st_ino, stat.st_size)
+
+            if mtime != self._mtime:
+                with self._lock_file(exclusive=False):
+                    self._entries = self._read()
+                    self._mtime = mtime
+
+            entry = self._entries.get(entry_key, None)
+
+            if entry is None:
+                return None
+
+            context = self._contexts.get(entry_key, None)
+
+            # Reuse the context (and the parsed service catalog) if the token
+            # hasn't changed since the file has been read last time
+            if context is None or context.token != entry['token']:
+                context = OpenStackAuthenticationContext(
+                    token=entry['token'],
+                    expires=(parse_date(entry['expires'])
+                             if entry['expires'] else None),
+                    user_info=entry['user_info'],
+                    urls=entry['urls'])
+                self._contexts[entry_key] = context
+
+            # Entries which have been written without the cache expiration
+            # time expire with the token
+            cache_expires = entry.get('cache_expires', None)
+            expires = parse_date(cache_expires) if cache_expires else \
+                context.expires
+
+            return context, expires
+
+    def _get_entry_key(self, key):
+        return json.dumps(list(key))
+
+    def _lock_file(self, exclusive):
+        return _FileLock(path=self.path + '.lock', exclusive=exclusive)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as fp:
+                return json.load(fp)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        tmp_path = '%s.%s.tmp' % (self.path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                     int('600', 8))
+
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(entries, fp)
+
+        if os.name == 'nt' and os.path.exists(self.path):
+            os.remove(self.path)
+
+        os.rename(tmp_path, self.path)
+
+
+class _FileLock(object):
+    """
+    Advisory lock which serializes access to a file between processes.
+    """
+
+    def __init__(self, path, exclusive=True):
+        self.path = path
+        self.exclusive = exclusive
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, int('600', 8))
+        fcntl.flock(self._fd,
+                    fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
 class OpenStackAuthResponse(Response):
     def success(self):
         return self.status in [httplib.OK, httplib.CREATED,
@@ -619,6 +960,18 @@ class OpenStackIdentityConnection(ConnectionUserAndKey):
         return self.request(action=action, params=params, data=data,
                             headers=headers, method=method, raw=raw)
 
+    def get_auth_cache_key(self):
+        """
+        Return the key which identifies the tokens of this connection in an
+        authentication cache.
+
+        :rtype: ``tuple``
+        """
+        secret_digest = hashlib.sha256(b(self.key or '')).hexdigest()
+        return (self.auth_url, self.auth_version, self.user_id,
+                self.tenant_name, self.domain_name, self.token_scope,
+                secret_digest)
+
     def morph_action_hook(self, action):
         (_, _, _, request_path) = self._tuple_from_url(self.auth_url)
 
@@ -0,0 +1,291 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Poller which waits for many asynchronous provider jobs at the same time.
+
+Jobs are started with :meth:`PollingConnection.start_async_request` which
+returns a :class:`PollingJob`. A single background thread per
+:class:`JobPoller` checks the status of all the outstanding jobs. Jobs which
+belong to the same connection and are due at the same time are checked
+together with :meth:`PollingConnection.poll_jobs` so connections can use an
+API call which returns the status of many jobs at once. The poll interval of
+each job grows exponentially until the job completes. Failed status checks
+are retried with the same backoff until the job times out.
+"""
+
+import sys
+import time
+import heapq
+import logging
+import itertools
+import threading
+
+from libcloud.common.types import LibcloudError
+
+__all__ = [
+    'PollingJob',
+    'JobPoller',
+    'get_default_poller'
+]
+
+LOG = logging.getLogger(__name__)
+
+_DEFAULT_POLLER = None
+_DEFAULT_POLLER_LOCK = threading.Lock()
+
+
+class PollingJob(object):
+    """
+    Handle for an asynchronous job which is tracked by :class:`JobPoller`.
+
+    The interface is a subset of :class:`concurrent.futures.Future`.
+    """
+
+    def __init__(self, connection, poll_kwargs, timeout, poll_interval,
+                 max_poll_interval, backoff):
+        """
+        :param connection: Connection which is used to check the job status.
+        :type connection: :class:`PollingConnection`
+
+        :param poll_kwargs: Keyword arguments for the poll request.
+        :type poll_kwargs: ``dict``
+
+        :param timeout: How many seconds to wait for the job to complete.
+        :type timeout: ``int``
+
+        :param poll_interval: Seconds to wait before the first status check.
+        :type poll_interval: ``float``
+
+        :param max_poll_interval: Upper bound for the poll interval.
+        :type max_poll_interval: ``float``
+
+        :param backoff: Factor the poll interval is multiplied with after
+                        each status check.
+        :type backoff: ``float``
+        """
+        self.connection = connection
+        self.poll_kwargs = poll_kwargs
+        self.timeout = timeout
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+
+        now = time.time()
+        self.deadline = now + timeout
+        self.poll_interval = poll_interval
+        self.next_poll = now + poll_interval
+
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._response = None
+        self._error = None
+
+    def done(self):
+        """
+        Return True if the job has completed or failed.
+
+        :rtype: ``bool``
+        """
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Wait for the job to complete and return the last poll response.
+
+        The error is raised if the job has failed or timed out.
+
+        :param timeout: How many seconds to wait. Waits forever if None.
+        :type timeout: ``float``
+        """
+        error = self.exception(timeout=timeout)
+
+        if error is not None:
+            raise error
+
+        return self._response
+
+    def exception(self, timeout=None):
+        """
+        Wait for the job to complete and return the error it failed with or
+        None.
+
+        :param timeout: How many seconds to wait. Waits forever if None.
+        :type timeout: ``float``
+        """
+        if not self._event.wait(timeout):
+            raise LibcloudError('Job did not complete in %s seconds' %
+                                (timeout))
+
+        return self._error
+
+    def add_done_callback(self, callback):
+        """
+        Call ``callback`` with the job as the only argument once it has
+        completed. The callback is called immediately if the job has
+        already completed.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+
+        self._call(callback)
+
+    def _schedule_next_poll(self, now):
+        self.poll_interval = min(self.poll_interval * self.backoff,
+                                 self.max_poll_interval)
+        self.next_poll = min(now + self.poll_interval, self.deadline)
+
+    def _set_result(self, response):
+        self._response = response
+        self._complete()
+
+    def _set_exception(self, error):
+        self._error = error
+        self._complete()
+
+    def _complete(self):
+        with self._lock:
+            self._event.set()
+            callbacks = self._callbacks
+            self._callbacks = []
+
+        for callback in callbacks:
+            self._call(callback)
+
+    def _call(self, callback):
+        try:
+            callback(self)
+        except Exception:
+            LOG.exception('Exception in callback of %r', self)
+
+
+class JobPoller(object):
+    """
+    Poll the status of many asynchronous jobs from a single thread.
+
+    The thread is started when a job is added and stops once there are no
+    outstanding jobs left.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._queue = []
+        self._counter = itertools.count()
+        self._thread = None
+
+    def add(self, job):
+        """
+        Start tracking the provided job.
+
+        :param job: Job to track.
+        :type job: :class:`PollingJob`
+        """
+        with self._condition:
+            heapq.heappush(self._queue,
+                           (job.next_poll, next(self._counter), job))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._thread = None
+                    return
+
+                delay = self._queue[0][0] - time.time()
+
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                now = time.time()
+                due = []
+
+                while self._queue and self._queue[0][0] <= now:
+                    due.append(heapq.heappop(self._queue)[2])
+
+            self._poll(due)
+
+    def _poll(self, jobs):
+        # Group the jobs per connection so they can be checked together
+        groups = {}
+
+        for job in jobs:
+            groups.setdefault(id(job.connection), []).append(job)
+
+        for group in groups.values():
+            connection = group[0].connection
+
+            try:
+                responses = connection.poll_jobs(group)
+            except Exception:
+                # Errors of the poll request itself are usually transient so
+                # the jobs are checked again after the next interval and only
+                # fail once they have timed out
+                e = sys.exc_info()[1]
+                LOG.warning('Failed to check the status of %s job(s): %s',
+                            len(group), e)
+                now = time.time()
+
+                for job in group:
+                    if now >= job.deadline:
+                        job._set_exception(e)
+                    else:
+                        job._schedule_next_poll(now)
+                        self.add(job)
+
+                continue
+
+            now = time.time()
+
+            for job, response in zip(group, responses):
+                try:
+                    completed = connection.has_completed(response=response)
+                except Exception:
+                    job._set_exception(sys.exc_info()[1])
+                    continue
+
+                if completed:
+                    job._set_result(response)
+                elif now >= job.deadline:
+                    job._set_exception(
+                        LibcloudError('Job did not complete in %s seconds' %
+                                      (job.timeout)))
+                else:
+                    job._schedule_next_poll(now)
+                    self.add(job)
+
+
+def get_default_poller():
+    """
+    Return the poller which is shared by all the connections.
+
+    :rtype: :class:`JobPoller`
+    """
+    global _DEFAULT_POLLER
+
+    with _DEFAULT_POLLER_LOCK:
+        if _DEFAULT_POLLER is None:
+            _DEFAULT_POLLER = JobPoller()
+
+    return _DEFAULT_POLLER
@@ -0,0 +1,62 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Asynchronous version of the compute API (requires Python 3.5 or newer).
+"""
+
+from libcloud.common.aio import AsyncDriver, async_method, async_iterator
+
+__all__ = [
+    'AsyncNodeDriver'
+]
+
+
+class AsyncNodeDriver(AsyncDriver):
+    """
+    Asynchronous wrapper around a :class:`libcloud.compute.base.NodeDriver`.
+
+    All the methods take the same arguments as the wrapped driver methods and
+    return futures.
+
+    >>> import asyncio
+    >>> from libcloud.compute.drivers.dummy import DummyNodeDriver
+    >>> driver = AsyncNodeDriver(DummyNodeDriver(0))
+    >>> loop = asyncio.get_event_loop()
+    >>> nodes = loop.run_until_complete(driver.list_nodes())
+    >>> len(nodes)
+    2
+    """
+
+    list_nodes = async_method('list_nodes')
+    list_sizes = async_method('list_sizes')
+    list_locations = async_method('list_locations')
+    list_images = async_method('list_images')
+    get_image = async_method('get_image')
+    create_node = async_method('create_node')
+    reboot_node = async_method('reboot_node')
+    destroy_node = async_method('destroy_node')
+    wait_until_running = async_method('wait_until_running')
+    iterate_running_nodes = async_iterator('iterate_running_nodes')
+    list_volumes = async_method('list_volumes')
+    create_volume = async_method('create_volume')
+    destroy_volume = async_method('destroy_volume')
+    attach_volume = async_method('attach_volume')
+    detach_volume = async_method('detach_volume')
+    list_volume_snapshots = async_method('list_volume_snapshots')
+    create_volume_snapshot = async_method('create_volume_snapshot')
+    destroy_volume_snapshot = async_method('destroy_volume_snapshot')
+    list_key_pairs = async_method('list_key_pairs')
+    get_key_pair = async_method('get_key_pair')
@@ -31,6 +31,7 @@ from libcloud.utils.py3 import b
 
 import libcloud.compute.ssh
 from libcloud.pricing import get_size_price
+from libcloud.pricing import get_size_prices
 from libcloud.compute.types import NodeState, StorageVolumeState,\
     DeploymentError
 from libcloud.compute.ssh import SSHClient
@@ -39,6 +40,8 @@ from libcloud.common.base import BaseDriver
 from libcloud.common.types import LibcloudError
 from libcloud.compute.ssh import have_paramiko
 
+from libcloud.utils.concurrency import DEFAULT_MAX_WORKERS
+from libcloud.utils.concurrency import run_concurrently
 from libcloud.utils.networking import is_private_subnet
 from libcloud.utils.networking import is_valid_ip_address
 
@@ -68,6 +71,7 @@ __all__ = [
     'NodeLocation',
     'NodeAuthSSHKey',
     'NodeAuthPassword',
+    'NodeDeploymentResult',
     'NodeDriver',
 
     'StorageVolume',
@@ -698,6 +702,39 @@ class KeyPair(object):
                 (self.name, self.fingerprint, self.driver.name))
 
 
+class NodeDeploymentResult(object):
+    """
+    Outcome of deploying a single node with :meth:`NodeDriver.deploy_nodes`.
+    """
+
+    def __init__(self, kwargs, node=None, error=None, attempts=0):
+        """
+        :param kwargs: Keyword arguments the node was created with.
+        :type kwargs: ``dict``
+
+        :param node: Created node or None if the node couldn't be created.
+        :type node: :class:`.Node`
+
+        :param error: Exception which caused the deployment to fail (if any).
+        :type error: ``Exception``
+
+        :param attempts: How many times the deployment has been run.
+        :type attempts: ``int``
+        """
+        self.kwargs = kwargs
+        self.node = node
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def success(self):
+        return self.node is not None and self.error is None
+
+    def __repr__(self):
+        return ('<NodeDeploymentResult: node=%s, success=%s, attempts=%s>' %
+                (self.node, self.success, self.attempts))
+
+
 class NodeDriver(BaseDriver):
     """
     A base NodeDriver class to derive from
@@ -930,6 +967,143 @@ class NodeDriver(BaseDriver):
                                    'public_ips', other option is 'private_ips'.
         :type ssh_interface: ``str``
         """
+        self._check_deploy_kwargs(kwargs)
+
+        node = self.create_node(**kwargs)
+
+        # Generated passwords are only returned by create_node
+        password = self._get_deploy_password(node=node, kwargs=kwargs)
+
+        ssh_interface = kwargs.get('ssh_interface', 'public_ips')
+
+        # Wait until node is up and running and has IP assigned
+        try:
+            node, ip_addresses = self.wait_until_running(
+                nodes=[node],
+                wait_period=3,
+                timeout=kwargs.get('timeout', NODE_ONLINE_WAIT_TIMEOUT),
+                ssh_interface=ssh_interface)[0]
+        except Exception:
+            e = sys.exc_info()[1]
+            raise DeploymentError(node=node, original_exception=e, driver=self)
+
+        self._deploy_to_running_node(node=node, ip_addresses=ip_addresses,
+                                     kwargs=kwargs, password=password)
+        return node
+
+    def deploy_nodes(self, nodes, max_workers=DEFAULT_MAX_WORKERS,
+                     deploy_retries=1, **kwargs):
+        """
+        Create multiple nodes and run a deployment on each of them.
+
+        The nodes are created concurrently and waited for together. Each
+        node is deployed as soon as it is running, using a pool of at most
+        ``max_workers`` SSH sessions, so a fleet takes about as long as the
+        slowest node instead of the sum of all of them.
+
+        Unlike :meth:`deploy_node` no exception is raised if deploying a
+        node fails. The outcome of every node is reported in the returned
+        results instead, so the nodes which failed can be inspected or
+        destroyed.
+
+        :param nodes: Keyword arguments for each node which are merged with
+                      the shared ``kwargs`` (e.g. ``[{'name': 'web-1'},
+                      {'name': 'web-2'}]``).
+        :type nodes: ``list`` of ``dict``
+
+        :param max_workers: Maximum number of nodes which are created or
+                            deployed at the same time.
+        :type max_workers: ``int``
+
+        :param deploy_retries: How many more times to connect to a node and
+                               run the deployment if it fails.
+        :type deploy_retries: ``int``
+
+        :param kwargs: Keyword arguments which are shared by all the nodes.
+                       The same arguments as for :meth:`deploy_node` are
+                       supported.
+
+        :return: Results in the same order as ``nodes``.
+        :rtype: ``list`` of :class:`NodeDeploymentResult`
+        """
+        results = []
+
+        for item in nodes:
+            node_kwargs = dict(kwargs)
+            node_kwargs.update(item)
+            self._check_deploy_kwargs(node_kwargs)
+            results.append(NodeDeploymentResult(kwargs=node_kwargs))
+
+        def create(result):
+            return self.create_node(**result.kwargs)
+
+        for result, node, error in run_concurrently(func=create,
+                                                    items=results,
+                                                    max_workers=max_workers):
+            result.node = node
+            result.error = error
+
+        pending = dict([(result.node.uuid, result) for result in results
+                        if result.node is not None])
+
+        # Generated passwords are only returned by create_node
+        passwords = dict([(uuid, self._get_deploy_password(
+            node=result.node, kwargs=result.kwargs))
+            for uuid, result in pending.items()])
+
+        def running_nodes():
+            if not pending:
+                return
+
+            try:
+                for node, ip_addresses in self.iterate_running_nodes(
+                        nodes=[result.node for result in pending.values()],
+                        wait_period=3,
+                        timeout=kwargs.get('timeout',
+                                           NODE_ONLINE_WAIT_TIMEOUT),
+                        ssh_interface=kwargs.get('ssh_interface',
+                                                 'public_ips')):
+                    result = pending.pop(node.uuid)
+                    result.node = node
+                    yield result, ip_addresses
+            except Exception:
+                e = sys.exc_info()[1]
+
+                for result in pending.values():
+                    result.error = DeploymentError(node=result.node,
+                                                   original_exception=e,
+                                                   driver=self)
+
+        def deploy(item):
+            result, ip_addresses = item
+
+            for _ in range(deploy_retries + 1):
+                result.attempts += 1
+
+                try:
+                    self._deploy_to_running_node(
+                        node=result.node, ip_addresses=ip_addresses,
+                        kwargs=result.kwargs,
+                        password=passwords[result.node.uuid])
+                except DeploymentError:
+                    result.error = sys.exc_info()[1]
+                else:
+                    result.error = None
+                    break
+
+        for item, _, error in run_concurrently(func=deploy,
+                                               items=running_nodes(),
+                                               max_workers=max_workers):
+            if error is not None:
+                item[0].error = error
+
+        return results
+
+    def _check_deploy_kwargs(self, kwargs):
+        """
+        Check that a node can be deployed with the provided keyword
+        arguments of :meth:`deploy_node`.
+        """
         if not libcloud.compute.ssh.have_paramiko:
             raise RuntimeError('paramiko is not installed. You can install ' +
                                'it using pip: pip install paramiko')
@@ -952,9 +1126,17 @@ class NodeDriver(BaseDriver):
             raise NotImplementedError(
                 'deploy_node not implemented for this driver')
 
-        node = self.create_node(**kwargs)
-        max_tries = kwargs.get('max_tries', 3)
+    def _get_deploy_password(self, node, kwargs):
+        """
+        Return the password which is used to SSH into a node which has been
+        created with the keyword arguments of :meth:`deploy_node`.
 
+        :param node: Node returned by ``create_node``. Drivers which generate
+                     a password only return it on this node.
+        :type node: :class:`.Node`
+
+        :rtype: ``str``
+        """
         password = None
         if 'auth' in kwargs:
             if isinstance(kwargs['auth'], NodeAuthPassword):
@@ -962,18 +1144,21 @@ class NodeDriver(BaseDriver):
         elif 'password' in node.extra:
             password = node.extra['password']
 
-        ssh_interface = kwargs.get('ssh_interface', 'public_ips')
+        return password
 
-        # Wait until node is up and running and has IP assigned
-        try:
-            node, ip_addresses = self.wait_until_running(
-                nodes=[node],
-                wait_period=3,
-                timeout=kwargs.get('timeout', NODE_ONLINE_WAIT_TIMEOUT),
-                ssh_interface=ssh_interface)[0]
-        except Exception:
-            e = sys.exc_info()[1]
-            raise DeploymentError(node=node, original_exception=e, driver=self)
+    def _deploy_to_running_node(self, node, ip_addresses, kwargs,
+                                password=None):
+        """
+        Connect to a running node over SSH and run the deployment which is
+        specified in the keyword arguments of :meth:`deploy_node`.
+
+        :param password: Password returned by :meth:`_get_deploy_password`
+                         for the node which has been created.
+        :type password: ``str``
+
+        :raises: :class:`DeploymentError` if the deployment fails.
+        """
+        max_tries = kwargs.get('max_tries', 3)
 
         ssh_username = kwargs.get('ssh_username', 'root')
         ssh_alternate_usernames = kwargs.get('ssh_alternate_usernames', [])
@@ -1007,8 +1192,6 @@ class NodeDriver(BaseDriver):
             raise DeploymentError(node=node, original_exception=deploy_error,
                                   driver=self)
 
-        return node
-
     def reboot_node(self, node):
         """
         Reboot a node.
@@ -1322,7 +1505,8 @@ class NodeDriver(BaseDriver):
 
     def wait_until_running(self, nodes, wait_period=3,
                            timeout=600, ssh_interface='public_ips',
-                           force_ipv4=True, ex_list_nodes_kwargs=None):
+                           force_ipv4=True, ex_list_nodes_kwargs=None,
+                           ex_max_wait_period=None, ex_backoff=1.5):
         """
         Block until the provided nodes are considered running.
 
@@ -1332,8 +1516,9 @@ class NodeDriver(BaseDriver):
         :param nodes: List of nodes to wait for.
         :type nodes: ``list`` of :class:`.Node`
 
-        :param wait_period: How many seconds to wait between each loop
-                            iteration. (default is 3)
+        :param wait_period: How many seconds to wait after the first loop
+                            iteration. The period grows with each iteration
+                            (see ``ex_backoff``). (default is 3)
         :type wait_period: ``int``
 
         :param timeout: How many seconds to wait before giving up.
@@ -1353,12 +1538,55 @@ class NodeDriver(BaseDriver):
                                      method.
         :type ex_list_nodes_kwargs: ``dict``
 
+        :param ex_max_wait_period: Upper bound for the period between loop
+                                   iterations. (default is 10 times
+                                   ``wait_period``)
+        :type ex_max_wait_period: ``int``
+
+        :param ex_backoff: Factor the period between loop iterations is
+                           multiplied with after each iteration. Use 1 to
+                           poll at a fixed period. (default is 1.5)
+        :type ex_backoff: ``float``
+
         :return: ``[(Node, ip_addresses)]`` list of tuple of Node instance and
                  list of ip_address on success.
         :rtype: ``list`` of ``tuple``
         """
+        order = dict([(node.uuid, index) for index, node in enumerate(nodes)])
+        result = self.iterate_running_nodes(
+            nodes=nodes, wait_period=wait_period, timeout=timeout,
+            ssh_interface=ssh_interface, force_ipv4=force_ipv4,
+            ex_list_nodes_kwargs=ex_list_nodes_kwargs,
+            ex_max_wait_period=ex_max_wait_period, ex_backoff=ex_backoff)
+
+        return sorted(result, key=lambda item: order[item[0].uuid])
+
+    def iterate_running_nodes(self, nodes, wait_period=3, timeout=600,
+                              ssh_interface='public_ips', force_ipv4=True,
+                              ex_list_nodes_kwargs=None,
+                              ex_max_wait_period=None, ex_backoff=1.5):
+        """
+        Return a generator which yields the provided nodes as soon as each
+        of them is considered running.
+
+        Only the nodes which are not running yet are looked up in each loop
+        iteration. Drivers which can look up individual nodes do so instead
+        of listing all the nodes in the account. The period between loop
+        iterations grows by ``ex_backoff`` up to ``ex_max_wait_period`` and
+        is randomized so many waiters don't poll the API in lockstep.
+
+        Arguments are the same as for :meth:`wait_until_running`.
+
+        :return: Generator of ``(Node, ip_addresses)`` tuples. A
+                 :class:`LibcloudError` is raised if not all the nodes are
+                 running before the timeout.
+        :rtype: ``generator`` of ``tuple``
+        """
         ex_list_nodes_kwargs = ex_list_nodes_kwargs or {}
 
+        if ex_max_wait_period is None:
+            ex_max_wait_period = wait_period * 10
+
         def is_supported(address):
             """
             Return True for supported address.
@@ -1380,38 +1608,68 @@ class NodeDriver(BaseDriver):
 
         start = time.time()
         end = start + timeout
+        delay = wait_period
 
-        uuids = set([node.uuid for node in nodes])
+        pending = dict([(node.uuid, node) for node in nodes])
 
         while time.time() < end:
-            all_nodes = self.list_nodes(**ex_list_nodes_kwargs)
-            matching_nodes = list([node for node in all_nodes
-                                   if node.uuid in uuids])
+            matching_nodes = [node for node in
+                              self._get_nodes_to_wait_for(
+                                  nodes=list(pending.values()),
+                                  ex_list_nodes_kwargs=ex_list_nodes_kwargs)
+                              if node.uuid in pending]
 
-            if len(matching_nodes) > len(uuids):
+            if len(matching_nodes) > len(pending):
                 found_uuids = [node.uuid for node in matching_nodes]
                 msg = ('Unable to match specified uuids ' +
-                       '(%s) with existing nodes. Found ' % (uuids) +
+                       '(%s) with existing nodes. Found ' % (set(pending)) +
                        'multiple nodes with same uuid: (%s)' % (found_uuids))
                 raise LibcloudError(value=msg, driver=self)
 
-            running_nodes = [node for node in matching_nodes
-                             if node.state == NodeState.RUNNING]
-            addresses = []
-            for node in running_nodes:
-                node_addresses = filter_addresses(getattr(node, ssh_interface))
-                if len(node_addresses) >= 1:
-                    addresses.append(node_addresses)
+            for node in matching_nodes:
+                if node.state != NodeState.RUNNING:
+                    continue
 
-            if len(running_nodes) == len(uuids) == len(addresses):
-                return list(zip(running_nodes, addresses))
-            else:
-                time.sleep(wait_period)
-                continue
+                addresses = filter_addresses(getattr(node, ssh_interface))
+
+                if len(addresses) >= 1:
+                    del pending[node.uuid]
+                    yield (node, addresses)
+
+            if not pending:
+                return
+
+            remaining = end - time.time()
+
+            if remaining <= 0:
+                break
+
+            # "Equal jitter": sleep at least half of the period
+            sleep = delay / 2.0 + random.uniform(0, delay / 2.0)
+            time.sleep(min(sleep, remaining))
+            delay = min(delay * ex_backoff, ex_max_wait_period)
 
         raise LibcloudError(value='Timed out after %s seconds' % (timeout),
                             driver=self)
 
+    def _get_nodes_to_wait_for(self, nodes, ex_list_nodes_kwargs):
+        """
+        Return the current version of the provided nodes.
+
+        Used by :meth:`iterate_running_nodes`. The default implementation
+        lists all the nodes. Drivers which can look up individual nodes
+        should override it. Nodes which can't be found are omitted.
+
+        :param nodes: Nodes to look up.
+        :type nodes: ``list`` of :class:`.Node`
+
+        :param ex_list_nodes_kwargs: Keyword arguments for ``list_nodes``.
+        :type ex_list_nodes_kwargs: ``dict``
+
+        :rtype: ``list`` of :class:`.Node`
+        """
+        return self.list_nodes(**ex_list_nodes_kwargs)
+
     def _get_and_check_auth(self, auth):
         """
         Helper function for providers supporting :class:`.NodeAuthPassword` or
@@ -1584,6 +1842,16 @@ class NodeDriver(BaseDriver):
                               driver_name=self.api_name,
                               size_id=size_id)
 
+    def _get_size_prices(self, size_ids):
+        """
+        Return pricing information for the provided size ids.
+
+        :rtype: ``list`` of ``float``
+        """
+        return get_size_prices(driver_type='compute',
+                               driver_name=self.api_name,
+                               size_ids=size_ids)
+
 
 if __name__ == '__main__':
     import doctest
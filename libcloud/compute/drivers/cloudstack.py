@@ -26,7 +26,7 @@ from libcloud.compute.providers import Provider
 from libcloud.common.cloudstack import CloudStackDriverMixIn
 from libcloud.compute.base import Node, NodeDriver, NodeImage, NodeLocation
 from libcloud.compute.base import NodeSize, StorageVolume, VolumeSnapshot
-from libcloud.compute.base import KeyPair
+from libcloud.compute.base import KeyPair, NodeDeploymentResult
 from libcloud.compute.types import NodeState, LibcloudError
 from libcloud.compute.types import KeyPairDoesNotExistError, StorageVolumeState
 from libcloud.utils.networking import is_private_subnet
@@ -1595,6 +1595,49 @@ class CloudStackNodeDriver(CloudStackDriverMixIn, NodeDriver):
         node = self._to_node(data=data)
         return node
 
+    def ex_create_nodes(self, nodes):
+        """
+        Create multiple nodes and wait for all of them at the same time.
+
+        All the deployVirtualMachine jobs are started first and then polled
+        together instead of waiting for each node in turn.
+
+        :param  nodes: List of dictionaries with the keyword arguments for
+                       :meth:`create_node`, one for each node.
+        :type   nodes: ``list`` of ``dict``
+
+        :return: Result for each node in the same order as ``nodes``. A
+                 node which couldn't be created doesn't affect the others,
+                 its error is available as ``error`` of the result.
+        :rtype: ``list`` of :class:`.NodeDeploymentResult`
+        """
+        results = []
+        jobs = []
+
+        for kwargs in nodes:
+            result = NodeDeploymentResult(kwargs=kwargs, attempts=1)
+            results.append(result)
+
+            try:
+                server_params = self._create_args_to_params(None, **kwargs)
+                job = self._start_async_request(
+                    command='deployVirtualMachine', params=server_params,
+                    method='GET')
+            except Exception:
+                result.error = sys.exc_info()[1]
+                continue
+
+            jobs.append((result, job))
+
+        for result, job in jobs:
+            try:
+                data = job.result()['jobresult']['virtualmachine']
+                result.node = self._to_node(data=data)
+            except Exception:
+                result.error = sys.exc_info()[1]
+
+        return results
+
     def _create_args_to_params(self, node, **kwargs):
         server_params = {}
 
@@ -28,11 +28,13 @@ from libcloud.utils.py3 import ET
 from libcloud.utils.py3 import b, basestring, ensure_string
 
 from libcloud.utils.xml import fixxpath, findtext, findattr, findall
+from libcloud.utils.xml import get_extractor
 from libcloud.utils.publickey import get_pubkey_ssh2_fingerprint
 from libcloud.utils.publickey import get_pubkey_comment
 from libcloud.utils.iso8601 import parse_date
 from libcloud.common.aws import AWSBaseResponse, SignedAWSConnection
 from libcloud.common.aws import DEFAULT_SIGNATURE_VERSION
+from libcloud.common.exceptions import BaseHTTPError
 from libcloud.common.types import (InvalidCredsError, MalformedResponseError,
                                    LibcloudError)
 from libcloud.compute.providers import Provider
@@ -3742,6 +3744,44 @@ class BaseEC2NodeDriver(NodeDriver):
 
         :rtype: ``list`` of :class:`Node`
         """
+        return list(self.iterate_nodes(ex_node_ids=ex_node_ids,
+                                       ex_filters=ex_filters))
+
+    def iterate_nodes(self, ex_node_ids=None, ex_filters=None,
+                      ex_page_size=None, ex_stream=False):
+        """
+        Return a generator which yields nodes as the result pages of the
+        DescribeInstances call arrive.
+
+        The generator follows NextToken until all the pages have been
+        retrieved. Elastic IP addresses are retrieved once, when the first
+        page arrives, and reused for all the pages.
+
+        :param      ex_node_ids: List of ``node.id``
+        :type       ex_node_ids: ``list`` of ``str``
+
+        :param      ex_filters: The filters so that only information for
+                                certain nodes is returned.
+        :type       ex_filters: ``dict``
+
+        :param      ex_page_size: Maximum number of instances to retrieve
+                                  per request (between 5 and 1000). It
+                                  can't be combined with ``ex_node_ids``.
+                                  If not specified, the API returns all the
+                                  instances at once.
+        :type       ex_page_size: ``int``
+
+        :param      ex_stream: True to parse the response pages
+                               incrementally while they are being read
+                               from the network instead of building the
+                               whole document in memory first.
+        :type       ex_stream: ``bool``
+
+        :rtype: ``generator`` of :class:`Node`
+        """
+        if ex_node_ids and ex_page_size:
+            raise ValueError('ex_page_size can\'t be used together with '
+                             'ex_node_ids')
 
         params = {'Action': 'DescribeInstances'}
 
@@ -3751,33 +3791,80 @@ class BaseEC2NodeDriver(NodeDriver):
         if ex_filters:
             params.update(self._build_filters(ex_filters))
 
-        elem = self.connection.request(self.path, params=params).object
+        if ex_page_size:
+            params['MaxResults'] = ex_page_size
 
-        nodes = []
-        for rs in findall(element=elem, xpath='reservationSet/item',
-                          namespace=NAMESPACE):
-            nodes += self._to_nodes(rs, 'instancesSet/item')
+        # Elastic IP addresses of the instances, keyed by instance ID
+        addresses = None
 
-        nodes_elastic_ips_mappings = self.ex_describe_addresses(nodes)
+        while True:
+            nodes = []
 
-        for node in nodes:
-            ips = nodes_elastic_ips_mappings[node.id]
-            node.public_ips.extend(ips)
+            if ex_stream:
+                response = self.connection.request_xml_items(
+                    self.path, item_xpath='reservationSet/item',
+                    namespace=NAMESPACE, params=params)
+
+                for rs in response.iter_items():
+                    nodes += self._to_nodes(rs, 'instancesSet/item')
+
+                elem = response.object
+            else:
+                elem = self.connection.request(self.path,
+                                               params=params).object
+
+                for rs in findall(element=elem, xpath='reservationSet/item',
+                                  namespace=NAMESPACE):
+                    nodes += self._to_nodes(rs, 'instancesSet/item')
+
+            next_token = findtext(element=elem, xpath='nextToken',
+                                  namespace=NAMESPACE)
+
+            if nodes and addresses is None:
+                if len(nodes) == 1 and not next_token:
+                    addresses = self._describe_instance_addresses(
+                        node=nodes[0])
+                else:
+                    addresses = self._describe_instance_addresses()
+
+            for node in nodes:
+                node.public_ips.extend(addresses.get(node.id, []))
+                yield node
+
+            if not next_token:
+                break
 
-        return nodes
+            params['NextToken'] = next_token
+
+    def _get_nodes_to_wait_for(self, nodes, ex_list_nodes_kwargs):
+        kwargs = dict(ex_list_nodes_kwargs)
+        kwargs.setdefault('ex_node_ids', [node.id for node in nodes])
+
+        try:
+            return self.list_nodes(**kwargs)
+        except BaseHTTPError:
+            e = sys.exc_info()[1]
+
+            # Instances which have just been created might not be visible
+            # to the API yet
+            if 'InvalidInstanceID.NotFound' in str(e):
+                return []
+
+            raise
 
     def list_sizes(self, location=None):
         available_types = REGION_DETAILS[self.region_name]['instance_types']
         sizes = []
 
-        for instance_type in available_types:
+        try:
+            prices = self._get_size_prices(size_ids=available_types)
+        except KeyError:
+            prices = [None] * len(available_types)  # pricing not available
+
+        for instance_type, price in zip(available_types, prices):
             attributes = INSTANCE_TYPES[instance_type]
             attributes = copy.deepcopy(attributes)
-            try:
-                price = self._get_size_price(size_id=instance_type)
-                attributes['price'] = price
-            except KeyError:
-                attributes['price'] = None  # pricing not available
+            attributes['price'] = price
             sizes.append(NodeSize(driver=self, **attributes))
         return sizes
 
@@ -3822,27 +3909,38 @@ class BaseEC2NodeDriver(NodeDriver):
 
         :rtype: ``list`` of :class:`NodeImage`
         """
-        params = {'Action': 'DescribeImages'}
-
-        if ex_owner:
-            params.update({'Owner.1': ex_owner})
-
-        if ex_executableby:
-            params.update({'ExecutableBy.1': ex_executableby})
-
-        if ex_image_ids:
-            for index, image_id in enumerate(ex_image_ids):
-                index += 1
-                params.update({'ImageId.%s' % (index): image_id})
-
-        if ex_filters:
-            params.update(self._build_filters(ex_filters))
+        params = self._get_describe_images_params(
+            ex_image_ids=ex_image_ids, ex_owner=ex_owner,
+            ex_executableby=ex_executableby, ex_filters=ex_filters)
 
         images = self._to_images(
             self.connection.request(self.path, params=params).object
         )
         return images
 
+    def iterate_images(self, location=None, ex_image_ids=None, ex_owner=None,
+                       ex_executableby=None, ex_filters=None):
+        """
+        Return a generator which yields images while the DescribeImages
+        response is being read from the network.
+
+        The response is parsed incrementally so memory usage stays flat
+        even for huge listings (e.g. all the public images in a region).
+        Arguments are the same as for :meth:`list_images`.
+
+        :rtype: ``generator`` of :class:`NodeImage`
+        """
+        params = self._get_describe_images_params(
+            ex_image_ids=ex_image_ids, ex_owner=ex_owner,
+            ex_executableby=ex_executableby, ex_filters=ex_filters)
+
+        response = self.connection.request_xml_items(
+            self.path, item_xpath='imagesSet/item', namespace=NAMESPACE,
+            params=params)
+
+        for element in response.iter_items():
+            yield self._to_image(element)
+
     def get_image(self, image_id):
         """
         Gets an image based on an image_id.
@@ -5623,32 +5721,39 @@ class BaseEC2NodeDriver(NodeDriver):
         if not nodes:
             return {}
 
+        node = nodes[0] if len(nodes) == 1 else None
+        addresses = self._describe_instance_addresses(node=node)
+
+        return dict((node.id, addresses.get(node.id, [])) for node in nodes)
+
+    def _describe_instance_addresses(self, node=None):
+        """
+        Return the Elastic IP addresses which are associated with instances.
+
+        :param      node: If specified, only the addresses of this node are
+                          returned.
+        :type       node: :class:`Node`
+
+        :return:    Dictionary where a key is an instance ID and the value is
+                    a list with the Elastic IP addresses associated with
+                    this instance.
+        :rtype:     ``dict``
+        """
         params = {'Action': 'DescribeAddresses'}
 
-        if len(nodes) == 1:
-            self._add_instance_filter(params, nodes[0])
+        if node is not None:
+            self._add_instance_filter(params, node)
 
         result = self.connection.request(self.path, params=params).object
 
-        node_instance_ids = [node.id for node in nodes]
-        nodes_elastic_ip_mappings = {}
+        addresses = {}
 
         # We will set only_associated to True so that we only get back
         # IPs which are associated with instances
-        only_associated = True
-
-        for node_id in node_instance_ids:
-            nodes_elastic_ip_mappings.setdefault(node_id, [])
-            for addr in self._to_addresses(result,
-                                           only_associated):
+        for addr in self._to_addresses(result, only_associated=True):
+            addresses.setdefault(addr.instance_id, []).append(addr.ip)
 
-                instance_id = addr.instance_id
-
-                if node_id == instance_id:
-                    nodes_elastic_ip_mappings[instance_id].append(
-                        addr.ip)
-
-        return nodes_elastic_ip_mappings
+        return addresses
 
     def ex_describe_addresses_for_node(self, node):
         """
@@ -6721,6 +6826,26 @@ class BaseEC2NodeDriver(NodeDriver):
                     driver=self.connection.driver, created_at=created,
                     extra=extra)
 
+    def _get_describe_images_params(self, ex_image_ids=None, ex_owner=None,
+                                    ex_executableby=None, ex_filters=None):
+        params = {'Action': 'DescribeImages'}
+
+        if ex_owner:
+            params.update({'Owner.1': ex_owner})
+
+        if ex_executableby:
+            params.update({'ExecutableBy.1': ex_executableby})
+
+        if ex_image_ids:
+            for index, image_id in enumerate(ex_image_ids):
+                index += 1
+                params.update({'ImageId.%s' % (index): image_id})
+
+        if ex_filters:
+            params.update(self._build_filters(ex_filters))
+
+        return params
+
     def _to_images(self, object):
         return [self._to_image(el) for el in object.findall(
             fixxpath(xpath='imagesSet/item', namespace=NAMESPACE))
@@ -7472,18 +7597,8 @@ class BaseEC2NodeDriver(NodeDriver):
 
         :rtype: ``dict``
         """
-        extra = {}
-        for attribute, values in mapping.items():
-            transform_func = values['transform_func']
-            value = findattr(element=element,
-                             xpath=values['xpath'],
-                             namespace=NAMESPACE)
-            if value is not None:
-                extra[attribute] = transform_func(value)
-            else:
-                extra[attribute] = None
-
-        return extra
+        extractor = get_extractor(mapping=mapping, namespace=NAMESPACE)
+        return extractor.extract(element)
 
     def _get_resource_tags(self, element):
         """
@@ -7906,17 +8021,13 @@ class NimbusNodeDriver(BaseEC2NodeDriver):
     connectionCls = NimbusConnection
     signature_version = '2'
 
-    def ex_describe_addresses(self, nodes):
+    def _describe_instance_addresses(self, node=None):
         """
         Nimbus doesn't support elastic IPs, so this is a pass-through.
 
-        @inherits: :class:`EC2NodeDriver.ex_describe_addresses`
+        @inherits: :class:`EC2NodeDriver._describe_instance_addresses`
         """
-        nodes_elastic_ip_mappings = {}
-        for node in nodes:
-            # empty list per node
-            nodes_elastic_ip_mappings[node.id] = []
-        return nodes_elastic_ip_mappings
+        return {}
 
     def ex_create_tags(self, resource, tags):
         """
@@ -8175,10 +8286,11 @@ class OutscaleNodeDriver(BaseEC2NodeDriver):
             self.region_details[self.region_name]['instance_types']
         sizes = []
 
-        for instance_type in available_types:
+        prices = self._get_size_prices(size_ids=available_types)
+
+        for instance_type, price in zip(available_types, prices):
             attributes = OUTSCALE_INSTANCE_TYPES[instance_type]
             attributes = copy.deepcopy(attributes)
-            price = self._get_size_price(size_id=instance_type)
             attributes.update({'price': price})
             sizes.append(NodeSize(driver=self, **attributes))
         return sizes
@@ -17,9 +17,12 @@ Module for Google Compute Engine Driver.
 """
 from __future__ import with_statement
 
+import os
 import datetime
+import logging
 import time
 import sys
+import threading
 
 from libcloud.common.base import LazyObject
 from libcloud.common.google import GoogleOAuth2Credential
@@ -35,11 +38,26 @@ from libcloud.compute.base import NodeSize, StorageVolume, VolumeSnapshot
 from libcloud.compute.base import UuidMixin
 from libcloud.compute.providers import Provider
 from libcloud.compute.types import NodeState
+from libcloud.utils import jsoncodec
 from libcloud.utils.iso8601 import parse_date
 
 API_VERSION = 'v1'
 DEFAULT_TASK_COMPLETION_TIMEOUT = 180
 
+# How many seconds the zone and region catalogs are cached for
+DEFAULT_CATALOG_CACHE_TTL = 3600
+
+# How many seconds the boot disks of nodes are cached for
+DEFAULT_DISK_CACHE_TTL = 60
+
+LOG = logging.getLogger(__name__)
+
+# Zone and region API responses which are shared by all the drivers in the
+# process, keyed by (project base path, catalog name). The values are
+# (timestamp, items) tuples.
+_CATALOG_CACHE = {}
+_CATALOG_CACHE_LOCK = threading.Lock()
+
 
 def timestamp_to_datetime(timestamp):
     """
@@ -1796,7 +1814,10 @@ class GCENodeDriver(NodeDriver):
     BACKEND_SERVICE_PROTOCOLS = ['HTTP', 'HTTPS', 'HTTP2', 'TCP', 'SSL']
 
     def __init__(self, user_id, key=None, datacenter=None, project=None,
-                 auth_type=None, scopes=None, credential_file=None, **kwargs):
+                 auth_type=None, scopes=None, credential_file=None,
+                 catalog_cache_ttl=DEFAULT_CATALOG_CACHE_TTL,
+                 catalog_cache_file=None,
+                 disk_cache_ttl=DEFAULT_DISK_CACHE_TTL, **kwargs):
         """
         :param  user_id: The email address (for service accounts) or Client ID
                          (for installed apps) to be used for authentication.
@@ -1830,6 +1851,21 @@ class GCENodeDriver(NodeDriver):
         :keyword  credential_file: Path to file for caching authentication
                                    information used by GCEConnection.
         :type     credential_file: ``str``
+
+        :keyword  catalog_cache_ttl: How many seconds the zone and region
+                                     catalogs are cached for. The catalogs
+                                     are loaded on first use and shared by
+                                     all the drivers for the same project.
+        :type     catalog_cache_ttl: ``int``
+
+        :keyword  catalog_cache_file: Path to file for caching the zone and
+                                      region catalogs between processes.
+        :type     catalog_cache_file: ``str``
+
+        :keyword  disk_cache_ttl: How many seconds the boot disks which are
+                                  looked up when converting nodes are cached
+                                  for.
+        :type     disk_cache_ttl: ``int``
         """
         if not project:
             raise ValueError('Project name must be specified using '
@@ -1841,35 +1877,111 @@ class GCENodeDriver(NodeDriver):
         self.credential_file = credential_file or \
             GoogleOAuth2Credential.default_credential_file + '.' + self.project
 
+        self.catalog_cache_ttl = catalog_cache_ttl
+        self.catalog_cache_file = catalog_cache_file
+
+        # Zone and Region objects built from the cached catalogs, keyed by
+        # catalog name. The values are (items, objects, objects by name).
+        self._catalogs = {}
+
+        # Boot disks of nodes keyed by (zone name, disk name). The values are
+        # (timestamp, disk) tuples.
+        self.disk_cache_ttl = disk_cache_ttl
+        self._disk_cache = {}
+
+        # The default zone and region are looked up on first use
+        self._datacenter = datacenter
+        self._zone = None
+
         super(GCENodeDriver, self).__init__(user_id, key, **kwargs)
 
-        # Cache Zone and Region information to reduce API calls and
-        # increase speed
+        self._region = None
+        self._region_resolved = False
+
         self.base_path = '/compute/%s/projects/%s' % (API_VERSION,
                                                       self.project)
-        self.zone_list = self.ex_list_zones()
-        self.zone_dict = {}
-        for zone in self.zone_list:
-            self.zone_dict[zone.name] = zone
-        if datacenter:
-            self.zone = self.ex_get_zone(datacenter)
-        else:
-            self.zone = None
-
-        self.region_list = self.ex_list_regions()
-        self.region_dict = {}
-        for region in self.region_list:
-            self.region_dict[region.name] = region
-
-        if self.zone:
-            self.region = self._get_region_from_zone(self.zone)
-        else:
-            self.region = None
 
         # Volume details are looked up in this name-zone dict.
         # It is populated if the volume name is not found or the dict is empty.
         self._ex_volume_dict = {}
 
+    @property
+    def zone(self):
+        """
+        Default zone which is used if no zone is specified.
+
+        :rtype: :class:`GCEZone` or ``None``
+        """
+        if self._zone is None and self._datacenter:
+            self._zone = self.ex_get_zone(self._datacenter)
+            self._datacenter = None
+
+        return self._zone
+
+    @zone.setter
+    def zone(self, zone):
+        self._zone = zone
+        self._datacenter = None
+
+    @property
+    def region(self):
+        """
+        Default region which is used if no region is specified. It's the
+        region of the default zone unless it's set explicitly.
+
+        :rtype: :class:`GCERegion` or ``None``
+        """
+        if not self._region_resolved:
+            zone = self.zone
+
+            if zone:
+                self._region = self._get_region_from_zone(zone)
+
+            self._region_resolved = True
+
+        return self._region
+
+    @region.setter
+    def region(self, region):
+        self._region = region
+        self._region_resolved = True
+
+    @property
+    def zone_list(self):
+        """
+        Cached list of the zones in the project.
+
+        :rtype: ``list`` of :class:`GCEZone`
+        """
+        return self._get_catalog('zones', self._to_zone)[0]
+
+    @property
+    def zone_dict(self):
+        """
+        Cached zones in the project keyed by name.
+
+        :rtype: ``dict`` of :class:`GCEZone`
+        """
+        return self._get_catalog('zones', self._to_zone)[1]
+
+    @property
+    def region_list(self):
+        """
+        Cached list of the regions in the project.
+
+        :rtype: ``list`` of :class:`GCERegion`
+        """
+        return self._get_catalog('regions', self._to_region)[0]
+
+    @property
+    def region_dict(self):
+        """
+        Cached regions in the project keyed by name.
+
+        :rtype: ``dict`` of :class:`GCERegion`
+        """
+        return self._get_catalog('regions', self._to_region)[1]
+
     def ex_add_access_config(self, node, name, nic, nat_ip=None,
                              config_type=None):
         """
@@ -2481,9 +2593,10 @@ class GCENodeDriver(NodeDriver):
         :type     ex_zone:  ``str`` or :class:`GCEZone` or
                             :class:`NodeLocation` or ``None``
 
-        :keyword  ex_use_disk_cache:  Disk information for each node will
-                                   retrieved from a dictionary rather
-                                   than making a distinct API call for it.
+        :keyword  ex_use_disk_cache:  Boot disks which have been looked up
+                                      recently are taken from the cache.
+                                      The other boot disks are always
+                                      retrieved with a single request.
         :type     ex_use_disk_cache: ``bool``
 
         :return:  List of Node objects
@@ -2500,43 +2613,33 @@ class GCENodeDriver(NodeDriver):
         if 'items' in response:
             # The aggregated response returns a dict for each zone
             if zone is None:
-                # Create volume cache now for fast lookups of disk info.
-                self._ex_populate_volume_dict()
-                for v in response['items'].values():
-                    for i in v.get('instances', []):
-                        try:
-                            list_nodes.append(
-                                self._to_node(i,
-                                              use_disk_cache=ex_use_disk_cache)
-                            )
-                        # If a GCE node has been deleted between
-                        #   - is was listed by `request('.../instances', 'GET')
-                        #   - it is converted by `self._to_node(i)`
-                        # `_to_node()` will raise a ResourceNotFoundError.
-                        #
-                        # Just ignore that node and return the list of the
-                        # other nodes.
-                        except ResourceNotFoundError:
-                            pass
+                items = [i for v in response['items'].values()
+                         for i in v.get('instances', [])]
             else:
-                for i in response['items']:
-                    try:
-                        list_nodes.append(
-                            self._to_node(i, use_disk_cache=ex_use_disk_cache)
-                        )
-                    # If a GCE node has been deleted between
-                    #   - is was listed by `request('.../instances', 'GET')
-                    #   - it is converted by `self._to_node(i)`
-                    # `_to_node()` will raise a ResourceNotFoundError.
-                    #
-                    # Just ignore that node and return the list of the
-                    # other nodes.
-                    except ResourceNotFoundError:
-                        pass
+                items = response['items']
+
+            list_nodes = self._to_nodes(items,
+                                        use_disk_cache=ex_use_disk_cache)
         # Clear the volume cache as lookups are complete.
         self._ex_volume_dict = {}
         return list_nodes
 
+    def _get_nodes_to_wait_for(self, nodes, ex_list_nodes_kwargs):
+        if ex_list_nodes_kwargs:
+            return super(GCENodeDriver, self)._get_nodes_to_wait_for(
+                nodes=nodes, ex_list_nodes_kwargs=ex_list_nodes_kwargs)
+
+        result = []
+
+        for node in nodes:
+            try:
+                result.append(self.ex_get_node(node.name,
+                                               node.extra.get('zone')))
+            except ResourceNotFoundError:
+                pass
+
+        return result
+
     def ex_list_regions(self):
         """
         Return the list of regions.
@@ -5063,7 +5166,8 @@ class GCENodeDriver(NodeDriver):
 
         for i in range(number):
             name = '%s-%03d' % (base_name, i)
-            status = {'name': name, 'node_response': None, 'node': None}
+            status = {'name': name, 'node_response': None, 'node': None,
+                      'created': False}
             status_list.append(status)
 
         start_time = time.time()
@@ -5083,9 +5187,23 @@ class GCENodeDriver(NodeDriver):
                         self._multi_check_node(status, node_attrs)
                 # If any of the nodes have not been created (or failed) we are
                 # not done yet.
-                if not status['node']:
+                if not status['node'] and not status['created']:
                     complete = False
 
+        # The created nodes are looked up together
+        names = [status['name'] for status in status_list
+                 if status['created']]
+        if names:
+            nodes = self._get_zone_nodes(location.name, names)
+            for status in status_list:
+                if not status['created']:
+                    continue
+                if status['name'] not in nodes:
+                    raise ResourceNotFoundError(
+                        'Node \'%s\' not found in zone %s.' %
+                        (status['name'], location.name), None, None)
+                status['node'] = nodes[status['name']]
+
         # Return list of nodes
         node_list = []
         for status in status_list:
@@ -5862,14 +5980,21 @@ class GCENodeDriver(NodeDriver):
         # Note: This API requires a 'POST'.
         response = self.connection.request(request, method='POST').object
 
-        list_data = []
-        if 'items' in response:
-            for v in response['items']:
-                instance_info = self._get_components_from_path(v['instance'])
-                list_data.append(
-                    self.ex_get_node(instance_info['name'], instance_info[
-                        'zone']))
-        return list_data
+        # Names of the instances keyed by zone
+        zone_names = {}
+        instances = []
+        for v in response.get('items', []):
+            instance_info = self._get_components_from_path(v['instance'])
+            zone_names.setdefault(instance_info['zone'], []).append(
+                instance_info['name'])
+            instances.append((instance_info['zone'], instance_info['name']))
+
+        nodes = {}
+        for zone, names in zone_names.items():
+            for name, node in self._get_zone_nodes(zone, names).items():
+                nodes[(zone, name)] = node
+
+        return [nodes[key] for key in instances if key in nodes]
 
     def ex_instancegroup_set_named_ports(self, instancegroup, named_ports=[]):
         """
@@ -7842,6 +7967,128 @@ class GCENodeDriver(NodeDriver):
         response = self.connection.request(url, method='GET').object
         return GCENodeDriver.KIND_METHOD_MAP[response['kind']](self, response)
 
+    def _get_catalog(self, name, to_object):
+        """
+        Return the objects of a cached catalog.
+
+        The objects are rebuilt when the cached API response changes.
+
+        :param  name: Catalog (API collection) name, "zones" or "regions".
+        :type   name: ``str``
+
+        :param  to_object: Function which converts an item of the API
+                           response into an object.
+        :type   to_object: ``callable``
+
+        :return:  Tuple with the list of objects and a dict of the objects
+                  keyed by name.
+        :rtype:   ``tuple``
+        """
+        items = self._get_catalog_items(name)
+        catalog = self._catalogs.get(name, None)
+
+        if catalog is None or catalog[0] is not items:
+            objects = [to_object(item) for item in items]
+            objects_dict = dict((obj.name, obj) for obj in objects)
+            catalog = (items, objects, objects_dict)
+            self._catalogs[name] = catalog
+
+        return catalog[1], catalog[2]
+
+    def _get_catalog_items(self, name):
+        """
+        Return the items of a catalog from the process wide cache, the cache
+        file or the API, in that order.
+
+        :param  name: Catalog (API collection) name, "zones" or "regions".
+        :type   name: ``str``
+
+        :rtype:   ``list`` of ``dict``
+        """
+        key = (self.base_path, name)
+        now = time.time()
+
+        with _CATALOG_CACHE_LOCK:
+            cached = _CATALOG_CACHE.get(key, None)
+
+        if cached is not None and now - cached[0] < self.catalog_cache_ttl:
+            return cached[1]
+
+        cached = self._read_catalog_file(name)
+
+        if cached is None or now - cached[0] >= self.catalog_cache_ttl:
+            request = '/%s' % (name)
+            response = self.connection.request(request, method='GET').object
+            cached = (now, response.get('items', []))
+            self._write_catalog_file(name, cached)
+
+        with _CATALOG_CACHE_LOCK:
+            _CATALOG_CACHE[key] = cached
+
+        return cached[1]
+
+    def _read_catalog_file(self, name):
+        """
+        Read a catalog from the cache file.
+
+        :return:  (timestamp, items) tuple or None
+        :rtype:   ``tuple`` or ``None``
+        """
+        if not self.catalog_cache_file:
+            return None
+
+        filename = os.path.realpath(
+            os.path.expanduser(self.catalog_cache_file))
+
+        try:
+            with open(filename, 'r') as fp:
+                data = jsoncodec.loads(fp.read())
+
+            catalog = data[self.base_path][name]
+            return (catalog['timestamp'], catalog['items'])
+        except (IOError, ValueError, KeyError, TypeError):
+            # Note: A missing or invalid cache file is not fatal, the
+            # catalog is retrieved from the API instead.
+            e = sys.exc_info()[1]
+            LOG.info('Failed to read cached %s from file "%s": %s', name,
+                     filename, str(e))
+
+        return None
+
+    def _write_catalog_file(self, name, cached):
+        """
+        Write a catalog to the cache file.
+        """
+        if not self.catalog_cache_file:
+            return
+
+        filename = os.path.realpath(
+            os.path.expanduser(self.catalog_cache_file))
+
+        try:
+            try:
+                with open(filename, 'r') as fp:
+                    data = jsoncodec.loads(fp.read())
+            except (IOError, ValueError):
+                data = {}
+
+            catalog = {'timestamp': cached[0], 'items': cached[1]}
+            data.setdefault(self.base_path, {})[name] = catalog
+
+            # Write to a temporary file first so other processes never read
+            # a partially written file
+            temp_filename = '%s.%s' % (filename, os.getpid())
+
+            with open(temp_filename, 'w') as fp:
+                fp.write(jsoncodec.dumps(data))
+
+            os.rename(temp_filename, filename)
+        except Exception:
+            # Note: Failure to write the cache file is not fatal
+            e = sys.exc_info()[1]
+            LOG.info('Failed to write cached %s to file "%s": %s', name,
+                     filename, str(e))
+
     def _get_region_from_zone(self, zone):
         """
         Return the Region object that contains the given Zone object.
@@ -8292,8 +8539,8 @@ class GCENodeDriver(NodeDriver):
             if error:
                 status['node'] = GCEFailedNode(status['name'], error, code)
             else:
-                status['node'] = self.ex_get_node(status['name'],
-                                                  node_attrs['location'])
+                # The node is looked up by ex_create_multiple_nodes
+                status['created'] = True
 
     def _create_vol_req(self, size, name, location=None, snapshot=None,
                         image=None, ex_disk_type='pd-standard'):
@@ -8731,16 +8978,208 @@ class GCENodeDriver(NodeDriver):
                             country=location['name'].split('-')[0],
                             driver=self)
 
-    def _to_node(self, node, use_disk_cache=False):
+    def _to_nodes(self, nodes, use_disk_cache=True):
+        """
+        Return Node objects from a list of JSON-response dictionaries.
+
+        The boot disks of all the nodes are looked up together with a single
+        request (see :meth:`_get_boot_disks`).
+
+        :param    nodes: The dictionaries describing the nodes.
+        :type     nodes: ``list`` of ``dict``
+
+        :keyword  use_disk_cache: If true, recently looked up boot disks are
+                                  taken from the cache.
+        :type     use_disk_cache: ``bool``
+
+        :return:  Node objects
+        :rtype:   ``list`` of :class:`Node`
+        """
+        boot_disks = self._get_boot_disks(nodes, use_cache=use_disk_cache)
+        result = []
+
+        for node in nodes:
+            try:
+                result.append(self._to_node(node, boot_disks=boot_disks))
+            # If a GCE node has been deleted between
+            #   - is was listed by `request('.../instances', 'GET')
+            #   - it is converted by `self._to_node(i)`
+            # `_to_node()` will raise a ResourceNotFoundError.
+            #
+            # Just ignore that node and return the list of the
+            # other nodes.
+            except ResourceNotFoundError:
+                pass
+
+        return result
+
+    def _get_zone_nodes(self, zone, names):
+        """
+        Look up the nodes with the provided names in a zone.
+
+        The nodes are retrieved with a single request (the node itself if
+        there's only one, the instances of the zone which are filtered by
+        name otherwise) and their boot disks are looked up together (see
+        :meth:`_to_nodes`).
+
+        :param    zone: Name of the zone.
+        :type     zone: ``str``
+
+        :param    names: Names of the nodes.
+        :type     names: ``list`` of ``str``
+
+        :return:  Node objects keyed by name. Nodes which don't exist are
+                  omitted.
+        :rtype:   ``dict``
+        """
+        if len(names) == 1:
+            request = '/zones/%s/instances/%s' % (zone, names[0])
+
+            try:
+                items = [self.connection.request(request,
+                                                 method='GET').object]
+            except ResourceNotFoundError:
+                items = []
+        else:
+            request = '/zones/%s/instances' % (zone)
+            params = {'filter': 'name eq (%s)' % ('|'.join(names))}
+            items = self._request_zone_items(request, params=params)
+
+        nodes = self._to_nodes(items, use_disk_cache=False)
+        return dict((node.name, node) for node in nodes)
+
+    def _get_boot_disk_keys(self, node):
+        """
+        Return the (zone name, disk name) tuples of the persistent boot disks
+        of a node.
+
+        :param    node: The dictionary describing the node.
+        :type     node: ``dict``
+
+        :rtype:   ``list`` of ``tuple``
+        """
+        keys = []
+
+        for disk in node.get('disks', []):
+            if disk.get('boot') and disk.get('type') == 'PERSISTENT':
+                parts = disk['source'].split('/')
+                keys.append((parts[-3], parts[-1]))
+
+        return keys
+
+    def _get_boot_disks(self, nodes, use_cache=True):
+        """
+        Look up the boot disks of the provided nodes.
+
+        Disks which are not cached are retrieved with a single request: the
+        disk itself if there's only one, the disks of the zone if they are
+        all in the same zone and the aggregated list of disks otherwise.
+
+        :param    nodes: The dictionaries describing the nodes.
+        :type     nodes: ``list`` of ``dict``
+
+        :keyword  use_cache: If true, disks which have been looked up less
+                             than disk_cache_ttl seconds ago are taken from
+                             the cache.
+        :type     use_cache: ``bool``
+
+        :return:  Disk dictionaries keyed by (zone name, disk name). Disks
+                  which don't exist are omitted.
+        :rtype:   ``dict``
+        """
+        keys = set()
+
+        for node in nodes:
+            keys.update(self._get_boot_disk_keys(node))
+
+        now = time.time()
+        disks = {}
+        missing = []
+
+        for key in keys:
+            cached = self._disk_cache.get(key, None) if use_cache else None
+
+            if cached is not None and now - cached[0] < self.disk_cache_ttl:
+                disks[key] = cached[1]
+            else:
+                missing.append(key)
+
+        if not missing:
+            return disks
+
+        zones = set(zone for zone, _ in missing)
+
+        if len(missing) == 1:
+            request = '/zones/%s/disks/%s' % missing[0]
+
+            try:
+                disk = self.connection.request(request, method='GET').object
+                items = [(missing[0], disk)]
+            except ResourceNotFoundError:
+                items = []
+        else:
+            if len(zones) == 1:
+                request = '/zones/%s/disks' % (zones.pop())
+                zone_disks = self._request_zone_items(request)
+            else:
+                aggregated_items = self.connection.request_aggregated_items(
+                    'disks')
+                zone_disks = [disk
+                              for v in aggregated_items['items'].values()
+                              for disk in v.get('disks', [])]
+
+            items = [((disk['zone'].split('/')[-1], disk['name']), disk)
+                     for disk in zone_disks]
+
+        # All the retrieved disks are cached since other nodes are likely to
+        # use them
+        for key, disk in items:
+            self._disk_cache[key] = (now, disk)
+
+            if key in keys:
+                disks[key] = disk
+
+        return disks
+
+    def _request_zone_items(self, request, params=None):
+        """
+        Perform request(s) to obtain all the items of a zonal collection.
+
+        :param    request: Path of the collection.
+        :type     request: ``str``
+
+        :keyword  params: Additional URL parameters (e.g. a filter).
+        :type     params: ``dict``
+
+        :rtype:   ``list`` of ``dict``
+        """
+        items = []
+        params = dict(params or {}, maxResults=500)
+        more_results = True
+
+        while more_results:
+            self.connection.gce_params = params
+            response = self.connection.request(request, method='GET').object
+            items.extend(response.get('items', []))
+            more_results = 'pageToken' in params
+
+        return items
+
+    def _to_node(self, node, use_disk_cache=False, boot_disks=None):
         """
         Return a Node object from the JSON-response dictionary.
 
         :param    node: The dictionary describing the node.
         :type     node: ``dict``
 
-        :keyword  use_disk_cache: If true, ex_get_volume call will use cache.
+        :keyword  use_disk_cache: If true, a recently looked up boot disk is
+                                  taken from the cache.
         :type     use_disk_cache: ``bool``
 
+        :keyword  boot_disks: Boot disks which have already been looked up
+                              (see :meth:`_get_boot_disks`).
+        :type     boot_disks: ``dict``
+
         :return:  Node object
         :rtype:   :class:`Node`
         """
@@ -8772,11 +9211,18 @@ class GCENodeDriver(NodeDriver):
         extra['labels'] = node.get('labels')
         extra['labelFingerprint'] = node.get('labelFingerprint')
 
-        for disk in extra['disks']:
-            if disk.get('boot') and disk.get('type') == 'PERSISTENT':
-                bd = self._get_components_from_path(disk['source'])
-                extra['boot_disk'] = self.ex_get_volume(
-                    bd['name'], bd['zone'], use_cache=use_disk_cache)
+        if boot_disks is None:
+            boot_disks = self._get_boot_disks([node], use_cache=use_disk_cache)
+
+        for zone_name, disk_name in self._get_boot_disk_keys(node):
+            if (zone_name, disk_name) not in boot_disks:
+                raise ResourceNotFoundError(
+                    'Volume \'%s\' not found for zone %s.' % (disk_name,
+                                                              zone_name),
+                    None, None)
+
+            extra['boot_disk'] = self._to_storage_volume(
+                boot_disks[(zone_name, disk_name)])
 
         if 'items' in node['tags']:
             tags = node['tags']['items']
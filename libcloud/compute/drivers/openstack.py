@@ -46,6 +46,7 @@ from libcloud.compute.types import NodeState, StorageVolumeState, Provider, \
     VolumeSnapshotState
 from libcloud.pricing import get_size_price
 from libcloud.utils.xml import findall
+from libcloud.utils import jsoncodec
 from libcloud.utils.py3 import ET
 
 __all__ = [
@@ -1194,7 +1195,7 @@ class OpenStack_1_1_Connection(OpenStackComputeConnection):
     default_content_type = 'application/json; charset=UTF-8'
 
     def encode_data(self, data):
-        return json.dumps(data)
+        return jsoncodec.dumps(data)
 
 
 class OpenStack_1_1_NodeDriver(OpenStackNodeDriver):
@@ -1279,6 +1280,22 @@ class OpenStack_1_1_NodeDriver(OpenStackNodeDriver):
 
         return self._to_node(server_object)
 
+    def _get_nodes_to_wait_for(self, nodes, ex_list_nodes_kwargs):
+        if ex_list_nodes_kwargs:
+            parent = super(OpenStack_1_1_NodeDriver, self)
+            return parent._get_nodes_to_wait_for(
+                nodes=nodes, ex_list_nodes_kwargs=ex_list_nodes_kwargs)
+
+        result = []
+
+        for node in nodes:
+            node = self.ex_get_node_details(node.id)
+
+            if node is not None:
+                result.append(node)
+
+        return result
+
     def _to_images(self, obj, ex_only_active):
         images = []
         for image in obj['images']:
@@ -2479,7 +2496,7 @@ class OpenStack_2_Connection(OpenStackComputeConnection):
     default_content_type = 'application/json; charset=UTF-8'
 
     def encode_data(self, data):
-        return json.dumps(data)
+        return jsoncodec.dumps(data)
 
 
 class OpenStack_2_ImageConnection(OpenStackImageConnection):
@@ -2488,7 +2505,7 @@ class OpenStack_2_ImageConnection(OpenStackImageConnection):
     default_content_type = 'application/json; charset=UTF-8'
 
     def encode_data(self, data):
-        return json.dumps(data)
+        return jsoncodec.dumps(data)
 
 
 class OpenStack_2_NodeDriver(OpenStack_1_1_NodeDriver):
@@ -31,6 +31,8 @@ except ImportError:
 
 import os
 import time
+import codecs
+import select
 import subprocess
 import logging
 import warnings
@@ -69,6 +71,39 @@ class SSHCommandTimeoutError(Exception):
         return self.message
 
 
+class _OutputBuffer(object):
+    """
+    Buffer for command output which only keeps the last ``max_size``
+    characters.
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+        self.size += len(data)
+
+        if self.max_size is None or self.size <= self.max_size * 2:
+            return
+
+        # Compact the buffer once it holds twice the maximum size so the cost
+        # of trimming is amortized over many writes
+        value = self.getvalue()
+        self.chunks = [value]
+        self.size = len(value)
+
+    def getvalue(self):
+        value = ''.join(self.chunks)
+
+        if self.max_size is not None and len(value) > self.max_size:
+            value = value[len(value) - self.max_size:]
+
+        return value
+
+
 class BaseSSHClient(object):
     """
     Base class representing a connection over SSH/SCP to a remote node.
@@ -202,9 +237,9 @@ class ParamikoSSHClient(BaseSSHClient):
     # Maximum number of bytes to read at once from a socket
     CHUNK_SIZE = 4096
 
-    # How long to sleep while waiting for command to finish (to prevent busy
-    # waiting)
-    SLEEP_DELAY = 0.2
+    # Upper bound for how long to block waiting for the channel before the
+    # exit status and the timeout are checked again
+    SELECT_TIMEOUT = 1
 
     def __init__(self, hostname, port=22, username='root', password=None,
                  key=None, key_files=None, key_material=None, timeout=None):
@@ -315,7 +350,8 @@ class ParamikoSSHClient(BaseSSHClient):
         sftp.close()
         return True
 
-    def run(self, cmd, timeout=None):
+    def run(self, cmd, timeout=None, stdout_handler=None,
+            stderr_handler=None, max_buffer_size=None):
         """
         Note: This function is based on paramiko's exec_command()
         method.
@@ -323,6 +359,64 @@ class ParamikoSSHClient(BaseSSHClient):
         :param timeout: How long to wait (in seconds) for the command to
                         finish (optional).
         :type timeout: ``float``
+
+        :param stdout_handler: Function which is called with every chunk of
+                               stdout as soon as it is received (optional).
+        :type stdout_handler: ``callable``
+
+        :param stderr_handler: Function which is called with every chunk of
+                               stderr as soon as it is received (optional).
+        :type stderr_handler: ``callable``
+
+        :param max_buffer_size: Maximum number of characters of stdout and
+                                stderr which are kept in memory and returned.
+                                If the output is longer only its end is
+                                returned. All of it is kept if not provided.
+        :type max_buffer_size: ``int``
+
+        :return: ``list`` of [stdout, stderr, exit_status]
+        """
+        stdout = _OutputBuffer(max_size=max_buffer_size)
+        stderr = _OutputBuffer(max_size=max_buffer_size)
+        handlers = {'stdout': (stdout, stdout_handler),
+                    'stderr': (stderr, stderr_handler)}
+        status = None
+
+        for stream, data in self.iter_run(cmd=cmd, timeout=timeout):
+            if stream == 'exit_status':
+                status = data
+                continue
+
+            buf, handler = handlers[stream]
+            buf.write(data)
+
+            if handler is not None:
+                handler(data)
+
+        stdout = stdout.getvalue()
+        stderr = stderr.getvalue()
+
+        extra = {'_status': status, '_stdout': stdout, '_stderr': stderr}
+        self.logger.debug('Command finished', extra=extra)
+
+        return [stdout, stderr, status]
+
+    def iter_run(self, cmd, timeout=None):
+        """
+        Run a command and yield its output as soon as it is received.
+
+        Instead of polling, the channel is waited on with ``select()`` so
+        many commands can run at the same time without using CPU while they
+        are idle.
+
+        :param timeout: How long to wait (in seconds) for the command to
+                        finish (optional).
+        :type timeout: ``float``
+
+        :return: Generator of ``(stream, data)`` tuples where ``stream`` is
+                 ``stdout`` or ``stderr``. The last item is
+                 ``('exit_status', status)``.
+        :rtype: ``generator`` of ``tuple``
         """
         extra = {'_cmd': cmd}
         self.logger.debug('Executing command', extra=extra)
@@ -336,63 +430,72 @@ class ParamikoSSHClient(BaseSSHClient):
         start_time = time.time()
         chan.exec_command(cmd)
 
-        stdout = StringIO()
-        stderr = StringIO()
-
         # Create a stdin file and immediately close it to prevent any
         # interactive script from hanging the process.
         stdin = chan.makefile('wb', bufsize)
         stdin.close()
 
-        # Receive all the output
-        # Note #1: This is used instead of chan.makefile approach to prevent
-        # buffering issues and hanging if the executed command produces a lot
-        # of output.
-        #
-        # Note #2: If you are going to remove "ready" checks inside the loop
-        # you are going to have a bad time. Trying to consume from a channel
-        # which is not ready will block for indefinitely.
-        exit_status_ready = chan.exit_status_ready()
-
-        if exit_status_ready:
-            # It's possible that some data is already available when exit
-            # status is ready
-            stdout.write(self._consume_stdout(chan).getvalue())
-            stderr.write(self._consume_stderr(chan).getvalue())
-
-        while not exit_status_ready:
-            current_time = time.time()
-            elapsed_time = (current_time - start_time)
-
-            if timeout and (elapsed_time > timeout):
-                # TODO: Is this the right way to clean up?
-                chan.close()
-
-                raise SSHCommandTimeoutError(cmd=cmd, timeout=timeout)
-
-            stdout.write(self._consume_stdout(chan).getvalue())
-            stderr.write(self._consume_stderr(chan).getvalue())
-
-            # We need to check the exist status here, because the command could
-            # print some output and exit during this sleep below.
+        # A single chunk could contain a part of multi byte UTF-8 character so
+        # the data is decoded incrementally
+        streams = [
+            ('stdout', chan.recv, chan.recv_ready,
+             codecs.getincrementaldecoder('utf-8')()),
+            ('stderr', chan.recv_stderr, chan.recv_stderr_ready,
+             codecs.getincrementaldecoder('utf-8')())
+        ]
+
+        # Note: If you are going to remove "ready" checks you are going to
+        # have a bad time. Trying to consume from a channel which is not
+        # ready will block for indefinitely.
+        while True:
+            # We need to check the exit status before consuming the data,
+            # because the command could print some output and exit in the
+            # meantime
             exit_status_ready = chan.exit_status_ready()
+            received = False
+
+            # At most one chunk is read from each stream per iteration so
+            # a chatty stream can't starve the other one or the timeout check
+            for name, recv_method, recv_ready_method, decoder in streams:
+                data = self._read_from_channel(
+                    recv_method=recv_method,
+                    recv_ready_method=recv_ready_method)
+
+                if data:
+                    received = True
+
+                data = decoder.decode(bytes(data))
+
+                if data:
+                    yield name, data
 
-            if exit_status_ready:
+            if exit_status_ready and not received:
                 break
 
-            # Short sleep to prevent busy waiting
-            time.sleep(self.SLEEP_DELAY)
+            wait = self.SELECT_TIMEOUT
 
-        # Receive the exit status code of the command we ran.
-        status = chan.recv_exit_status()
+            if timeout:
+                remaining = timeout - (time.time() - start_time)
 
-        stdout = stdout.getvalue()
-        stderr = stderr.getvalue()
+                if remaining <= 0:
+                    # TODO: Is this the right way to clean up?
+                    chan.close()
 
-        extra = {'_status': status, '_stdout': stdout, '_stderr': stderr}
-        self.logger.debug('Command finished', extra=extra)
+                    raise SSHCommandTimeoutError(cmd=cmd, timeout=timeout)
 
-        return [stdout, stderr, status]
+                wait = min(wait, remaining)
+
+            if not received:
+                self._wait_for_channel(chan=chan, timeout=wait)
+
+        for name, _, _, decoder in streams:
+            data = decoder.decode(b(''), True)
+
+            if data:
+                yield name, data
+
+        # Receive the exit status code of the command we ran.
+        yield 'exit_status', chan.recv_exit_status()
 
     def close(self):
         self.logger.debug('Closing server connection')
@@ -400,55 +503,34 @@ class ParamikoSSHClient(BaseSSHClient):
         self.client.close()
         return True
 
-    def _consume_stdout(self, chan):
-        """
-        Try to consume stdout data from chan if it's receive ready.
-        """
-        stdout = self._consume_data_from_channel(
-            chan=chan,
-            recv_method=chan.recv,
-            recv_ready_method=chan.recv_ready)
-        return stdout
-
-    def _consume_stderr(self, chan):
+    def _read_from_channel(self, recv_method, recv_ready_method):
         """
-        Try to consume stderr data from chan if it's receive ready.
-        """
-        stderr = self._consume_data_from_channel(
-            chan=chan,
-            recv_method=chan.recv_stderr,
-            recv_ready_method=chan.recv_stderr_ready)
-        return stderr
+        Read a single chunk of data if it is available without blocking.
 
-    def _consume_data_from_channel(self, chan, recv_method, recv_ready_method):
+        :rtype: ``bytearray``
         """
-        Try to consume data from the provided channel.
-
-        Keep in mind that data is only consumed if the channel is receive
-        ready.
-        """
-        result = StringIO()
-        result_bytes = bytearray()
+        result = bytearray()
 
         if recv_ready_method():
             data = recv_method(self.CHUNK_SIZE)
-            result_bytes += b(data)
-
-            while data:
-                ready = recv_ready_method()
 
-                if not ready:
-                    break
+            if data:
+                result += b(data)
 
-                data = recv_method(self.CHUNK_SIZE)
-                result_bytes += b(data)
-
-        # We only decode data at the end because a single chunk could contain
-        # a part of multi byte UTF-8 character (whole multi bytes character
-        # could be split over two chunks)
-        result.write(result_bytes.decode('utf-8'))
         return result
 
+    def _wait_for_channel(self, chan, timeout):
+        """
+        Block until there is new data in the channel, the channel is closed
+        or the timeout expires.
+        """
+        if chan.eof_received:
+            # The channel will stay readable once EOF has been received,
+            # the exit status is all that is left to wait for
+            chan.status_event.wait(timeout)
+        else:
+            select.select([chan], [], [], timeout)
+
     def _get_pkey_object(self, key):
         """
         Try to detect private key type and return paramiko.PKey object.
@@ -26,6 +26,7 @@ except:
 
 from libcloud.utils.py3 import httplib
 from libcloud.utils.py3 import b
+from libcloud.utils import jsoncodec
 
 from libcloud.common.base import JsonResponse, ConnectionUserAndKey
 from libcloud.common.base import KeyCertificateConnection
@@ -48,7 +49,7 @@ class DockerResponse(JsonResponse):
                             httplib.NO_CONTENT]
 
     def parse_body(self):
-        if len(self.body) == 0 and not self.parse_zero_length_body:
+        if self._is_body_empty() and not self.parse_zero_length_body:
             return self.body
 
         try:
@@ -61,7 +62,7 @@ class DockerResponse(JsonResponse):
                     body = [json.loads(chunk) for chunk in
                             self.body.strip().replace('\r', '').split('\n')]
                 else:
-                    body = json.loads(self.body)
+                    body = jsoncodec.loads(self._get_body_content())
             else:
                 body = self.body
         except ValueError:
@@ -0,0 +1,47 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Asynchronous version of the DNS API (requires Python 3.5 or newer).
+"""
+
+from libcloud.common.aio import AsyncDriver, async_method, async_iterator
+
+__all__ = [
+    'AsyncDNSDriver'
+]
+
+
+class AsyncDNSDriver(AsyncDriver):
+    """
+    Asynchronous wrapper around a :class:`libcloud.dns.base.DNSDriver`.
+
+    The methods take the same arguments as the wrapped driver methods and
+    return futures, except the ``iterate_*`` methods which return
+    asynchronous iterators which can be used with ``async for``.
+    """
+
+    iterate_zones = async_iterator('iterate_zones')
+    list_zones = async_method('list_zones')
+    iterate_records = async_iterator('iterate_records')
+    list_records = async_method('list_records')
+    get_zone = async_method('get_zone')
+    get_record = async_method('get_record')
+    create_zone = async_method('create_zone')
+    update_zone = async_method('update_zone')
+    delete_zone = async_method('delete_zone')
+    create_record = async_method('create_record')
+    update_record = async_method('update_record')
+    delete_record = async_method('delete_record')
@@ -15,18 +15,41 @@
 
 from __future__ import with_statement
 
+import re
 import datetime
 
 from libcloud import __version__
 from libcloud.common.base import ConnectionUserAndKey, BaseDriver
+from libcloud.common.types import LibcloudError
 from libcloud.dns.types import RecordType
+from libcloud.utils.concurrency import DEFAULT_MAX_WORKERS
+from libcloud.utils.concurrency import run_concurrently
 
 __all__ = [
     'Zone',
     'Record',
+    'RecordChange',
+    'RecordChangeResult',
     'DNSDriver'
 ]
 
+# Tokens of a BIND zone file line: quoted strings, parentheses, comments and
+# other words
+BIND_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[()]|;.*|[^\s"();]+')
+
+BIND_TTL_RE = re.compile(r'(\d+)([smhdw]?)', re.IGNORECASE)
+
+BIND_TTL_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400,
+                  'w': 604800}
+
+BIND_CLASSES = ['IN', 'CS', 'CH', 'HS']
+
+# Index of the domain name in the data of the records which point to a name
+# (after the priority of MX and SRV records)
+BIND_TARGET_INDEXES = {RecordType.CNAME: 0, RecordType.DNAME: 0,
+                       RecordType.NS: 0, RecordType.PTR: 0, RecordType.MX: 0,
+                       RecordType.SRV: 2}
+
 
 class Zone(object):
     """
@@ -81,6 +104,10 @@ class Zone(object):
         self.driver.export_zone_to_bind_zone_file(zone=self,
                                                   file_path=file_path)
 
+    def import_bind_zone_file(self, file_path):
+        return self.driver.import_bind_zone_file(zone=self,
+                                                 file_path=file_path)
+
     def __repr__(self):
         return ('<Zone: domain=%s, ttl=%s, provider=%s ...>' %
                 (self.domain, self.ttl, self.driver.name))
@@ -150,6 +177,112 @@ class Record(object):
                  self.driver.name, self.ttl))
 
 
+class RecordChange(object):
+    """
+    A change to a single record which is applied with
+    :meth:`DNSDriver.apply_changes`.
+
+    Use the :meth:`create`, :meth:`update` and :meth:`delete` class methods
+    to build changes.
+    """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+    def __init__(self, action, record=None, name=None, type=None, data=None,
+                 extra=None):
+        """
+        :param action: Change action (create, update or delete).
+        :type action: ``str``
+
+        :param record: Record to update or delete.
+        :type record: :class:`Record`
+
+        :param name: Record name (same as for :meth:`DNSDriver.create_record`).
+        :type name: ``str``
+
+        :param type: DNS record type (A, AAAA, ...).
+        :type type: :class:`RecordType`
+
+        :param data: Data for the record (depends on the record type).
+        :type data: ``str``
+
+        :param extra: (optional) Extra attributes (driver specific).
+        :type extra: ``dict``
+        """
+        if action not in [self.CREATE, self.UPDATE, self.DELETE]:
+            raise ValueError('Invalid action: %s' % (action))
+
+        if action == self.CREATE and None in (name, type, data):
+            raise ValueError('name, type and data are required for create')
+
+        if action != self.CREATE and record is None:
+            raise ValueError('record is required for %s' % (action))
+
+        if action == self.UPDATE:
+            # Attributes which are not provided are left as they are
+            name = record.name if name is None else name
+            type = record.type if type is None else type
+            data = record.data if data is None else data
+
+        self.action = action
+        self.record = record
+        self.name = name
+        self.type = type
+        self.data = data
+        self.extra = extra
+
+    @classmethod
+    def create(cls, name, type, data, extra=None):
+        return cls(action=cls.CREATE, name=name, type=type, data=data,
+                   extra=extra)
+
+    @classmethod
+    def update(cls, record, name=None, type=None, data=None, extra=None):
+        return cls(action=cls.UPDATE, record=record, name=name, type=type,
+                   data=data, extra=extra)
+
+    @classmethod
+    def delete(cls, record):
+        return cls(action=cls.DELETE, record=record)
+
+    def __repr__(self):
+        return ('<RecordChange: action=%s, name=%s, type=%s, data=%s>' %
+                (self.action, self.name, self.type, self.data))
+
+
+class RecordChangeResult(object):
+    """
+    Outcome of a change which has been applied with
+    :meth:`DNSDriver.apply_changes`.
+    """
+
+    def __init__(self, change, record=None, error=None):
+        """
+        :param change: The applied change.
+        :type change: :class:`RecordChange`
+
+        :param record: Created or updated record. The deleted record for
+                       deletions.
+        :type record: :class:`Record`
+
+        :param error: Exception which caused the change to fail (if any).
+        :type error: ``Exception``
+        """
+        self.change = change
+        self.record = record
+        self.error = error
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def __repr__(self):
+        return ('<RecordChangeResult: change=%r, success=%s>' %
+                (self.change, self.success))
+
+
 class DNSDriver(BaseDriver):
     """
     A base DNSDriver class to derive from
@@ -387,6 +520,271 @@ class DNSDriver(BaseDriver):
         raise NotImplementedError(
             'delete_record not implemented for this driver')
 
+    def apply_changes(self, zone, changes, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Apply many record changes to a zone.
+
+        Drivers for providers which can apply many changes with a single
+        request do so. Otherwise the changes are applied with
+        :meth:`create_record`, :meth:`update_record` and
+        :meth:`delete_record` using a pool of at most ``max_workers``
+        threads. The deletes are applied first, then the updates and then
+        the creates, so a record can be replaced in a single call. Changes
+        within each of these phases are applied in no particular order.
+
+        Failed changes don't stop the other changes from being applied, the
+        outcome of each change is reported in the returned results.
+
+        :param zone: Zone to change.
+        :type  zone: :class:`Zone`
+
+        :param changes: Changes to apply.
+        :type  changes: ``list`` of :class:`RecordChange`
+
+        :param max_workers: Maximum number of changes which are applied at
+                            the same time if the provider can't apply them
+                            with a single request.
+        :type  max_workers: ``int``
+
+        :return: Results in the same order as ``changes``.
+        :rtype: ``list`` of :class:`RecordChangeResult`
+        """
+        results = [RecordChangeResult(change=change) for change in changes]
+
+        def apply_change(result):
+            return self._apply_change(zone=zone, change=result.change)
+
+        for action in [RecordChange.DELETE, RecordChange.UPDATE,
+                       RecordChange.CREATE]:
+            phase = [result for result in results
+                     if result.change.action == action]
+
+            for result, record, error in run_concurrently(
+                    func=apply_change, items=phase, max_workers=max_workers):
+                result.record = record
+                result.error = error
+
+        return results
+
+    def _apply_change(self, zone, change):
+        """
+        Apply a single change with the per record methods.
+
+        :rtype: :class:`Record`
+        """
+        if change.action == RecordChange.CREATE:
+            return self.create_record(name=change.name, zone=zone,
+                                      type=change.type, data=change.data,
+                                      extra=change.extra)
+        elif change.action == RecordChange.UPDATE:
+            return self.update_record(record=change.record, name=change.name,
+                                      type=change.type, data=change.data,
+                                      extra=change.extra)
+
+        if not self.delete_record(record=change.record):
+            raise LibcloudError(value='Failed to delete record %s' %
+                                (change.record.id), driver=self)
+
+        return change.record
+
+    def get_record_changes(self, zone, records, delete=True,
+                           ignore_types=(RecordType.SOA,)):
+        """
+        Return the changes which make the records of a zone match the
+        provided records.
+
+        The current records are indexed by name, type and data, so the
+        changes are computed with a single pass over the current and the
+        provided records. Records which only differ in data (or in the
+        provided extra attributes) are updated instead of being deleted and
+        created again.
+
+        Names and data need to use the same format as the records which are
+        returned by the driver (the same format as for
+        :meth:`create_record`).
+
+        :param zone: Zone to compare the records with.
+        :type  zone: :class:`Zone`
+
+        :param records: Desired records. Each record is a dictionary with
+                        the ``name``, ``type``, ``data`` and optional
+                        ``extra`` keys. Extra attributes which are not
+                        provided are not compared.
+        :type  records: ``iterable`` of ``dict``
+
+        :param delete: True to delete the current records which are not in
+                       ``records``.
+        :type  delete: ``bool``
+
+        :param ignore_types: Types of the records which are left untouched.
+        :type  ignore_types: ``list`` of :class:`RecordType`
+
+        :return: Deletions followed by updates and creations.
+        :rtype: ``list`` of :class:`RecordChange`
+        """
+        ignore_types = ignore_types or []
+
+        # Current records keyed by (name, type, data)
+        current = {}
+
+        for record in self._iterate_zone_records(zone=zone):
+            if record.type in ignore_types:
+                continue
+
+            key = (record.name, record.type,
+                   self._get_record_data_key(record.type, record.data))
+            current.setdefault(key, []).append(record)
+
+        updates = []
+
+        # Desired records which don't exist yet keyed by (name, type)
+        missing = {}
+        missing_keys = []
+
+        for values in records:
+            name = values['name']
+            type = values['type']
+            extra = values.get('extra', None)
+            key = (name, type, self._get_record_data_key(type, values['data']))
+            matches = current.get(key, None)
+
+            if matches:
+                record = matches.pop()
+
+                if not matches:
+                    del current[key]
+
+                if extra and not self._record_has_extra(record, extra):
+                    updates.append(RecordChange.update(record, extra=extra))
+
+                continue
+
+            if (name, type) not in missing:
+                missing[(name, type)] = []
+                missing_keys.append((name, type))
+
+            missing[(name, type)].append(values)
+
+        # Current records which are not in the desired records
+        stale = {}
+
+        for (name, type, _), stale_records in current.items():
+            stale.setdefault((name, type), []).extend(stale_records)
+
+        deletes = []
+        creates = []
+
+        for key in missing_keys:
+            desired = missing[key]
+            stale_records = stale.pop(key, [])
+
+            for values, record in zip(desired, stale_records):
+                updates.append(RecordChange.update(
+                    record, data=values['data'],
+                    extra=values.get('extra', None)))
+
+            for values in desired[len(stale_records):]:
+                creates.append(RecordChange.create(
+                    name=values['name'], type=values['type'],
+                    data=values['data'], extra=values.get('extra', None)))
+
+            if delete:
+                deletes.extend(RecordChange.delete(record)
+                               for record in stale_records[len(desired):])
+
+        if delete:
+            for stale_records in stale.values():
+                deletes.extend(RecordChange.delete(record)
+                               for record in stale_records)
+
+        return deletes + updates + creates
+
+    def sync_records(self, zone, records, delete=True,
+                     ignore_types=(RecordType.SOA,), dry_run=False,
+                     max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Make the records of a zone match the provided records.
+
+        The changes are computed with :meth:`get_record_changes` and applied
+        with :meth:`apply_changes`.
+
+        :param zone: Zone to synchronize.
+        :type  zone: :class:`Zone`
+
+        :param records: Desired records (see :meth:`get_record_changes`).
+        :type  records: ``iterable`` of ``dict``
+
+        :param delete: True to delete the current records which are not in
+                       ``records``.
+        :type  delete: ``bool``
+
+        :param ignore_types: Types of the records which are left untouched.
+        :type  ignore_types: ``list`` of :class:`RecordType`
+
+        :param dry_run: True to only return the changes without applying
+                        them.
+        :type  dry_run: ``bool``
+
+        :param max_workers: Passed to :meth:`apply_changes`.
+        :type  max_workers: ``int``
+
+        :return: The planned changes if ``dry_run`` is True, otherwise the
+                 results of applying them.
+        :rtype: ``list`` of :class:`RecordChange` or ``list`` of
+                :class:`RecordChangeResult`
+        """
+        changes = self.get_record_changes(zone=zone, records=records,
+                                          delete=delete,
+                                          ignore_types=ignore_types)
+
+        if dry_run:
+            return changes
+
+        return self.apply_changes(zone=zone, changes=changes,
+                                  max_workers=max_workers)
+
+    def _iterate_zone_records(self, zone):
+        """
+        Return an iterator over the zone records for drivers which implement
+        either :meth:`iterate_records` or :meth:`list_records`.
+        """
+        try:
+            return self.iterate_records(zone)
+        except NotImplementedError:
+            return self.list_records(zone)
+
+    def _get_record_data_key(self, type, data):
+        """
+        Return a hashable value which is equal for equal record data.
+
+        Drivers with structured record data can override this method to only
+        compare the relevant parts of the data.
+        """
+        if isinstance(data, dict):
+            return tuple(sorted((key, self._get_record_data_key(type, value))
+                                for key, value in data.items()))
+        elif isinstance(data, list):
+            return tuple(self._get_record_data_key(type, value)
+                         for value in data)
+
+        return data
+
+    def _record_has_extra(self, record, extra):
+        """
+        Return True if the record has all the provided extra attributes.
+        """
+        for key, value in extra.items():
+            if key == 'ttl' and record.ttl is not None:
+                current = record.ttl
+            else:
+                current = record.extra.get(key, None)
+
+            # Some providers return numeric attributes as strings
+            if current != value and str(current) != str(value):
+                return False
+
+        return True
+
     def export_zone_to_bind_format(self, zone):
         """
         Export Zone object to the BIND compatible format.
@@ -397,27 +795,13 @@ class DNSDriver(BaseDriver):
         :return: Zone data in BIND compatible format.
         :rtype: ``str``
         """
-        if zone.type != 'master':
-            raise ValueError('You can only generate BIND out for master zones')
-
-        lines = []
+        self._check_bind_export(zone=zone)
 
         # For consistent output, records are sorted based on the id
         records = zone.list_records()
         records = sorted(records, key=Record._get_numeric_id)
 
-        date = datetime.datetime.now().strftime('%Y-%m-%d %H:%m:%S')
-        values = {'version': __version__, 'date': date}
-
-        lines.append('; Generated by Libcloud v%(version)s on %(date)s' %
-                     values)
-        lines.append('$ORIGIN %(domain)s.' % {'domain': zone.domain})
-        lines.append('$TTL %(domain_ttl)s\n' % {'domain_ttl': zone.ttl})
-
-        for record in records:
-            line = self._get_bind_record_line(record=record)
-            lines.append(line)
-
+        lines = self._get_bind_lines(zone=zone, records=records)
         output = '\n'.join(lines)
         return output
 
@@ -426,16 +810,343 @@ class DNSDriver(BaseDriver):
         Export Zone object to the BIND compatible format and write result to a
         file.
 
+        The records are written as they are retrieved (see
+        :meth:`export_zone_to_bind_file_object`).
+
         :param zone: Zone to export.
         :type  zone: :class:`Zone`
 
         :param file_path: File path where the output will be saved.
         :type  file_path: ``str``
         """
-        result = self.export_zone_to_bind_format(zone=zone)
+        self._check_bind_export(zone=zone)
 
         with open(file_path, 'w') as fp:
-            fp.write(result)
+            self.export_zone_to_bind_file_object(zone=zone, fp=fp)
+
+    def export_zone_to_bind_file_object(self, zone, fp):
+        """
+        Export Zone object to the BIND compatible format and write result to a
+        file object.
+
+        Records are written in the order in which the provider returns them
+        as they are retrieved, so the whole zone is never kept in memory.
+
+        :param zone: Zone to export.
+        :type  zone: :class:`Zone`
+
+        :param fp: File object the output is written to.
+        :type  fp: ``file``
+        """
+        self._check_bind_export(zone=zone)
+
+        records = self._iterate_zone_records(zone=zone)
+        separator = ''
+
+        for line in self._get_bind_lines(zone=zone, records=records):
+            fp.write(separator + line)
+            separator = '\n'
+
+    def parse_bind_zone_file(self, zone, file_path):
+        """
+        Parse the records from a BIND zone file.
+
+        ``$ORIGIN`` and ``$TTL`` directives, multi line records and
+        comments are supported. Record names are returned relative to the
+        zone domain (an empty string for the zone apex) and priorities of
+        MX and SRV records are stored in the ``priority`` extra attribute,
+        the same as in the output of :meth:`export_zone_to_bind_format`.
+        Domain names in the data of CNAME, DNAME, NS, PTR, MX and SRV
+        records are made absolute in the format which is used by the
+        driver.
+
+        :param zone: Zone the file belongs to.
+        :type  zone: :class:`Zone`
+
+        :param file_path: Path of the zone file.
+        :type  file_path: ``str``
+
+        :return: Records which are parsed from the file as it's being read.
+        :rtype: ``generator`` of :class:`Record`
+        """
+        with open(file_path, 'r') as fp:
+            for record in self._parse_bind_lines(zone=zone, lines=fp):
+                yield record
+
+    def import_bind_zone_file(self, zone, file_path,
+                              ignore_types=(RecordType.SOA, RecordType.NS),
+                              delete=False, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Import the records from a BIND zone file into a zone.
+
+        The records are imported with :meth:`sync_records`, so records which
+        already exist are left untouched and running an import which has
+        been interrupted again only applies the remaining changes.
+
+        :param zone: Zone to import the records into.
+        :type  zone: :class:`Zone`
+
+        :param file_path: Path of the zone file.
+        :type  file_path: ``str``
+
+        :param ignore_types: Types of the records which are not imported.
+                             SOA and NS records are managed by the provider
+                             by default.
+        :type  ignore_types: ``list`` of :class:`RecordType`
+
+        :param delete: True to delete the records which are not in the file.
+        :type  delete: ``bool``
+
+        :param max_workers: Passed to :meth:`apply_changes`.
+        :type  max_workers: ``int``
+
+        :rtype: ``list`` of :class:`RecordChangeResult`
+        """
+        ignore_types = ignore_types or []
+
+        with open(file_path, 'r') as fp:
+            records = (record for record in self._parse_bind_lines(zone=zone,
+                                                                   lines=fp)
+                       if record.type not in ignore_types)
+            records = self._get_bind_import_records(zone=zone,
+                                                    records=records)
+
+            return self.sync_records(zone=zone, records=records,
+                                     delete=delete,
+                                     ignore_types=ignore_types,
+                                     max_workers=max_workers)
+
+    def _get_bind_import_records(self, zone, records):
+        """
+        Return the desired records (see :meth:`get_record_changes`) for the
+        records which are parsed from a BIND zone file.
+
+        Drivers whose record data doesn't use the BIND format should
+        override this method to convert the records into the format which
+        is returned by the driver, so importing the same file again doesn't
+        result in any changes.
+
+        :param zone: Zone the records are imported into.
+        :type  zone: :class:`Zone`
+
+        :param records: Records parsed from the zone file.
+        :type  records: ``iterable`` of :class:`Record`
+
+        :rtype: ``iterable`` of ``dict``
+        """
+        for record in records:
+            yield {'name': record.name, 'type': record.type,
+                   'data': record.data, 'extra': record.extra}
+
+    def _check_bind_export(self, zone):
+        if zone.type != 'master':
+            raise ValueError('You can only generate BIND out for master zones')
+
+    def _get_bind_lines(self, zone, records):
+        """
+        Return a generator of the BIND zone file lines for the provided
+        records.
+        """
+        date = datetime.datetime.now().strftime('%Y-%m-%d %H:%m:%S')
+        values = {'version': __version__, 'date': date}
+
+        yield ('; Generated by Libcloud v%(version)s on %(date)s' %
+               values)
+        yield '$ORIGIN %(domain)s.' % {'domain': zone.domain}
+
+        # Records without a TTL use the default TTL of the name server if the
+        # zone doesn't have one either
+        if zone.ttl is not None:
+            yield '$TTL %(domain_ttl)s\n' % {'domain_ttl': zone.ttl}
+        else:
+            yield ''
+
+        for record in records:
+            yield self._get_bind_record_line(record=record)
+
+    def _parse_bind_lines(self, zone, lines):
+        """
+        Return a generator of the records in the provided BIND zone file
+        lines.
+        """
+        domain = zone.domain.rstrip('.')
+        origin = domain
+        default_ttl = zone.ttl
+        previous_name = None
+
+        tokens = []
+        depth = 0
+        start_line = 0
+
+        for line_number, line in enumerate(lines, 1):
+            if depth == 0:
+                # A line which starts with whitespace belongs to the
+                # previous owner
+                inherit_name = line[:1] in (' ', '\t')
+                start_line = line_number
+
+            for token in BIND_TOKEN_RE.findall(line):
+                if token[0] == ';':
+                    break
+                elif token == '(':
+                    depth += 1
+                elif token == ')':
+                    depth -= 1
+                else:
+                    tokens.append(token)
+
+            if depth > 0 or not tokens:
+                continue
+
+            record_tokens = tokens
+            tokens = []
+            depth = 0
+
+            if record_tokens[0][0] == '$':
+                directive = record_tokens[0].upper()
+
+                if directive == '$ORIGIN' and len(record_tokens) > 1:
+                    origin = self._get_bind_absolute_name(record_tokens[1],
+                                                          origin)
+                elif directive == '$TTL' and len(record_tokens) > 1:
+                    default_ttl = self._parse_bind_ttl(record_tokens[1],
+                                                       start_line)
+                else:
+                    raise ValueError('Line %s: unsupported directive %s' %
+                                     (start_line, record_tokens[0]))
+
+                continue
+
+            if inherit_name:
+                if previous_name is None:
+                    raise ValueError('Line %s: record without a name' %
+                                     (start_line))
+
+                name = previous_name
+            else:
+                name = self._get_bind_relative_name(
+                    self._get_bind_absolute_name(record_tokens.pop(0),
+                                                 origin),
+                    domain, start_line)
+
+            previous_name = name
+
+            yield self._get_bind_record(zone=zone, name=name,
+                                        tokens=record_tokens,
+                                        default_ttl=default_ttl,
+                                        origin=origin,
+                                        line_number=start_line)
+
+        if tokens:
+            raise ValueError('Line %s: unbalanced parentheses' % (start_line))
+
+    def _get_bind_record(self, zone, name, tokens, default_ttl, origin,
+                         line_number):
+        """
+        Create a record from the tokens of a BIND record line which follow
+        the owner name.
+
+        Domain names in the data are relative to ``origin``.
+        """
+        ttl = default_ttl
+        index = 0
+
+        # TTL and class are both optional and can be in any order
+        while index < len(tokens) - 1:
+            token = tokens[index]
+
+            if token[0].isdigit():
+                ttl = self._parse_bind_ttl(token, line_number)
+            elif token.upper() not in BIND_CLASSES:
+                break
+
+            index += 1
+
+        type = getattr(RecordType, tokens[index].upper(), None)
+        rdata = tokens[index + 1:]
+
+        if type is None:
+            raise ValueError('Line %s: unsupported record type %s' %
+                             (line_number, tokens[index]))
+
+        if not rdata:
+            raise ValueError('Line %s: record without data' % (line_number))
+
+        extra = {'ttl': ttl}
+
+        if type in [RecordType.MX, RecordType.SRV] and len(rdata) > 1:
+            extra['priority'] = int(rdata[0])
+            rdata = rdata[1:]
+
+        target_index = BIND_TARGET_INDEXES.get(type, None)
+
+        if target_index is not None and target_index < len(rdata):
+            rdata = list(rdata)
+            rdata[target_index] = self._get_bind_record_target(
+                self._get_bind_absolute_name(rdata[target_index], origin))
+
+        if type in [RecordType.TXT, RecordType.SPF] and \
+                all(token[0] == '"' for token in rdata):
+            # Character strings are concatenated
+            data = ''.join(re.sub(r'\\(.)', r'\1', token[1:-1])
+                           for token in rdata)
+        else:
+            data = ' '.join(rdata)
+
+        return Record(id=None, name=name, type=type, data=data, zone=zone,
+                      driver=self, ttl=ttl, extra=extra)
+
+    def _get_bind_absolute_name(self, name, origin):
+        """
+        Return the absolute name (without the trailing dot) of a name from a
+        BIND zone file.
+        """
+        if name == '@':
+            return origin
+        elif name.endswith('.'):
+            return name[:-1]
+
+        return '%s.%s' % (name, origin)
+
+    def _get_bind_record_target(self, name):
+        """
+        Return the absolute domain name (without the trailing dot) from the
+        data of a record in the format which is used by the driver.
+
+        The name is returned with a trailing dot, the same as in the output
+        of :meth:`export_zone_to_bind_format`.
+        """
+        return name + '.'
+
+    def _get_bind_relative_name(self, name, domain, line_number):
+        """
+        Return the name relative to the zone domain.
+        """
+        lower_name = name.lower()
+        lower_domain = domain.lower()
+
+        if lower_name == lower_domain:
+            return ''
+        elif lower_name.endswith('.' + lower_domain):
+            return name[:-len(domain) - 1]
+
+        raise ValueError('Line %s: name %s is not in zone %s' %
+                         (line_number, name, domain))
+
+    def _parse_bind_ttl(self, value, line_number):
+        """
+        Parse a TTL value which can use units (e.g. 1h30m).
+        """
+        if value.isdigit():
+            return int(value)
+
+        parts = BIND_TTL_RE.findall(value)
+
+        if ''.join(number + unit for number, unit in parts) != value:
+            raise ValueError('Line %s: invalid TTL %s' % (line_number, value))
+
+        return sum(int(number) * BIND_TTL_UNITS[unit.lower()]
+                   for number, unit in parts)
 
     def _get_bind_record_line(self, record):
         """
@@ -458,7 +1169,6 @@ class DNSDriver(BaseDriver):
         name += '.'
 
         ttl = record.extra['ttl'] if 'ttl' in record.extra else record.zone.ttl
-        ttl = str(ttl)
         data = record.data
 
         if record.type in [RecordType.CNAME, RecordType.DNAME, RecordType.MX,
@@ -476,9 +1186,12 @@ class DNSDriver(BaseDriver):
 
         if record.type in [RecordType.MX, RecordType.SRV]:
             priority = str(record.extra['priority'])
-            parts = [name, ttl, 'IN', record.type, priority, data]
+            parts = [name, 'IN', record.type, priority, data]
         else:
-            parts = [name, ttl, 'IN', record.type, data]
+            parts = [name, 'IN', record.type, data]
+
+        if ttl is not None:
+            parts.insert(1, str(ttl))
 
         line = '\t'.join(parts)
         return line
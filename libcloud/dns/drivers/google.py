@@ -21,11 +21,14 @@ __all__ = [
 API_VERSION = 'v1'
 
 import re
+import sys
 from libcloud.common.google import GoogleResponse, GoogleBaseConnection
 from libcloud.common.google import ResourceNotFoundError
 from libcloud.dns.types import Provider, RecordType
 from libcloud.dns.types import ZoneDoesNotExistError, RecordDoesNotExistError
 from libcloud.dns.base import DNSDriver, Zone, Record
+from libcloud.dns.base import RecordChange, RecordChangeResult
+from libcloud.utils.concurrency import DEFAULT_MAX_WORKERS
 
 
 class GoogleDNSResponse(GoogleResponse):
@@ -63,6 +66,10 @@ class GoogleDNSDriver(DNSDriver):
         RecordType.TXT: 'TXT',
     }
 
+    # Maximum number of record set additions and deletions which are sent in
+    # a single change
+    MAX_CHANGES_PER_BATCH = 1000
+
     def __init__(self, user_id, key, project=None, auth_type=None, scopes=None,
                  **kwargs):
         self.auth_type = auth_type
@@ -303,6 +310,136 @@ class GoogleDNSDriver(DNSDriver):
 
         return response_data
 
+    def apply_changes(self, zone, changes, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Changes are sent with as few :meth:`ex_bulk_record_changes` calls as
+        possible. Google Cloud DNS applies each call atomically, so if a call
+        fails all the changes in it fail with the same error. Record names
+        and data use the same format as :meth:`create_record`.
+
+        @inherits: :class:`DNSDriver.apply_changes`
+        """
+        results = []
+        batch = []
+        batch_size = 0
+
+        for change in changes:
+            result = RecordChangeResult(change=change)
+            results.append(result)
+
+            additions = []
+            deletions = []
+
+            if change.action != RecordChange.CREATE:
+                record = change.record
+                deletions.append({
+                    'name': record.name,
+                    'type': record.type,
+                    'rrdatas': record.data['rrdatas'],
+                    'ttl': record.data['ttl']
+                })
+
+            if change.action != RecordChange.DELETE:
+                additions.append({
+                    'name': change.name,
+                    'type': change.type,
+                    'ttl': int(change.data.get('ttl', 0)),
+                    'rrdatas': change.data.get('rrdatas', [])
+                })
+
+            size = len(additions) + len(deletions)
+
+            if batch and batch_size + size > self.MAX_CHANGES_PER_BATCH:
+                self._post_change_results(zone=zone, batch=batch)
+                batch = []
+                batch_size = 0
+
+            batch.append((result, additions, deletions))
+            batch_size += size
+
+        if batch:
+            self._post_change_results(zone=zone, batch=batch)
+
+        return results
+
+    def _post_change_results(self, zone, batch):
+        """
+        Send the changes in a single call and store the outcome in the
+        results.
+
+        :param batch: List of (:class:`RecordChangeResult`, additions,
+                      deletions) tuples.
+        :type batch: ``list``
+        """
+        records = {'additions': [], 'deletions': []}
+
+        for _, additions, deletions in batch:
+            records['additions'].extend(additions)
+            records['deletions'].extend(deletions)
+
+        try:
+            response = self.ex_bulk_record_changes(zone=zone, records=records)
+        except Exception:
+            e = sys.exc_info()[1]
+
+            for result, _, _ in batch:
+                result.error = e
+
+            return
+
+        # Additions are returned in the same order as they were sent
+        added = iter(response['additions'])
+
+        for result, additions, _ in batch:
+            if additions:
+                result.record = next(added, None)
+            else:
+                result.record = result.change.record
+
+    def _get_bind_import_records(self, zone, records):
+        # Google Cloud DNS records are record sets, so the records with the
+        # same name and type are combined into a single record
+        domain = zone.domain.rstrip('.')
+        record_sets = {}
+        keys = []
+
+        for record in records:
+            if record.name:
+                name = '%s.%s.' % (record.name, domain)
+            else:
+                name = domain + '.'
+
+            key = (name, record.type)
+
+            if key not in record_sets:
+                ttl = record.extra.get('ttl', None)
+                record_sets[key] = {'ttl': ttl or 0, 'rrdatas': []}
+                keys.append(key)
+
+            record_sets[key]['rrdatas'].append(self._get_bind_rrdata(record))
+
+        return [{'name': name, 'type': type, 'data': record_sets[(name, type)]}
+                for name, type in keys]
+
+    def _get_bind_rrdata(self, record):
+        """
+        Return the rrdata of a record which is parsed from a BIND zone file.
+        """
+        data = record.data
+
+        if record.type in [RecordType.TXT, RecordType.SPF]:
+            data = data.replace('\\', '\\\\').replace('"', '\\"')
+            data = '"%s"' % (data)
+        elif 'priority' in record.extra:
+            data = '%s %s' % (record.extra['priority'], data)
+
+        return data
+
+    def _get_record_data_key(self, type, data):
+        # Record data also contains the name, type and kind of the record set
+        rrdatas = tuple(sorted(data.get('rrdatas', [])))
+        return (int(data.get('ttl', 0)), rrdatas)
+
     def _get_more(self, rtype, **kwargs):
         last_key = None
         exhausted = False
@@ -21,8 +21,10 @@ from libcloud.common.base import ConnectionKey, JsonResponse
 from libcloud.common.exceptions import BaseHTTPError
 from libcloud.common.types import InvalidCredsError, MalformedResponseError
 from libcloud.dns.base import DNSDriver, Zone, Record
+from libcloud.dns.base import RecordChange, RecordChangeResult
 from libcloud.dns.types import ZoneDoesNotExistError, ZoneAlreadyExistsError
 from libcloud.dns.types import Provider, RecordType
+from libcloud.utils.concurrency import DEFAULT_MAX_WORKERS
 from libcloud.utils.py3 import httplib
 
 __all__ = [
@@ -431,6 +433,146 @@ class PowerDNSDriver(DNSDriver):
         return Record(id=None, name=name, data=data, type=type,
                       zone=record.zone, driver=self, ttl=extra['ttl'])
 
+    def apply_changes(self, zone, changes, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        All the changes are sent with a single PATCH request which PowerDNS
+        applies atomically, so if the request fails all the changes fail
+        with the same error.
+
+        PowerDNS replaces whole record sets (all the records with the same
+        name and type), so the current records of the zone are retrieved
+        first and the records of a changed record set which are not deleted
+        or updated are sent again with the changed records.
+
+        @inherits: :class:`DNSDriver.apply_changes`
+        """
+        results = []
+        batch = []
+
+        for change in changes:
+            result = RecordChangeResult(change=change)
+            results.append(result)
+
+            extra = change.extra
+
+            if change.action != RecordChange.DELETE and \
+                    (extra is None or extra.get('ttl', None) is None):
+                result.error = ValueError('PowerDNS requires a ttl value for '
+                                          'every record')
+                continue
+
+            batch.append(result)
+
+        if not batch:
+            return results
+
+        try:
+            current = self.list_records(zone)
+        except (BaseHTTPError, ZoneDoesNotExistError):
+            e = sys.exc_info()[1]
+
+            for result in batch:
+                result.error = e
+
+            return results
+
+        # Current records keyed by (name, type)
+        current_rrsets = {}
+
+        for record in current:
+            current_rrsets.setdefault((record.name, record.type), []).append(
+                self._to_rrset_record(name=record.name, type=record.type,
+                                      data=record.data, ttl=record.ttl))
+
+        # Records of the record sets to change keyed by (name, type)
+        rrsets = {}
+        rrsets_order = []
+
+        def get_rrset_records(name, type):
+            key = (name, type)
+
+            if key not in rrsets:
+                rrsets[key] = list(current_rrsets.get(key, []))
+                rrsets_order.append(key)
+
+            return rrsets[key]
+
+        for result in batch:
+            change = result.change
+
+            if change.action != RecordChange.CREATE:
+                rrset_records = get_rrset_records(change.record.name,
+                                                  change.record.type)
+
+                for item in rrset_records:
+                    if item['content'] == change.record.data:
+                        rrset_records.remove(item)
+                        break
+
+            if change.action != RecordChange.DELETE:
+                get_rrset_records(change.name, change.type).append(
+                    self._to_rrset_record(name=change.name, type=change.type,
+                                          data=change.data,
+                                          ttl=change.extra['ttl']))
+
+        payload_rrsets = []
+
+        for name, type in rrsets_order:
+            rrset = {'name': name, 'type': type}
+
+            if rrsets[(name, type)]:
+                rrset['changetype'] = 'REPLACE'
+                rrset['records'] = rrsets[(name, type)]
+            else:
+                rrset['changetype'] = 'DELETE'
+
+            payload_rrsets.append(rrset)
+
+        action = '%s/servers/%s/zones/%s' % (self.api_root, self.ex_server,
+                                             zone.id)
+        payload = {'rrsets': payload_rrsets}
+
+        try:
+            self.connection.request(action=action, data=json.dumps(payload),
+                                    method='PATCH')
+        except BaseHTTPError:
+            e = sys.exc_info()[1]
+            if e.code == httplib.UNPROCESSABLE_ENTITY and \
+               e.message.startswith('Could not find domain'):
+                e = ZoneDoesNotExistError(zone_id=zone.id, driver=self,
+                                          value=e.message)
+
+            for result in batch:
+                result.error = e
+
+            return results
+
+        for result in batch:
+            change = result.change
+
+            if change.action == RecordChange.DELETE:
+                result.record = change.record
+            else:
+                result.record = Record(id=None, name=change.name,
+                                       data=change.data, type=change.type,
+                                       zone=zone, driver=self,
+                                       ttl=change.extra['ttl'])
+
+        return results
+
+    def _get_bind_record_target(self, name):
+        # PowerDNS returns names without the trailing dot
+        return name
+
+    def _to_rrset_record(self, name, type, data, ttl):
+        return {
+            'content': data,
+            'disabled': False,
+            'name': name,
+            'ttl': ttl,
+            'type': type,
+        }
+
     def _to_zone(self, item):
         extra = {}
         for e in ['kind', 'dnssec', 'account', 'masters', 'serial',
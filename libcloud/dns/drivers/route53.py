@@ -17,6 +17,8 @@ __all__ = [
     'Route53DNSDriver'
 ]
 
+import re
+import sys
 import base64
 import hmac
 import datetime
@@ -33,9 +35,11 @@ from libcloud.utils.xml import findtext, findall, fixxpath
 from libcloud.dns.types import Provider, RecordType
 from libcloud.dns.types import ZoneDoesNotExistError, RecordDoesNotExistError
 from libcloud.dns.base import DNSDriver, Zone, Record
+from libcloud.dns.base import RecordChange, RecordChangeResult
 from libcloud.common.types import LibcloudError
 from libcloud.common.aws import AWSGenericResponse, AWSTokenConnection
 from libcloud.common.base import ConnectionUserAndKey
+from libcloud.utils.concurrency import DEFAULT_MAX_WORKERS
 
 
 API_VERSION = '2012-02-29'
@@ -44,6 +48,9 @@ API_ROOT = '/%s/' % (API_VERSION)
 
 NAMESPACE = 'https://%s/doc%s' % (API_HOST, API_ROOT)
 
+# Character string of a TXT or SPF record value
+QUOTED_STRING_RE = re.compile(r'\s*"((?:[^"\\]|\\.)*)"\s*')
+
 
 class InvalidChangeBatch(LibcloudError):
     pass
@@ -115,6 +122,9 @@ class Route53DNSDriver(DNSDriver):
         RecordType.TXT: 'TXT',
     }
 
+    # Maximum number of changes which are posted in a single change batch
+    MAX_CHANGES_PER_BATCH = 1000
+
     def __init__(self, *args, **kwargs):
         self.token = kwargs.pop('token', None)
         super(Route53DNSDriver, self).__init__(*args, **kwargs)
@@ -234,6 +244,57 @@ class Route53DNSDriver(DNSDriver):
                                           record_id=r.id)
         return True
 
+    def apply_changes(self, zone, changes, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Changes are posted in as few change batches as possible. Route53
+        applies each batch atomically, so if a batch is rejected all the
+        changes in it fail with the same error. Updates of records with
+        multiple values are applied individually.
+
+        @inherits: :class:`DNSDriver.apply_changes`
+        """
+        results = []
+        individual = []
+        batch = []
+        batch_size = 0
+
+        for change in changes:
+            result = RecordChangeResult(change=change)
+            results.append(result)
+
+            record = change.record
+
+            if change.action == RecordChange.UPDATE and \
+                    record.extra.get('_multi_value', False) and \
+                    record.extra.get('_other_records', []):
+                individual.append(result)
+                continue
+
+            items = self._get_changeset_items(change=change)
+
+            if batch and batch_size + len(items) > self.MAX_CHANGES_PER_BATCH:
+                self._post_change_results(zone=zone, batch=batch)
+                batch = []
+                batch_size = 0
+
+            batch.append((result, items))
+            batch_size += len(items)
+
+        if batch:
+            self._post_change_results(zone=zone, batch=batch)
+
+        if individual:
+            individual_results = super(Route53DNSDriver, self).apply_changes(
+                zone=zone, changes=[result.change for result in individual],
+                max_workers=max_workers)
+
+            for result, individual_result in zip(individual,
+                                                 individual_results):
+                result.record = individual_result.record
+                result.error = individual_result.error
+
+        return results
+
     def ex_create_multi_value_record(self, name, zone, type, data, extra=None):
         """
         Create a record with multiple values with a single call.
@@ -371,6 +432,65 @@ class Route53DNSDriver(DNSDriver):
 
         return response.status == httplib.OK
 
+    def _get_changeset_items(self, change):
+        """
+        Return the changeset items (as accepted by ``_post_changeset``) for
+        the provided change.
+        """
+        if change.action == RecordChange.CREATE:
+            data = change.data
+
+            if change.type in (RecordType.TXT, RecordType.SPF):
+                data = self._quote_data(data)
+
+            return [('CREATE', change.name, change.type, data,
+                     change.extra or {})]
+
+        record = change.record
+        items = [('DELETE', record.name, record.type, record.data,
+                  record.extra)]
+
+        if change.action == RecordChange.UPDATE:
+            data = change.data
+
+            if change.type in (RecordType.TXT, RecordType.SPF):
+                data = self._quote_data(data)
+
+            items.append(('CREATE', change.name, change.type, data,
+                          change.extra or record.extra))
+
+        return items
+
+    def _post_change_results(self, zone, batch):
+        """
+        Post a change batch and store the outcome in the results.
+
+        :param batch: List of (:class:`RecordChangeResult`, changeset items)
+                      tuples.
+        :type batch: ``list``
+        """
+        try:
+            self._post_changeset(zone, [item for _, items in batch
+                                        for item in items])
+        except Exception:
+            e = sys.exc_info()[1]
+
+            for result, _ in batch:
+                result.error = e
+
+            return
+
+        for result, items in batch:
+            if result.change.action == RecordChange.DELETE:
+                result.record = result.change.record
+                continue
+
+            _, name, type, data, extra = items[-1]
+            id = ':'.join((self.RECORD_TYPE_MAP[type], name))
+            result.record = Record(id=id, name=name, type=type, data=data,
+                                   zone=zone, driver=self,
+                                   ttl=extra.get('ttl', None), extra=extra)
+
     def _post_changeset(self, zone, changes_list):
         attrs = {'xmlns': NAMESPACE}
         changeset = ET.Element('ChangeResourceRecordSetsRequest', attrs)
@@ -395,6 +515,13 @@ class Route53DNSDriver(DNSDriver):
             rrecs = ET.SubElement(rrs, 'ResourceRecords')
             rrec = ET.SubElement(rrecs, 'ResourceRecord')
             if 'priority' in extra:
+                if type_ == RecordType.SRV and 'weight' in extra and \
+                        'port' in extra and len(data.split()) == 1:
+                    # Records returned by the driver only contain the
+                    # target in the data
+                    data = '%s %s %s' % (extra['weight'], extra['port'],
+                                         data)
+
                 data = '%s %s' % (extra['priority'], data)
             ET.SubElement(rrec, 'Value').text = data
 
@@ -405,6 +532,34 @@ class Route53DNSDriver(DNSDriver):
 
         return response.status == httplib.OK
 
+    def _get_bind_import_records(self, zone, records):
+        # Records are converted into the format which is returned by
+        # _to_record so importing the same file again is a no-op
+        parent = super(Route53DNSDriver, self)
+        records = parent._get_bind_import_records(zone=zone, records=records)
+
+        for values in records:
+            type = values['type']
+            data = values['data']
+
+            if type in (RecordType.TXT, RecordType.SPF):
+                data = data.replace('\\', '\\\\').replace('"', '\\"')
+                values['data'] = '"%s"' % (data)
+            elif type == RecordType.SRV and len(data.split()) == 3:
+                weight, port, target = data.split()
+                values['data'] = target
+                values['extra']['weight'] = int(weight)
+                values['extra']['port'] = int(port)
+
+            yield values
+
+    def _get_record_data_key(self, type, data):
+        if type in (RecordType.TXT, RecordType.SPF):
+            # The same value can be provided with or without the quotes
+            return self._unquote_data(data)
+
+        return data
+
     def _to_zones(self, data):
         zones = []
         for element in data.findall(fixxpath(xpath='HostedZones/HostedZone',
@@ -562,3 +717,29 @@ class Route53DNSDriver(DNSDriver):
         if data[0] == '"' and data[-1] == '"':
             return data
         return '"{0}"'.format(data.replace('"', '\"'))
+
+    def _unquote_data(self, data):
+        """
+        Return the value of TXT or SPF record data without the quotes.
+
+        Long values consist of many quoted character strings which are
+        concatenated.
+        """
+        strings = []
+        position = 0
+
+        while position < len(data):
+            match = QUOTED_STRING_RE.match(data, position)
+
+            if match is None:
+                # Data which isn't (correctly) quoted is compared as is,
+                # apart from the outer quotes
+                if len(data) > 1 and data[0] == '"' and data[-1] == '"':
+                    return data[1:-1]
+
+                return data
+
+            strings.append(re.sub(r'\\(.)', r'\1', match.group(1)))
+            position = match.end()
+
+        return ''.join(strings)
@@ -19,6 +19,8 @@ verification, depending on libcloud.security settings.
 """
 
 import os
+import time
+import threading
 import warnings
 import requests
 from requests.adapters import HTTPAdapter
@@ -30,21 +32,40 @@ from libcloud.utils.py3 import urlparse, PY3
 
 __all__ = [
     'LibcloudBaseConnection',
-    'LibcloudConnection'
+    'LibcloudConnection',
+
+    'POOL_OPTIONS'
 ]
 
 ALLOW_REDIRECTS = 1
 
 HTTP_PROXY_ENV_VARIABLE_NAME = 'http_proxy'
 
+# Keyword arguments which control the urllib3 connection pool and are passed
+# to the requests HTTPAdapter
+POOL_OPTIONS = ['pool_connections', 'pool_maxsize', 'pool_block',
+                'max_retries']
+
+# Sessions which are shared between connections to the same host, keyed by
+# the connection settings
+_SHARED_SESSIONS = {}
+_SHARED_SESSIONS_LOCK = threading.Lock()
+
+# Lock which guards lazy creation of the per thread response state
+_RESPONSE_STATE_LOCK = threading.Lock()
+
+# Lock which guards the idle time and the number of requests in progress
+# which are tracked on the sessions
+_SESSION_STATE_LOCK = threading.Lock()
+
 
 class SignedHTTPSAdapter(HTTPAdapter):
-    def __init__(self, cert_file, key_file):
+    def __init__(self, cert_file, key_file, **pool_options):
         self.cert_file = cert_file
         self.key_file = key_file
-        super(SignedHTTPSAdapter, self).__init__()
+        super(SignedHTTPSAdapter, self).__init__(**pool_options)
 
-    def init_poolmanager(self, connections, maxsize, block=False):
+    def init_poolmanager(self, connections, maxsize, block=False, **kwargs):
         self.poolmanager = PoolManager(
             num_pools=connections, maxsize=maxsize,
             block=block,
@@ -72,8 +93,8 @@ class LibcloudBaseConnection(object):
 
     ca_cert = None
 
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, session=None):
+        self.session = session or requests.Session()
 
     def set_http_proxy(self, proxy_url):
         """
@@ -163,20 +184,63 @@ class LibcloudBaseConnection(object):
             else:
                 self.ca_cert = ca_certs_path
 
-    def _setup_signing(self, cert_file=None, key_file=None):
+    def _setup_signing(self, cert_file=None, key_file=None, **pool_options):
         """
         Setup request signing by mounting a signing
         adapter to the session
         """
-        self.session.mount('https://', SignedHTTPSAdapter(cert_file, key_file))
+        self.session.mount('https://', SignedHTTPSAdapter(cert_file, key_file,
+                                                          **pool_options))
+
+    def _setup_pool(self, **pool_options):
+        """
+        Setup connection pooling by mounting adapters configured with the
+        provided pool options to the session
+        """
+        self.session.mount('http://', HTTPAdapter(**pool_options))
+        self.session.mount('https://', HTTPAdapter(**pool_options))
 
 
 class LibcloudConnection(LibcloudBaseConnection):
+    """
+    HTTP connection which is backed by a requests session.
+
+    The session can be used by multiple threads at the same time and the
+    last response is stored per thread.
+    """
     timeout = None
     host = None
-    response = None
+
+    # Number of seconds after which idle pooled connections are closed
+    # instead of being reused (None to keep them open)
+    keep_alive_timeout = None
 
     def __init__(self, host, port, secure=None, **kwargs):
+        """
+        :param pool_connections: Number of connection pools to cache.
+        :type pool_connections: ``int``
+
+        :param pool_maxsize: Maximum number of connections to keep open in
+                             a pool.
+        :type pool_maxsize: ``int``
+
+        :param pool_block: True to block when no free connection is
+                           available in a pool instead of opening a new one.
+        :type pool_block: ``bool``
+
+        :param max_retries: Number of retries urllib3 performs on failed
+                            connections.
+        :type max_retries: ``int``
+
+        :param keep_alive_timeout: Number of seconds after which idle
+                                   connections are closed.
+        :type keep_alive_timeout: ``int``
+
+        :param shared_session: True to share a single pooled session with
+                               all the other connections to the same host
+                               which use the same settings.
+        :type shared_session: ``bool``
+        """
         scheme = 'https' if secure is not None and secure else 'http'
         self.host = '{0}://{1}{2}'.format(
             'https' if port == 443 else scheme,
@@ -187,17 +251,113 @@ class LibcloudConnection(LibcloudBaseConnection):
         proxy_url_env = os.environ.get(HTTP_PROXY_ENV_VARIABLE_NAME, None)
         proxy_url = kwargs.pop('proxy_url', proxy_url_env)
 
+        pool_options = dict((key, kwargs.pop(key)) for key in POOL_OPTIONS
+                            if kwargs.get(key, None) is not None)
+        self.keep_alive_timeout = kwargs.pop('keep_alive_timeout',
+                                             self.keep_alive_timeout)
+        shared_session = kwargs.pop('shared_session', False)
+
         self._setup_verify()
         self._setup_ca_cert()
 
-        LibcloudBaseConnection.__init__(self)
+        if shared_session:
+            session_key = (self.host, kwargs.get('cert_file', None),
+                           kwargs.get('key_file', None), proxy_url,
+                           tuple(sorted(pool_options.items())))
+
+            with _SHARED_SESSIONS_LOCK:
+                session = _SHARED_SESSIONS.get(session_key, None)
+
+                if session is None:
+                    LibcloudBaseConnection.__init__(self)
+                    self._setup_session(proxy_url=proxy_url,
+                                        pool_options=pool_options, **kwargs)
+                    _SHARED_SESSIONS[session_key] = self.session
+                else:
+                    LibcloudBaseConnection.__init__(self, session=session)
+
+                    if proxy_url:
+                        self.set_http_proxy(proxy_url=proxy_url)
+        else:
+            LibcloudBaseConnection.__init__(self)
+            self._setup_session(proxy_url=proxy_url,
+                                pool_options=pool_options, **kwargs)
+
+        self.session.timeout = kwargs.get('timeout', 60)
+
+    def _setup_session(self, proxy_url=None, pool_options=None, **kwargs):
+        pool_options = pool_options or {}
+
+        if pool_options:
+            self._setup_pool(**pool_options)
 
         if 'cert_file' in kwargs or 'key_file' in kwargs:
-            self._setup_signing(**kwargs)
+            self._setup_signing(cert_file=kwargs.get('cert_file', None),
+                                key_file=kwargs.get('key_file', None),
+                                **pool_options)
 
         if proxy_url:
             self.set_http_proxy(proxy_url=proxy_url)
-        self.session.timeout = kwargs.get('timeout', 60)
+
+    @property
+    def last_request_time(self):
+        """
+        Time of the last request sent using the session of this connection.
+
+        The time is tracked per session, so a shared session is only idle if
+        none of the connections which use it have sent a request.
+        """
+        return getattr(self.session, '_libcloud_last_request_time', None)
+
+    def _acquire_session(self):
+        """
+        Mark the session as used by a request.
+
+        The pooled connections are closed first if they have been idle for
+        longer than keep_alive_timeout seconds and no other request (e.g.
+        from another thread which uses the same shared session) is in
+        progress.
+        """
+        now = time.time()
+
+        with _SESSION_STATE_LOCK:
+            last_request_time = self.last_request_time
+            in_progress = getattr(self.session,
+                                  '_libcloud_requests_in_progress', 0)
+
+            if self.keep_alive_timeout is not None and in_progress == 0 and \
+                    last_request_time is not None and \
+                    now - last_request_time > self.keep_alive_timeout:
+                for adapter in self.session.adapters.values():
+                    adapter.close()
+
+            self.session._libcloud_last_request_time = now
+            self.session._libcloud_requests_in_progress = in_progress + 1
+
+    def _release_session(self):
+        """
+        Mark the end of a request which has been started with
+        :meth:`_acquire_session`.
+        """
+        with _SESSION_STATE_LOCK:
+            self.session._libcloud_last_request_time = time.time()
+            self.session._libcloud_requests_in_progress -= 1
+
+    @property
+    def response(self):
+        state = self.__dict__.get('_response_state', None)
+        return getattr(state, 'response', None)
+
+    @response.setter
+    def response(self, value):
+        state = self.__dict__.get('_response_state', None)
+
+        if state is None:
+            with _RESPONSE_STATE_LOCK:
+                state = self.__dict__.setdefault('_response_state',
+                                                 threading.local())
+
+        state.response = value
 
     @property
     def verification(self):
@@ -211,15 +371,19 @@ class LibcloudConnection(LibcloudBaseConnection):
         url = urlparse.urljoin(self.host, url)
         headers = self._normalize_headers(headers=headers)
 
-        self.response = self.session.request(
-            method=method.lower(),
-            url=url,
-            data=body,
-            headers=headers,
-            allow_redirects=ALLOW_REDIRECTS,
-            stream=stream,
-            verify=self.verification
-        )
+        self._acquire_session()
+        try:
+            self.response = self.session.request(
+                method=method.lower(),
+                url=url,
+                data=body,
+                headers=headers,
+                allow_redirects=ALLOW_REDIRECTS,
+                stream=stream,
+                verify=self.verification
+            )
+        finally:
+            self._release_session()
 
     def prepared_request(self, method, url, body=None,
                          headers=None, raw=False, stream=False):
@@ -232,10 +396,15 @@ class LibcloudConnection(LibcloudBaseConnection):
 
         prepped.body = body
 
-        self.response = self.session.send(
-            prepped,
-            stream=raw,
-            verify=self.ca_cert if self.ca_cert is not None else self.verify)
+        self._acquire_session()
+        try:
+            self.response = self.session.send(
+                prepped,
+                stream=raw,
+                verify=self.ca_cert if self.ca_cert is not None else
+                self.verify)
+        finally:
+            self._release_session()
 
     def getresponse(self):
         return self.response
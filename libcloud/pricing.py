@@ -37,6 +37,7 @@ from libcloud.utils.connection import get_response_object
 __all__ = [
     'get_pricing',
     'get_size_price',
+    'get_size_prices',
     'set_pricing',
     'clear_pricing_data',
     'download_pricing_file'
@@ -57,6 +58,15 @@ PRICING_DATA = {
 
 VALID_PRICING_DRIVER_TYPES = ['compute', 'storage']
 
+# Parsed pricing files keyed by path. Values are (signature, data) tuples
+# where signature is the (mtime, size) of the file when it was parsed
+_PRICING_FILE_CACHE = {}
+
+# Where the entries in PRICING_DATA which were loaded from a file come from,
+# keyed by (driver_type, driver_name). Values are (path, signature, pricing)
+# tuples
+_PRICING_DATA_SOURCES = {}
+
 
 def get_pricing_file_path(file_path=None):
     if os.path.exists(CUSTOM_PRICING_FILE_PATH) and \
@@ -71,6 +81,9 @@ def get_pricing(driver_type, driver_name, pricing_file_path=None):
     """
     Return pricing for the provided driver.
 
+    Only the pricing of the requested driver is cached. The pricing file is
+    parsed once and loaded again when it has been modified.
+
     :type driver_type: ``str``
     :param driver_type: Driver type ('compute' or 'storage')
 
@@ -88,27 +101,69 @@ def get_pricing(driver_type, driver_name, pricing_file_path=None):
     if driver_type not in VALID_PRICING_DRIVER_TYPES:
         raise AttributeError('Invalid driver type: %s', driver_type)
 
-    if driver_name in PRICING_DATA[driver_type]:
-        return PRICING_DATA[driver_type][driver_name]
+    key = (driver_type, driver_name)
+    pricing = PRICING_DATA[driver_type].get(driver_name, None)
+    source = _PRICING_DATA_SOURCES.get(key, None)
+
+    # Entries which were populated with set_pricing are always used, entries
+    # which were loaded from a file only as long as the file doesn't change
+    if pricing is not None and (source is None or source[2] is not pricing):
+        return pricing
 
     if not pricing_file_path:
         pricing_file_path = get_pricing_file_path(file_path=pricing_file_path)
 
-    with open(pricing_file_path) as fp:
-        content = fp.read()
+    if pricing is not None and source[:2] == (
+            pricing_file_path, _get_file_signature(pricing_file_path)):
+        return pricing
 
-    pricing_data = json.loads(content)
+    signature, pricing_data = _load_pricing_file(pricing_file_path)
     size_pricing = pricing_data[driver_type][driver_name]
 
-    for driver_type in VALID_PRICING_DRIVER_TYPES:
-        # pylint: disable=maybe-no-member
-        pricing = pricing_data.get(driver_type, None)
-        if pricing:
-            PRICING_DATA[driver_type] = pricing
+    PRICING_DATA[driver_type][driver_name] = size_pricing
+    _PRICING_DATA_SOURCES[key] = (pricing_file_path, signature, size_pricing)
 
     return size_pricing
 
 
+def _get_file_signature(file_path):
+    """
+    Return a value which changes when the provided file is modified.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    return (stat.st_mtime, stat.st_size)
+
+
+def _load_pricing_file(file_path):
+    """
+    Return the parsed content of the provided pricing file.
+
+    The file is only parsed again if it has been modified since it was last
+    parsed.
+
+    :rtype: ``tuple`` of (signature, ``dict``)
+    """
+    with open(file_path) as fp:
+        stat = os.fstat(fp.fileno())
+        signature = (stat.st_mtime, stat.st_size)
+
+        cached = _PRICING_FILE_CACHE.get(file_path, None)
+
+        if cached is not None and cached[0] == signature:
+            return cached
+
+        content = fp.read()
+
+    pricing_data = json.loads(content)
+    _PRICING_FILE_CACHE[file_path] = (signature, pricing_data)
+
+    return signature, pricing_data
+
+
 def set_pricing(driver_type, driver_name, pricing):
     """
     Populate the driver pricing dictionary.
@@ -124,6 +179,7 @@ def set_pricing(driver_type, driver_name, pricing):
     """
 
     PRICING_DATA[driver_type][driver_name] = pricing
+    _PRICING_DATA_SOURCES.pop((driver_type, driver_name), None)
 
 
 def get_size_price(driver_type, driver_name, size_id):
@@ -154,12 +210,44 @@ def get_size_price(driver_type, driver_name, size_id):
     return price
 
 
+def get_size_prices(driver_type, driver_name, size_ids):
+    """
+    Return prices for many sizes of the same driver at once.
+
+    The pricing of the driver is only looked up once instead of once per
+    size.
+
+    :type driver_type: ``str``
+    :param driver_type: Driver type ('compute' or 'storage')
+
+    :type driver_name: ``str``
+    :param driver_name: Driver name
+
+    :type size_ids: ``list`` of ``str`` or ``int``
+    :param size_ids: Unique size IDs.
+
+    :rtype: ``list`` of ``float``
+    :return: Prices in the same order as ``size_ids``. The price is None for
+             sizes without pricing.
+    """
+    pricing = get_pricing(driver_type=driver_type, driver_name=driver_name)
+    prices = []
+
+    for size_id in size_ids:
+        price = pricing.get(size_id, None)
+        prices.append(float(price) if price is not None else None)
+
+    return prices
+
+
 def invalidate_pricing_cache():
     """
     Invalidate pricing cache for all the drivers.
     """
     PRICING_DATA['compute'] = {}
     PRICING_DATA['storage'] = {}
+    _PRICING_DATA_SOURCES.clear()
+    _PRICING_FILE_CACHE.clear()
 
 
 def clear_pricing_data():
@@ -185,6 +273,8 @@ def invalidate_module_pricing_cache(driver_type, driver_name):
     if driver_name in PRICING_DATA[driver_type]:
         del PRICING_DATA[driver_type][driver_name]
 
+    _PRICING_DATA_SOURCES.pop((driver_type, driver_name), None)
+
 
 def download_pricing_file(file_url=DEFAULT_FILE_URL,
                           file_path=CUSTOM_PRICING_FILE_PATH):
@@ -0,0 +1,48 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Asynchronous version of the storage API (requires Python 3.5 or newer).
+"""
+
+from libcloud.common.aio import AsyncDriver, async_method, async_iterator
+
+__all__ = [
+    'AsyncStorageDriver'
+]
+
+
+class AsyncStorageDriver(AsyncDriver):
+    """
+    Asynchronous wrapper around a
+    :class:`libcloud.storage.base.StorageDriver`.
+
+    The methods take the same arguments as the wrapped driver methods and
+    return futures, except the ``iterate_*`` methods which return
+    asynchronous iterators which can be used with ``async for``.
+    """
+
+    iterate_containers = async_iterator('iterate_containers')
+    list_containers = async_method('list_containers')
+    iterate_container_objects = async_iterator('iterate_container_objects')
+    list_container_objects = async_method('list_container_objects')
+    get_container = async_method('get_container')
+    create_container = async_method('create_container')
+    delete_container = async_method('delete_container')
+    get_object = async_method('get_object')
+    upload_object = async_method('upload_object')
+    upload_object_via_stream = async_method('upload_object_via_stream')
+    download_object = async_method('download_object')
+    delete_object = async_method('delete_object')
@@ -21,11 +21,18 @@ Provides base classes for working with storage
 from __future__ import with_statement
 
 import os.path                          # pylint: disable-msg=W0404
+import copy
+import sys
+import socket
 import hashlib
+import threading
 from os.path import join as pjoin
 
+import requests
+
 from libcloud.utils.py3 import httplib
 from libcloud.utils.py3 import b
+from libcloud.utils.py3 import queue
 
 import libcloud.utils.files
 from libcloud.common.types import LibcloudError
@@ -43,6 +50,14 @@ __all__ = [
 
 CHUNK_SIZE = 8096
 
+# Default size (in bytes) of each byte range requested when an object is
+# downloaded using parallel range requests.
+RANGE_SIZE = 8 * 1024 * 1024
+
+# Suffix of the file which stores the ETag of an object next to a partial
+# resumable download of the object.
+RESUME_ETAG_SUFFIX = '.etag'
+
 # Default Content-Type which is sent when uploading an object if one is not
 # supplied and can't be detected when using non-strict mode.
 DEFAULT_CONTENT_TYPE = 'application/octet-stream'
@@ -175,6 +190,90 @@ class Container(object):
                 % (self.name, self.driver.name))
 
 
+class HashingReader(object):
+    """
+    File like object which wraps another file like object and calculates the
+    hash and length of the data as it's being read.
+    """
+
+    def __init__(self, stream, hasher, blocksize=65536):
+        """
+        :param stream: File like object with a read method.
+        :type stream: :class:`object`
+
+        :param hasher: Hash object which is updated with the data.
+        :type hasher: :class:`hashlib.HASH`
+
+        :param blocksize: Size of the blocks yielded when iterating.
+        :type blocksize: ``int``
+        """
+        self.stream = stream
+        self.hasher = hasher
+        self.blocksize = blocksize
+        self.bytes_read = 0
+
+    @property
+    def len(self):
+        # Used by requests to determine the Content-Length of the body
+        return requests.utils.super_len(self.stream)
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.hasher.update(b(data))
+        self.bytes_read += len(data)
+        return data
+
+    def __iter__(self):
+        data = self.read(self.blocksize)
+        while len(data) > 0:
+            yield data
+            data = self.read(self.blocksize)
+
+    def exhaust(self):
+        for _ in self:
+            pass
+
+    def hexdigest(self):
+        return self.hasher.hexdigest()
+
+
+class HashingIterator(object):
+    """
+    Iterator which wraps another iterator and calculates the hash and length
+    of the data as it's being consumed.
+    """
+
+    def __init__(self, iterator, hasher):
+        """
+        :param iterator: An object which implements the iterator interface.
+        :type iterator: :class:`object`
+
+        :param hasher: Hash object which is updated with the data.
+        :type hasher: :class:`hashlib.HASH`
+        """
+        self.iterator = iterator
+        self.hasher = hasher
+        self.bytes_read = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        data = b(next(self.iterator))
+        self.hasher.update(data)
+        self.bytes_read += len(data)
+        return data
+
+    next = __next__
+
+    def exhaust(self):
+        for _ in self:
+            pass
+
+    def hexdigest(self):
+        return self.hasher.hexdigest()
+
+
 class StorageDriver(BaseDriver):
     """
     A base StorageDriver to derive from.
@@ -189,6 +288,10 @@ class StorageDriver(BaseDriver):
     # provided and none can be detected when uploading an object
     strict_mode = False
 
+    # Number of times a resumable download which ended early is continued
+    # with a range request in a single call
+    resume_attempts = 3
+
     def iterate_containers(self):
         """
         Return a generator of containers for the given account
@@ -538,6 +641,371 @@ class StorageDriver(BaseDriver):
 
         chunk_size = chunk_size or CHUNK_SIZE
 
+        file_path = self._get_destination_file_path(
+            obj=obj, destination_path=destination_path,
+            overwrite_existing=overwrite_existing)
+
+        bytes_transferred = 0
+
+        with open(file_path, 'wb') as file_handle:
+            for chunk in response._response.iter_content(chunk_size):
+                file_handle.write(b(chunk))
+                bytes_transferred += len(chunk)
+
+        if int(obj.size) != int(bytes_transferred):
+            # Transfer failed
+            if delete_on_failure:
+                try:
+                    os.unlink(file_path)
+                except Exception:
+                    pass
+
+            return False
+
+        return True
+
+    def _save_object_resumable(self, obj, destination_path, request_range,
+                               overwrite_existing=False, chunk_size=None):
+        """
+        Save object to the provided path using range requests, continuing a
+        previous partial download of the object if there is one.
+
+        The ETag of the object is stored next to the destination file in a
+        file with the ``RESUME_ETAG_SUFFIX`` suffix while the download is in
+        progress. If the download fails, both files are kept and the next
+        call continues the download from the end of the partial file, as
+        long as the ETag matches the object hash. If the ETag returned by the
+        server doesn't match the stored one, the object has changed and the
+        partial file is deleted.
+
+        Within a single call, a transfer which ends early or is interrupted
+        by a connection error is continued up to ``resume_attempts`` times.
+
+        :param obj: Object instance.
+        :type obj: :class:`Object`
+
+        :param destination_path: Destination directory.
+        :type destination_path: ``str``
+
+        :param request_range: Function which is called with ``connection``,
+                              ``obj``, ``start`` and ``end`` (inclusive)
+                              keyword arguments and returns a RawResponse
+                              for that byte range of the object.
+        :type request_range: :class:`function`
+
+        :param overwrite_existing: True to overwrite a local path if it already
+                                   exists. A partial download of the object
+                                   is always continued.
+        :type overwrite_existing: ``bool``
+
+        :param chunk_size: Optional chunk size
+            (defaults to ``libcloud.storage.base.CHUNK_SIZE``, 8kb)
+        :type chunk_size: ``int``
+
+        :return: ``True`` on success, ``False`` otherwise.
+        :rtype: ``bool``
+        """
+        chunk_size = chunk_size or CHUNK_SIZE
+        size = int(obj.size)
+
+        file_path = self._get_destination_file_path(
+            obj=obj, destination_path=destination_path,
+            overwrite_existing=True)
+        etag_path = file_path + RESUME_ETAG_SUFFIX
+
+        etag = None
+        bytes_transferred = 0
+        changed = False
+
+        if os.path.exists(file_path) and os.path.exists(etag_path):
+            with open(etag_path, 'r') as etag_file:
+                etag = etag_file.read().strip()
+
+            object_etag = self._get_etag({'etag': obj.hash or ''})
+
+            if etag and (not object_etag or etag == object_etag):
+                bytes_transferred = os.path.getsize(file_path)
+
+            if bytes_transferred > size:
+                bytes_transferred = 0
+        else:
+            # Raises if the file exists and overwrite_existing is False
+            self._get_destination_file_path(
+                obj=obj, destination_path=destination_path,
+                overwrite_existing=overwrite_existing)
+
+        if not bytes_transferred:
+            etag = None
+
+        attempts = self.resume_attempts + 1
+
+        with open(file_path, 'r+b' if bytes_transferred else 'wb') \
+                as file_handle:
+            file_handle.seek(bytes_transferred)
+            file_handle.truncate()
+
+            while bytes_transferred < size and attempts:
+                attempts -= 1
+                response = request_range(connection=self.connection,
+                                         obj=obj, start=bytes_transferred,
+                                         end=size - 1)
+
+                if response.status == httplib.NOT_FOUND:
+                    raise ObjectDoesNotExistError(object_name=obj.name,
+                                                  value='', driver=self)
+
+                if response.status != httplib.PARTIAL_CONTENT:
+                    break
+
+                response = response.response
+                range_etag = self._get_etag(response._response.headers)
+
+                if etag and range_etag and etag != range_etag:
+                    # Object has changed since the partial file was written
+                    response._response.close()
+                    changed = True
+                    break
+
+                if etag is None and range_etag:
+                    etag = range_etag
+
+                    with open(etag_path, 'w') as etag_file:
+                        etag_file.write(etag)
+
+                try:
+                    for chunk in response._response.iter_content(chunk_size):
+                        file_handle.write(b(chunk))
+                        bytes_transferred += len(chunk)
+                except (requests.exceptions.RequestException, socket.error):
+                    pass
+                finally:
+                    file_handle.flush()
+
+        if changed:
+            for path in (file_path, etag_path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+            return False
+
+        if size != int(bytes_transferred):
+            # Transfer failed, keep the partial file for the next attempt
+            return False
+
+        try:
+            os.unlink(etag_path)
+        except OSError:
+            pass
+
+        return True
+
+    def _save_object_in_ranges(self, obj, destination_path, request_range,
+                               overwrite_existing=False,
+                               delete_on_failure=True, range_size=None,
+                               concurrency=2, chunk_size=None):
+        """
+        Save object to the provided path by fetching byte ranges of the
+        object in parallel.
+
+        The destination file is preallocated to the object size and each
+        range is written at its offset as soon as it arrives. Ranges are
+        fetched by a pool of worker threads, each of which uses its own
+        connection.
+
+        The range requests are expected to be conditional on the object hash
+        (see :meth:`_get_range_headers`) so ranges of two different versions
+        of an object are never combined. The download fails if the object
+        changes while it is being downloaded.
+
+        :param obj: Object instance.
+        :type obj: :class:`Object`
+
+        :param destination_path: Destination directory.
+        :type destination_path: ``str``
+
+        :param request_range: Function which is called with ``connection``,
+                              ``obj``, ``start`` and ``end`` (inclusive)
+                              keyword arguments and returns a RawResponse
+                              for that byte range of the object.
+        :type request_range: :class:`function`
+
+        :param overwrite_existing: True to overwrite a local path if it already
+                                   exists.
+        :type overwrite_existing: ``bool``
+
+        :param delete_on_failure: True to delete partially downloaded object if
+                                  the download fails.
+        :type delete_on_failure: ``bool``
+
+        :param range_size: Size of each requested range in bytes
+            (defaults to ``libcloud.storage.base.RANGE_SIZE``, 8 MB)
+        :type range_size: ``int``
+
+        :param concurrency: Number of ranges which are fetched in parallel.
+        :type concurrency: ``int``
+
+        :param chunk_size: Optional chunk size
+            (defaults to ``libcloud.storage.base.CHUNK_SIZE``, 8kb)
+        :type chunk_size: ``int``
+
+        :return: ``True`` on success, ``False`` otherwise.
+        :rtype: ``bool``
+        """
+        range_size = range_size or RANGE_SIZE
+        chunk_size = chunk_size or CHUNK_SIZE
+        size = int(obj.size)
+
+        file_path = self._get_destination_file_path(
+            obj=obj, destination_path=destination_path,
+            overwrite_existing=overwrite_existing)
+
+        with open(file_path, 'wb') as file_handle:
+            file_handle.truncate(size)
+
+        pending = queue.Queue()
+        for start in range(0, size, range_size):
+            pending.put((start, min(start + range_size, size) - 1))
+
+        failures = []
+
+        def worker():
+            connection = None
+
+            try:
+                with open(file_path, 'r+b') as file_handle:
+                    while not failures:
+                        try:
+                            start, end = pending.get_nowait()
+                        except queue.Empty:
+                            return
+
+                        try:
+                            if connection is None:
+                                connection = self._get_worker_connection()
+
+                            response = request_range(connection=connection,
+                                                     obj=obj, start=start,
+                                                     end=end)
+
+                            if response.status == \
+                                    httplib.PRECONDITION_FAILED:
+                                # Object has changed since the transfer has
+                                # started
+                                failures.append(None)
+                                continue
+
+                            if response.status != httplib.PARTIAL_CONTENT:
+                                raise LibcloudError(
+                                    value='Unexpected status code: %s' %
+                                          (response.status), driver=self)
+
+                            file_handle.seek(start)
+                            bytes_transferred = 0
+
+                            iterator = \
+                                response.response._response.iter_content(
+                                    chunk_size)
+                            for chunk in iterator:
+                                file_handle.write(b(chunk))
+                                bytes_transferred += len(chunk)
+
+                            if bytes_transferred != end - start + 1:
+                                # Transfer failed
+                                failures.append(None)
+                        except Exception:
+                            failures.append(sys.exc_info()[1])
+            finally:
+                if connection is not None:
+                    self._close_worker_connection(connection)
+
+        workers = []
+        for _ in range(min(concurrency, pending.qsize())):
+            thread = threading.Thread(target=worker)
+            thread.daemon = True
+            thread.start()
+            workers.append(thread)
+
+        for thread in workers:
+            thread.join()
+
+        if failures:
+            if delete_on_failure:
+                try:
+                    os.unlink(file_path)
+                except Exception:
+                    pass
+
+            if failures[0] is not None:
+                raise failures[0]
+
+            return False
+
+        return True
+
+    def _get_range_headers(self, obj, start, end):
+        """
+        Return the headers of a request for a byte range of an object.
+
+        If the object hash is known, the request is made conditional on it
+        with an ``If-Match`` header, so the server responds with
+        ``412 Precondition Failed`` instead of returning data of a newer
+        version of the object.
+
+        :param obj: Object instance.
+        :type obj: :class:`Object`
+
+        :param start: Offset of the first byte.
+        :type start: ``int``
+
+        :param end: Offset of the last byte (inclusive).
+        :type end: ``int``
+
+        :rtype: ``dict``
+        """
+        headers = {'Range': 'bytes=%d-%d' % (start, end)}
+
+        if obj.hash:
+            headers['If-Match'] = '"%s"' % (obj.hash.strip().replace('"', ''))
+
+        return headers
+
+    def _get_etag(self, headers):
+        """
+        Return the value of the ETag header without quotes or ``None`` if the
+        header is not present.
+
+        :param headers: Response headers.
+        :type headers: ``dict``
+
+        :rtype: ``str``
+        """
+        etag = headers.get('etag', None)
+
+        if etag is None:
+            return None
+
+        return etag.strip().replace('"', '')
+
+    def _get_destination_file_path(self, obj, destination_path,
+                                   overwrite_existing=False):
+        """
+        Return the path of the local file an object is saved to.
+
+        :param obj: Object instance.
+        :type obj: :class:`Object`
+
+        :param destination_path: Full path to a file or a directory where the
+                                 incoming file will be saved.
+        :type destination_path: ``str``
+
+        :param overwrite_existing: True to overwrite a local path if it already
+                                   exists.
+        :type overwrite_existing: ``bool``
+
+        :rtype: ``str``
+        """
         base_name = os.path.basename(destination_path)
 
         if not base_name and not os.path.exists(destination_path):
@@ -556,24 +1024,41 @@ class StorageDriver(BaseDriver):
                 'overwrite_existing=False',
                 driver=self)
 
-        bytes_transferred = 0
+        return file_path
 
-        with open(file_path, 'wb') as file_handle:
-            for chunk in response._response.iter_content(chunk_size):
-                file_handle.write(b(chunk))
-                bytes_transferred += len(chunk)
+    def _get_worker_connection(self):
+        """
+        Return a new connection which shares the credentials and settings of
+        the driver connection, but not its underlying HTTP connection.
 
-        if int(obj.size) != int(bytes_transferred):
-            # Transfer failed, support retry?
-            if delete_on_failure:
-                try:
-                    os.unlink(file_path)
-                except Exception:
-                    pass
+        Each worker thread which transfers data in parallel gets its own HTTP
+        connection pool so large transfers don't contend for the sockets of
+        the driver connection.
 
-            return False
+        :rtype: :class:`Connection`
+        """
+        connection = copy.copy(self.connection)
+        connection.connection = None
+        connection.connect()
+        return connection
 
-        return True
+    def _close_worker_connection(self, connection):
+        """
+        Close the HTTP connections opened by a connection which was returned
+        by :meth:`_get_worker_connection`.
+
+        Sessions which are shared with other connections are left open.
+
+        :param connection: Worker connection
+        :type connection: :class:`Connection`
+        """
+        pool_options = connection.pool_options or {}
+
+        if connection.connection is None or \
+                pool_options.get('shared_session', False):
+            return
+
+        connection.connection.session.close()
 
     def _upload_object(self, object_name, content_type, request_path,
                        request_method='PUT',
@@ -612,23 +1097,16 @@ class StorageDriver(BaseDriver):
 
         headers['Content-Type'] = content_type
         if stream:
-            response = self.connection.request(
-                request_path,
-                method=request_method, data=stream,
-                headers=headers, raw=True)
-            stream_hash, stream_length = self._hash_buffered_stream(
-                stream,
-                self._get_hash_function())
+            response, stream_hash, stream_length = self._send_hashed_stream(
+                request_path=request_path, request_method=request_method,
+                headers=headers, stream=stream)
         else:
             with open(file_path, 'rb') as file_stream:
-                response = self.connection.request(
-                    request_path,
-                    method=request_method, data=file_stream,
-                    headers=headers, raw=True)
-            with open(file_path, 'rb') as file_stream:
-                stream_hash, stream_length = self._hash_buffered_stream(
-                    file_stream,
-                    self._get_hash_function())
+                response, stream_hash, stream_length = \
+                    self._send_hashed_stream(request_path=request_path,
+                                             request_method=request_method,
+                                             headers=headers,
+                                             stream=file_stream)
 
         if not response.success():
             response.parse_error()
@@ -640,30 +1118,32 @@ class StorageDriver(BaseDriver):
                 'bytes_transferred': stream_length,
                 'data_hash': stream_hash}
 
-    def _hash_buffered_stream(self, stream, hasher, blocksize=65536):
-        total_len = 0
-
-        if hasattr(stream, '__next__') or hasattr(stream, 'next'):
-            for chunk in libcloud.utils.files.read_in_chunks(iterator=stream):
-                hasher.update(b(chunk))
-                total_len += len(chunk)
+    def _send_hashed_stream(self, request_path, request_method, headers,
+                            stream):
+        """
+        Send the data from the provided stream as the request body and
+        calculate its hash and length while it's being sent, so the data is
+        only read once.
 
-            return (hasher.hexdigest(), total_len)
+        :return: A tuple of (response, data hash, bytes transferred)
+        :rtype: ``tuple``
+        """
+        if hasattr(stream, 'read'):
+            hashing_stream = HashingReader(stream, self._get_hash_function())
+        else:
+            hashing_stream = HashingIterator(stream,
+                                             self._get_hash_function())
 
-        if not hasattr(stream, '__exit__'):
-            for s in stream:
-                hasher.update(s)
-                total_len = total_len + len(s)
-            return (hasher.hexdigest(), total_len)
+        response = self.connection.request(request_path,
+                                           method=request_method,
+                                           data=hashing_stream,
+                                           headers=headers, raw=True)
 
-        with stream:
-            buf = stream.read(blocksize)
-            while len(buf) > 0:
-                total_len = total_len + len(buf)
-                hasher.update(buf)
-                buf = stream.read(blocksize)
+        # Account for any data which was not consumed by the request
+        hashing_stream.exhaust()
 
-        return (hasher.hexdigest(), total_len)
+        return (response, hashing_stream.hexdigest(),
+                hashing_stream.bytes_read)
 
     def _get_hash_function(self):
         """
@@ -557,10 +557,41 @@ class AzureBlobsStorageDriver(StorageDriver):
         return False
 
     def download_object(self, obj, destination_path, overwrite_existing=False,
-                        delete_on_failure=True):
+                        delete_on_failure=True, ex_range_concurrency=None,
+                        ex_range_size=None, ex_resumable=False):
         """
         @inherits: :class:`StorageDriver.download_object`
-        """
+
+        :param ex_range_concurrency: If specified, the object is downloaded
+                                     in byte ranges with this many ranges
+                                     being fetched in parallel.
+        :type ex_range_concurrency: ``int``
+
+        :param ex_range_size: Size of each byte range when
+                              ex_range_concurrency is specified (defaults
+                              to 8 MB).
+        :type ex_range_size: ``int``
+
+        :param ex_resumable: True to download the object with range
+                             requests, keep the partial file if the
+                             download fails and continue from it on the
+                             next call (delete_on_failure is ignored).
+        :type ex_resumable: ``bool``
+        """
+        if ex_range_concurrency and ex_range_concurrency > 1:
+            return self._save_object_in_ranges(
+                obj=obj, destination_path=destination_path,
+                request_range=self._get_object_range,
+                overwrite_existing=overwrite_existing,
+                delete_on_failure=delete_on_failure,
+                range_size=ex_range_size, concurrency=ex_range_concurrency)
+
+        if ex_resumable:
+            return self._save_object_resumable(
+                obj=obj, destination_path=destination_path,
+                request_range=self._get_object_range,
+                overwrite_existing=overwrite_existing)
+
         obj_path = self._get_object_path(obj.container, obj.name)
         response = self.connection.request(obj_path, raw=True, data=None)
 
@@ -574,6 +605,18 @@ class AzureBlobsStorageDriver(StorageDriver):
                                     'delete_on_failure': delete_on_failure},
                                 success_status_code=httplib.OK)
 
+    def _get_object_range(self, connection, obj, start, end):
+        """
+        Request a byte range of an object.
+
+        :return: RawResponse instance.
+        :rtype: :class:`RawResponse`
+        """
+        obj_path = self._get_object_path(obj.container, obj.name)
+        headers = self._get_range_headers(obj=obj, start=start, end=end)
+        return connection.request(obj_path, headers=headers, raw=True,
+                                  data=None)
+
     def download_object_as_stream(self, obj, chunk_size=None):
         """
         @inherits: :class:`StorageDriver.download_object_as_stream`
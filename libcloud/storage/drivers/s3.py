@@ -15,7 +15,9 @@
 
 import base64
 import hmac
+import sys
 import time
+import threading
 
 from hashlib import sha1
 
@@ -32,6 +34,7 @@ from libcloud.utils.py3 import httplib
 from libcloud.utils.py3 import urlquote
 from libcloud.utils.py3 import b
 from libcloud.utils.py3 import tostring
+from libcloud.utils.py3 import queue
 
 from libcloud.utils.xml import fixxpath, findtext
 from libcloud.utils.files import read_in_chunks
@@ -270,7 +273,8 @@ class BaseS3StorageDriver(StorageDriver):
         return list(self.iterate_container_objects(container,
                                                    ex_prefix=ex_prefix))
 
-    def iterate_container_objects(self, container, ex_prefix=None):
+    def iterate_container_objects(self, container, ex_prefix=None,
+                                  ex_stream=False):
         """
         Return a generator of objects for the given container.
 
@@ -280,6 +284,11 @@ class BaseS3StorageDriver(StorageDriver):
         :param ex_prefix: Only return objects starting with ex_prefix
         :type ex_prefix: ``str``
 
+        :param ex_stream: True to parse each listing page incrementally
+                          while it's being read from the network and yield
+                          the objects one at a time.
+        :type ex_stream: ``bool``
+
         :return: A generator of Object instances.
         :rtype: ``generator`` of :class:`Object`
         """
@@ -295,24 +304,31 @@ class BaseS3StorageDriver(StorageDriver):
             if last_key:
                 params['marker'] = last_key
 
-            response = self.connection.request(container_path,
-                                               params=params)
+            if ex_stream:
+                response = self.connection.request_xml_items(
+                    container_path, item_xpath='Contents',
+                    namespace=self.namespace, params=params)
+                objects = (self._to_obj(element, container) for element in
+                           response.iter_items())
+            else:
+                response = self.connection.request(container_path,
+                                                   params=params)
+                objects = self._to_objs(obj=response.object,
+                                        xpath='Contents', container=container)
 
             if response.status != httplib.OK:
                 raise LibcloudError('Unexpected status code: %s' %
                                     (response.status), driver=self)
 
-            objects = self._to_objs(obj=response.object,
-                                    xpath='Contents', container=container)
-            is_truncated = response.object.findtext(fixxpath(
-                xpath='IsTruncated', namespace=self.namespace)).lower()
-            exhausted = (is_truncated == 'false')
-
             last_key = None
             for obj in objects:
                 last_key = obj.name
                 yield obj
 
+            is_truncated = response.object.findtext(fixxpath(
+                xpath='IsTruncated', namespace=self.namespace)).lower()
+            exhausted = (is_truncated == 'false')
+
     def get_container(self, container_name):
         try:
             response = self.connection.request('/%s' % container_name,
@@ -419,7 +435,41 @@ class BaseS3StorageDriver(StorageDriver):
         return False
 
     def download_object(self, obj, destination_path, overwrite_existing=False,
-                        delete_on_failure=True):
+                        delete_on_failure=True, ex_range_concurrency=None,
+                        ex_range_size=None, ex_resumable=False):
+        """
+        @inherits: :class:`StorageDriver.download_object`
+
+        :param ex_range_concurrency: If specified, the object is downloaded
+                                     in byte ranges with this many ranges
+                                     being fetched in parallel.
+        :type ex_range_concurrency: ``int``
+
+        :param ex_range_size: Size of each byte range when
+                              ex_range_concurrency is specified (defaults
+                              to 8 MB).
+        :type ex_range_size: ``int``
+
+        :param ex_resumable: True to download the object with range
+                             requests, keep the partial file if the
+                             download fails and continue from it on the
+                             next call (delete_on_failure is ignored).
+        :type ex_resumable: ``bool``
+        """
+        if ex_range_concurrency and ex_range_concurrency > 1:
+            return self._save_object_in_ranges(
+                obj=obj, destination_path=destination_path,
+                request_range=self._get_object_range,
+                overwrite_existing=overwrite_existing,
+                delete_on_failure=delete_on_failure,
+                range_size=ex_range_size, concurrency=ex_range_concurrency)
+
+        if ex_resumable:
+            return self._save_object_resumable(
+                obj=obj, destination_path=destination_path,
+                request_range=self._get_object_range,
+                overwrite_existing=overwrite_existing)
+
         obj_path = self._get_object_path(obj.container, obj.name)
 
         response = self.connection.request(obj_path, method='GET', raw=True)
@@ -434,6 +484,18 @@ class BaseS3StorageDriver(StorageDriver):
                                     'delete_on_failure': delete_on_failure},
                                 success_status_code=httplib.OK)
 
+    def _get_object_range(self, connection, obj, start, end):
+        """
+        Request a byte range of an object.
+
+        :return: RawResponse instance.
+        :rtype: :class:`RawResponse`
+        """
+        obj_path = self._get_object_path(obj.container, obj.name)
+        headers = self._get_range_headers(obj=obj, start=start, end=end)
+        return connection.request(obj_path, method='GET', headers=headers,
+                                  raw=True)
+
     def download_object_as_stream(self, obj, chunk_size=None):
         obj_path = self._get_object_path(obj.container, obj.name)
         response = self.connection.request(obj_path, method='GET',
@@ -447,13 +509,39 @@ class BaseS3StorageDriver(StorageDriver):
             success_status_code=httplib.OK)
 
     def upload_object(self, file_path, container, object_name, extra=None,
-                      verify_hash=True, ex_storage_class=None):
+                      verify_hash=True, ex_storage_class=None,
+                      ex_multipart_concurrency=None,
+                      ex_multipart_chunk_size=None):
         """
         @inherits: :class:`StorageDriver.upload_object`
 
         :param ex_storage_class: Storage class
         :type ex_storage_class: ``str``
+
+        :param ex_multipart_concurrency: If specified, the file is uploaded
+                                         using the S3 multipart algorithm
+                                         with this many parts being uploaded
+                                         in parallel. With verify_hash the
+                                         MD5 hash of each part is verified.
+        :type ex_multipart_concurrency: ``int``
+
+        :param ex_multipart_chunk_size: Size of each uploaded part in bytes
+                                        when ex_multipart_concurrency is
+                                        specified (defaults to 5 MB).
+        :type ex_multipart_chunk_size: ``int``
         """
+        if ex_multipart_concurrency and self.supports_s3_multipart_upload:
+            chunk_size = ex_multipart_chunk_size or CHUNK_SIZE
+
+            with open(file_path, 'rb') as file_stream:
+                stream = iter(lambda: file_stream.read(chunk_size), b(''))
+                return self._put_object_multipart(
+                    container=container, object_name=object_name,
+                    extra=extra, stream=stream, verify_hash=verify_hash,
+                    storage_class=ex_storage_class,
+                    chunk_size=chunk_size,
+                    concurrency=ex_multipart_concurrency)
+
         return self._put_object(container=container, object_name=object_name,
                                 extra=extra, file_path=file_path,
                                 verify_hash=verify_hash,
@@ -491,7 +579,8 @@ class BaseS3StorageDriver(StorageDriver):
                         namespace=self.namespace)
 
     def _upload_multipart_chunks(self, container, object_name, upload_id,
-                                 stream, calculate_hash=True):
+                                 stream, calculate_hash=True,
+                                 chunk_size=None, concurrency=None):
         """
         Uploads data from an iterator in fixed sized chunks to S3
 
@@ -508,11 +597,34 @@ class BaseS3StorageDriver(StorageDriver):
         :type stream: ``generator``
 
         :keyword calculate_hash: Indicates if we must calculate the data hash
+                                 and verify the hash of each uploaded part
         :type calculate_hash: ``bool``
 
+        :keyword chunk_size: Size of each uploaded part in bytes (defaults to
+                             ``CHUNK_SIZE``, 5 MB)
+        :type chunk_size: ``int``
+
+        :keyword concurrency: Number of parts which are uploaded in parallel.
+                              Parts are uploaded one after another over the
+                              driver connection if not specified.
+        :type concurrency: ``int``
+
         :return: A tuple of (chunk info, checksum, bytes transferred)
         :rtype: ``tuple``
         """
+        chunk_size = chunk_size or CHUNK_SIZE
+
+        if chunk_size < CHUNK_SIZE:
+            raise ValueError('Multipart chunk size must be at least %s bytes' %
+                             (CHUNK_SIZE))
+
+        if concurrency is not None and concurrency > 1:
+            return self._upload_multipart_chunks_concurrently(
+                container=container, object_name=object_name,
+                upload_id=upload_id, stream=stream,
+                calculate_hash=calculate_hash, chunk_size=chunk_size,
+                concurrency=concurrency)
+
         data_hash = None
         if calculate_hash:
             data_hash = self._get_hash_function()
@@ -520,49 +632,191 @@ class BaseS3StorageDriver(StorageDriver):
         bytes_transferred = 0
         count = 1
         chunks = []
-        params = {'uploadId': upload_id}
 
         request_path = self._get_object_path(container, object_name)
 
         # Read the input data in chunk sizes suitable for AWS
-        for data in read_in_chunks(stream, chunk_size=CHUNK_SIZE,
+        for data in read_in_chunks(stream, chunk_size=chunk_size,
                                    fill_size=True, yield_empty=True):
             bytes_transferred += len(data)
 
             if calculate_hash:
                 data_hash.update(data)
 
-            chunk_hash = self._get_hash_function()
-            chunk_hash.update(data)
-            chunk_hash = base64.b64encode(chunk_hash.digest()).decode('utf-8')
+            server_hash = self._upload_multipart_chunk(
+                connection=self.connection, request_path=request_path,
+                upload_id=upload_id, part_number=count, data=data,
+                verify_hash=calculate_hash)
 
-            # The Content-MD5 header provides an extra level of data check and
-            # is recommended by amazon
-            headers = {
-                'Content-Length': len(data),
-                'Content-MD5': chunk_hash,
-            }
+            # Keep this data for a later commit
+            chunks.append((count, server_hash))
+            count += 1
 
-            params['partNumber'] = count
+        if calculate_hash:
+            data_hash = data_hash.hexdigest()
 
-            resp = self.connection.request(request_path, method='PUT',
-                                           data=data, headers=headers,
-                                           params=params)
+        return (chunks, data_hash, bytes_transferred)
 
-            if resp.status != httplib.OK:
-                raise LibcloudError('Error uploading chunk', driver=self)
+    def _upload_multipart_chunks_concurrently(self, container, object_name,
+                                              upload_id, stream,
+                                              calculate_hash, chunk_size,
+                                              concurrency):
+        """
+        Uploads data from an iterator in fixed sized chunks to S3 using a pool
+        of worker threads.
 
-            server_hash = resp.headers['etag'].replace('"', '')
+        Chunks are read ahead from the stream in the calling thread and handed
+        to the workers through a bounded queue, so only around
+        ``2 * concurrency`` chunks are held in memory at any time. Each worker
+        uses its own connection.
 
-            # Keep this data for a later commit
-            chunks.append((count, server_hash))
-            count += 1
+        If uploading any of the chunks fails, reading of the stream stops and
+        the first error is re-raised once all the workers have finished.
+
+        See :meth:`_upload_multipart_chunks` for the parameters.
+
+        :return: A tuple of (chunk info, checksum, bytes transferred)
+        :rtype: ``tuple``
+        """
+        data_hash = None
+        if calculate_hash:
+            data_hash = self._get_hash_function()
+
+        bytes_transferred = 0
+        count = 1
+        server_hashes = {}
+        errors = []
+
+        request_path = self._get_object_path(container, object_name)
+        pending = queue.Queue(maxsize=concurrency)
+
+        def worker():
+            connection = None
+
+            try:
+                while True:
+                    item = pending.get()
+
+                    if item is None:
+                        return
+
+                    # Keep draining the queue after a failure so the reader
+                    # never blocks, but don't upload anything else
+                    if errors:
+                        continue
+
+                    part_number, data = item
+
+                    try:
+                        if connection is None:
+                            connection = self._get_worker_connection()
+
+                        server_hashes[part_number] = \
+                            self._upload_multipart_chunk(
+                                connection=connection,
+                                request_path=request_path,
+                                upload_id=upload_id, part_number=part_number,
+                                data=data, verify_hash=calculate_hash)
+                    except Exception:
+                        errors.append(sys.exc_info()[1])
+            finally:
+                if connection is not None:
+                    self._close_worker_connection(connection)
+
+        workers = []
+        for _ in range(concurrency):
+            thread = threading.Thread(target=worker)
+            thread.daemon = True
+            thread.start()
+            workers.append(thread)
+
+        try:
+            # Read the input data in chunk sizes suitable for AWS
+            for data in read_in_chunks(stream, chunk_size=chunk_size,
+                                       fill_size=True, yield_empty=True):
+                if errors:
+                    break
+
+                bytes_transferred += len(data)
+
+                if calculate_hash:
+                    data_hash.update(data)
+
+                pending.put((count, data))
+                count += 1
+        finally:
+            for _ in workers:
+                pending.put(None)
+
+            for thread in workers:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        chunks = sorted(server_hashes.items())
 
         if calculate_hash:
             data_hash = data_hash.hexdigest()
 
         return (chunks, data_hash, bytes_transferred)
 
+    def _upload_multipart_chunk(self, connection, request_path, upload_id,
+                                part_number, data, verify_hash=False):
+        """
+        Uploads a single chunk (part) of a multipart upload.
+
+        :param connection: Connection which is used to send the request
+        :type connection: :class:`BaseS3Connection`
+
+        :param request_path: Path of the object which we are uploading
+        :type request_path: ``str``
+
+        :param upload_id: The upload id allocated for this multipart upload
+        :type upload_id: ``str``
+
+        :param part_number: Number of this part (starting at 1)
+        :type part_number: ``int``
+
+        :param data: Chunk data
+        :type data: ``bytes``
+
+        :keyword verify_hash: Indicates if the server side hash of the chunk
+                              must match the hash of the uploaded data
+        :type verify_hash: ``bool``
+
+        :return: The server side hash of the uploaded chunk
+        :rtype: ``str``
+        """
+        data_hash = self._get_hash_function()
+        data_hash.update(data)
+        chunk_hash = base64.b64encode(data_hash.digest()).decode('utf-8')
+
+        # The Content-MD5 header provides an extra level of data check and
+        # is recommended by amazon
+        headers = {
+            'Content-Length': len(data),
+            'Content-MD5': chunk_hash,
+        }
+
+        params = {'uploadId': upload_id, 'partNumber': part_number}
+
+        resp = connection.request(request_path, method='PUT', data=data,
+                                  headers=headers, params=params)
+
+        if resp.status != httplib.OK:
+            raise LibcloudError('Error uploading chunk', driver=self)
+
+        server_hash = resp.headers['etag'].replace('"', '')
+
+        if verify_hash and server_hash != data_hash.hexdigest():
+            raise ObjectHashMismatchError(
+                value='MD5 hash {0} of part {1} does not match {2}'.format(
+                    server_hash, part_number, data_hash.hexdigest()),
+                object_name=request_path, driver=self)
+
+        return server_hash
+
     def _commit_multipart(self, container, object_name, upload_id, chunks):
         """
         Makes a final commit of the data.
@@ -639,12 +893,23 @@ class BaseS3StorageDriver(StorageDriver):
                                 (resp.status), driver=self)
 
     def upload_object_via_stream(self, iterator, container, object_name,
-                                 extra=None, ex_storage_class=None):
+                                 extra=None, ex_storage_class=None,
+                                 ex_multipart_concurrency=None,
+                                 ex_multipart_chunk_size=None):
         """
         @inherits: :class:`StorageDriver.upload_object_via_stream`
 
         :param ex_storage_class: Storage class
         :type ex_storage_class: ``str``
+
+        :param ex_multipart_concurrency: Number of multipart upload parts
+                                         which are uploaded in parallel
+                                         (defaults to 1, sequential upload).
+        :type ex_multipart_concurrency: ``int``
+
+        :param ex_multipart_chunk_size: Size of each multipart upload part in
+                                        bytes (defaults to 5 MB).
+        :type ex_multipart_chunk_size: ``int``
         """
 
         method = 'PUT'
@@ -654,12 +919,12 @@ class BaseS3StorageDriver(StorageDriver):
         # Amazon provides a different (complex?) mechanism to do multipart
         # uploads
         if self.supports_s3_multipart_upload:
-            return self._put_object_multipart(container=container,
-                                              object_name=object_name,
-                                              extra=extra,
-                                              stream=iterator,
-                                              verify_hash=False,
-                                              storage_class=ex_storage_class)
+            return self._put_object_multipart(
+                container=container, object_name=object_name, extra=extra,
+                stream=iterator, verify_hash=False,
+                storage_class=ex_storage_class,
+                chunk_size=ex_multipart_chunk_size,
+                concurrency=ex_multipart_concurrency)
         return self._put_object(container=container, object_name=object_name,
                                 extra=extra, method=method, query_args=params,
                                 stream=iterator, verify_hash=False,
@@ -835,7 +1100,8 @@ class BaseS3StorageDriver(StorageDriver):
 
     def _put_object_multipart(self, container, object_name, stream,
                               extra=None, verify_hash=False,
-                              storage_class=None):
+                              storage_class=None, chunk_size=None,
+                              concurrency=None):
         """
         Uploads an object using the S3 multipart algorithm.
 
@@ -857,6 +1123,12 @@ class BaseS3StorageDriver(StorageDriver):
         :keyword storage_class: The name of the S3 object's storage class
         :type extra: ``str``
 
+        :keyword chunk_size: Size of each uploaded part in bytes
+        :type chunk_size: ``int``
+
+        :keyword concurrency: Number of parts which are uploaded in parallel
+        :type concurrency: ``int``
+
         :return: The uploaded object
         :rtype: :class:`Object`
         """
@@ -890,7 +1162,9 @@ class BaseS3StorageDriver(StorageDriver):
         try:
             result = self._upload_multipart_chunks(container, object_name,
                                                    upload_id, stream,
-                                                   calculate_hash=verify_hash)
+                                                   calculate_hash=verify_hash,
+                                                   chunk_size=chunk_size,
+                                                   concurrency=concurrency)
             chunks, data_hash, bytes_transferred = result
 
             # Commit the chunk info and complete the upload
@@ -0,0 +1,238 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import json
+import threading
+
+from mock import Mock, patch
+
+from libcloud.common.base import ConnectionKey, JsonResponse
+from libcloud.common.exceptions import BaseHTTPError
+from libcloud.compute.drivers.dummy import DummyNodeDriver
+from libcloud.storage.base import Container
+from libcloud.storage.drivers.s3 import S3StorageDriver
+
+from libcloud.test import unittest
+from libcloud.test.secrets import STORAGE_S3_PARAMS
+from libcloud.test.storage.test_s3 import S3MockHttp
+
+try:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from libcloud.common.aio import AsyncConnection, have_aiohttp
+    from libcloud.compute.aio import AsyncNodeDriver
+    from libcloud.storage.aio import AsyncStorageDriver
+    from libcloud.dns.aio import AsyncDNSDriver
+except ImportError:
+    have_asyncio = False
+    have_aiohttp = False
+else:
+    have_asyncio = sys.version_info >= (3, 5)
+
+
+@unittest.skipIf(not have_asyncio, 'Python 3.5 or newer is required')
+class AsyncDriverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+        # Mock HTTP connections are not thread safe so the requests which go
+        # through them are performed by a single worker thread
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        S3StorageDriver.connectionCls.conn_class = S3MockHttp
+        S3MockHttp.type = None
+        self.s3_driver = S3StorageDriver(*STORAGE_S3_PARAMS)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.loop.close()
+
+    def _collect(self, iterator):
+        items = []
+
+        while True:
+            try:
+                items.append(self.loop.run_until_complete(
+                    iterator.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+    def test_operations_run_in_the_executor(self):
+        S3MockHttp.type = 'list_containers'
+        driver = AsyncStorageDriver(self.s3_driver, loop=self.loop,
+                                    executor=self.executor)
+
+        with patch.object(self.executor, 'submit',
+                          wraps=self.executor.submit) as mock_submit:
+            containers = self.loop.run_until_complete(
+                driver.list_containers())
+
+        self.assertEqual(len(containers), 2)
+        self.assertEqual(mock_submit.call_count, 1)
+
+    def test_node_driver_concurrent_operations(self):
+        driver = AsyncNodeDriver(DummyNodeDriver(0), loop=self.loop)
+
+        futures = [driver.list_nodes(), driver.list_sizes(),
+                   driver.list_images()]
+        nodes, sizes, images = self.loop.run_until_complete(
+            asyncio.gather(*futures))
+
+        self.assertEqual(len(nodes), 2)
+        self.assertEqual(len(sizes), 4)
+        self.assertEqual(len(images), 3)
+
+    def test_storage_driver_list_and_iterate(self):
+        S3MockHttp.type = 'list_containers'
+        driver = AsyncStorageDriver(self.s3_driver, loop=self.loop,
+                                    executor=self.executor)
+
+        containers = self.loop.run_until_complete(driver.list_containers())
+        self.assertEqual(len(containers), 2)
+
+        S3MockHttp.type = 'ITERATOR'
+        container = Container(name='test_container', extra={},
+                              driver=self.s3_driver)
+        objects = self._collect(
+            driver.iterate_container_objects(container=container))
+        expected = self.s3_driver.list_container_objects(container=container)
+
+        self.assertEqual([obj.name for obj in objects],
+                         [obj.name for obj in expected])
+
+    def test_dns_driver_operations(self):
+        dns_driver = Mock()
+        dns_driver.list_records.return_value = ['a', 'b']
+        dns_driver.iterate_records.return_value = iter(['a', 'b', 'c'])
+        driver = AsyncDNSDriver(dns_driver, loop=self.loop)
+
+        records = self.loop.run_until_complete(driver.list_records('zone'))
+        self.assertEqual(records, ['a', 'b'])
+        dns_driver.list_records.assert_called_once_with('zone')
+
+        records = self._collect(driver.iterate_records(zone='zone'))
+        self.assertEqual(records, ['a', 'b', 'c'])
+        dns_driver.iterate_records.assert_called_once_with(zone='zone')
+
+    def test_errors_are_propagated(self):
+        dns_driver = Mock()
+        dns_driver.get_zone.side_effect = ValueError('not found')
+        driver = AsyncDNSDriver(dns_driver, loop=self.loop)
+
+        self.assertRaises(ValueError, self.loop.run_until_complete,
+                          driver.get_zone('zone'))
+
+
+class EchoConnection(ConnectionKey):
+    responseCls = JsonResponse
+
+    def add_default_params(self, params):
+        params['key'] = self.key
+        return params
+
+    def add_default_headers(self, headers):
+        headers['X-Auth'] = 'token'
+        return headers
+
+    def pre_connect_hook(self, params, headers):
+        headers['X-Signature'] = '%s:%s' % (self.method, self.action)
+        return params, headers
+
+
+class EchoHandler(BaseHTTPRequestHandler if have_asyncio else object):
+    def do_GET(self):
+        if self.path.startswith('/missing'):
+            self._respond(404, {'error': 'not found'})
+        else:
+            self._respond(200, {'path': self.path,
+                                'auth': self.headers['X-Auth'],
+                                'signature': self.headers['X-Signature']})
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self._respond(200, {'body': self.rfile.read(length).decode('utf-8')})
+
+    def _respond(self, status, value):
+        body = json.dumps(value).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipIf(not have_aiohttp, 'aiohttp is required')
+class AsyncConnectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), EchoHandler)
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+        self.loop = asyncio.new_event_loop()
+        self.connection = EchoConnection(
+            'secret', secure=False, host='127.0.0.1',
+            port=self.server.server_address[1])
+        self.async_connection = AsyncConnection(self.connection,
+                                                loop=self.loop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.async_connection.close())
+        self.loop.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_request_goes_through_the_connection_hooks(self):
+        response = self.loop.run_until_complete(
+            self.async_connection.request('/test', params={'a': 1}))
+
+        self.assertTrue(isinstance(response, JsonResponse))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.object['path'], '/test?a=1&key=secret')
+        self.assertEqual(response.object['auth'], 'token')
+        self.assertEqual(response.object['signature'], 'GET:/test')
+
+    def test_concurrent_requests(self):
+        futures = [self.async_connection.request('/test/%s' % (index))
+                   for index in range(10)]
+        responses = self.loop.run_until_complete(asyncio.gather(*futures))
+
+        self.assertEqual([response.object['signature']
+                          for response in responses],
+                         ['GET:/test/%s' % (index) for index in range(10)])
+
+    def test_request_with_data(self):
+        response = self.loop.run_until_complete(
+            self.async_connection.request('/test', data='payload',
+                                          method='POST'))
+        self.assertEqual(response.object['body'], 'payload')
+
+    def test_errors_are_raised_by_the_response_class(self):
+        future = self.async_connection.request('/missing')
+
+        with self.assertRaises(BaseHTTPError) as context:
+            self.loop.run_until_complete(future)
+
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
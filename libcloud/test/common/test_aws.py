@@ -15,10 +15,11 @@
 
 import sys
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import mock
 
+from libcloud.common import aws
 from libcloud.common.aws import AWSRequestSignerAlgorithmV4
 from libcloud.common.aws import SignedAWSConnection
 from libcloud.common.aws import UNSIGNED_PAYLOAD
@@ -133,6 +134,41 @@ class AWSRequestSignerAlgorithmV4TestCase(LibcloudTestCase):
 
         self.assertEqual(key, 'AWS4my_secret|20150304|my_region|my_service|aws4_request')
 
+    def test_get_key_to_sign_with_is_cached_per_day_region_and_service(self):
+        with mock.patch('libcloud.common.aws._sign',
+                        wraps=aws._sign) as mock_sign:
+            key1 = self.signer._get_key_to_sign_with(self.now)
+            key2 = self.signer._get_key_to_sign_with(
+                self.now + timedelta(hours=1))
+            self.assertEqual(key1, key2)
+            self.assertEqual(mock_sign.call_count, 4)
+
+            self.connection.service_name = 'other_service'
+            key3 = self.signer._get_key_to_sign_with(self.now)
+            del self.connection.service_name
+            self.assertNotEqual(key1, key3)
+            self.assertEqual(mock_sign.call_count, 8)
+
+            key4 = self.signer._get_key_to_sign_with(
+                self.now + timedelta(days=1))
+            self.assertNotEqual(key1, key4)
+            self.assertEqual(mock_sign.call_count, 12)
+
+        # Keys for the previous days are evicted
+        self.assertEqual(list(self.signer._signing_keys[1].keys()),
+                         [('my_region', 'my_service')])
+
+    def test_get_canonical_request_reuses_payload_hash_header(self):
+        headers = {'X-AMZ-Content-SHA256': 'my_payload_hash'}
+
+        with mock.patch('libcloud.common.aws.AWSRequestSignerAlgorithmV4._get_payload_hash') as mock_get_hash:
+            request = self.signer._get_canonical_request(
+                params={}, headers=headers, method='PUT', path='/',
+                data='data')
+
+        self.assertEqual(mock_get_hash.call_count, 0)
+        self.assertTrue(request.endswith('\nmy_payload_hash'))
+
     def test_get_signed_headers_contains_all_headers_lowercased(self):
         headers = {'Content-Type': 'text/plain', 'Host': 'my_host', 'X-Special-Header': ''}
         signed_headers = self.signer._get_signed_headers(headers)
@@ -27,6 +27,8 @@ from libcloud.utils.py3 import b
 from libcloud.utils.py3 import parse_qsl
 
 from libcloud.common.cloudstack import CloudStackConnection
+from libcloud.common.poller import JobPoller
+from libcloud.common.poller import PollingJob
 from libcloud.common.types import MalformedResponseError
 
 from libcloud.test import MockHttp
@@ -51,6 +53,7 @@ class CloudStackCommonTest(unittest.TestCase):
         self.connection = CloudStackConnection('apikey', 'secret',
                                                host=CloudStackMockDriver.host)
         self.connection.poll_interval = 0.0
+        CloudStackMockHttp.commands = []
         self.driver = self.connection.driver = CloudStackMockDriver()
 
     def test_sync_request_bad_response(self):
@@ -89,6 +92,29 @@ class CloudStackCommonTest(unittest.TestCase):
         self.connection._async_request('fake')
         self.assertEqual(async_delay, 0)
 
+    def test_start_async_request(self):
+        self.driver.path = '/async/success'
+        poller = JobPoller()
+        job = self.connection._start_async_request('fake', poller=poller)
+        self.assertEqual(job.result(timeout=5)['jobresult'],
+                         {'fake': 'result'})
+
+    def test_poll_jobs_uses_list_async_jobs(self):
+        self.driver.path = '/async/batch'
+        jobs = [PollingJob(connection=self.connection,
+                           poll_kwargs={'command': 'queryAsyncJobResult',
+                                        'params': {'jobid': job_id}},
+                           timeout=5, poll_interval=0, max_poll_interval=0,
+                           backoff=1)
+                for job_id in ('1', '2', '3')]
+
+        responses = self.connection.poll_jobs(jobs)
+        self.assertEqual([response['jobresult'] for response in responses],
+                         [{'id': '1'}, {'id': '2'}, {'id': '3'}])
+        # Job 3 is not included in the listing and is queried separately
+        self.assertEqual(CloudStackMockHttp.commands,
+                         ['listAsyncJobs', 'queryAsyncJobResult'])
+
     def test_signature_algorithm(self):
         cases = [
             (
@@ -128,6 +154,8 @@ class CloudStackMockHttp(MockHttp, unittest.TestCase):
 
     ERROR_TEXT = 'ERROR TEXT'
 
+    commands = []
+
     def _response(self, status, result, response):
         return (status, json.dumps(result), {}, response)
 
@@ -206,5 +234,32 @@ class CloudStackMockHttp(MockHttp, unittest.TestCase):
             result = {query['command'].lower() + 'response': {'jobid': '42'}}
         return self._response(httplib.OK, result, httplib.responses[httplib.OK])
 
+    def _async_batch(self, method, url, body, headers):
+        query = self._check_request(url)
+        command = query['command'].lower()
+        CloudStackMockHttp.commands.append(query['command'])
+
+        if command == 'listasyncjobs':
+            result = {
+                'listasyncjobsresponse': {
+                    'count': 2,
+                    'asyncjobs': [
+                        {'jobid': job_id, 'jobstatus': 1,
+                         'jobresult': {'id': job_id}}
+                        for job_id in ('1', '2')
+                    ]
+                }
+            }
+        else:
+            self.assertEqual(command, 'queryasyncjobresult')
+            result = {
+                'queryasyncjobresultresponse': {
+                    'jobid': query['jobid'], 'jobstatus': 1,
+                    'jobresult': {'id': query['jobid']}
+                }
+            }
+        return self._response(httplib.OK, result,
+                              httplib.responses[httplib.OK])
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
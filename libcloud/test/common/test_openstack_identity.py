@@ -13,25 +13,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
+import shutil
 import datetime
+import tempfile
 
 try:
     import simplejson as json
 except ImportError:
     import json
 
-from mock import Mock
+from mock import Mock, patch
 
 from libcloud.utils.py3 import httplib
+from libcloud.common.exceptions import BaseHTTPError
 from libcloud.common.openstack import OpenStackBaseConnection
 from libcloud.common.openstack_identity import AUTH_TOKEN_EXPIRES_GRACE_SECONDS
 from libcloud.common.openstack_identity import get_class_for_auth_version
 from libcloud.common.openstack_identity import OpenStackServiceCatalog
+from libcloud.common.openstack_identity import OpenStackIdentity_1_0_Connection
 from libcloud.common.openstack_identity import OpenStackIdentity_2_0_Connection
 from libcloud.common.openstack_identity import OpenStackIdentity_3_0_Connection
 from libcloud.common.openstack_identity import OpenStackIdentity_3_0_Connection_OIDC_access_token
 from libcloud.common.openstack_identity import OpenStackIdentityUser
+from libcloud.common.openstack_identity import OpenStackAuthenticationContext
+from libcloud.common.openstack_identity import OpenStackMemoryAuthenticationCache
+from libcloud.common.openstack_identity import OpenStackFileAuthenticationCache
 from libcloud.compute.drivers.openstack import OpenStack_1_0_NodeDriver
 from libcloud.common.openstack_identity import OpenStackIdentity_2_0_Connection_VOMS
 
@@ -222,6 +230,214 @@ class OpenStackIdentityConnectionTestCase(unittest.TestCase):
         return connection
 
 
+class OpenStackAuthenticationCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        OpenStackBaseConnection.conn_class = OpenStack_2_0_MockHttp
+        OpenStackBaseConnection.auth_url = 'https://auth.api.example.com'
+        OpenStack_2_0_MockHttp.type = None
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.tomorrow = datetime.datetime.utcnow() + datetime.timedelta(1)
+
+    def tearDown(self):
+        OpenStackBaseConnection.auth_url = None
+        shutil.rmtree(self.tmp_dir)
+
+    def _get_connection(self, cache, key=OPENSTACK_PARAMS[1]):
+        return OpenStackBaseConnection(OPENSTACK_PARAMS[0], key,
+                                       ex_force_auth_version='2.0',
+                                       ex_force_base_url='https://www.foo.com',
+                                       ex_auth_cache=cache)
+
+    def _get_context(self, token='token', expires=None):
+        return OpenStackAuthenticationContext(
+            token=token, expires=expires or self.tomorrow,
+            user_info={'id': 'user'},
+            urls=[{'type': 'compute', 'name': 'nova', 'endpoints': []}])
+
+    def test_memory_cache(self):
+        cache = OpenStackMemoryAuthenticationCache()
+        context = self._get_context()
+
+        self.assertEqual(cache.get(('key', )), None)
+        cache.put(('key', ), context)
+        self.assertTrue(cache.get(('key', )) is context)
+
+        cache.clear(('key', ))
+        self.assertEqual(cache.get(('key', )), None)
+
+    def test_cache_doesnt_return_tokens_which_are_about_to_expire(self):
+        cache = OpenStackMemoryAuthenticationCache(refresh_seconds=300)
+        soon = datetime.datetime.utcnow() + datetime.timedelta(seconds=200)
+
+        cache.put(('soon', ), self._get_context(expires=soon))
+        cache.put(('later', ), self._get_context(expires=self.tomorrow))
+
+        self.assertEqual(cache.get(('soon', )), None)
+        self.assertEqual(cache.get(('later', )).token, 'token')
+
+    def test_file_cache_is_shared_between_instances(self):
+        path = os.path.join(self.tmp_dir, 'auth_cache.json')
+        cache1 = OpenStackFileAuthenticationCache(path=path)
+        cache2 = OpenStackFileAuthenticationCache(path=path)
+
+        self.assertEqual(cache2.get(('key', )), None)
+
+        cache1.put(('key', ), self._get_context(token='token1'))
+        context = cache2.get(('key', ))
+        self.assertEqual(context.token, 'token1')
+        self.assertEqual(context.user_info, {'id': 'user'})
+        self.assertEqual(context.urls[0]['name'], 'nova')
+        self.assertEqual(context.expires.utctimetuple(),
+                         self.tomorrow.utctimetuple())
+
+        # Same context is returned while the token doesn't change
+        self.assertTrue(cache2.get(('key', )) is context)
+
+        cache1.put(('key', ), self._get_context(token='token2'))
+        self.assertEqual(cache2.get(('key', )).token, 'token2')
+
+        cache1.clear(('key', ))
+        self.assertEqual(cache2.get(('key', )), None)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+    def test_connections_share_cached_token_and_service_catalog(self):
+        path = os.path.join(self.tmp_dir, 'auth_cache.json')
+
+        for cache in [OpenStackMemoryAuthenticationCache(),
+                      OpenStackFileAuthenticationCache(path=path)]:
+            authenticate = OpenStackIdentity_2_0_Connection.authenticate
+
+            with patch.object(OpenStackIdentity_2_0_Connection,
+                              'authenticate', autospec=True,
+                              side_effect=authenticate) as mock_authenticate:
+                connection1 = self._get_connection(cache)
+                connection1._populate_hosts_and_request_paths()
+                connection1._populate_hosts_and_request_paths()
+
+                connection2 = self._get_connection(cache)
+                connection2._populate_hosts_and_request_paths()
+
+                # Different credentials don't share the cache entry
+                connection3 = self._get_connection(cache, key='other')
+                connection3._populate_hosts_and_request_paths()
+
+            self.assertEqual(mock_authenticate.call_count, 2)
+            self.assertEqual(connection2.auth_token,
+                             connection1.auth_token)
+            self.assertEqual(connection2.auth_token_expires,
+                             connection1.auth_token_expires)
+            self.assertTrue(connection2.service_catalog is
+                            connection1.service_catalog)
+            self.assertFalse(connection3.service_catalog is
+                             connection1.service_catalog)
+
+    def test_tokens_without_expiration_are_cached(self):
+        path = os.path.join(self.tmp_dir, 'auth_cache.json')
+
+        for cache in [OpenStackMemoryAuthenticationCache(),
+                      OpenStackFileAuthenticationCache(path=path)]:
+            authenticate = OpenStackIdentity_1_0_Connection.authenticate
+
+            with patch.object(OpenStackIdentity_1_0_Connection,
+                              'authenticate', autospec=True,
+                              side_effect=authenticate) as mock_authenticate:
+                connection1 = OpenStackBaseConnection(
+                    OPENSTACK_PARAMS[0], OPENSTACK_PARAMS[1],
+                    ex_force_auth_version='1.0',
+                    ex_force_base_url='https://www.foo.com',
+                    ex_auth_cache=cache)
+                connection1._populate_hosts_and_request_paths()
+                connection1._populate_hosts_and_request_paths()
+
+                connection2 = OpenStackBaseConnection(
+                    OPENSTACK_PARAMS[0], OPENSTACK_PARAMS[1],
+                    ex_force_auth_version='1.0',
+                    ex_force_base_url='https://www.foo.com',
+                    ex_auth_cache=cache)
+                connection2._populate_hosts_and_request_paths()
+
+            self.assertEqual(mock_authenticate.call_count, 1)
+            self.assertEqual(connection1.auth_token_expires, None)
+            self.assertEqual(connection2.auth_token,
+                             'FE011C19-CF86-4F87-BE5D-9229145D7A06')
+
+    def test_tokens_without_expiration_expire_in_the_cache(self):
+        path = os.path.join(self.tmp_dir, 'auth_cache.json')
+        context = OpenStackAuthenticationContext(token='token')
+
+        for cache_cls, kwargs in [(OpenStackMemoryAuthenticationCache, {}),
+                                  (OpenStackFileAuthenticationCache,
+                                   {'path': path})]:
+            cache = cache_cls(no_expiry_ttl=3600, **kwargs)
+            cache.put(('key', ), context)
+            self.assertEqual(cache.get(('key', )).token, 'token')
+
+            cache = cache_cls(no_expiry_ttl=0, **kwargs)
+            cache.put(('key', ), context)
+            self.assertEqual(cache.get(('key', )), None)
+
+    def test_clear_only_removes_the_provided_token(self):
+        cache = OpenStackMemoryAuthenticationCache()
+        cache.put(('key', ), self._get_context(token='new'))
+
+        cache.clear(('key', ), token='revoked')
+        self.assertEqual(cache.get(('key', )).token, 'new')
+
+        cache.clear(('key', ), token='new')
+        self.assertEqual(cache.get(('key', )), None)
+
+    def test_unauthorized_cached_token_is_replaced(self):
+        OpenStackBaseConnection.conn_class = OpenStackRevokedTokenMockHttp
+        path = os.path.join(self.tmp_dir, 'auth_cache.json')
+
+        for cache in [OpenStackMemoryAuthenticationCache(),
+                      OpenStackFileAuthenticationCache(path=path)]:
+            connection = self._get_connection(cache)
+            key = connection.get_auth_class().get_auth_cache_key()
+            cache.put(key, self._get_context(token='revoked'))
+            authenticate = OpenStackIdentity_2_0_Connection.authenticate
+
+            with patch.object(OpenStackIdentity_2_0_Connection,
+                              'authenticate', autospec=True,
+                              side_effect=authenticate) as mock_authenticate:
+                response = connection.request('/test')
+
+            self.assertEqual(response.status, httplib.OK)
+            self.assertEqual(mock_authenticate.call_count, 1)
+            self.assertNotEqual(connection.auth_token, 'revoked')
+            self.assertEqual(cache.get(key).token, connection.auth_token)
+
+            # Other failures are not retried
+            connection.auth_token = 'forbidden'
+
+            with patch.object(OpenStackIdentity_2_0_Connection,
+                              'authenticate', autospec=True,
+                              side_effect=authenticate) as mock_authenticate:
+                self.assertRaises(BaseHTTPError, connection.request,
+                                  '/test')
+
+            self.assertEqual(mock_authenticate.call_count, 0)
+
+    def test_token_is_refreshed_early(self):
+        # Refresh window is larger than the token lifetime so the token is
+        # always refreshed
+        cache = OpenStackMemoryAuthenticationCache(
+            refresh_seconds=100 * 365 * 24 * 60 * 60)
+        authenticate = OpenStackIdentity_2_0_Connection.authenticate
+
+        with patch.object(OpenStackIdentity_2_0_Connection, 'authenticate',
+                          autospec=True,
+                          side_effect=authenticate) as mock_authenticate:
+            connection = self._get_connection(cache)
+            connection._populate_hosts_and_request_paths()
+            connection._populate_hosts_and_request_paths()
+
+        self.assertEqual(mock_authenticate.call_count, 2)
+        self.assertEqual(mock_authenticate.call_args[1],
+                         {'force': True})
+
+
 class OpenStackIdentity_2_0_ConnectionTests(unittest.TestCase):
     def setUp(self):
         mock_cls = OpenStackIdentity_2_0_MockHttp
@@ -620,6 +836,20 @@ class OpenStackServiceCatalogTestCase(unittest.TestCase):
                                          'nova'])
 
 
+class OpenStackRevokedTokenMockHttp(OpenStack_2_0_MockHttp):
+    def _test(self, method, url, body, headers):
+        token = headers['X-Auth-Token']
+
+        if token == 'revoked':
+            return (httplib.UNAUTHORIZED, '', {},
+                    httplib.responses[httplib.UNAUTHORIZED])
+        elif token == 'forbidden':
+            return (httplib.FORBIDDEN, '', {},
+                    httplib.responses[httplib.FORBIDDEN])
+
+        return (httplib.OK, '', {}, httplib.responses[httplib.OK])
+
+
 class OpenStackIdentity_2_0_MockHttp(MockHttp):
     fixtures = ComputeFileFixtures('openstack_identity/v2')
     json_content_headers = {'content-type': 'application/json; charset=UTF-8'}
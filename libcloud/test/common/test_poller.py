@@ -0,0 +1,211 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import threading
+import unittest
+
+from libcloud.common.base import PollingConnection
+from libcloud.common.poller import JobPoller
+from libcloud.common.poller import PollingJob
+from libcloud.common.types import LibcloudError
+
+
+class FakePollingConnection(PollingConnection):
+    """
+    Connection whose jobs complete after ``polls_needed`` status checks.
+    """
+
+    poll_interval = 0.01
+    max_poll_interval = 0.05
+    timeout = 5
+
+    def __init__(self, polls_needed=1):
+        super(FakePollingConnection, self).__init__()
+        self.polls_needed = polls_needed
+        self.poll_calls = []
+        self.counter = 0
+        self.poll_errors = 0
+        self.lock = threading.Lock()
+
+    def request(self, action, params=None, data=None, headers=None,
+                method='GET', **kwargs):
+        with self.lock:
+            self.counter += 1
+            return {'job_id': self.counter, 'polls': 0}
+
+    def get_poll_request_kwargs(self, response, context, request_kwargs):
+        return {'action': '/jobs/%s' % (response['job_id']),
+                'job': response}
+
+    def poll_jobs(self, jobs):
+        self.poll_calls.append(len(jobs))
+
+        if self.poll_errors:
+            self.poll_errors -= 1
+            raise LibcloudError('Temporary failure')
+
+        responses = []
+
+        for job in jobs:
+            state = job.poll_kwargs['job']
+            state['polls'] += 1
+            responses.append(dict(state))
+
+        return responses
+
+    def has_completed(self, response):
+        if response['job_id'] < 0:
+            raise LibcloudError('Job has failed')
+
+        return response['polls'] >= self.polls_needed
+
+
+class JobPollerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.poller = JobPoller()
+
+    def test_result(self):
+        connection = FakePollingConnection(polls_needed=3)
+        job = connection.start_async_request('/create', poller=self.poller)
+
+        response = job.result(timeout=5)
+        self.assertTrue(job.done())
+        self.assertEqual(response, {'job_id': 1, 'polls': 3})
+        self.assertEqual(job.exception(), None)
+
+    def test_jobs_due_together_are_polled_together(self):
+        connection = FakePollingConnection(polls_needed=2)
+        jobs = [PollingJob(connection=connection,
+                           poll_kwargs={'job': {'job_id': index, 'polls': 0}},
+                           timeout=5, poll_interval=0.01,
+                           max_poll_interval=0.01, backoff=1)
+                for index in range(1, 6)]
+
+        # Hold the poller thread back until all the jobs have been added
+        with self.poller._condition:
+            for job in jobs:
+                job.next_poll = jobs[0].next_poll
+                self.poller.add(job)
+
+        for job in jobs:
+            job.result(timeout=5)
+
+        self.assertEqual(connection.poll_calls, [5, 5])
+
+    def test_poll_interval_backoff(self):
+        job = PollingJob(connection=None, poll_kwargs={}, timeout=60,
+                         poll_interval=1, max_poll_interval=5, backoff=2)
+
+        intervals = []
+
+        for _ in range(4):
+            job._schedule_next_poll(now=100)
+            intervals.append(job.poll_interval)
+
+        self.assertEqual(intervals, [2, 4, 5, 5])
+        self.assertEqual(job.next_poll, 105)
+
+        # The last poll happens when the job times out
+        job.deadline = 102
+        job._schedule_next_poll(now=100)
+        self.assertEqual(job.next_poll, 102)
+
+    def test_callback(self):
+        connection = FakePollingConnection()
+        called = threading.Event()
+        jobs = []
+
+        def callback(job):
+            jobs.append(job)
+            called.set()
+
+        job = connection.start_async_request('/create', callback=callback,
+                                             poller=self.poller)
+        self.assertTrue(called.wait(5))
+        self.assertEqual(jobs, [job])
+
+        # Callbacks added after completion are called immediately
+        job.add_done_callback(callback)
+        self.assertEqual(jobs, [job, job])
+
+    def test_failed_job(self):
+        connection = FakePollingConnection()
+        job = PollingJob(connection=connection,
+                         poll_kwargs={'job': {'job_id': -1, 'polls': 0}},
+                         timeout=5, poll_interval=0.01,
+                         max_poll_interval=0.01, backoff=1)
+        self.poller.add(job)
+
+        try:
+            job.result(timeout=5)
+        except LibcloudError:
+            e = sys.exc_info()[1]
+            self.assertEqual(e.value, 'Job has failed')
+        else:
+            self.fail('Exception was not thrown')
+
+    def test_poll_error_is_retried(self):
+        connection = FakePollingConnection()
+        connection.poll_errors = 2
+        jobs = [PollingJob(connection=connection,
+                           poll_kwargs={'job': {'job_id': job_id, 'polls': 0}},
+                           timeout=5, poll_interval=0.01,
+                           max_poll_interval=0.01, backoff=1)
+                for job_id in [1, -1]]
+
+        with self.poller._condition:
+            for job in jobs:
+                job.next_poll = jobs[0].next_poll
+                self.poller.add(job)
+
+        # Only the job whose status reports an error fails
+        self.assertEqual(jobs[0].result(timeout=5), {'job_id': 1, 'polls': 1})
+        error = jobs[1].exception(timeout=5)
+        self.assertEqual(error.value, 'Job has failed')
+        self.assertEqual(connection.poll_calls, [2, 2, 2])
+
+    def test_poll_error_fails_job_after_timeout(self):
+        connection = FakePollingConnection()
+        connection.poll_errors = 1000
+        job = PollingJob(connection=connection,
+                         poll_kwargs={'job': {'job_id': 1, 'polls': 0}},
+                         timeout=0.05, poll_interval=0.01,
+                         max_poll_interval=0.01, backoff=1)
+        self.poller.add(job)
+
+        error = job.exception(timeout=5)
+        self.assertEqual(error.value, 'Temporary failure')
+        self.assertTrue(len(connection.poll_calls) > 1)
+
+    def test_job_timeout(self):
+        connection = FakePollingConnection(polls_needed=1000)
+        connection.timeout = 0.05
+
+        job = connection.start_async_request('/create', poller=self.poller)
+        error = job.exception(timeout=5)
+
+        self.assertTrue(isinstance(error, LibcloudError))
+        self.assertTrue('did not complete' in str(error))
+
+    def test_result_wait_timeout(self):
+        job = PollingJob(connection=None, poll_kwargs={}, timeout=60,
+                         poll_interval=1, max_poll_interval=5, backoff=2)
+        self.assertRaises(LibcloudError, job.result, timeout=0.01)
+        self.assertFalse(job.done())
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
@@ -15,11 +15,13 @@
 import sys
 import unittest
 
+from mock import patch
+
 from libcloud.common.base import Connection, ConnectionKey, ConnectionUserAndKey
 from libcloud.common.types import LibcloudError
 from libcloud.compute.base import Node, NodeSize, NodeImage, NodeDriver, StorageVolume
 from libcloud.compute.base import NodeAuthSSHKey, NodeAuthPassword
-from libcloud.compute.types import StorageVolumeState
+from libcloud.compute.types import StorageVolumeState, NodeState
 
 
 class FakeDriver(object):
@@ -108,5 +110,85 @@ class TestValidateAuth(unittest.TestCase):
         self.assertRaises(LibcloudError, n._get_and_check_auth, auth)
 
 
+class StatefulNodeDriver(NodeDriver):
+    """
+    Driver which returns a different snapshot of the nodes for each
+    list_nodes call.
+    """
+    type = 'stateful'
+
+    def __init__(self, snapshots):
+        super(StatefulNodeDriver, self).__init__('foo')
+        self.snapshots = snapshots
+        self.calls = 0
+
+    def list_nodes(self):
+        snapshot = self.snapshots[min(self.calls, len(self.snapshots) - 1)]
+        self.calls += 1
+        return [Node(id=node_id, name=node_id, state=state,
+                     public_ips=ips, private_ips=[], driver=self)
+                for node_id, state, ips in snapshot]
+
+
+class WaitUntilRunningTests(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = StatefulNodeDriver([
+            [('1', NodeState.PENDING, []), ('2', NodeState.PENDING, [])],
+            [('1', NodeState.RUNNING, ['1.1.1.1']),
+             ('2', NodeState.PENDING, [])],
+            [('1', NodeState.RUNNING, ['1.1.1.1']),
+             ('2', NodeState.RUNNING, ['1.1.1.2'])]
+        ])
+        self.nodes = [Node(id=node_id, name=node_id, state=NodeState.PENDING,
+                           public_ips=[], private_ips=[], driver=self.driver)
+                      for node_id in ['2', '1']]
+
+    @patch('libcloud.compute.base.time.sleep')
+    def test_iterate_running_nodes_yields_nodes_when_ready(self, sleep):
+        nodes = self.driver.iterate_running_nodes(nodes=self.nodes,
+                                                  wait_period=1)
+
+        node, ips = next(nodes)
+        self.assertEqual(node.id, '1')
+        self.assertEqual(ips, ['1.1.1.1'])
+        self.assertEqual(self.driver.calls, 2)
+
+        node, ips = next(nodes)
+        self.assertEqual(node.id, '2')
+        self.assertEqual(self.driver.calls, 3)
+        self.assertRaises(StopIteration, next, nodes)
+
+    @patch('libcloud.compute.base.time.sleep')
+    def test_wait_until_running_keeps_order_of_nodes(self, sleep):
+        result = self.driver.wait_until_running(nodes=self.nodes,
+                                                wait_period=1)
+        self.assertEqual([node.id for node, _ in result], ['2', '1'])
+
+    @patch('libcloud.compute.base.time.sleep')
+    def test_wait_until_running_backoff(self, sleep):
+        driver = StatefulNodeDriver([[('1', NodeState.PENDING, [])]] * 6 +
+                                    [[('1', NodeState.RUNNING, ['1.1.1.1'])]])
+        nodes = [Node(id='1', name='1', state=NodeState.PENDING,
+                      public_ips=[], private_ips=[], driver=driver)]
+
+        driver.wait_until_running(nodes=nodes, wait_period=1,
+                                  ex_max_wait_period=3, ex_backoff=2)
+
+        delays = [call[0][0] for call in sleep.call_args_list]
+        self.assertEqual(len(delays), 6)
+
+        for delay, period in zip(delays, [1, 2, 3, 3, 3, 3]):
+            self.assertTrue(period / 2.0 <= delay <= period)
+
+    def test_wait_until_running_timeout(self):
+        driver = StatefulNodeDriver([[('1', NodeState.PENDING, [])]])
+        nodes = [Node(id='1', name='1', state=NodeState.PENDING,
+                      public_ips=[], private_ips=[], driver=driver)]
+
+        self.assertRaises(LibcloudError, driver.wait_until_running,
+                          nodes=nodes, wait_period=0.05, timeout=0.2)
+
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
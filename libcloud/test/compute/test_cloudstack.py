@@ -89,6 +89,47 @@ class CloudStackCommonTestCase(TestCaseMixin):
             self.driver.create_node,
             name='node-name', image=image, size=size)
 
+    def test_ex_create_nodes(self):
+        size = self.driver.list_sizes()[0]
+        image = self.driver.list_images()[0]
+
+        results = self.driver.ex_create_nodes([
+            {'name': 'fred', 'image': image, 'size': size},
+            {'name': 'fred', 'image': image, 'size': size}
+        ])
+
+        self.assertEqual(len(results), 2)
+
+        for result in results:
+            self.assertTrue(result.success)
+            self.assertEqual(result.node.name, 'fred')
+            self.assertEqual(result.node.private_ips, ['192.168.1.2'])
+
+    def test_ex_create_nodes_failure(self):
+        size = self.driver.list_sizes()[0]
+        image = self.driver.list_images()[0]
+        start_async_request = self.driver._start_async_request
+
+        def fail_after_first_node(*args, **kwargs):
+            job = start_async_request(*args, **kwargs)
+            CloudStackMockHttp.fixture_tag = 'deployfail2'
+            return job
+
+        self.driver._start_async_request = fail_after_first_node
+
+        results = self.driver.ex_create_nodes([
+            {'name': 'fred', 'image': image, 'size': size},
+            {'name': 'node-name', 'image': image, 'size': size}
+        ])
+
+        # The node which was created is returned even if another one failed
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[0].node.name, 'fred')
+        self.assertFalse(results[1].success)
+        self.assertEqual(results[1].node, None)
+        self.assertTrue(results[1].error is not None)
+        self.assertEqual(results[1].kwargs['name'], 'node-name')
+
     def test_create_node_default_location_success(self):
         size = self.driver.list_sizes()[0]
         image = self.driver.list_images()[0]
@@ -1344,5 +1385,12 @@ class CloudStackMockHttp(MockHttp, unittest.TestCase):
         body, obj = self._load_fixture(fixture)
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
+    def _cmd_listAsyncJobs(self):
+        body, obj = self._load_fixture('queryAsyncJobResult_17164.json')
+        job = obj['queryasyncjobresultresponse']
+        result = {'listasyncjobsresponse': {'count': 1, 'asyncjobs': [job]}}
+        return (httplib.OK, json.dumps(result), {},
+                httplib.responses[httplib.OK])
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
@@ -466,6 +466,26 @@ class DeploymentTests(unittest.TestCase):
         node = self.driver.deploy_node(deploy=Mock())
         self.assertEqual(self.node.id, node.id)
 
+    @patch('libcloud.compute.ssh')
+    def test_deploy_node_uses_password_generated_by_create_node(
+            self, mock_ssh_module):
+        mock_ssh_module.have_paramiko = True
+
+        # Only the node returned by create_node contains the password
+        created_node = Node(id=12345, name='test', state=NodeState.PENDING,
+                            public_ips=[], private_ips=[], driver=Rackspace,
+                            extra={'password': 'secret'})
+        self.driver.create_node = Mock(return_value=created_node)
+        self.driver.list_nodes = Mock(return_value=[self.node])
+        self.driver._connect_and_run_deployment_script = Mock()
+
+        node = self.driver.deploy_node(deploy=Mock())
+        self.assertTrue(node is self.node)
+
+        kwargs = self.driver._connect_and_run_deployment_script.call_args[1]
+        self.assertEqual(kwargs['ssh_password'], 'secret')
+        self.assertEqual(kwargs['ssh_hostname'], '1.2.3.4')
+
     @patch('libcloud.compute.base.SSHClient')
     @patch('libcloud.compute.ssh')
     def test_exception_is_thrown_is_paramiko_is_not_available(self,
@@ -489,6 +509,115 @@ class DeploymentTests(unittest.TestCase):
         node = self.driver.deploy_node(deploy=Mock())
         self.assertEqual(self.node.id, node.id)
 
+    def _create_node(self, name, **kwargs):
+        if name == 'fail':
+            raise LibcloudError('Quota exceeded')
+
+        return {'test-1': self.node, 'test-2': self.node2}[name]
+
+    @patch('libcloud.compute.base.SSHClient')
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_success(self, mock_ssh_module, _):
+        self.driver.create_node = Mock(side_effect=self._create_node)
+        self.driver.list_nodes = Mock(return_value=[self.node, self.node2])
+        mock_ssh_module.have_paramiko = True
+
+        deploy = Mock()
+        results = self.driver.deploy_nodes([{'name': 'test-1'},
+                                            {'name': 'test-2'}],
+                                           deploy=deploy, max_workers=2)
+
+        self.assertEqual([result.node.id for result in results],
+                         ['12345', '123456'])
+        self.assertEqual([result.success for result in results],
+                         [True, True])
+        self.assertEqual([result.attempts for result in results], [1, 1])
+        self.assertEqual(results[0].kwargs, {'name': 'test-1',
+                                             'deploy': deploy})
+        self.assertEqual(deploy.run.call_count, 2)
+
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_retries_and_reports_failures(self,
+                                                       mock_ssh_module):
+        self.driver.create_node = Mock(side_effect=self._create_node)
+        self.driver.list_nodes = Mock(return_value=[self.node, self.node2])
+        mock_ssh_module.have_paramiko = True
+
+        calls = []
+
+        def run_deployment(node, **kwargs):
+            calls.append(node.id)
+
+            # The first node only fails the first time, the second node
+            # always fails
+            if node.id == '123456' or calls.count(node.id) == 1:
+                raise IOError('Connection refused')
+
+            return node
+
+        self.driver._connect_and_run_deployment_script = \
+            Mock(side_effect=run_deployment)
+
+        results = self.driver.deploy_nodes([{'name': 'test-1'},
+                                            {'name': 'test-2'},
+                                            {'name': 'fail'}],
+                                           deploy=Mock(), deploy_retries=1)
+
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[0].attempts, 2)
+
+        self.assertFalse(results[1].success)
+        self.assertEqual(results[1].attempts, 2)
+        self.assertTrue(isinstance(results[1].error, DeploymentError))
+        self.assertEqual(results[1].error.node.id, '123456')
+
+        # Nodes which couldn't be created are not waited for or deployed
+        self.assertFalse(results[2].success)
+        self.assertEqual(results[2].node, None)
+        self.assertEqual(results[2].attempts, 0)
+        self.assertTrue(isinstance(results[2].error, LibcloudError))
+
+        self.assertEqual(sorted(calls), ['12345', '12345', '123456',
+                                         '123456'])
+
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_use_passwords_generated_by_create_node(
+            self, mock_ssh_module):
+        mock_ssh_module.have_paramiko = True
+
+        def create_node(name, **kwargs):
+            node = self._create_node(name)
+            return Node(id=node.id, name=name, state=NodeState.PENDING,
+                        public_ips=[], private_ips=[], driver=Rackspace,
+                        extra={'password': 'secret-%s' % (name)})
+
+        self.driver.create_node = Mock(side_effect=create_node)
+        self.driver.list_nodes = Mock(return_value=[self.node, self.node2])
+        self.driver._connect_and_run_deployment_script = Mock()
+
+        results = self.driver.deploy_nodes([{'name': 'test-1'},
+                                            {'name': 'test-2'}],
+                                           deploy=Mock())
+
+        self.assertEqual([result.success for result in results],
+                         [True, True])
+
+        passwords = dict(
+            (call[1]['node'].id, call[1]['ssh_password']) for call in
+            self.driver._connect_and_run_deployment_script.call_args_list)
+        self.assertEqual(passwords, {'12345': 'secret-test-1',
+                                     '123456': 'secret-test-2'})
+
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_not_implemented(self, mock_ssh_module):
+        self.driver.features = {'create_node': []}
+        self.driver.create_node = Mock()
+        mock_ssh_module.have_paramiko = True
+
+        self.assertRaises(NotImplementedError, self.driver.deploy_nodes,
+                          [{'name': 'test-1'}], deploy=Mock())
+        self.assertEqual(self.driver.create_node.call_count, 0)
+
 
 class RackspaceMockHttp(MockHttp):
     fixtures = ComputeFileFixtures('openstack')
@@ -20,6 +20,8 @@ import sys
 from datetime import datetime
 from libcloud.utils.iso8601 import UTC
 
+from mock import call, patch
+
 from libcloud.utils.py3 import httplib
 
 from libcloud.compute.drivers.ec2 import EC2NodeDriver
@@ -33,7 +35,8 @@ from libcloud.compute.drivers.ec2 import EC2NetworkSubnet
 from libcloud.compute.base import Node, NodeImage, NodeSize, NodeLocation
 from libcloud.compute.base import StorageVolume, VolumeSnapshot
 from libcloud.compute.types import KeyPairDoesNotExistError, StorageVolumeState, \
-    VolumeSnapshotState
+    VolumeSnapshotState, NodeState
+from libcloud.common.exceptions import BaseHTTPError
 
 from libcloud.test import MockHttp, LibcloudTestCase
 from libcloud.test.compute import TestCaseMixin
@@ -278,6 +281,65 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         self.assertIn('instance_type', ret_node1.extra)
         self.assertIn('instance_type', ret_node2.extra)
 
+    def test_iterate_nodes_follows_next_token(self):
+        expected = self.driver.list_nodes()
+
+        EC2MockHttp.type = 'paginated'
+
+        with patch.object(
+                self.driver, '_describe_instance_addresses',
+                wraps=self.driver._describe_instance_addresses) \
+                as mock_addresses:
+            nodes = self.driver.iterate_nodes(ex_page_size=5)
+
+            # Nodes of the first page are yielded before the next page is
+            # requested
+            node = next(nodes)
+            self.assertEqual(node.id, 'i-4382922a')
+            self.assertEqual(node.public_ips, expected[0].public_ips)
+
+            nodes = list(nodes)
+
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(nodes[0].id, 'i-8474834a')
+        self.assertEqual(nodes[0].public_ips, expected[1].public_ips)
+
+        # Addresses are retrieved once for all the pages
+        self.assertEqual(mock_addresses.call_count, 1)
+        self.assertEqual(mock_addresses.call_args, call())
+
+    def test_iterate_nodes_stream(self):
+        expected = self.driver.list_nodes()
+
+        EC2MockHttp.type = 'paginated'
+        nodes = list(self.driver.iterate_nodes(ex_page_size=5,
+                                               ex_stream=True))
+
+        self.assertEqual([node.id for node in nodes],
+                         ['i-4382922a', 'i-8474834a'])
+        self.assertEqual([node.public_ips for node in nodes],
+                         [node.public_ips for node in expected])
+
+    @patch('libcloud.compute.base.time.sleep')
+    def test_wait_until_running_looks_up_node_ids(self, sleep):
+        node = self.driver.list_nodes()[1]
+        node.state = NodeState.RUNNING
+        error = BaseHTTPError(400, 'InvalidInstanceID.NotFound: not found')
+
+        with patch.object(self.driver, 'list_nodes',
+                          side_effect=[error, [node]]) as list_nodes:
+            result = self.driver.wait_until_running([node], wait_period=0.1,
+                                                    timeout=5)
+
+        list_nodes.assert_called_with(ex_node_ids=['i-8474834a'])
+        self.assertEqual(list_nodes.call_count, 2)
+        self.assertEqual(result, [(node, ['1.2.3.5'])])
+
+    def test_iterate_nodes_page_size_and_node_ids(self):
+        nodes = self.driver.iterate_nodes(ex_node_ids=['i-4382922a'],
+                                          ex_page_size=5)
+        self.assertRaises(ValueError, list, nodes)
+
     def test_ex_list_reserved_nodes(self):
         node = self.driver.ex_list_reserved_nodes()[0]
         self.assertEqual(node.id, '93bbbca2-c500-49d0-9ede-9d8737400498')
@@ -518,6 +580,20 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         self.assertEqual(billing_product2, 'as-6dr90319')
         self.assertEqual(size, 20)
 
+    def test_iterate_images(self):
+        expected = self.driver.list_images()
+        images = self.driver.iterate_images()
+
+        self.assertFalse(isinstance(images, list))
+
+        images = list(images)
+        self.assertEqual([image.id for image in images],
+                         [image.id for image in expected])
+        self.assertEqual([image.name for image in images],
+                         [image.name for image in expected])
+        self.assertEqual(images[0].extra, expected[0].extra)
+        self.assertEqual(images[1].extra, expected[1].extra)
+
     def test_list_images_with_image_ids(self):
         EC2MockHttp.type = 'ex_imageids'
         images = self.driver.list_images(ex_image_ids=['ami-57ba933a'])
@@ -1342,6 +1418,21 @@ class EC2MockHttp(MockHttp):
         body = self.fixtures.load('describe_instances.xml')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
+    def _paginated_DescribeInstances(self, method, url, body, headers):
+        self.assertUrlContainsQueryParams(url, {'MaxResults': '5'})
+
+        if 'NextToken' in url:
+            self.assertUrlContainsQueryParams(
+                url, {'NextToken': 'eyJ2IjoiMiIsImMiOiJwYWdlMiJ9'})
+            body = self.fixtures.load('describe_instances_paginated_2.xml')
+        else:
+            body = self.fixtures.load('describe_instances_paginated_1.xml')
+
+        return (httplib.OK, body, {}, httplib.responses[httplib.OK])
+
+    def _paginated_DescribeAddresses(self, method, url, body, headers):
+        return self._DescribeAddresses(method, url, body, headers)
+
     def _DescribeReservedInstances(self, method, url, body, headers):
         body = self.fixtures.load('describe_reserved_instances.xml')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
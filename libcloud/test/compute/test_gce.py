@@ -16,17 +16,24 @@
 Tests for Google Compute Engine Driver
 """
 
+import os
+import re
+import copy
+import json
 import datetime
 import mock
 import sys
+import tempfile
 import unittest
 
 from libcloud.utils.py3 import httplib
+from libcloud.utils.py3 import parse_qs
+from libcloud.utils.py3 import urlparse
 from libcloud.compute.drivers.gce import (
     GCENodeDriver, API_VERSION, timestamp_to_datetime, GCEAddress, GCEBackend,
     GCEBackendService, GCEFirewall, GCEForwardingRule, GCEHealthCheck,
     GCENetwork, GCENodeImage, GCERoute, GCERegion, GCETargetHttpProxy,
-    GCEUrlMap, GCEZone, GCESubnetwork)
+    GCEUrlMap, GCEZone, GCESubnetwork, GCEConnection, _CATALOG_CACHE)
 from libcloud.common.google import (GoogleBaseAuthConnection,
                                     ResourceNotFoundError, ResourceExistsError,
                                     GoogleBaseError)
@@ -57,8 +64,124 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         kwargs = GCE_KEYWORD_PARAMS.copy()
         kwargs['auth_type'] = 'IA'
         kwargs['datacenter'] = self.datacenter
+        _CATALOG_CACHE.clear()
         self.driver = GCENodeDriver(*GCE_PARAMS, **kwargs)
 
+    def _get_driver_requests(self, func):
+        # Return the actions of the requests which are made by func
+        with mock.patch.object(GCEConnection, 'request', autospec=True,
+                               side_effect=GCEConnection.request) as request:
+            func()
+
+        return [args[1] for args, _ in request.call_args_list]
+
+    def _get_driver(self, **kwargs):
+        driver_kwargs = GCE_KEYWORD_PARAMS.copy()
+        driver_kwargs['auth_type'] = 'IA'
+        driver_kwargs['datacenter'] = self.datacenter
+        driver_kwargs.update(kwargs)
+        return GCENodeDriver(*GCE_PARAMS, **driver_kwargs)
+
+    def test_catalogs_are_loaded_on_first_use(self):
+        _CATALOG_CACHE.clear()
+        drivers = []
+
+        requests = self._get_driver_requests(
+            lambda: drivers.append(self._get_driver()))
+        self.assertEqual(requests, [])
+
+        driver = drivers[0]
+        requests = self._get_driver_requests(lambda: driver.zone)
+        self.assertEqual(requests, ['/zones'])
+        self.assertEqual(driver.zone.name, self.datacenter)
+
+        requests = self._get_driver_requests(lambda: driver.region)
+        self.assertEqual(requests, ['/regions'])
+        self.assertEqual(driver.region.name, 'us-central1')
+
+        # The catalogs are shared by the drivers of the same project
+        other_driver = self._get_driver()
+        requests = self._get_driver_requests(
+            lambda: (other_driver.zone, other_driver.region_list))
+        self.assertEqual(requests, [])
+        self.assertTrue(other_driver.zone.driver is other_driver)
+        self.assertEqual(len(other_driver.zone_list), len(driver.zone_list))
+
+    def test_catalog_cache_ttl(self):
+        driver = self._get_driver(catalog_cache_ttl=0)
+
+        requests = self._get_driver_requests(
+            lambda: (driver.zone_dict, driver.zone_dict))
+        self.assertEqual(requests, ['/zones', '/zones'])
+
+    def test_catalog_cache_file(self):
+        fd, file_path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, file_path)
+
+        driver = self._get_driver(catalog_cache_file=file_path)
+        requests = self._get_driver_requests(lambda: driver.region_dict)
+        self.assertEqual(requests, ['/regions', '/zones'])
+
+        _CATALOG_CACHE.clear()
+        other_driver = self._get_driver(catalog_cache_file=file_path)
+        requests = self._get_driver_requests(
+            lambda: (other_driver.region_dict, other_driver.zone_dict))
+        self.assertEqual(requests, [])
+        self.assertEqual(sorted(other_driver.region_dict.keys()),
+                         sorted(driver.region_dict.keys()))
+
+    def test_list_nodes_looks_up_disks_in_bulk(self):
+        # Load the zone catalog first
+        self.driver.zone_list
+
+        nodes = []
+        requests = self._get_driver_requests(
+            lambda: nodes.extend(self.driver.list_nodes(ex_zone='all')))
+        self.assertEqual(requests, ['/aggregated/instances',
+                                    '/aggregated/disks'])
+        self.assertEqual(len(nodes), 8)
+
+        # Boot disks are cached
+        requests = self._get_driver_requests(
+            lambda: self.driver.list_nodes(ex_zone='all'))
+        self.assertEqual(requests, ['/aggregated/instances'])
+
+        requests = self._get_driver_requests(
+            lambda: self.driver.list_nodes(ex_zone='all',
+                                           ex_use_disk_cache=False))
+        self.assertEqual(requests, ['/aggregated/instances',
+                                    '/aggregated/disks'])
+
+    def test_to_nodes_looks_up_zone_disks(self):
+        self.driver.zone_list
+        item = self.driver.connection.request(
+            '/zones/us-central1-a/instances/node-name').object
+        other_item = copy.deepcopy(item)
+        other_item['name'] = 'other-node'
+        other_item['disks'][0]['source'] = \
+            other_item['disks'][0]['source'].replace('node-name', 'lcdisk')
+        items = [item, other_item]
+
+        nodes = []
+        requests = self._get_driver_requests(
+            lambda: nodes.extend(self.driver._to_nodes(items)))
+        self.assertEqual(requests, ['/zones/us-central1-a/disks'])
+        self.assertEqual([node.extra['boot_disk'].name for node in nodes],
+                         ['node-name', 'lcdisk'])
+
+    def test_ex_get_node_looks_up_boot_disk(self):
+        self.driver.zone_list
+        node = []
+        requests = self._get_driver_requests(
+            lambda: node.append(self.driver.ex_get_node('node-name',
+                                                        'us-central1-a')))
+        self.assertEqual(requests,
+                         ['/zones/us-central1-a/instances/node-name',
+                          '/zones/us-central1-a/disks/node-name'])
+        self.assertTrue(isinstance(node[0].extra['boot_disk'],
+                                   StorageVolume))
+
     def test_default_scopes(self):
         self.assertEqual(self.driver.scopes, None)
 
@@ -405,6 +528,22 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
             self.assertTrue(isinstance(node, Node))
             self.assertEqual(loc, node.extra['zone'].name)
 
+    def test_ex_instancegroup_list_instances_looks_up_nodes_in_bulk(self):
+        self.driver.zone_list
+        gceobj = self.driver.ex_get_instancegroup('myname', 'us-central1-a')
+        nodes = []
+        requests = self._get_driver_requests(
+            lambda: nodes.extend(
+                self.driver.ex_instancegroup_list_instances(gceobj)))
+        self.assertEqual(requests, [
+            '/zones/us-central1-a/instanceGroups/myname/listInstances',
+            '/zones/us-central1-a/instances',
+            '/zones/us-central1-a/disks'])
+        self.assertEqual([node.name for node in nodes],
+                         ['node-name', 'lcnode-001'])
+        self.assertEqual([node.extra['boot_disk'].name for node in nodes],
+                         ['node-name', 'lcnode-001'])
+
     def test_ex_instancegroup_add_instances(self):
         name = 'myname'
         loc = 'us-central1-a'
@@ -619,6 +758,23 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         names = [n.name for n in nodes_all]
         self.assertTrue('node-name' in names)
 
+    @mock.patch('libcloud.compute.base.time.sleep')
+    def test_wait_until_running_gets_nodes_by_zone(self, sleep):
+        node = self.driver.list_nodes()[0]
+        not_found = ResourceNotFoundError('not found', 404, None)
+
+        with mock.patch.object(self.driver, 'ex_get_node',
+                               side_effect=[not_found, node]) as get_node:
+            with mock.patch.object(self.driver, 'list_nodes') as list_nodes:
+                result = self.driver.wait_until_running([node],
+                                                        wait_period=0.1,
+                                                        timeout=5)
+
+        self.assertEqual(list_nodes.call_count, 0)
+        get_node.assert_called_with(node.name, node.extra['zone'])
+        self.assertEqual(get_node.call_count, 2)
+        self.assertEqual(result, [(node, node.public_ips)])
+
     def test_ex_list_regions(self):
         regions = self.driver.ex_list_regions()
         self.assertEqual(len(regions), 3)
@@ -730,9 +886,9 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         volumes = self.driver.list_volumes()
         volumes_all = self.driver.list_volumes('all')
         volumes_uc1a = self.driver.list_volumes('us-central1-a')
-        self.assertEqual(len(volumes), 2)
+        self.assertEqual(len(volumes), 4)
         self.assertEqual(len(volumes_all), 17)
-        self.assertEqual(len(volumes_uc1a), 2)
+        self.assertEqual(len(volumes_uc1a), 4)
         self.assertEqual(volumes[0].name, 'lcdisk')
         self.assertEqual(volumes_uc1a[0].name, 'lcdisk')
         names = [v.name for v in volumes_all]
@@ -1395,6 +1551,17 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         self.assertEqual(nodes[0].extra['boot_disk'].size, disk_size)
         self.assertEqual(nodes[1].extra['boot_disk'].size, disk_size)
 
+    def test_ex_create_multiple_nodes_looks_up_nodes_in_bulk(self):
+        image = self.driver.ex_get_image('debian-7')
+        size = self.driver.ex_get_size('n1-standard-1')
+        requests = self._get_driver_requests(
+            lambda: self.driver.ex_create_multiple_nodes(
+                'lcnode', size, image, 2, poll_interval=0))
+        self.assertEqual(requests[-2:], ['/zones/us-central1-a/instances',
+                                         '/zones/us-central1-a/disks'])
+        self.assertFalse('/zones/us-central1-a/instances/lcnode-000' in
+                         requests)
+
     def test_ex_create_multiple_nodes_image_family(self):
         base_name = 'lcnode'
         image = None
@@ -3333,12 +3500,18 @@ class GCEMockHttp(MockHttp):
 
     def _zones_us_central1_a_disks_lcnode_000(self, method, url, body,
                                               headers):
-        body = self.fixtures.load('generic_disk.json')
+        if method == 'GET':
+            body = self.fixtures.load('zones_us-central1-a_disks_lcnode-000.json')
+        else:
+            body = self.fixtures.load('generic_disk.json')
         return (httplib.OK, body, self.json_hdr, httplib.responses[httplib.OK])
 
     def _zones_us_central1_a_disks_lcnode_001(self, method, url, body,
                                               headers):
-        body = self.fixtures.load('generic_disk.json')
+        if method == 'GET':
+            body = self.fixtures.load('zones_us-central1-a_disks_lcnode-001.json')
+        else:
+            body = self.fixtures.load('generic_disk.json')
         return (httplib.OK, body, self.json_hdr, httplib.responses[httplib.OK])
 
     def _zones_us_central1_b_disks_libcloud_lb_demo_www_000(self, method, url,
@@ -3413,9 +3586,19 @@ class GCEMockHttp(MockHttp):
         return (httplib.OK, body, self.json_hdr, httplib.responses[httplib.OK])
 
     def _zones_us_central1_a_instances(self, method, url, body, headers):
+        query = parse_qs(urlparse.urlparse(url).query)
         if method == 'POST':
             body = self.fixtures.load(
                 'zones_us-central1-a_instances_post.json')
+        elif 'filter' in query:
+            # Only filters on a list of names are supported
+            names = re.match(r'^name eq \((.*)\)$',
+                             query['filter'][0]).group(1).split('|')
+            items = [json.loads(self.fixtures.load(
+                'zones_us-central1-a_instances_%s.json' % (name)))
+                for name in names]
+            body = json.dumps({'kind': 'compute#instanceList',
+                               'items': items})
         else:
             body = self.fixtures.load('zones_us-central1-a_instances.json')
         return (httplib.OK, body, self.json_hdr, httplib.responses[httplib.OK])
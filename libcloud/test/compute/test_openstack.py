@@ -754,6 +754,23 @@ class OpenStack_1_1_Tests(unittest.TestCase, TestCaseMixin):
         self.assertEqual('/v1.1/slug', driver.connection.request_path)
         self.assertEqual(443, driver.connection.port)
 
+    @patch('libcloud.compute.base.time.sleep')
+    def test_wait_until_running_gets_node_details(self, sleep):
+        nodes = self.driver.list_nodes()
+        node = nodes[1]
+
+        with patch.object(self.driver, 'ex_get_node_details',
+                          side_effect=[None, node]) as get_node_details:
+            with patch.object(self.driver, 'list_nodes') as list_nodes:
+                result = self.driver.wait_until_running([node],
+                                                        wait_period=0.1,
+                                                        timeout=5)
+
+        self.assertEqual(list_nodes.call_count, 0)
+        get_node_details.assert_called_with(node.id)
+        self.assertEqual(get_node_details.call_count, 2)
+        self.assertEqual(result, [(node, ['50.57.94.30'])])
+
     def test_list_nodes(self):
         nodes = self.driver.list_nodes()
         self.assertEqual(len(nodes), 2)
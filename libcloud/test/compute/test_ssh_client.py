@@ -20,18 +20,21 @@ from __future__ import with_statement
 import os
 import sys
 import tempfile
+import threading
 
 from libcloud import _init_once
 from libcloud.test import LibcloudTestCase
 from libcloud.test import unittest
 from libcloud.compute.ssh import ParamikoSSHClient
 from libcloud.compute.ssh import ShellOutSSHClient
+from libcloud.compute.ssh import SSHCommandTimeoutError
 from libcloud.compute.ssh import have_paramiko
 
 from libcloud.utils.py3 import StringIO
 from libcloud.utils.py3 import u
+from libcloud.utils.py3 import b
 
-from mock import patch, Mock, MagicMock
+from mock import patch, Mock
 
 if not have_paramiko:
     ParamikoSSHClient = None  # NOQA
@@ -194,10 +197,6 @@ class ParamikoSSHClientTests(LibcloudTestCase):
                          'port': 22}
         mock.client.connect.assert_called_once_with(**expected_conn)
 
-    @patch.object(ParamikoSSHClient, '_consume_stdout',
-                  MagicMock(return_value=StringIO('')))
-    @patch.object(ParamikoSSHClient, '_consume_stderr',
-                  MagicMock(return_value=StringIO('')))
     def test_basic_usage_absolute_path(self):
         """
         Basic execution.
@@ -224,7 +223,13 @@ class ParamikoSSHClientTests(LibcloudTestCase):
         mock_cli.open_sftp().file.assert_called_once_with('random_script.sh',
                                                           mode='w')
 
-        mock.run(sd)
+        chan = mock_cli.get_transport().open_session()
+        chan.recv_ready.return_value = False
+        chan.recv_stderr_ready.return_value = False
+        chan.exit_status_ready.return_value = True
+        chan.recv_exit_status.return_value = 0
+
+        self.assertEqual(mock.run(sd), ['', '', 0])
 
         # Make assertions over 'run' method
         mock_cli.get_transport().open_session().exec_command \
@@ -258,87 +263,155 @@ class ParamikoSSHClientTests(LibcloudTestCase):
 
         self.assertTrue(content.find(expected_msg) != -1)
 
-    def test_consume_stdout(self):
-        conn_params = {'hostname': 'dummy.host.org',
-                       'username': 'ubuntu'}
-        client = ParamikoSSHClient(**conn_params)
-        client.CHUNK_SIZE = 1024
-
-        chan = Mock()
-        chan.recv_ready.side_effect = [True, True, False]
-        chan.recv.side_effect = ['123', '456']
-
-        stdout = client._consume_stdout(chan).getvalue()
-        self.assertEqual(u('123456'), stdout)
-        self.assertEqual(len(stdout), 6)
-
-        conn_params = {'hostname': 'dummy.host.org',
-                       'username': 'ubuntu'}
-        client = ParamikoSSHClient(**conn_params)
-        client.CHUNK_SIZE = 1024
-
-        chan = Mock()
-        chan.recv_ready.side_effect = [True, True, False]
-        chan.recv.side_effect = ['987', '6543210']
-
-        stdout = client._consume_stdout(chan).getvalue()
-        self.assertEqual(u('9876543210'), stdout)
-        self.assertEqual(len(stdout), 10)
-
-    def test_consume_stderr(self):
-        conn_params = {'hostname': 'dummy.host.org',
-                       'username': 'ubuntu'}
-        client = ParamikoSSHClient(**conn_params)
-        client.CHUNK_SIZE = 1024
-
-        chan = Mock()
-        chan.recv_stderr_ready.side_effect = [True, True, False]
-        chan.recv_stderr.side_effect = ['123', '456']
-
-        stderr = client._consume_stderr(chan).getvalue()
-        self.assertEqual(u('123456'), stderr)
-        self.assertEqual(len(stderr), 6)
-
-        conn_params = {'hostname': 'dummy.host.org',
-                       'username': 'ubuntu'}
-        client = ParamikoSSHClient(**conn_params)
-        client.CHUNK_SIZE = 1024
-
-        chan = Mock()
-        chan.recv_stderr_ready.side_effect = [True, True, False]
-        chan.recv_stderr.side_effect = ['987', '6543210']
-
-        stderr = client._consume_stderr(chan).getvalue()
-        self.assertEqual(u('9876543210'), stderr)
-        self.assertEqual(len(stderr), 10)
-
-    def test_consume_stdout_chunk_contains_part_of_multi_byte_utf8_character(self):
-        conn_params = {'hostname': 'dummy.host.org',
-                       'username': 'ubuntu'}
-        client = ParamikoSSHClient(**conn_params)
-        client.CHUNK_SIZE = 1
-
-        chan = Mock()
-        chan.recv_ready.side_effect = [True, True, True, True, False]
-        chan.recv.side_effect = ['\xF0', '\x90', '\x8D', '\x88']
-
-        stdout = client._consume_stdout(chan).getvalue()
-        self.assertEqual('\xf0\x90\x8d\x88', stdout.encode('utf-8'))
-        self.assertTrue(len(stdout) in [1, 2])
-
-    def test_consume_stderr_chunk_contains_part_of_multi_byte_utf8_character(self):
-        conn_params = {'hostname': 'dummy.host.org',
-                       'username': 'ubuntu'}
-        client = ParamikoSSHClient(**conn_params)
-        client.CHUNK_SIZE = 1
-
-        chan = Mock()
-        chan.recv_stderr_ready.side_effect = [True, True, True, True, False]
-        chan.recv_stderr.side_effect = ['\xF0', '\x90', '\x8D', '\x88']
-
-        stderr = client._consume_stderr(chan).getvalue()
-        self.assertEqual('\xf0\x90\x8d\x88', stderr.encode('utf-8'))
-        self.assertTrue(len(stderr) in [1, 2])
+    def _get_client_with_channel(self, chan):
+        client = ParamikoSSHClient(hostname='dummy.host.org',
+                                   username='ubuntu')
+        client.client = Mock()
+        client.client.get_transport().open_session.return_value = chan
+        return client
+
+    @patch('libcloud.compute.ssh.select.select')
+    def test_run_streams_output_to_handlers(self, mock_select):
+        chan = FakeChannel(batches=[(b'hel', b''), (b'lo \xc3', b'err'),
+                                    (b'\xa9', b'or')], status=3)
+        mock_select.side_effect = lambda r, w, x, timeout: chan.deliver()
+        client = self._get_client_with_channel(chan)
+
+        stdout_chunks = []
+        stderr_chunks = []
+        result = client.run('ls', stdout_handler=stdout_chunks.append,
+                            stderr_handler=stderr_chunks.append)
+
+        self.assertEqual(result, [u('hello \xe9'), 'error', 3])
+        self.assertEqual(stdout_chunks, ['hel', 'lo ', u('\xe9')])
+        self.assertEqual(stderr_chunks, ['err', 'or'])
+        self.assertEqual(mock_select.call_count, 2)
+
+    @patch('libcloud.compute.ssh.select.select')
+    def test_run_max_buffer_size(self, mock_select):
+        batches = [(b('%s' % (index)), b'') for index in range(10)]
+        chan = FakeChannel(batches=batches)
+        mock_select.side_effect = lambda r, w, x, timeout: chan.deliver()
+        client = self._get_client_with_channel(chan)
+
+        chunks = []
+        stdout, stderr, status = client.run('ls', stdout_handler=chunks.append,
+                                            max_buffer_size=4)
+
+        self.assertEqual(stdout, '6789')
+        self.assertEqual(''.join(chunks), '0123456789')
+        self.assertEqual(status, 0)
+
+    @patch('libcloud.compute.ssh.select.select')
+    def test_iter_run(self, mock_select):
+        chan = FakeChannel(batches=[(b'out', b'err')], status=1)
+        mock_select.side_effect = lambda r, w, x, timeout: chan.deliver()
+        client = self._get_client_with_channel(chan)
+
+        self.assertEqual(list(client.iter_run('ls')),
+                         [('stdout', 'out'), ('stderr', 'err'),
+                          ('exit_status', 1)])
+
+    @patch('libcloud.compute.ssh.select.select')
+    def test_run_timeout(self, mock_select):
+        chan = FakeChannel(batches=[(b'out', b'')], status=None)
+        client = self._get_client_with_channel(chan)
+
+        self.assertRaises(SSHCommandTimeoutError, client.run, 'sleep 100',
+                          timeout=0.05)
+        self.assertTrue(chan.closed)
+
+        for call in mock_select.call_args_list:
+            self.assertTrue(call[0][3] <= 0.05)
+
+    @patch('libcloud.compute.ssh.select.select')
+    def test_iter_run_reads_one_chunk_per_stream(self, mock_select):
+        chan = FakeChannel(batches=[])
+        chan.stdout = [b'1', b'2', b'3']
+        chan.stderr = [b'a']
+        client = self._get_client_with_channel(chan)
+
+        self.assertEqual(list(client.iter_run('ls')),
+                         [('stdout', '1'), ('stderr', 'a'), ('stdout', '2'),
+                          ('stdout', '3'), ('exit_status', 0)])
+        self.assertEqual(mock_select.call_count, 0)
+
+    @patch('libcloud.compute.ssh.select.select')
+    def test_run_timeout_with_endless_output(self, mock_select):
+        chan = FakeChannel(batches=[], status=None)
+        chan.recv_ready = lambda: True
+        chan.recv = lambda size: b'y' * size
+        client = self._get_client_with_channel(chan)
+
+        chunks = []
+        self.assertRaises(SSHCommandTimeoutError, client.run, 'yes',
+                          timeout=0.05, stdout_handler=chunks.append,
+                          max_buffer_size=4)
+        self.assertTrue(chan.closed)
+        self.assertTrue(chunks)
+
+        for chunk in chunks:
+            self.assertEqual(len(chunk), client.CHUNK_SIZE)
+
+    def test_wait_for_channel_after_eof(self):
+        client = ParamikoSSHClient(hostname='dummy.host.org',
+                                   username='ubuntu')
+        chan = FakeChannel(batches=[])
+        chan.eof_received = True
+        chan.status_event = Mock()
+
+        client._wait_for_channel(chan=chan, timeout=1)
+        chan.status_event.wait.assert_called_once_with(1)
+
+
+class FakeChannel(object):
+    """
+    Channel which receives a batch of (stdout, stderr) data every time it
+    is waited on.
+    """
+
+    def __init__(self, batches, status=0):
+        self.batches = list(batches)
+        self.status = status
+        self.stdout = []
+        self.stderr = []
+        self.closed = False
+        self.eof_received = False
+        self.status_event = threading.Event()
+        self.deliver()
+
+    def deliver(self):
+        if self.batches:
+            stdout, stderr = self.batches.pop(0)
+            self.stdout.extend([stdout] if stdout else [])
+            self.stderr.extend([stderr] if stderr else [])
+
+    def exec_command(self, cmd):
+        pass
+
+    def makefile(self, mode, bufsize):
+        return Mock()
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv(self, size):
+        return self.stdout.pop(0)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv_stderr(self, size):
+        return self.stderr.pop(0)
+
+    def exit_status_ready(self):
+        return not self.batches and self.status is not None
+
+    def recv_exit_status(self):
+        return self.status
+
+    def close(self):
+        self.closed = True
 
 
 class ShellOutSSHClientTests(LibcloudTestCase):
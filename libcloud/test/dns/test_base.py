@@ -14,13 +14,18 @@
 
 from __future__ import with_statement
 
+import os
 import sys
+import time
 import tempfile
 
 from mock import Mock
 
 from libcloud.test import unittest
+from libcloud.utils.py3 import StringIO
+from libcloud.common.types import LibcloudError
 from libcloud.dns.base import DNSDriver, Zone, Record
+from libcloud.dns.base import RecordChange
 from libcloud.dns.types import RecordType
 
 
@@ -103,6 +108,312 @@ class BaseTestCase(unittest.TestCase):
             self.assertRegexpMatches(lines[10], r'example.com\.\s+900\s+IN\s+MX\s+10\s+mx.example.com')
             self.assertRegexpMatches(lines[11], r'example.com\.\s+900\s+IN\s+SRV\s+20\s+10 3333 example.com')
 
+    def test_record_change_validation(self):
+        record = Record(id=1, name='www', type=RecordType.A, data='127.0.0.1',
+                        zone=None, driver=self.driver)
+
+        self.assertRaises(ValueError, RecordChange, action='rename')
+        self.assertRaises(ValueError, RecordChange, action='create',
+                          name='www', type=RecordType.A)
+        self.assertRaises(ValueError, RecordChange, action='delete')
+
+        change = RecordChange.update(record, data='127.0.0.2')
+        self.assertEqual(change.action, RecordChange.UPDATE)
+        self.assertEqual(change.name, 'www')
+        self.assertEqual(change.type, RecordType.A)
+        self.assertEqual(change.data, '127.0.0.2')
+
+    def test_apply_changes(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        record1 = Record(id=1, name='www', type=RecordType.A,
+                         data='127.0.0.1', zone=zone, driver=self.driver)
+        record2 = Record(id=2, name='mail', type=RecordType.A,
+                         data='127.0.0.2', zone=zone, driver=self.driver)
+        created = Record(id=3, name='ftp', type=RecordType.A,
+                         data='127.0.0.3', zone=zone, driver=self.driver)
+        updated = Record(id=1, name='www', type=RecordType.A,
+                         data='127.0.0.4', zone=zone, driver=self.driver)
+
+        self.driver.create_record = Mock(return_value=created)
+        self.driver.update_record = Mock(return_value=updated)
+        self.driver.delete_record = Mock(side_effect=[False])
+
+        changes = [
+            RecordChange.create('ftp', RecordType.A, '127.0.0.3'),
+            RecordChange.update(record1, data='127.0.0.4'),
+            RecordChange.delete(record2)
+        ]
+        results = self.driver.apply_changes(zone=zone, changes=changes,
+                                            max_workers=2)
+
+        self.assertEqual([result.change for result in results], changes)
+        self.assertEqual(results[0].record, created)
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[1].record, updated)
+        self.assertTrue(results[1].success)
+        self.assertFalse(results[2].success)
+        self.assertTrue(isinstance(results[2].error, LibcloudError))
+
+        self.driver.create_record.assert_called_once_with(
+            name='ftp', zone=zone, type=RecordType.A, data='127.0.0.3',
+            extra=None)
+        self.driver.update_record.assert_called_once_with(
+            record=record1, name='www', type=RecordType.A, data='127.0.0.4',
+            extra=None)
+        self.driver.delete_record.assert_called_once_with(record=record2)
+
+    def test_apply_changes_order(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        record1 = Record(id=1, name='www', type=RecordType.CNAME,
+                         data='example.com.', zone=zone, driver=self.driver)
+        record2 = Record(id=2, name='mail', type=RecordType.A,
+                         data='127.0.0.2', zone=zone, driver=self.driver)
+        calls = []
+
+        def delete_record(record):
+            # Slow deletes must still finish before anything is created
+            time.sleep(0.05)
+            calls.append('delete')
+            return True
+
+        def update_record(record, **kwargs):
+            time.sleep(0.02)
+            calls.append('update')
+            return record
+
+        def create_record(**kwargs):
+            calls.append('create')
+            return record1
+
+        self.driver.delete_record = delete_record
+        self.driver.update_record = update_record
+        self.driver.create_record = create_record
+
+        changes = [
+            RecordChange.create('www', RecordType.A, '127.0.0.1'),
+            RecordChange.create('ftp', RecordType.A, '127.0.0.3'),
+            RecordChange.update(record2, data='127.0.0.4'),
+            RecordChange.delete(record1)
+        ]
+        results = self.driver.apply_changes(zone=zone, changes=changes,
+                                            max_workers=4)
+
+        self.assertTrue(all([result.success for result in results]))
+        self.assertEqual(calls, ['delete', 'update', 'create', 'create'])
+
+    def _get_sync_zone(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        records = [
+            Record(id=1, name='', type=RecordType.SOA,
+                   data='ns1.example.com. admin.example.com. 1 2 3 4 5',
+                   zone=zone, driver=self.driver),
+            Record(id=2, name='www', type=RecordType.A, data='127.0.0.1',
+                   zone=zone, driver=self.driver, ttl=300,
+                   extra={'ttl': 300}),
+            Record(id=3, name='www', type=RecordType.A, data='127.0.0.2',
+                   zone=zone, driver=self.driver, ttl=300,
+                   extra={'ttl': 300}),
+            Record(id=4, name='mail', type=RecordType.A, data='127.0.0.3',
+                   zone=zone, driver=self.driver, ttl=300,
+                   extra={'ttl': 300}),
+            Record(id=5, name='ftp', type=RecordType.A, data='127.0.0.4',
+                   zone=zone, driver=self.driver, ttl=300,
+                   extra={'ttl': 300}),
+        ]
+
+        self.driver.list_records = Mock(return_value=records)
+
+        return zone, records
+
+    def test_get_record_changes(self):
+        zone, records = self._get_sync_zone()
+        desired = [
+            # Unchanged
+            {'name': 'www', 'type': RecordType.A, 'data': '127.0.0.1',
+             'extra': {'ttl': '300'}},
+            # New TTL
+            {'name': 'www', 'type': RecordType.A, 'data': '127.0.0.2',
+             'extra': {'ttl': 600}},
+            # New data
+            {'name': 'mail', 'type': RecordType.A, 'data': '127.0.0.5'},
+            # New record
+            {'name': 'mail', 'type': RecordType.A, 'data': '127.0.0.6'},
+            {'name': 'mail', 'type': RecordType.MX, 'data': 'mail',
+             'extra': {'priority': 10}},
+        ]
+
+        changes = self.driver.get_record_changes(zone=zone, records=desired)
+
+        self.assertEqual([(change.action, change.record) for change in
+                          changes],
+                         [(RecordChange.DELETE, records[4]),
+                          (RecordChange.UPDATE, records[2]),
+                          (RecordChange.UPDATE, records[3]),
+                          (RecordChange.CREATE, None),
+                          (RecordChange.CREATE, None)])
+        self.assertEqual(changes[1].data, '127.0.0.2')
+        self.assertEqual(changes[1].extra, {'ttl': 600})
+        self.assertEqual(changes[2].data, '127.0.0.5')
+        self.assertEqual((changes[3].name, changes[3].data),
+                         ('mail', '127.0.0.6'))
+        self.assertEqual((changes[4].type, changes[4].extra),
+                         (RecordType.MX, {'priority': 10}))
+
+        changes = self.driver.get_record_changes(zone=zone, records=desired,
+                                                 delete=False)
+        self.assertEqual([change.action for change in changes],
+                         [RecordChange.UPDATE, RecordChange.UPDATE,
+                          RecordChange.CREATE, RecordChange.CREATE])
+
+    def test_get_record_changes_unchanged_zone(self):
+        zone, records = self._get_sync_zone()
+        desired = [{'name': record.name, 'type': record.type,
+                    'data': record.data} for record in records[1:]]
+
+        changes = self.driver.get_record_changes(zone=zone, records=desired)
+        self.assertEqual(changes, [])
+
+        changes = self.driver.get_record_changes(zone=zone, records=desired,
+                                                 ignore_types=None)
+        self.assertEqual([(change.action, change.record) for change in
+                          changes], [(RecordChange.DELETE, records[0])])
+
+    def test_sync_records(self):
+        zone, records = self._get_sync_zone()
+        desired = [{'name': 'www', 'type': RecordType.A, 'data': '127.0.0.1'}]
+        self.driver.apply_changes = Mock(return_value=[])
+
+        changes = self.driver.sync_records(zone=zone, records=desired,
+                                           dry_run=True)
+        self.assertEqual(len(changes), 3)
+        self.assertFalse(self.driver.apply_changes.called)
+
+        self.driver.sync_records(zone=zone, records=desired, max_workers=2)
+        call_kwargs = self.driver.apply_changes.call_args[1]
+        self.assertEqual(len(call_kwargs['changes']), 3)
+        self.assertEqual(call_kwargs['max_workers'], 2)
+
+    def test_export_zone_to_bind_file_object(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=None,
+                    driver=self.driver)
+        records = [
+            Record(id=2, name='www', type=RecordType.A, data='127.0.0.1',
+                   zone=zone, driver=self.driver),
+            Record(id=1, name='', type=RecordType.MX, data='mx.example.com',
+                   zone=zone, driver=self.driver,
+                   extra={'priority': 10, 'ttl': 300}),
+        ]
+
+        self.driver.iterate_records = Mock(return_value=iter(records))
+        self.driver.list_records = Mock()
+
+        fp = StringIO()
+        self.driver.export_zone_to_bind_file_object(zone=zone, fp=fp)
+        lines = fp.getvalue().split('\n')
+
+        # Records are written in the order in which they are retrieved
+        self.assertFalse(self.driver.list_records.called)
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[2], '')
+        self.assertEqual(lines[3], 'www.example.com.\tIN\tA\t127.0.0.1')
+        self.assertEqual(lines[4],
+                         'example.com.\t300\tIN\tMX\t10\tmx.example.com.')
+
+    def test_parse_bind_zone_file(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        file_path = os.path.join(os.path.dirname(__file__), 'fixtures',
+                                 'bind', 'example.com.zone')
+
+        records = list(self.driver.parse_bind_zone_file(zone=zone,
+                                                        file_path=file_path))
+        values = [(record.name, record.type, record.data, record.ttl,
+                   record.extra.get('priority', None))
+                  for record in records]
+
+        self.assertEqual(values, [
+            ('', RecordType.SOA, 'ns1.example.com. admin.example.com. '
+             '2016010101 7200 3600 1209600 300', 3600, None),
+            ('', RecordType.NS, 'ns1.example.com.', 3600, None),
+            ('', RecordType.MX, 'mail.example.com.', 3600, 10),
+            ('www', RecordType.A, '192.0.2.1', 300, None),
+            ('www', RecordType.A, '192.0.2.2', 300, None),
+            ('mail', RecordType.A, '192.0.2.3', 3600, None),
+            ('txt', RecordType.TXT, 'v=spf1 mx; -allsecond "part"', 3600,
+             None),
+            ('', RecordType.AAAA, '2001:db8::1', 3600, None),
+            ('_sip._tcp', RecordType.SRV, '5 5060 sip.example.com.', 86400,
+             20),
+            ('ftp.sub', RecordType.CNAME, 'www.example.com.', 3600, None),
+            ('www.sub', RecordType.CNAME, 'ftp.sub.example.com.', 3600, None),
+            ('alias.sub', RecordType.CNAME, 'sub.example.com.', 3600, None)
+        ])
+        self.assertEqual(records[0].zone, zone)
+        self.assertEqual(records[0].id, None)
+
+    def test_parse_bind_zone_file_export_round_trip(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        mock_records = [Record(driver=self.driver, zone=zone, **values)
+                        for values in MOCK_RECORDS_VALUES]
+        self.driver.list_records = Mock(return_value=mock_records)
+
+        self.driver.export_zone_to_bind_zone_file(zone=zone,
+                                                  file_path=self.tmp_path)
+        records = self.driver.parse_bind_zone_file(zone=zone,
+                                                   file_path=self.tmp_path)
+
+        for record, mock_record in zip(records, mock_records):
+            self.assertEqual(record.name, mock_record.name)
+            self.assertEqual(record.type, mock_record.type)
+            self.assertEqual(record.ttl, mock_record.extra.get('ttl', 900))
+            self.assertEqual(record.extra.get('priority', None),
+                             mock_record.extra.get('priority', None))
+            self.assertEqual(record.data.rstrip('.'), mock_record.data)
+
+    def test_parse_bind_zone_file_errors(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        invalid_lines = [
+            ['$INCLUDE other.zone'],
+            ['\tIN A 127.0.0.1'],
+            ['www IN A'],
+            ['www IN FOO bar'],
+            ['www.example.org. IN A 127.0.0.1'],
+            ['www 1x IN A 127.0.0.1'],
+            ['@ IN SOA ns1.example.com. admin.example.com. (', '1 2 3'],
+        ]
+
+        for lines in invalid_lines:
+            self.assertRaises(ValueError, list,
+                              self.driver._parse_bind_lines(zone=zone,
+                                                            lines=lines))
+
+    def test_import_bind_zone_file(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        file_path = os.path.join(os.path.dirname(__file__), 'fixtures',
+                                 'bind', 'example.com.zone')
+        imported = []
+
+        def sync_records(zone, records, delete, ignore_types, max_workers):
+            imported.extend(records)
+            self.assertFalse(delete)
+            return []
+
+        self.driver.sync_records = sync_records
+        self.driver.import_bind_zone_file(zone=zone, file_path=file_path)
+
+        # SOA and NS records are managed by the provider
+        self.assertEqual(len(imported), 10)
+        self.assertEqual(imported[0], {'name': '', 'type': RecordType.MX,
+                                       'data': 'mail.example.com.',
+                                       'extra': {'ttl': 3600,
+                                                 'priority': 10}})
+
 
 if __name__ == '__main__':
     sys.exit(unittest.main())
@@ -12,15 +12,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 
+import os
 import sys
+import json
 import unittest
 
 from libcloud.utils.py3 import httplib
 
 from libcloud.dns.types import ZoneDoesNotExistError
 from libcloud.dns.types import RecordDoesNotExistError
+from libcloud.dns.base import RecordChange
 from libcloud.dns.drivers.google import GoogleDNSDriver
 from libcloud.common.google import GoogleBaseAuthConnection
+from libcloud.common.google import ResourceNotFoundError
 
 from libcloud.test.common.test_google import GoogleAuthMockHttp, GoogleTestCase
 from libcloud.test import MockHttp
@@ -119,9 +123,99 @@ class GoogleTests(GoogleTestCase):
         self.assertEqual(records['deletions'][0].name, 'bar.example.com.')
         self.assertEqual(records['deletions'][0].type, 'A')
 
+    def test_apply_changes(self):
+        zone = self.driver.get_zone('example-com')
+        record = self.driver.list_records(zone)[2]
+        GoogleDNSMockHttp.changes = []
+
+        changes = [
+            RecordChange.create('foo.example.com.', 'A',
+                                {'ttl': 300, 'rrdatas': ['127.0.0.1']}),
+            RecordChange.delete(record)
+        ]
+        results = self.driver.apply_changes(zone, changes)
+
+        self.assertEqual(len(GoogleDNSMockHttp.changes), 1)
+        body = GoogleDNSMockHttp.changes[0]
+        self.assertEqual(body['additions'],
+                         [{'name': 'foo.example.com.', 'type': 'A',
+                           'ttl': 300, 'rrdatas': ['127.0.0.1']}])
+        self.assertEqual(body['deletions'],
+                         [{'name': 'foo.example.com.', 'type': 'A',
+                           'ttl': 3600, 'rrdatas': ['1.2.3.4']}])
+
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[0].record.name, 'foo.example.com.')
+        self.assertEqual(results[0].record.type, 'A')
+        self.assertTrue(results[1].success)
+        self.assertEqual(results[1].record, record)
+
+    def test_apply_changes_failed_request(self):
+        zone = self.driver.get_zone('example-com')
+        GoogleDNSMockHttp.type = 'ZONE_DOES_NOT_EXIST'
+
+        changes = [
+            RecordChange.create('foo.example.com.', 'A',
+                                {'ttl': 300, 'rrdatas': ['127.0.0.1']}),
+            RecordChange.create('bar.example.com.', 'A',
+                                {'ttl': 300, 'rrdatas': ['127.0.0.2']})
+        ]
+        results = self.driver.apply_changes(zone, changes)
+
+        for result in results:
+            self.assertFalse(result.success)
+            self.assertTrue(isinstance(result.error, ResourceNotFoundError))
+
+    def test_get_record_changes(self):
+        zone = self.driver.get_zone('example-com')
+        records = self.driver.list_records(zone)
+        desired = [
+            {'name': 'foo.example.com.', 'type': 'A',
+             'data': {'ttl': 3600, 'rrdatas': ['1.2.3.4']}},
+            {'name': 'example.com.', 'type': 'NS',
+             'data': {'ttl': 300, 'rrdatas': ['ns1.example.com.']}}
+        ]
+
+        changes = self.driver.get_record_changes(zone, desired)
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].action, RecordChange.UPDATE)
+        self.assertEqual(changes[0].record.id, records[0].id)
+        self.assertEqual(changes[0].data, desired[1]['data'])
+
+    def test_import_bind_zone_file_again(self):
+        zone = self.driver.get_zone('example-com')
+        file_path = os.path.join(os.path.dirname(__file__), 'fixtures',
+                                 'bind', 'example.com.zone')
+        current = []
+        self.driver.iterate_records = lambda zone: iter(current)
+        GoogleDNSMockHttp.changes = []
+
+        self.driver.import_bind_zone_file(zone=zone, file_path=file_path)
+
+        additions = GoogleDNSMockHttp.changes[0]['additions']
+        self.assertEqual(len(additions), 9)
+        self.assertTrue({'name': 'www.example.com.', 'type': 'A',
+                         'ttl': 300,
+                         'rrdatas': ['192.0.2.1', '192.0.2.2']} in additions)
+        self.assertTrue({'name': 'txt.example.com.', 'type': 'TXT',
+                         'ttl': 3600,
+                         'rrdatas': ['"v=spf1 mx; -allsecond \\"part\\""']}
+                        in additions)
+
+        # Importing the records which now exist doesn't change anything
+        current.extend(self.driver._to_record(item, zone)
+                       for item in additions)
+        results = self.driver.import_bind_zone_file(zone=zone,
+                                                    file_path=file_path)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(GoogleDNSMockHttp.changes), 1)
+
 
 class GoogleDNSMockHttp(MockHttp):
     fixtures = DNSFileFixtures('google')
+    changes = []
 
     def _dns_v1_projects_project_name_managedZones(
             self, method, url, body, headers):
@@ -156,6 +250,7 @@ class GoogleDNSMockHttp(MockHttp):
 
     def _dns_v1_projects_project_name_managedZones_example_com_changes(
             self, method, url, body, headers):
+        self.changes.append(json.loads(body) if body else {})
         body = self.fixtures.load('record_changes.json')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
@@ -175,6 +270,12 @@ class GoogleDNSMockHttp(MockHttp):
         body = self.fixtures.load('no_record.json')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
+    def _dns_v1_projects_project_name_managedZones_example_com_changes_ZONE_DOES_NOT_EXIST(
+            self, method, url, body, headers):
+        body = self.fixtures.load('get_zone_does_not_exists.json')
+        return (httplib.NOT_FOUND, body, {},
+                httplib.responses[httplib.NOT_FOUND])
+
     def _dns_v1_projects_project_name_managedZones_example_com_rrsets_ZONE_DOES_NOT_EXIST(
             self, method, url, body, headers):
         body = self.fixtures.load('get_zone_does_not_exists.json')
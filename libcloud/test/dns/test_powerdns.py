@@ -18,7 +18,7 @@ import json
 
 from libcloud.utils.py3 import httplib
 
-from libcloud.dns.base import Record, Zone
+from libcloud.dns.base import Record, RecordChange, Zone
 from libcloud.dns.drivers.powerdns import PowerDNSDriver
 from libcloud.dns.types import ZoneDoesNotExistError, ZoneAlreadyExistsError
 from libcloud.dns.types import RecordType
@@ -133,10 +133,104 @@ class PowerDNSTestCase(LibcloudTestCase):
         PowerDNSMockHttp.type = 'MISSING'
         self.assertFalse(self.test_zone.delete())
 
+    def test_apply_changes(self):
+        PowerDNSMockHttp.patches = []
+        changes = [
+            RecordChange.create('www.example.com', RecordType.A, '192.0.2.2',
+                                extra={'ttl': 300}),
+            RecordChange.create('www.example.com', RecordType.A, '192.0.2.3',
+                                extra={'ttl': 300}),
+            RecordChange.create('ftp.example.com', RecordType.A, '192.0.2.4'),
+            RecordChange.update(self.test_record, name='mail.example.com',
+                                extra={'ttl': 600})
+        ]
+        results = self.driver.apply_changes(self.test_zone, changes)
+
+        self.assertEqual(len(PowerDNSMockHttp.patches), 1)
+        rrsets = PowerDNSMockHttp.patches[0]['rrsets']
+        self.assertEqual([(rrset['name'], rrset['changetype'],
+                           len(rrset.get('records', [])))
+                          for rrset in rrsets],
+                         [('www.example.com', 'REPLACE', 3),
+                          ('', 'DELETE', 0),
+                          ('mail.example.com', 'REPLACE', 1)])
+
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[0].record.data, '192.0.2.2')
+        self.assertEqual(results[0].record.ttl, 300)
+        self.assertTrue(results[1].success)
+        self.assertFalse(results[2].success)
+        self.assertTrue(isinstance(results[2].error, ValueError))
+        self.assertTrue(results[3].success)
+        self.assertEqual(results[3].record.name, 'mail.example.com')
+        self.assertEqual(results[3].record.data, '192.0.2.1')
+
+    def test_apply_changes_keeps_unchanged_records_of_record_set(self):
+        PowerDNSMockHttp.patches = []
+        records = [
+            {'name': 'www.example.com', 'type': RecordType.A,
+             'data': '192.0.5.1'},
+            {'name': 'www.example.com', 'type': RecordType.A,
+             'data': '192.0.2.2', 'extra': {'ttl': 300}},
+        ]
+        results = self.driver.sync_records(self.test_zone, records,
+                                           delete=False)
+
+        self.assertEqual([result.change.action for result in results],
+                         [RecordChange.CREATE])
+        self.assertTrue(results[0].success)
+
+        rrsets = PowerDNSMockHttp.patches[0]['rrsets']
+        self.assertEqual(len(rrsets), 1)
+        self.assertEqual(rrsets[0]['changetype'], 'REPLACE')
+        self.assertEqual([(record['content'], record['ttl'])
+                          for record in rrsets[0]['records']],
+                         [('192.0.5.1', 86400), ('192.0.2.2', 300)])
+
+    def test_apply_changes_delete_keeps_other_records_of_record_set(self):
+        PowerDNSMockHttp.patches = []
+        records = self.driver.list_records(self.test_zone)
+        record = [record for record in records
+                  if record.name == 'www.example.com'][0]
+        changes = [
+            RecordChange.create('www.example.com', RecordType.A, '192.0.2.2',
+                                extra={'ttl': 300}),
+            RecordChange.delete(record)
+        ]
+        results = self.driver.apply_changes(self.test_zone, changes)
+
+        self.assertTrue(results[0].success)
+        self.assertTrue(results[1].success)
+
+        rrsets = PowerDNSMockHttp.patches[0]['rrsets']
+        self.assertEqual(len(rrsets), 1)
+        self.assertEqual(rrsets[0]['changetype'], 'REPLACE')
+        self.assertEqual([record['content'] for record in rrsets[0]['records']],
+                         ['192.0.2.2'])
+
+    def test_parse_bind_names_in_record_data(self):
+        lines = ['$ORIGIN example.com.',
+                 'ftp 300 IN CNAME www',
+                 '@ 300 IN MX 10 mail.example.com.']
+        records = list(self.driver._parse_bind_lines(zone=self.test_zone,
+                                                     lines=lines))
+
+        self.assertEqual([record.data for record in records],
+                         ['www.example.com', 'mail.example.com'])
+
+    def test_apply_changes_missing_zone(self):
+        PowerDNSMockHttp.type = 'MISSING'
+        changes = [RecordChange.delete(self.test_record)]
+        results = self.driver.apply_changes(self.test_zone, changes)
+
+        self.assertFalse(results[0].success)
+        self.assertTrue(isinstance(results[0].error, ZoneDoesNotExistError))
+
 
 class PowerDNSMockHttp(MockHttp):
     fixtures = DNSFileFixtures('powerdns')
     base_headers = {'content-type': 'application/json'}
+    patches = []
 
     def _servers_localhost_zones(self, method, url, body, headers):
         if method == 'GET':
@@ -160,6 +254,7 @@ class PowerDNSMockHttp(MockHttp):
             # create/update/delete_record()
             # Don't bother with a fixture for these operations, because we do
             # nothing with the parsed body anyway.
+            self.patches.append(json.loads(args[1]))
             body = ''
         elif method == 'DELETE':
             # delete_zone()
@@ -181,8 +276,9 @@ class PowerDNSMockHttp(MockHttp):
                 'Unprocessable Entity')
 
     def _servers_localhost_zones_example_com__MISSING(self, *args, **kwargs):
-        return (httplib.UNPROCESSABLE_ENTITY, 'Could not find domain',
-                self.base_headers, 'Unprocessable Entity')
+        body = json.dumps({'error': "Could not find domain 'example.com.'"})
+        return (httplib.UNPROCESSABLE_ENTITY, body, self.base_headers,
+                'Unprocessable Entity')
 
 
 if __name__ == '__main__':
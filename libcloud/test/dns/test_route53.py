@@ -13,14 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
 import unittest
 
 from libcloud.utils.py3 import httplib
+from libcloud.utils.py3 import ET
 
 from libcloud.dns.types import RecordType, ZoneDoesNotExistError
 from libcloud.dns.types import RecordDoesNotExistError
+from libcloud.dns.base import Zone, Record, RecordChange
 from libcloud.dns.drivers.route53 import Route53DNSDriver
+from libcloud.dns.drivers.route53 import InvalidChangeBatch, NAMESPACE
 from libcloud.test import MockHttp
 from libcloud.test.file_fixtures import DNSFileFixtures
 from libcloud.test.secrets import DNS_PARAMS_ROUTE53
@@ -319,9 +323,128 @@ class Route53Tests(unittest.TestCase):
         else:
             self.fail('Exception was not thrown')
 
+    def test_apply_changes(self):
+        zone = self.driver.list_zones()[0]
+        records = self.driver.list_records(zone=zone)
+        Route53MockHttp.type = 'BATCH'
+        Route53MockHttp.changesets = []
+
+        changes = [
+            RecordChange.create('ftp', RecordType.A, '127.0.0.1',
+                                extra={'ttl': 300}),
+            RecordChange.create('txt', RecordType.TXT, 'foo bar'),
+            RecordChange.update(records[1], data='127.0.0.2'),
+            RecordChange.delete(records[0])
+        ]
+        results = self.driver.apply_changes(zone=zone, changes=changes)
+
+        self.assertEqual(len(Route53MockHttp.changesets), 1)
+        actions = [findtext(change, 'Action')
+                   for change in Route53MockHttp.changesets[0]]
+        self.assertEqual(actions, ['CREATE', 'CREATE', 'DELETE', 'CREATE',
+                                   'DELETE'])
+
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(results[0].record.id, 'A:ftp')
+        self.assertEqual(results[0].record.ttl, 300)
+        self.assertEqual(results[1].record.data, '"foo bar"')
+        self.assertEqual(results[2].record.name, 'www')
+        self.assertEqual(results[2].record.data, '127.0.0.2')
+        self.assertEqual(results[2].record.extra, records[1].extra)
+        self.assertEqual(results[3].record, records[0])
+
+    def test_apply_changes_multiple_batches(self):
+        zone = self.driver.list_zones()[0]
+        record = self.driver.list_records(zone=zone)[1]
+        Route53MockHttp.type = 'BATCH'
+        Route53MockHttp.changesets = []
+        self.driver.MAX_CHANGES_PER_BATCH = 2
+
+        changes = [
+            RecordChange.create('ftp', RecordType.A, '127.0.0.1'),
+            RecordChange.update(record, data='127.0.0.2'),
+            RecordChange.create('mail', RecordType.A, '127.0.0.3')
+        ]
+        results = self.driver.apply_changes(zone=zone, changes=changes)
+
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual([len(changeset) for changeset in
+                          Route53MockHttp.changesets], [1, 2, 1])
+
+    def test_apply_changes_rejected_batch(self):
+        zone = self.driver.list_zones()[0]
+        record = self.driver.list_records(zone=zone)[0]
+        Route53MockHttp.type = 'RECORD_DOES_NOT_EXIST'
+
+        changes = [
+            RecordChange.create('ftp', RecordType.A, '127.0.0.1'),
+            RecordChange.delete(record)
+        ]
+        results = self.driver.apply_changes(zone=zone, changes=changes)
+
+        for result in results:
+            self.assertFalse(result.success)
+            self.assertTrue(isinstance(result.error, InvalidChangeBatch))
+            self.assertEqual(result.record, None)
+
+    def test_import_bind_zone_file_again(self):
+        zone = Zone(id='47234', domain='example.com.', type='master', ttl=0,
+                    driver=self.driver)
+        file_path = os.path.join(os.path.dirname(__file__), 'fixtures',
+                                 'bind', 'example.com.zone')
+        current = []
+        self.driver.iterate_records = lambda zone: iter(current)
+        Route53MockHttp.type = 'BATCH'
+        Route53MockHttp.changesets = []
+
+        self.driver.import_bind_zone_file(zone=zone, file_path=file_path)
+
+        changes = Route53MockHttp.changesets[0]
+        self.assertEqual(len(changes), 10)
+        values = [change.findtext('{%s}ResourceRecordSet/{%s}ResourceRecords/'
+                                  '{%s}ResourceRecord/{%s}Value' %
+                                  (NAMESPACE, NAMESPACE, NAMESPACE, NAMESPACE))
+                  for change in changes]
+        self.assertTrue('"v=spf1 mx; -allsecond \\"part\\""' in values)
+        self.assertTrue('20 5 5060 sip.example.com.' in values)
+
+        # List the created record sets the same way Route53 returns them
+        response = ET.Element('{%s}ListResourceRecordSetsResponse' %
+                              (NAMESPACE))
+        record_sets = ET.SubElement(response, '{%s}ResourceRecordSets' %
+                                    (NAMESPACE))
+
+        for change in changes:
+            record_sets.append(change.find('{%s}ResourceRecordSet' %
+                                           (NAMESPACE)))
+
+        current.extend(self.driver._to_records(data=response, zone=zone))
+        results = self.driver.import_bind_zone_file(zone=zone,
+                                                    file_path=file_path)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(Route53MockHttp.changesets), 1)
+
+    def test_get_record_changes_txt_quotes(self):
+        zone = self.driver.list_zones()[0]
+        record = Record(id='TXT:txt', name='txt', type=RecordType.TXT,
+                        data='"foo \\"bar\\"" " baz"', zone=zone,
+                        driver=self.driver, extra={'ttl': 300})
+        self.driver.iterate_records = lambda zone: iter([record])
+
+        changes = self.driver.get_record_changes(zone, [
+            {'name': 'txt', 'type': RecordType.TXT, 'data': 'foo "bar" baz'}
+        ])
+        self.assertEqual(changes, [])
+
+
+def findtext(element, name):
+    return element.findtext('{%s}%s' % (NAMESPACE, name))
+
 
 class Route53MockHttp(MockHttp):
     fixtures = DNSFileFixtures('route53')
+    changesets = []
 
     def _2012_02_29_hostedzone_47234(self, method, url, body, headers):
         body = self.fixtures.load('get_zone.xml')
@@ -370,6 +493,14 @@ class Route53MockHttp(MockHttp):
         body = self.fixtures.load('get_zone.xml')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
+    def _2012_02_29_hostedzone_47234_rrset_BATCH(self, method, url, body,
+                                                 headers):
+        changes = ET.XML(body).findall('{%s}ChangeBatch/{%s}Changes/{%s}Change'
+                                       % (NAMESPACE, NAMESPACE, NAMESPACE))
+        self.changesets.append(changes)
+        body = self.fixtures.load('list_records.xml')
+        return (httplib.OK, body, {}, httplib.responses[httplib.OK])
+
 
 if __name__ == '__main__':
     sys.exit(unittest.main())
@@ -344,6 +344,23 @@ class AzureBlobsMockHttp(MockHttp, unittest.TestCase):
         # test_upload_object_invalid_file_size
         self._assert_content_length_header_is_string(headers=headers)
 
+        if headers.get('If-Match', '"0x8CFB877BB56A6FB"') != \
+                '"0x8CFB877BB56A6FB"':
+            # test_download_object_range_concurrency_object_changed
+            return (httplib.PRECONDITION_FAILED,
+                    '',
+                    {},
+                    httplib.responses[httplib.PRECONDITION_FAILED])
+
+        if 'Range' in headers:
+            # test_download_object_range_concurrency
+            start, end = headers['Range'].split('=')[1].split('-')
+            body = generate_random_data(int(end) - int(start) + 1)
+            return (httplib.PARTIAL_CONTENT,
+                    body,
+                    headers,
+                    httplib.responses[httplib.PARTIAL_CONTENT])
+
         body = generate_random_data(1000)
         return (httplib.OK,
                 body,
@@ -605,6 +622,39 @@ class AzureBlobsTests(unittest.TestCase):
                                              delete_on_failure=True)
         self.assertTrue(result)
 
+    def test_download_object_range_concurrency(self):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = os.path.abspath(__file__) + '.temp'
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=True,
+                                             delete_on_failure=True,
+                                             ex_range_concurrency=2,
+                                             ex_range_size=1000)
+        self.assertTrue(result)
+        self.assertEqual(os.path.getsize(destination_path), 1000)
+
+    def test_download_object_range_concurrency_object_changed(self):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000,
+                     hash='0x8CFB877BB56A6FC', extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = os.path.abspath(__file__) + '.temp'
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=True,
+                                             delete_on_failure=True,
+                                             ex_range_concurrency=2,
+                                             ex_range_size=500)
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(destination_path))
+
     def test_download_object_invalid_file_size(self):
         self.mock_response_klass.type = 'INVALID_SIZE'
         container = Container(name='foo_bar_container', extra={},
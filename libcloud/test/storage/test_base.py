@@ -13,18 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
 import hashlib
 
 from libcloud.utils.py3 import httplib
 from io import BytesIO
 
-import mock
 from mock import Mock
 
 from libcloud.utils.py3 import StringIO
 from libcloud.utils.py3 import b
-from libcloud.utils.py3 import PY2
 
 from libcloud.storage.base import StorageDriver
 from libcloud.storage.base import DEFAULT_CONTENT_TYPE
@@ -135,35 +134,36 @@ class BaseStorageTests(unittest.TestCase):
                                 request_path='/',
                                 stream=iterator)
 
-    @mock.patch('libcloud.utils.files.exhaust_iterator')
-    @mock.patch('libcloud.utils.files.read_in_chunks')
-    def test_upload_object_hash_calculation_is_efficient(self, mock_read_in_chunks,
-                                                         mock_exhaust_iterator):
-        # Verify that we don't buffer whole file in memory when calculating
-        # object has when iterator has __next__ method, but instead read and calculate hash in chunks
-        size = 100
+    def _consume_request_data(self, *args, **kwargs):
+        # Mimic the HTTP client reading the request body
+        data = kwargs['data']
 
-        self.driver1.connection = Mock()
+        if hasattr(data, 'read'):
+            while len(data.read(10)) > 0:
+                pass
+        else:
+            for _ in data:
+                pass
 
-        # stream has __next__ method and next() method
-        mock_read_in_chunks.return_value = 'a' * size
+        return Mock()
 
-        iterator = BodyStream('a' * size)
-        self.assertTrue(hasattr(iterator, '__next__'))
-        self.assertTrue(hasattr(iterator, 'next'))
+    def test_upload_object_hash_calculation_is_single_pass(self):
+        # Verify that the hash is calculated while the data is being sent
+        # instead of reading the data again once it has been sent
+        size = 100
 
-        upload_func = Mock()
-        upload_func.return_value = True, '', size
+        self.driver1.connection = Mock()
+        self.driver1.connection.request.side_effect = \
+            self._consume_request_data
 
-        self.assertEqual(mock_read_in_chunks.call_count, 0)
-        self.assertEqual(mock_exhaust_iterator.call_count, 0)
+        def iterator():
+            for _ in range(size):
+                yield 'a'
 
         result = self.driver1._upload_object(object_name='test1',
                                              content_type=None,
-                                             upload_func=upload_func,
-                                             upload_func_kwargs={},
                                              request_path='/',
-                                             stream=iterator)
+                                             stream=iterator())
 
         hasher = hashlib.md5()
         hasher.update(b('a') * size)
@@ -171,35 +171,13 @@ class BaseStorageTests(unittest.TestCase):
 
         self.assertEqual(result['data_hash'], expected_hash)
         self.assertEqual(result['bytes_transferred'], size)
+        self.assertEqual(self.driver1.connection.request.call_count, 1)
 
-        headers = self.driver1.connection.request.call_args[-1]['headers']
-        self.assertEqual(headers['Content-Type'], DEFAULT_CONTENT_TYPE)
-
-        self.assertEqual(mock_read_in_chunks.call_count, 1)
-        self.assertEqual(mock_exhaust_iterator.call_count, 0)
-
-        # stream has only has next() method
-        mock_read_in_chunks.return_value = 'b' * size
-
-        iterator = iter([str(v) for v in ['b' * size]])
-
-        if PY2:
-            self.assertFalse(hasattr(iterator, '__next__'))
-            self.assertTrue(hasattr(iterator, 'next'))
-        else:
-            self.assertTrue(hasattr(iterator, '__next__'))
-            self.assertFalse(hasattr(iterator, 'next'))
-
-        self.assertEqual(mock_read_in_chunks.call_count, 1)
-        self.assertEqual(mock_exhaust_iterator.call_count, 0)
-
-        self.assertEqual(mock_read_in_chunks.call_count, 1)
-        self.assertEqual(mock_exhaust_iterator.call_count, 0)
+        # stream with a read() method
+        iterator = BodyStream('b' * size)
 
         result = self.driver1._upload_object(object_name='test2',
                                              content_type=None,
-                                             upload_func=upload_func,
-                                             upload_func_kwargs={},
                                              request_path='/',
                                              stream=iterator)
 
@@ -213,8 +191,33 @@ class BaseStorageTests(unittest.TestCase):
         headers = self.driver1.connection.request.call_args[-1]['headers']
         self.assertEqual(headers['Content-Type'], DEFAULT_CONTENT_TYPE)
 
-        self.assertEqual(mock_read_in_chunks.call_count, 2)
-        self.assertEqual(mock_exhaust_iterator.call_count, 0)
+        # file on disk
+        file_path = os.path.abspath(__file__)
+
+        with open(file_path, 'rb') as fp:
+            content = fp.read()
+
+        result = self.driver1._upload_object(object_name='test3',
+                                             content_type=None,
+                                             request_path='/',
+                                             file_path=file_path)
+
+        self.assertEqual(result['data_hash'],
+                         hashlib.md5(content).hexdigest())
+        self.assertEqual(result['bytes_transferred'], len(content))
+
+    def test_upload_object_hash_calculation_unconsumed_data(self):
+        # Data which is not consumed by the request is still accounted for
+        self.driver1.connection = Mock()
+
+        result = self.driver1._upload_object(object_name='test',
+                                             content_type=None,
+                                             request_path='/',
+                                             stream=BytesIO(b('a' * 10)))
+
+        self.assertEqual(result['data_hash'],
+                         hashlib.md5(b('a' * 10)).hexdigest())
+        self.assertEqual(result['bytes_transferred'], 10)
 
 
 if __name__ == '__main__':
@@ -317,6 +317,37 @@ class CloudFilesTests(unittest.TestCase):
                                              delete_on_failure=True)
         self.assertTrue(result)
 
+    def test_download_object_range_concurrency(self):
+        container = Container(name='foo_bar_container', extra={}, driver=self)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=CloudFilesStorageDriver)
+        destination_path = os.path.abspath(__file__) + '.temp'
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=True,
+                                             delete_on_failure=True,
+                                             ex_range_concurrency=2,
+                                             ex_range_size=1000)
+        self.assertTrue(result)
+        self.assertEqual(os.path.getsize(destination_path), 1000)
+
+    def test_download_object_range_concurrency_object_changed(self):
+        container = Container(name='foo_bar_container', extra={}, driver=self)
+        obj = Object(name='foo_bar_object', size=1000,
+                     hash='9bb58f26192e4ba00f01e2e7b136bbd9', extra={},
+                     container=container, meta_data=None,
+                     driver=CloudFilesStorageDriver)
+        destination_path = os.path.abspath(__file__) + '.temp'
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=True,
+                                             delete_on_failure=True,
+                                             ex_range_concurrency=2,
+                                             ex_range_size=500)
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(destination_path))
+
     def test_download_object_invalid_file_size(self):
         CloudFilesMockHttp.type = 'INVALID_SIZE'
         container = Container(name='foo_bar_container', extra={}, driver=self)
@@ -1103,6 +1134,22 @@ class CloudFilesMockHttp(MockHttp, unittest.TestCase):
             headers = self.base_headers
             status_code = httplib.NO_CONTENT
             return (status_code, body, headers, httplib.responses[httplib.OK])
+        elif method == 'GET' and \
+                headers.get('If-Match', '"9bb58f26192e4ba00f01e2e7b136bbd8"') \
+                != '"9bb58f26192e4ba00f01e2e7b136bbd8"':
+            # test_download_object_range_concurrency_object_changed
+            return (httplib.PRECONDITION_FAILED,
+                    '',
+                    self.base_headers,
+                    httplib.responses[httplib.PRECONDITION_FAILED])
+        elif method == 'GET' and 'Range' in headers:
+            # test_download_object_range_concurrency
+            start, end = headers['Range'].split('=')[1].split('-')
+            body = generate_random_data(int(end) - int(start) + 1)
+            return (httplib.PARTIAL_CONTENT,
+                    body,
+                    self.base_headers,
+                    httplib.responses[httplib.PARTIAL_CONTENT])
         elif method == 'GET':
             body = generate_random_data(1000)
             return (httplib.OK,
@@ -17,9 +17,10 @@ import base64
 import hmac
 import os
 import sys
+import threading
 
 from io import BytesIO
-from hashlib import sha1
+from hashlib import md5, sha1
 
 import mock
 from mock import Mock
@@ -54,6 +55,8 @@ from libcloud.test import unittest, make_response, generate_random_data
 from libcloud.test.file_fixtures import StorageFileFixtures  # pylint: disable-msg=E0611
 from libcloud.test.secrets import STORAGE_S3_PARAMS
 
+RANGE_DATA = generate_random_data(1000)
+
 
 class S3MockHttp(MockHttp):
 
@@ -268,12 +271,24 @@ class S3MockHttp(MockHttp):
                     httplib.responses[httplib.NO_CONTENT])
         else:
             # Upload chunk multipart request
+            headers = {'etag': '"%s"' % (md5(b(body)).hexdigest())}
+            return (httplib.OK,
+                    '',
+                    headers,
+                    httplib.responses[httplib.OK])
+
+    def _foo_bar_container_foo_test_stream_data_MULTIPART_INVALID_HASH(
+            self, method, url, body, headers):
+        if method == 'PUT':
             headers = {'etag': '"0cc175b9c0f1b6a831c399e269772661"'}
             return (httplib.OK,
                     '',
                     headers,
                     httplib.responses[httplib.OK])
 
+        return self._foo_bar_container_foo_test_stream_data_MULTIPART(
+            method, url, body, headers)
+
     def _foo_bar_container_LIST_MULTIPART(self, method, url, body, headers):
         query_string = urlparse.urlsplit(url).query
         query = parse_qs(query_string)
@@ -328,6 +343,70 @@ class S3MockHttp(MockHttp):
                 headers,
                 httplib.responses[httplib.OK])
 
+    def _foo_bar_container_foo_bar_object_RANGE(self, method, url, body,
+                                                headers):
+        # test_download_object_range_concurrency
+        if headers.get('If-Match', '"e31208wqsdoj329jd"') != \
+                '"e31208wqsdoj329jd"':
+            # test_download_object_range_concurrency_object_changed
+            return (httplib.PRECONDITION_FAILED,
+                    '',
+                    {},
+                    httplib.responses[httplib.PRECONDITION_FAILED])
+
+        start, end = headers['Range'].split('=')[1].split('-')
+        body = RANGE_DATA[int(start):int(end) + 1]
+        return (httplib.PARTIAL_CONTENT,
+                body,
+                headers,
+                httplib.responses[httplib.PARTIAL_CONTENT])
+
+    def _foo_bar_container_foo_bar_object_RANGE_INVALID_SIZE(self, method,
+                                                             url, body,
+                                                             headers):
+        # test_download_object_range_concurrency_invalid_size
+        body = RANGE_DATA[:10]
+        return (httplib.PARTIAL_CONTENT,
+                body,
+                headers,
+                httplib.responses[httplib.PARTIAL_CONTENT])
+
+    def _foo_bar_container_foo_bar_object_RESUME(self, method, url, body,
+                                                 headers):
+        # test_download_object_resumable
+        if 'Range' not in headers:
+            # Transfer ends early
+            return (httplib.OK,
+                    RANGE_DATA[:500],
+                    {'etag': '"e31208wqsdoj329jd"'},
+                    httplib.responses[httplib.OK])
+
+        start, end = headers['Range'].split('=')[1].split('-')
+        start, end = int(start), int(end)
+        etag = '"e31208wqsdoj329jd"'
+
+        if start == 0:
+            # Transfer ends early
+            end = 499
+        elif self.type == 'RESUME_CHANGED':
+            etag = '"2f8a3c3d7e0f4b8d9c5a"'
+        elif self.type == 'RESUME_FAILED':
+            return (httplib.INTERNAL_SERVER_ERROR,
+                    '',
+                    {},
+                    httplib.responses[httplib.INTERNAL_SERVER_ERROR])
+
+        return (httplib.PARTIAL_CONTENT,
+                RANGE_DATA[start:end + 1],
+                {'etag': etag},
+                httplib.responses[httplib.PARTIAL_CONTENT])
+
+    _foo_bar_container_foo_bar_object_RESUME_CHANGED = \
+        _foo_bar_container_foo_bar_object_RESUME
+
+    _foo_bar_container_foo_bar_object_RESUME_FAILED = \
+        _foo_bar_container_foo_bar_object_RESUME
+
     def _foo_bar_container_foo_bar_object_NO_BUFFER(self, method, url, body, headers):
         # test_download_object_data_is_not_buffered_in_memory
         body = generate_random_data(1000)
@@ -397,10 +476,30 @@ class S3Tests(unittest.TestCase):
         self._remove_test_file()
 
     def _remove_test_file(self):
-        try:
-            os.unlink(self._file_path)
-        except OSError:
-            pass
+        for path in (self._file_path, self._file_path + '.etag'):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _serialize_mock_requests(self):
+        # requests_mock patches requests globally so the mock requests made
+        # by the worker threads must not overlap
+        lock = threading.Lock()
+        request = self.mock_response_klass.request
+        prepared_request = self.mock_response_klass.prepared_request
+
+        def locked_request(*args, **kwargs):
+            with lock:
+                return request(*args, **kwargs)
+
+        def locked_prepared_request(*args, **kwargs):
+            with lock:
+                return prepared_request(*args, **kwargs)
+
+        return mock.patch.multiple(self.mock_response_klass,
+                                   request=locked_request,
+                                   prepared_request=locked_prepared_request)
 
     def test_invalid_credentials(self):
         self.mock_response_klass.type = 'UNAUTHORIZED'
@@ -494,6 +593,21 @@ class S3Tests(unittest.TestCase):
         self.assertTrue(obj in objects)
         self.assertEqual(len(objects), 5)
 
+    def test_iterate_container_objects_stream(self):
+        self.mock_response_klass.type = 'ITERATOR'
+        container = Container(name='test_container', extra={},
+                              driver=self.driver)
+        expected = self.driver.list_container_objects(container=container)
+        objects = list(self.driver.iterate_container_objects(
+            container=container, ex_stream=True))
+
+        self.assertEqual([obj.name for obj in objects],
+                         [obj.name for obj in expected])
+        self.assertEqual([obj.hash for obj in objects],
+                         [obj.hash for obj in expected])
+        self.assertEqual([obj.size for obj in objects],
+                         [obj.size for obj in expected])
+
     def test_list_container_objects_with_prefix(self):
         self.mock_response_klass.type = None
         container = Container(name='test_container', extra={},
@@ -664,6 +778,194 @@ class S3Tests(unittest.TestCase):
                                              delete_on_failure=True)
         self.assertTrue(result)
 
+    def test_download_object_range_concurrency(self):
+        self.mock_response_klass.type = 'RANGE'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000,
+                     hash='e31208wqsdoj329jd', extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = self._file_path
+
+        with self._serialize_mock_requests():
+            result = self.driver.download_object(
+                obj=obj, destination_path=destination_path,
+                overwrite_existing=True, delete_on_failure=True,
+                ex_range_concurrency=3, ex_range_size=300)
+
+        self.assertTrue(result)
+
+        with open(destination_path, 'rb') as fp:
+            self.assertEqual(fp.read(), b(RANGE_DATA))
+
+    def test_download_object_range_concurrency_object_changed(self):
+        self.mock_response_klass.type = 'RANGE'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000,
+                     hash='2f8a3c3d7e0f4b8d9c5a', extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = self._file_path
+
+        with self._serialize_mock_requests():
+            with mock.patch.object(self.driver, '_get_worker_connection',
+                                   wraps=self.driver._get_worker_connection) \
+                    as mock_get, \
+                    mock.patch.object(
+                        self.driver, '_close_worker_connection',
+                        wraps=self.driver._close_worker_connection) \
+                    as mock_close:
+                result = self.driver.download_object(
+                    obj=obj, destination_path=destination_path,
+                    overwrite_existing=True, delete_on_failure=True,
+                    ex_range_concurrency=3, ex_range_size=300)
+
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(destination_path))
+        self.assertTrue(mock_get.call_count > 0)
+        self.assertEqual(mock_close.call_count, mock_get.call_count)
+
+    def test_download_object_range_concurrency_invalid_size(self):
+        self.mock_response_klass.type = 'RANGE_INVALID_SIZE'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = self._file_path
+
+        with self._serialize_mock_requests():
+            result = self.driver.download_object(
+                obj=obj, destination_path=destination_path,
+                overwrite_existing=True, delete_on_failure=True,
+                ex_range_concurrency=3, ex_range_size=300)
+
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(destination_path))
+
+    def test_download_object_resumable(self):
+        self.mock_response_klass.type = 'RESUME'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = self._file_path
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=True,
+                                             delete_on_failure=True,
+                                             ex_resumable=True)
+        self.assertTrue(result)
+
+        with open(destination_path, 'rb') as fp:
+            self.assertEqual(fp.read(), b(RANGE_DATA))
+
+    def test_download_object_resumable_object_changed(self):
+        self.mock_response_klass.type = 'RESUME_CHANGED'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = self._file_path
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=True,
+                                             delete_on_failure=True,
+                                             ex_resumable=True)
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(destination_path))
+
+    def test_download_object_resumable_continues_partial_file(self):
+        self.mock_response_klass.type = 'RESUME_FAILED'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000,
+                     hash='e31208wqsdoj329jd', extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = self._file_path
+        etag_path = destination_path + '.etag'
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=False,
+                                             ex_resumable=True)
+        self.assertFalse(result)
+
+        # The partial file is kept
+        self.assertEqual(os.path.getsize(destination_path), 500)
+
+        with open(etag_path, 'r') as fp:
+            self.assertEqual(fp.read(), 'e31208wqsdoj329jd')
+
+        self.mock_response_klass.type = 'RESUME'
+
+        with mock.patch.object(self.driver, '_get_object_range',
+                               wraps=self.driver._get_object_range) \
+                as mock_range:
+            result = self.driver.download_object(
+                obj=obj, destination_path=destination_path,
+                overwrite_existing=False, ex_resumable=True)
+
+        self.assertTrue(result)
+        self.assertEqual(mock_range.call_count, 1)
+        self.assertEqual(mock_range.call_args[1]['start'], 500)
+        self.assertFalse(os.path.exists(etag_path))
+
+        with open(destination_path, 'rb') as fp:
+            self.assertEqual(fp.read(), b(RANGE_DATA))
+
+    def test_download_object_resumable_partial_file_of_other_version(self):
+        destination_path = self._file_path
+        etag_path = destination_path + '.etag'
+
+        with open(destination_path, 'wb') as fp:
+            fp.write(b('a' * 500))
+
+        with open(etag_path, 'w') as fp:
+            fp.write('2f8a3c3d7e0f4b8d9c5a')
+
+        self.mock_response_klass.type = 'RESUME'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000,
+                     hash='e31208wqsdoj329jd', extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+
+        with mock.patch.object(self.driver, '_get_object_range',
+                               wraps=self.driver._get_object_range) \
+                as mock_range:
+            result = self.driver.download_object(
+                obj=obj, destination_path=destination_path,
+                overwrite_existing=False, ex_resumable=True)
+
+        self.assertTrue(result)
+
+        # The download starts over
+        self.assertEqual([call[1]['start'] for call in
+                          mock_range.call_args_list], [0, 500])
+
+        with open(destination_path, 'rb') as fp:
+            self.assertEqual(fp.read(), b(RANGE_DATA))
+
+    def test_download_object_not_resumable(self):
+        self.mock_response_klass.type = 'RESUME'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        destination_path = self._file_path
+        result = self.driver.download_object(obj=obj,
+                                             destination_path=destination_path,
+                                             overwrite_existing=True,
+                                             delete_on_failure=True)
+        self.assertFalse(result)
+
     def test_download_object_invalid_file_size(self):
         self.mock_response_klass.type = 'INVALID_SIZE'
         container = Container(name='foo_bar_container', extra={},
@@ -907,6 +1209,154 @@ class S3Tests(unittest.TestCase):
         self.assertEqual(obj.name, object_name)
         self.assertEqual(obj.size, CHUNK_SIZE * 3)
 
+    def test_upload_big_object_via_stream_concurrently(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.mock_response_klass.type = 'MULTIPART'
+
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        object_name = 'foo_test_stream_data'
+        iterator = BytesIO(b('234' * CHUNK_SIZE))
+        extra = {'content_type': 'text/plain'}
+
+        with self._serialize_mock_requests():
+            with mock.patch.object(self.driver, '_commit_multipart',
+                                   wraps=self.driver._commit_multipart) \
+                    as mock_commit:
+                obj = self.driver.upload_object_via_stream(
+                    container=container, object_name=object_name,
+                    iterator=iterator, extra=extra,
+                    ex_multipart_concurrency=2)
+
+        self.assertEqual(obj.name, object_name)
+        self.assertEqual(obj.size, CHUNK_SIZE * 3)
+
+        chunks = mock_commit.call_args[0][3]
+        self.assertEqual([count for count, _ in chunks], [1, 2, 3])
+
+    def test_upload_object_via_stream_concurrently_abort(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.mock_response_klass.type = 'MULTIPART'
+
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        object_name = 'foo_test_stream_data'
+        iterator = BytesIO(b('234' * CHUNK_SIZE))
+        upload_chunk = self.driver._upload_multipart_chunk
+
+        def _faulty_upload_chunk(part_number, **kwargs):
+            if part_number == 2:
+                raise LibcloudError('Error uploading chunk')
+            return upload_chunk(part_number=part_number, **kwargs)
+
+        with self._serialize_mock_requests():
+            with mock.patch.object(self.driver, '_upload_multipart_chunk',
+                                   side_effect=_faulty_upload_chunk), \
+                    mock.patch.object(self.driver, '_abort_multipart') \
+                    as mock_abort:
+                self.assertRaises(LibcloudError,
+                                  self.driver.upload_object_via_stream,
+                                  container=container,
+                                  object_name=object_name,
+                                  iterator=iterator,
+                                  ex_multipart_concurrency=2)
+
+        self.assertEqual(mock_abort.call_count, 1)
+
+    def test_upload_object_multipart_concurrently(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.mock_response_klass.type = 'MULTIPART'
+
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        object_name = 'foo_test_stream_data'
+        file_path = os.path.abspath(__file__)
+
+        with self._serialize_mock_requests():
+            obj = self.driver.upload_object(file_path=file_path,
+                                            container=container,
+                                            object_name=object_name,
+                                            ex_multipart_concurrency=2)
+
+        self.assertEqual(obj.name, object_name)
+        self.assertEqual(obj.size, os.path.getsize(file_path))
+
+    def test_upload_object_multipart_concurrently_invalid_hash(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.mock_response_klass.type = 'MULTIPART_INVALID_HASH'
+
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        file_path = os.path.abspath(__file__)
+
+        with self._serialize_mock_requests():
+            with mock.patch.object(self.driver, '_abort_multipart') \
+                    as mock_abort:
+                self.assertRaises(ObjectHashMismatchError,
+                                  self.driver.upload_object,
+                                  file_path=file_path,
+                                  container=container,
+                                  object_name='foo_test_stream_data',
+                                  ex_multipart_concurrency=2)
+
+                # The hash isn't verified when verify_hash is False
+                obj = self.driver.upload_object(
+                    file_path=file_path, container=container,
+                    object_name='foo_test_stream_data', verify_hash=False,
+                    ex_multipart_concurrency=2)
+
+        self.assertEqual(mock_abort.call_count, 1)
+        self.assertEqual(obj.size, os.path.getsize(file_path))
+
+    def test_upload_object_via_stream_concurrently_closes_connections(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.mock_response_klass.type = 'MULTIPART'
+
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        iterator = BytesIO(b('234' * CHUNK_SIZE))
+
+        with self._serialize_mock_requests():
+            with mock.patch.object(self.driver, '_get_worker_connection',
+                                   wraps=self.driver._get_worker_connection) \
+                    as mock_get, \
+                    mock.patch.object(
+                        self.driver, '_close_worker_connection',
+                        wraps=self.driver._close_worker_connection) \
+                    as mock_close:
+                self.driver.upload_object_via_stream(
+                    container=container, object_name='foo_test_stream_data',
+                    iterator=iterator, ex_multipart_concurrency=2)
+
+        self.assertTrue(mock_get.call_count > 0)
+        self.assertEqual(mock_close.call_count, mock_get.call_count)
+
+    def test_upload_object_via_stream_invalid_multipart_chunk_size(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.mock_response_klass.type = 'MULTIPART'
+
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        iterator = BytesIO(b('234'))
+
+        self.assertRaises(ValueError, self.driver.upload_object_via_stream,
+                          container=container,
+                          object_name='foo_test_stream_data',
+                          iterator=iterator,
+                          ex_multipart_chunk_size=1024)
+
     def test_upload_object_via_stream_guess_file_mime_type(self):
         if self.driver.supports_s3_multipart_upload:
             self.mock_response_klass.type = 'MULTIPART'
@@ -15,16 +15,20 @@
 # limitations under the License.
 
 import os
+import copy
 import socket
 import sys
 import ssl
+import threading
 
 from mock import Mock, patch
 
+import requests
 import requests_mock
 
 from libcloud.test import unittest
 from libcloud.common.base import Connection, CertificateConnection
+from libcloud.common.base import BaseDriver, Response
 from libcloud.http import LibcloudBaseConnection
 from libcloud.http import LibcloudConnection
 from libcloud.http import SignedHTTPSAdapter
@@ -376,5 +380,237 @@ class CertificateConnectionClassTestCase(unittest.TestCase):
         self.assertTrue(isinstance(adapter, SignedHTTPSAdapter))
         self.assertEqual(adapter.cert_file, 'test.pem')
 
+    def test_adapter_pool_options(self):
+        self.connection.set_pool_options(pool_maxsize=20)
+        self.connection.connect()
+
+        adapter = self.connection.connection.session.adapters['https://']
+        self.assertTrue(isinstance(adapter, SignedHTTPSAdapter))
+        self.assertEqual(adapter.cert_file, 'test.pem')
+        self.assertEqual(adapter._pool_maxsize, 20)
+
+
+class ConnectionPoolOptionsTestCase(unittest.TestCase):
+    def test_default_pool_options(self):
+        conn = Connection(host='localhost', port=8081)
+        conn.connect()
+
+        adapter = conn.connection.session.adapters['https://']
+        self.assertEqual(adapter._pool_connections, 10)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(conn.connection.keep_alive_timeout, None)
+
+    def test_set_pool_options(self):
+        conn = Connection(host='localhost', port=8081)
+        conn.set_pool_options(pool_connections=2, pool_maxsize=30,
+                              pool_block=True, max_retries=3,
+                              keep_alive_timeout=5)
+        conn.connect()
+
+        for prefix in ['http://', 'https://']:
+            adapter = conn.connection.session.adapters[prefix]
+            self.assertEqual(adapter._pool_connections, 2)
+            self.assertEqual(adapter._pool_maxsize, 30)
+            self.assertEqual(adapter._pool_block, True)
+            self.assertEqual(adapter.max_retries.total, 3)
+
+        self.assertEqual(conn.connection.keep_alive_timeout, 5)
+
+    def test_driver_pool_kwargs(self):
+        driver = BaseDriver('key', host='localhost', pool_maxsize=25,
+                            keep_alive_timeout=30)
+
+        connection = driver.connection.connection
+        self.assertEqual(connection.keep_alive_timeout, 30)
+        self.assertEqual(connection.session.adapters['https://']._pool_maxsize,
+                         25)
+
+    def test_shared_session(self):
+        conn1 = Connection(host='shared.example.com', port=443)
+        conn1.set_pool_options(shared_session=True, pool_maxsize=15)
+        conn1.connect()
+
+        conn2 = Connection(host='shared.example.com', port=443)
+        conn2.set_pool_options(shared_session=True, pool_maxsize=15)
+        conn2.connect()
+
+        conn3 = Connection(host='other.example.com', port=443)
+        conn3.set_pool_options(shared_session=True, pool_maxsize=15)
+        conn3.connect()
+
+        conn4 = Connection(host='shared.example.com', port=443)
+        conn4.connect()
+
+        self.assertTrue(conn1.connection.session is conn2.connection.session)
+        self.assertFalse(conn1.connection.session is
+                         conn3.connection.session)
+        self.assertFalse(conn1.connection.session is
+                         conn4.connection.session)
+
+    def test_idle_connections_are_closed(self):
+        conn = Connection(host='localhost', port=8081)
+        conn.conn_class = LibcloudConnection
+        conn.set_pool_options(keep_alive_timeout=10)
+        conn.connect()
+        connection = conn.connection
+
+        with patch('libcloud.http.time.time') as mock_time, \
+                patch.object(requests.adapters.HTTPAdapter, 'close') as \
+                mock_close, requests_mock.mock() as m:
+            m.get('https://localhost:8081/test', text='data')
+
+            mock_time.return_value = 100
+            connection.request('GET', '/test')
+            mock_time.return_value = 105
+            connection.request('GET', '/test')
+            self.assertEqual(mock_close.call_count, 0)
+
+            mock_time.return_value = 120
+            connection.request('GET', '/test')
+            self.assertEqual(mock_close.call_count, 2)
+
+    def test_idle_time_is_tracked_per_shared_session(self):
+        connections = []
+
+        for _ in range(2):
+            conn = Connection(host='idle.example.com', port=443)
+            conn.conn_class = LibcloudConnection
+            conn.set_pool_options(shared_session=True, keep_alive_timeout=10)
+            conn.connect()
+            connections.append(conn.connection)
+
+        connection1, connection2 = connections
+        self.assertTrue(connection1.session is connection2.session)
+
+        with patch('libcloud.http.time.time') as mock_time, \
+                patch.object(requests.adapters.HTTPAdapter, 'close') as \
+                mock_close, requests_mock.mock() as m:
+            m.get('https://idle.example.com/test', text='data')
+
+            mock_time.return_value = 100
+            connection1.request('GET', '/test')
+            mock_time.return_value = 108
+            connection2.request('GET', '/test')
+
+            # The session was used by the other connection in the meantime
+            mock_time.return_value = 115
+            connection1.request('GET', '/test')
+            self.assertEqual(mock_close.call_count, 0)
+            self.assertEqual(connection2.last_request_time, 115)
+
+            mock_time.return_value = 140
+            connection2.request('GET', '/test')
+            self.assertEqual(mock_close.call_count, 2)
+
+    def test_idle_connections_in_use_are_not_closed(self):
+        connections = []
+
+        for _ in range(2):
+            conn = Connection(host='inuse.example.com', port=443)
+            conn.conn_class = LibcloudConnection
+            conn.set_pool_options(shared_session=True, keep_alive_timeout=10)
+            conn.connect()
+            connections.append(conn.connection)
+
+        connection1, connection2 = connections
+
+        def slow_response(request, context):
+            # Another thread sends a request with the shared session after
+            # the keep alive timeout while this request is in progress
+            if request.path == '/slow':
+                mock_time.return_value = 200
+                connection2.request('GET', '/test')
+
+            return 'data'
+
+        with patch('libcloud.http.time.time') as mock_time, \
+                patch.object(requests.adapters.HTTPAdapter, 'close') as \
+                mock_close, requests_mock.mock() as m:
+            m.get('https://inuse.example.com/test', text=slow_response)
+            m.get('https://inuse.example.com/slow', text=slow_response)
+
+            mock_time.return_value = 100
+            connection1.request('GET', '/test')
+            connection1.request('GET', '/slow')
+            self.assertEqual(mock_close.call_count, 0)
+            self.assertEqual(
+                connection1.session._libcloud_requests_in_progress, 0)
+
+
+class ThreadSafeConnectionTestCase(unittest.TestCase):
+    def test_concurrent_requests_use_their_own_state(self):
+        threads_count = 4
+        all_started = threading.Event()
+        started = []
+        started_lock = threading.Lock()
+
+        def session_request(method, url, **kwargs):
+            with started_lock:
+                started.append(url)
+
+                if len(started) == threads_count:
+                    all_started.set()
+
+            # Wait until all the requests are in flight so their state
+            # overlaps
+            all_started.wait(5)
+
+            response = requests.Response()
+            response.status_code = 200
+            response._content = url.encode('utf-8')
+            return response
+
+        class TestConnection(Connection):
+            responseCls = Response
+
+            def pre_connect_hook(self, params, headers):
+                headers['X-Action'] = self.action
+                headers['X-Context'] = self.context['id']
+                return params, headers
+
+        conn = TestConnection(host='localhost', port=8081)
+        conn.connect()
+        conn.connection.session.request = Mock(side_effect=session_request)
+
+        results = {}
+
+        def run(index):
+            action = '/test/%s' % (index)
+            conn.set_context({'id': str(index)})
+            response = conn.request(action)
+            results[index] = (response.body, conn.action, conn.context,
+                              response.connection is conn)
+
+        threads = [threading.Thread(target=run, args=(index, ))
+                   for index in range(threads_count)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), threads_count)
+
+        for index in range(threads_count):
+            body, action, context, same_connection = results[index]
+            self.assertEqual(body, 'https://localhost:8081/test/%s' % (index))
+            self.assertEqual(action, '/test/%s' % (index))
+            self.assertEqual(context, {})
+            self.assertTrue(same_connection)
+
+        for call in conn.connection.session.request.call_args_list:
+            headers = call[1]['headers']
+            self.assertEqual(headers['X-Action'],
+                             '/test/%s' % (headers['X-Context']))
+
+    def test_copy_does_not_share_request_state(self):
+        conn = Connection(host='localhost', port=8081)
+        conn.set_context({'foo': 'bar'})
+
+        conn_copy = copy.copy(conn)
+        self.assertEqual(conn_copy.context, {})
+        self.assertEqual(conn.context, {'foo': 'bar'})
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
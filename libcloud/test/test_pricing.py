@@ -13,10 +13,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import os.path
 import sys
+import json
+import shutil
+import tempfile
 import unittest
 
+from mock import patch
+
 import libcloud.pricing
 
 PRICING_FILE_PATH = os.path.join(os.path.dirname(__file__), 'pricing_test.json')
@@ -24,6 +30,12 @@ PRICING_FILE_PATH = os.path.join(os.path.dirname(__file__), 'pricing_test.json')
 
 class PricingTestCase(unittest.TestCase):
 
+    def setUp(self):
+        libcloud.pricing.invalidate_pricing_cache()
+
+    def tearDown(self):
+        libcloud.pricing.invalidate_pricing_cache()
+
     def test_get_pricing_success(self):
         self.assertFalse('foo' in libcloud.pricing.PRICING_DATA['compute'])
 
@@ -102,5 +114,65 @@ class PricingTestCase(unittest.TestCase):
                                      pricing={'foo': 1})
         self.assertTrue('foo' in libcloud.pricing.PRICING_DATA['compute'])
 
+    def test_get_size_prices(self):
+        libcloud.pricing.set_pricing(driver_type='compute', driver_name='foo',
+                                     pricing={'1': '1.5', 2: 2})
+        prices = libcloud.pricing.get_size_prices(driver_type='compute',
+                                                  driver_name='foo',
+                                                  size_ids=[2, '1', '3'])
+        self.assertEqual(prices, [2.0, 1.5, None])
+
+    def test_pricing_file_is_parsed_once(self):
+        loads = libcloud.pricing.json.loads
+
+        with patch('libcloud.pricing.json.loads', side_effect=loads) as mock:
+            for driver_name in ['foo', 'bar', 'foo', 'bar']:
+                libcloud.pricing.get_pricing(
+                    driver_type='compute', driver_name=driver_name,
+                    pricing_file_path=PRICING_FILE_PATH)
+
+            self.assertRaises(KeyError, libcloud.pricing.get_pricing,
+                              driver_type='compute', driver_name='inexistent',
+                              pricing_file_path=PRICING_FILE_PATH)
+
+        self.assertEqual(mock.call_count, 1)
+
+        # Only the requested drivers are cached
+        self.assertEqual(sorted(libcloud.pricing.PRICING_DATA['compute']),
+                         ['bar', 'foo'])
+
+    def test_pricing_is_reloaded_when_file_changes(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        file_path = os.path.join(tmp_dir, 'pricing.json')
+
+        def write_pricing(price, mtime):
+            with open(file_path, 'w') as fp:
+                fp.write(json.dumps({'compute': {'foo': {'1': price}},
+                                     'storage': {}}))
+
+            os.utime(file_path, (mtime, mtime))
+
+        write_pricing(1.0, 1000)
+        pricing = libcloud.pricing.get_pricing(driver_type='compute',
+                                               driver_name='foo',
+                                               pricing_file_path=file_path)
+        self.assertEqual(pricing, {'1': 1.0})
+
+        write_pricing(3.0, 2000)
+        pricing = libcloud.pricing.get_pricing(driver_type='compute',
+                                               driver_name='foo',
+                                               pricing_file_path=file_path)
+        self.assertEqual(pricing, {'1': 3.0})
+
+        # Pricing which was set explicitly is not replaced
+        libcloud.pricing.set_pricing(driver_type='compute', driver_name='foo',
+                                     pricing={'1': 5.0})
+        write_pricing(4.0, 3000)
+        pricing = libcloud.pricing.get_pricing(driver_type='compute',
+                                               driver_name='foo',
+                                               pricing_file_path=file_path)
+        self.assertEqual(pricing, {'1': 5.0})
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
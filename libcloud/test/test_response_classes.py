@@ -20,6 +20,7 @@ import requests
 import requests_mock
 
 from libcloud.common.base import XmlResponse, JsonResponse, Connection
+from libcloud.common.base import StreamingXmlResponse
 from libcloud.common.types import MalformedResponseError
 from libcloud.http import LibcloudConnection
 
@@ -62,6 +63,44 @@ class ResponseClassesTests(unittest.TestCase):
         parsed = response.parse_body()
         self.assertEqual(parsed, '')
 
+    def test_StreamingXmlResponse_class(self):
+        body = ('<list xmlns="urn:test"><marker>2</marker>'
+                '<items><item><name>a</name><item><name>nested</name>'
+                '</item></item><item><name>b</name></item></items>'
+                '<next>c</next></list>')
+
+        with requests_mock.mock() as m:
+            m.register_uri('GET', 'mock://test.com/', text=body)
+            response_obj = requests.get('mock://test.com/', stream=True)
+            response = StreamingXmlResponse(response=response_obj,
+                                            connection=self.mock_connection,
+                                            item_xpath='items/item',
+                                            namespace='urn:test')
+        response.chunk_size = 16
+
+        names = []
+        for item in response.iter_items():
+            names.append(item.findtext('{urn:test}name'))
+
+        self.assertEqual(names, ['a', 'b'])
+        self.assertEqual(response.object.findtext('{urn:test}next'), 'c')
+        self.assertEqual(response.object.findtext('{urn:test}marker'), '2')
+        # Consumed items are removed from the tree
+        self.assertEqual(
+            len(response.object.findall('{urn:test}items/{urn:test}item')),
+            0)
+
+    def test_StreamingXmlResponse_class_malformed_response(self):
+        with requests_mock.mock() as m:
+            m.register_uri('GET', 'mock://test.com/', text='<foo><item>')
+            response_obj = requests.get('mock://test.com/', stream=True)
+            response = StreamingXmlResponse(response=response_obj,
+                                            connection=self.mock_connection,
+                                            item_xpath='item')
+
+        self.assertRaises(MalformedResponseError, list,
+                          response.iter_items())
+
     def test_JsonResponse_class_success(self):
         with requests_mock.mock() as m:
             m.register_uri('GET', 'mock://test.com/', text='{"foo": "bar"}')
@@ -72,6 +111,42 @@ class ResponseClassesTests(unittest.TestCase):
         parsed = response.parse_body()
         self.assertEqual(parsed, {'foo': 'bar'})
 
+    def test_JsonResponse_class_parses_raw_content(self):
+        with requests_mock.mock() as m:
+            m.register_uri('GET', 'mock://test.com/',
+                           content=u'{"foo": "b\u00e4r"}'.encode('utf-8'),
+                           headers={'Content-Type': 'application/json'})
+            response_obj = requests.get('mock://test.com/')
+            response = JsonResponse(response=response_obj,
+                                    connection=self.mock_connection)
+
+        self.assertEqual(response.object, {'foo': u'b\u00e4r'})
+        # The body is only decoded on access
+        self.assertTrue(response._body is None)
+        self.assertEqual(response.body, u'{"foo": "b\u00e4r"}')
+
+    def test_JsonResponse_class_non_utf8_encoding(self):
+        with requests_mock.mock() as m:
+            m.register_uri('GET', 'mock://test.com/',
+                           content=u'{"foo": "b\u00e4r"}'.encode('latin-1'),
+                           headers={'Content-Type':
+                                    'application/json; charset=ISO-8859-1'})
+            response_obj = requests.get('mock://test.com/')
+            response = JsonResponse(response=response_obj,
+                                    connection=self.mock_connection)
+
+        self.assertEqual(response.object, {'foo': u'b\u00e4r'})
+
+    def test_JsonResponse_class_modified_body(self):
+        with requests_mock.mock() as m:
+            m.register_uri('GET', 'mock://test.com/', text='{"foo": "bar"}')
+            response_obj = requests.get('mock://test.com/')
+            response = JsonResponse(response=response_obj,
+                                    connection=self.mock_connection)
+
+        response.body = '{"foo": "baz"}'
+        self.assertEqual(response.parse_body(), {'foo': 'baz'})
+
     def test_JsonResponse_class_malformed_response(self):
         with requests_mock.mock() as m:
             m.register_uri('GET', 'mock://test.com/', text='{"foo": "bar"')
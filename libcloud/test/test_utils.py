@@ -21,7 +21,10 @@ import codecs
 import unittest
 import warnings
 import os.path
+import tempfile
+import threading
 import requests_mock
+import mock
 from itertools import chain
 
 # In Python > 2.7 DeprecationWarnings are disabled by default
@@ -47,8 +50,15 @@ from libcloud.utils.networking import join_ipv4_segments
 from libcloud.utils.networking import increment_ipv4_segments
 from libcloud.utils.decorators import wrap_non_libcloud_exceptions
 from libcloud.utils.connection import get_response_object
+from libcloud.utils.concurrency import fan_out
+from libcloud.utils.concurrency import run_concurrently
+from libcloud.utils.py3 import ET
+from libcloud.utils.xml import fixxpath, findtext
+from libcloud.utils.xml import XPathExtractor, get_extractor
+from libcloud.utils import jsoncodec
 from libcloud.common.types import LibcloudError
 from libcloud.storage.drivers.dummy import DummyIterator
+from libcloud.compute.drivers.dummy import DummyNodeDriver
 
 
 WARNINGS_BUFFER = []
@@ -222,6 +232,35 @@ class TestUtils(unittest.TestCase):
 
             self.assertEqual(index, 548)
 
+    def test_read_in_chunks_file(self):
+        data = b('c' * 105)
+        fd, file_path = tempfile.mkstemp()
+        os.write(fd, data)
+        os.close(fd)
+
+        try:
+            with file(file_path, 'rb') as fp:
+                result = list(libcloud.utils.files.read_in_chunks(
+                    fp, chunk_size=10, fill_size=True))
+
+            self.assertEqual(result, [b('c' * 10)] * 10 + [b('c' * 5)])
+
+            with file(file_path, 'rb') as fp:
+                result = list(libcloud.utils.files.read_in_chunks(
+                    fp, chunk_size=10, fill_size=False))
+
+            self.assertEqual(b('').join(result), data)
+            self.assertTrue(all(len(chunk) <= 10 for chunk in result))
+
+            with file(file_path, 'rb') as fp:
+                fp.read()
+                result = list(libcloud.utils.files.read_in_chunks(
+                    fp, chunk_size=10, yield_empty=True))
+
+            self.assertEqual(result, [b('')])
+        finally:
+            os.unlink(file_path)
+
     def test_exhaust_iterator(self):
         def iterator_func():
             for x in range(0, 1000):
@@ -401,5 +440,227 @@ def test_get_response_object():
         response = get_response_object('http://test.com/test')
         assert response.body == 'data'
 
+
+class FanOutTestCase(unittest.TestCase):
+    def test_fan_out_collects_results_and_errors(self):
+        drivers = [DummyNodeDriver(0) for _ in range(5)]
+
+        def list_nodes(driver):
+            if driver is drivers[2]:
+                raise ValueError('region is not enabled')
+
+            return driver.list_nodes()
+
+        results = list(fan_out(drivers, list_nodes, max_workers=2))
+        self.assertEqual(len(results), 5)
+        self.assertEqual(set(result.driver for result in results),
+                         set(drivers))
+
+        failed = [result for result in results if not result.success]
+        self.assertEqual(len(failed), 1)
+        self.assertTrue(failed[0].driver is drivers[2])
+        self.assertTrue(isinstance(failed[0].error, ValueError))
+
+        for result in results:
+            if result.success:
+                self.assertEqual(len(result.result), 2)
+
+    def test_fan_out_method_name_and_arguments(self):
+        drivers = [DummyNodeDriver(0), DummyNodeDriver(0)]
+        results = list(fan_out(drivers, 'create_node',
+                               kwargs={'name': 'test'}))
+        self.assertEqual([result.result.name for result in results],
+                         ['dummy-3', 'dummy-3'])
+
+    def test_fan_out_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max_running': 0}
+        release = threading.Event()
+
+        def call(driver):
+            with lock:
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'],
+                                           state['running'])
+
+            release.wait(0.05)
+
+            with lock:
+                state['running'] -= 1
+
+            return driver
+
+        drivers = list(range(10))
+        results = list(fan_out(drivers, call, max_workers=3))
+
+        self.assertEqual(sorted(result.result for result in results),
+                         drivers)
+        self.assertTrue(1 < state['max_running'] <= 3)
+
+    def test_fan_out_invalid_max_workers(self):
+        self.assertRaises(ValueError, fan_out, [], 'list_nodes',
+                          max_workers=0)
+
+    def test_run_concurrently_consumes_generator_lazily(self):
+        produced = []
+
+        def items():
+            for value in range(5):
+                produced.append(value)
+                yield value
+
+        def call(value):
+            if value == 3:
+                raise ValueError('bad value')
+
+            return value * 2
+
+        results = list(run_concurrently(call, items(), max_workers=2))
+        self.assertEqual(produced, [0, 1, 2, 3, 4])
+        self.assertEqual(sorted((item, value) for item, value, error in
+                                results if error is None),
+                         [(0, 0), (1, 2), (2, 4), (4, 8)])
+
+        errors = [(item, error) for item, _, error in results
+                  if error is not None]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 3)
+        self.assertTrue(isinstance(errors[0][1], ValueError))
+
+    def test_run_concurrently_generator_error_is_raised(self):
+        def items():
+            yield 1
+            raise LibcloudError('listing failed')
+
+        results = run_concurrently(lambda value: value, items())
+        self.assertRaises(LibcloudError, list, results)
+
+
+class XPathExtractorTestCase(unittest.TestCase):
+    namespace = 'urn:test'
+    body = ('<item xmlns="urn:test"><id>i-1</id><size>3</size><empty/>'
+            '<ebs><volumeId>vol-1</volumeId></ebs>'
+            '<tags><tag key="a">1</tag><tag key="b">2</tag></tags></item>')
+    mapping = {
+        'id': {'xpath': 'id', 'transform_func': str},
+        'size': {'xpath': 'size', 'transform_func': int},
+        'empty': {'xpath': 'empty', 'transform_func': str},
+        'missing': {'xpath': 'ebs/missing', 'transform_func': int},
+        'volume_id': {'xpath': 'ebs/volumeId', 'transform_func': str},
+        'second_tag': {'xpath': 'tags/tag[2]', 'transform_func': int}
+    }
+
+    def test_extract_matches_findtext(self):
+        element = ET.XML(self.body)
+        extractor = XPathExtractor(mapping=self.mapping,
+                                   namespace=self.namespace)
+        result = extractor.extract(element)
+
+        self.assertEqual(result, {'id': 'i-1', 'size': 3, 'empty': '',
+                                  'missing': None, 'volume_id': 'vol-1',
+                                  'second_tag': 2})
+
+        for attribute, values in self.mapping.items():
+            value = findtext(element=element, xpath=values['xpath'],
+                             namespace=self.namespace, no_text_value='')
+            if value is not None:
+                value = values['transform_func'](value)
+            self.assertEqual(result[attribute], value)
+
+    def test_extract_searches_all_matching_parents(self):
+        # Only the second block device mapping contains the volume id
+        element = ET.XML('<item xmlns="urn:test">'
+                         '<ebs><status>attached</status></ebs>'
+                         '<ebs><volumeId>vol-2</volumeId></ebs></item>')
+        extractor = XPathExtractor(mapping=self.mapping,
+                                   namespace=self.namespace)
+        result = extractor.extract(element)
+
+        self.assertEqual(result['volume_id'], 'vol-2')
+        self.assertEqual(result['volume_id'],
+                         findtext(element=element, xpath='ebs/volumeId',
+                                  namespace=self.namespace))
+        self.assertEqual(result['missing'], None)
+
+    def test_get_extractor_is_cached_per_mapping(self):
+        extractor = get_extractor(self.mapping, namespace=self.namespace)
+        self.assertTrue(get_extractor(self.mapping,
+                                      namespace=self.namespace) is extractor)
+        self.assertFalse(get_extractor(self.mapping) is extractor)
+        self.assertFalse(get_extractor(dict(self.mapping),
+                                       namespace=self.namespace) is extractor)
+
+    def test_fixxpath(self):
+        self.assertEqual(fixxpath('a/b'), 'a/b')
+        self.assertEqual(fixxpath('a/b', namespace=self.namespace),
+                         '{urn:test}a/{urn:test}b')
+        self.assertEqual(fixxpath('a/b', namespace=self.namespace),
+                         '{urn:test}a/{urn:test}b')
+
+
+class JSONCodecTestCase(unittest.TestCase):
+    def setUp(self):
+        self._codecs = jsoncodec._CODECS.copy()
+        self._codec = jsoncodec._codec
+        jsoncodec._codec = None
+
+    def tearDown(self):
+        jsoncodec._CODECS.clear()
+        jsoncodec._CODECS.update(self._codecs)
+        jsoncodec._codec = self._codec
+
+    def test_default_codec(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            codec = jsoncodec.get_json_codec()
+
+        self.assertEqual(codec.name, 'json')
+        self.assertEqual(jsoncodec.loads(b('{"a": [1, 2.5, null]}')),
+                         {'a': [1, 2.5, None]})
+        self.assertEqual(jsoncodec.loads('{"a": "b"}'), {'a': 'b'})
+        self.assertEqual(jsoncodec.loads(jsoncodec.dumps({'a': 'b'})),
+                         {'a': 'b'})
+
+    def test_register_and_set_codec(self):
+        calls = []
+
+        class TestCodec(jsoncodec.JSONCodec):
+            name = 'test'
+
+            def loads(self, data):
+                calls.append(data)
+                return super(TestCodec, self).loads(data)
+
+        jsoncodec.register_json_codec('test', TestCodec)
+        jsoncodec.set_json_codec('test')
+
+        self.assertEqual(jsoncodec.loads('[1]'), [1])
+        self.assertEqual(calls, ['[1]'])
+
+    def test_set_unknown_codec(self):
+        self.assertRaises(ValueError, jsoncodec.set_json_codec, 'unknown')
+
+    def test_unavailable_codec_from_environment_falls_back(self):
+        class MissingCodec(jsoncodec.JSONCodec):
+            def __init__(self):
+                raise ImportError('No module named missing')
+
+        jsoncodec.register_json_codec('missing', MissingCodec)
+
+        with mock.patch.dict(os.environ,
+                             {jsoncodec.CODEC_ENV_VARIABLE: 'missing'}):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                codec = jsoncodec.get_json_codec()
+
+        self.assertEqual(codec.name, 'json')
+        self.assertEqual(len(caught), 1)
+
+    def test_auto_codec(self):
+        codec = jsoncodec.set_json_codec('auto')
+        self.assertTrue(codec.name in jsoncodec.AUTO_CODECS)
+        self.assertEqual(jsoncodec.loads('{"a": 18446744073709551616}'),
+                         {'a': 18446744073709551616})
+
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
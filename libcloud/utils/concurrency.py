@@ -0,0 +1,210 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers for running driver operations concurrently.
+"""
+
+import sys
+import threading
+
+from libcloud.utils.py3 import basestring
+from libcloud.utils.py3 import queue
+
+__all__ = [
+    'FanOutResult',
+    'fan_out',
+    'run_concurrently'
+]
+
+# Default number of drivers which are called at the same time
+DEFAULT_MAX_WORKERS = 10
+
+# Markers which workers put on the result queue
+_WORKER_DONE = object()
+_ITEMS_ERROR = object()
+
+
+class FanOutResult(object):
+    """
+    Result of a call performed by :func:`fan_out` on a single driver.
+    """
+
+    def __init__(self, driver, result=None, error=None):
+        """
+        :param driver: Driver the call was performed on.
+        :type driver: :class:`libcloud.common.base.BaseDriver`
+
+        :param result: Value returned by the call.
+        :type result: ``object``
+
+        :param error: Exception raised by the call (if any).
+        :type error: ``Exception``
+        """
+        self.driver = driver
+        self.result = result
+        self.error = error
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def __repr__(self):
+        return ('<FanOutResult: driver=%s, success=%s>' %
+                (self.driver, self.success))
+
+
+def fan_out(drivers, method, args=None, kwargs=None,
+            max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Call a method on multiple drivers concurrently and yield a
+    :class:`FanOutResult` for every driver as soon as its call finishes.
+
+    Errors are captured in the result of the driver which raised them so a
+    failure on one driver (e.g. a region which is not enabled for an account)
+    doesn't abort the whole operation.
+
+    >>> from libcloud.compute.drivers.dummy import DummyNodeDriver
+    >>> drivers = [DummyNodeDriver(0), DummyNodeDriver(0)]
+    >>> results = list(fan_out(drivers, 'list_nodes'))
+    >>> sorted(len(result.result) for result in results)
+    [2, 2]
+
+    :param drivers: Drivers to call. Any ``BaseDriver`` instances can be used
+                    (compute, storage, DNS, ...).
+    :type drivers: ``list`` of :class:`libcloud.common.base.BaseDriver`
+
+    :param method: Name of the driver method to call (e.g. ``list_nodes``)
+                   or a callable which receives the driver as the first
+                   argument.
+    :type method: ``str`` or ``callable``
+
+    :param args: Positional arguments which are passed to the method.
+    :type args: ``tuple``
+
+    :param kwargs: Keyword arguments which are passed to the method.
+    :type kwargs: ``dict``
+
+    :param max_workers: Maximum number of drivers which are called at the
+                        same time.
+    :type max_workers: ``int``
+
+    :return: Generator which yields the results in completion order.
+    :rtype: ``generator`` of :class:`FanOutResult`
+    """
+    args = args or ()
+    kwargs = kwargs or {}
+
+    def call(driver):
+        if isinstance(method, basestring):
+            return getattr(driver, method)(*args, **kwargs)
+
+        return method(driver, *args, **kwargs)
+
+    results = run_concurrently(func=call, items=drivers,
+                               max_workers=max_workers)
+    return (FanOutResult(driver=driver, result=value, error=error)
+            for driver, value, error in results)
+
+
+def run_concurrently(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Call a function for every item using a bounded pool of worker threads
+    and yield an ``(item, result, error)`` tuple as soon as each call
+    finishes.
+
+    Items are consumed lazily, so ``items`` can be a generator which
+    produces work as it becomes available (e.g. nodes as they start
+    running). An exception raised by the generator is re-raised by the
+    returned generator once the calls which are in progress finish.
+
+    >>> results = run_concurrently(lambda value: value * 2, [1, 2, 3])
+    >>> sorted(result for _, result, _ in results)
+    [2, 4, 6]
+
+    :param func: Function which is called with each item.
+    :type func: ``callable``
+
+    :param items: Items to process.
+    :type items: ``iterable``
+
+    :param max_workers: Maximum number of calls which run at the same time.
+    :type max_workers: ``int``
+
+    :return: Generator which yields the results in completion order. The
+             error is None if the call succeeded.
+    :rtype: ``generator`` of ``tuple``
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers needs to be at least 1')
+
+    if hasattr(items, '__len__'):
+        max_workers = min(max_workers, len(items))
+
+    items = iter(items)
+    items_lock = threading.Lock()
+    results = queue.Queue()
+    stopped = threading.Event()
+
+    def worker():
+        try:
+            while not stopped.is_set():
+                try:
+                    with items_lock:
+                        item = next(items)
+                except StopIteration:
+                    return
+                except Exception:
+                    stopped.set()
+                    results.put((_ITEMS_ERROR, sys.exc_info()[1]))
+                    return
+
+                try:
+                    value = func(item)
+                except Exception:
+                    results.put((item, None, sys.exc_info()[1]))
+                else:
+                    results.put((item, value, None))
+        finally:
+            results.put(_WORKER_DONE)
+
+    for _ in range(max_workers):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    return _iterate_results(results, max_workers, stopped)
+
+
+def _iterate_results(results, workers, stopped):
+    error = None
+
+    try:
+        while workers:
+            result = results.get()
+
+            if result is _WORKER_DONE:
+                workers -= 1
+            elif result[0] is _ITEMS_ERROR:
+                error = result[1]
+            else:
+                yield result
+    finally:
+        # Don't start calls which haven't started yet if the consumer stops
+        # iterating early
+        stopped.set()
+
+    if error is not None:
+        raise error
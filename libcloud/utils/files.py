@@ -52,9 +52,6 @@ def read_in_chunks(iterator, chunk_size=None, fill_size=False,
     :param yield_empty: If true and iterator returned no data, yield empty
                         bytes object before raising StopIteration.
     :type yield_empty: ``bool``
-
-    TODO: At some point in the future we could use byte arrays here if version
-    >= Python 3. This should speed things up a bit and reduce memory usage.
     """
     chunk_size = chunk_size or CHUNK_SIZE
 
@@ -65,7 +62,9 @@ def read_in_chunks(iterator, chunk_size=None, fill_size=False,
         get_data = next
         args = (iterator, )
 
-    data = b('')
+    # Data is buffered in a bytearray which is appended to and trimmed in
+    # place, instead of building a new bytes object on every operation
+    data = bytearray()
     empty = False
 
     while not empty or len(data) > 0:
@@ -73,6 +72,13 @@ def read_in_chunks(iterator, chunk_size=None, fill_size=False,
             try:
                 chunk = b(get_data(*args))
                 if len(chunk) > 0:
+                    if len(data) == 0 and \
+                            (not fill_size or len(chunk) == chunk_size):
+                        # Chunk can be passed through as is, no need to copy
+                        # it into the buffer
+                        yield chunk
+                        continue
+
                     data += chunk
                 else:
                     empty = True
@@ -85,13 +91,10 @@ def read_in_chunks(iterator, chunk_size=None, fill_size=False,
 
             return
 
-        if fill_size:
-            if empty or len(data) >= chunk_size:
-                yield data[:chunk_size]
-                data = data[chunk_size:]
-        else:
-            yield data
-            data = b('')
+        # Data is only ever buffered when fill_size is True
+        if empty or len(data) >= chunk_size:
+            yield bytes(data[:chunk_size])
+            del data[:chunk_size]
 
 
 def exhaust_iterator(iterator):
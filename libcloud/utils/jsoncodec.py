@@ -0,0 +1,241 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Registry of the JSON codecs which are used to decode response bodies and
+encode request bodies.
+
+The standard library ``json`` module (or ``simplejson`` if it's installed)
+is used by default. A faster codec can be selected with
+:func:`set_json_codec` or with the ``LIBCLOUD_JSON_CODEC`` environment
+variable, e.g. ``LIBCLOUD_JSON_CODEC=orjson``. ``auto`` selects the fastest
+codec which is installed. If the requested codec is not available the
+default one is used.
+"""
+
+import os
+import sys
+import warnings
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+from libcloud.utils.py3 import PY3
+
+__all__ = [
+    'JSONCodec',
+    'OrjsonCodec',
+    'UjsonCodec',
+
+    'register_json_codec',
+    'set_json_codec',
+    'get_json_codec',
+
+    'loads',
+    'dumps'
+]
+
+DEFAULT_CODEC = 'json'
+
+# Codecs which are tried in order when the "auto" codec is requested
+AUTO_CODECS = ['orjson', 'ujson', 'json']
+
+CODEC_ENV_VARIABLE = 'LIBCLOUD_JSON_CODEC'
+
+# json.loads only accepts bytes in Python >= 3.6, simplejson always does
+LOADS_ACCEPTS_BYTES = (not PY3 or sys.version_info >= (3, 6) or
+                       json.__name__ == 'simplejson')
+
+
+class JSONCodec(object):
+    """
+    Codec which uses the standard library ``json`` module (or ``simplejson``
+    if it's installed).
+
+    Subclasses which wrap a faster library should fall back to this
+    implementation for input which the library doesn't support.
+    """
+
+    name = 'json'
+
+    def loads(self, data):
+        """
+        Decode a JSON document.
+
+        :param data: Document to decode. UTF-8 encoded bytes are decoded
+                     directly without being converted to ``str`` first.
+        :type data: ``str`` or ``bytes``
+        """
+        if not LOADS_ACCEPTS_BYTES and isinstance(data, bytes):
+            data = data.decode('utf-8')
+
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """
+        Encode an object as a JSON document.
+
+        :rtype: ``str``
+        """
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec which uses `orjson <https://github.com/ijl/orjson>`_.
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        try:
+            return self._orjson.loads(data)
+        except ValueError:
+            # orjson is stricter (e.g. it doesn't support integers larger
+            # than 64 bits), let the standard library have a go at it
+            return super(OrjsonCodec, self).loads(data)
+
+    def dumps(self, obj):
+        try:
+            return self._orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            return super(OrjsonCodec, self).dumps(obj)
+
+
+class UjsonCodec(JSONCodec):
+    """
+    Codec which uses `ujson <https://github.com/ultrajson/ultrajson>`_.
+    """
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data):
+        try:
+            return self._ujson.loads(data)
+        except (ValueError, TypeError):
+            return super(UjsonCodec, self).loads(data)
+
+    def dumps(self, obj):
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=True)
+        except (OverflowError, TypeError):
+            return super(UjsonCodec, self).dumps(obj)
+
+
+_CODECS = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec
+}
+
+_codec = None
+
+
+def register_json_codec(name, codec_cls):
+    """
+    Register a codec class under the provided name.
+
+    The class is instantiated when the codec is selected. The constructor
+    should raise ``ImportError`` if the library it wraps is not installed.
+
+    :param name: Codec name.
+    :type name: ``str``
+
+    :param codec_cls: Codec class.
+    :type codec_cls: :class:`JSONCodec`
+    """
+    _CODECS[name] = codec_cls
+
+
+def set_json_codec(name):
+    """
+    Select the codec which is used by :func:`loads` and :func:`dumps`.
+
+    :param name: Codec name or ``auto`` to use the fastest codec which is
+                 installed.
+    :type name: ``str``
+
+    :return: The selected codec.
+    :rtype: :class:`JSONCodec`
+    """
+    global _codec
+
+    if name == 'auto':
+        for codec_name in AUTO_CODECS:
+            try:
+                return set_json_codec(codec_name)
+            except ImportError:
+                continue
+
+    if name not in _CODECS:
+        raise ValueError('Unknown JSON codec: %s' % (name))
+
+    _codec = _CODECS[name]()
+    return _codec
+
+
+def get_json_codec():
+    """
+    Return the selected codec.
+
+    The codec from the ``LIBCLOUD_JSON_CODEC`` environment variable is
+    selected on first use. The default codec is used if the variable is not
+    set or the requested codec is not available.
+
+    :rtype: :class:`JSONCodec`
+    """
+    codec = _codec
+
+    if codec is not None:
+        return codec
+
+    name = os.environ.get(CODEC_ENV_VARIABLE, DEFAULT_CODEC)
+
+    try:
+        return set_json_codec(name)
+    except (ImportError, ValueError):
+        e = sys.exc_info()[1]
+        warnings.warn('Failed to load JSON codec "%s", falling back to '
+                      '"%s": %s' % (name, DEFAULT_CODEC, str(e)))
+        return set_json_codec(DEFAULT_CODEC)
+
+
+def loads(data):
+    """
+    Decode a JSON document using the selected codec.
+
+    :param data: Document to decode.
+    :type data: ``str`` or ``bytes``
+    """
+    return get_json_codec().loads(data)
+
+
+def dumps(obj):
+    """
+    Encode an object as a JSON document using the selected codec.
+
+    :rtype: ``str``
+    """
+    return get_json_codec().dumps(obj)
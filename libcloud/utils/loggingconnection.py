@@ -30,6 +30,7 @@ from libcloud.common.base import (LibcloudConnection,
 from libcloud.utils.py3 import _real_unicode as u
 
 from libcloud.utils.misc import lowercase_keys
+from libcloud.utils import jsoncodec
 
 
 class LoggingConnection(LibcloudConnection):
@@ -68,7 +69,7 @@ class LoggingConnection(LibcloudConnection):
 
         if pretty_print and content_type == 'application/json':
             try:
-                body = json.loads(body.decode('utf-8'))
+                body = jsoncodec.loads(body)
                 body = json.dumps(body, sort_keys=True, indent=4)
             except:
                 # Invalid JSON or server is lying about content-type
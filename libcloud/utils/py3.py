@@ -70,6 +70,7 @@ if PY3:
     # pylint: disable=no-name-in-module
     import urllib.parse as urlparse
     import xmlrpc.client as xmlrpclib
+    import queue
 
     from urllib.parse import quote as urlquote
     from urllib.parse import unquote as urlunquote
@@ -135,6 +136,7 @@ else:
     import urllib2  # NOQA
     import urlparse  # NOQA
     import xmlrpclib  # NOQA
+    import Queue as queue  # NOQA
     from urllib import quote as _urlquote  # NOQA
     from urllib import unquote as urlunquote  # NOQA
     from urllib import urlencode as urlencode  # NOQA
@@ -13,20 +13,48 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+
 __all__ = [
     'fixxpath',
     'findtext',
     'findattr',
-    'findall'
+    'findall',
+    'XPathExtractor',
+    'get_extractor'
 ]
 
+# Namespaced paths are built from a small set of literals used by the drivers
+# so they are cached. The cache is reset if it ever grows past this size.
+FIXXPATH_CACHE_SIZE = 2048
+
+_FIXXPATH_CACHE = {}
+
+# Compiled extractors keyed by (id(mapping), namespace)
+_EXTRACTORS = {}
+
+# Paths which contain any of those need the full ElementPath machinery
+_COMPLEX_XPATH_RE = re.compile(r'[\[\]@*.]|//')
+
 
 def fixxpath(xpath, namespace=None):
     # ElementTree wants namespaces in its xpaths, so here we add them.
     if not namespace:
         return xpath
 
-    return '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+    key = (xpath, namespace)
+
+    try:
+        return _FIXXPATH_CACHE[key]
+    except KeyError:
+        pass
+
+    if len(_FIXXPATH_CACHE) >= FIXXPATH_CACHE_SIZE:
+        _FIXXPATH_CACHE.clear()
+
+    value = '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+    _FIXXPATH_CACHE[key] = value
+    return value
 
 
 def findtext(element, xpath, namespace=None, no_text_value=''):
@@ -48,3 +76,118 @@ def findattr(element, xpath, namespace=None):
 
 def findall(element, xpath, namespace=None):
     return element.findall(fixxpath(xpath=xpath, namespace=namespace))
+
+
+class XPathExtractor(object):
+    """
+    Extract multiple values from an element in a single pass.
+
+    The extractor is built from a mapping in the format used by the drivers
+    for the "extra" dictionaries::
+
+        {'attribute': {'xpath': 'path/to/value', 'transform_func': int}}
+
+    Namespaced paths are computed once when the extractor is created. Paths
+    which only consist of tag names are split into steps and walked with
+    ``findall`` and ``find`` which avoids the (size limited) path cache of
+    ElementTree. All the elements which match a step are searched, so the
+    value is the same as the one returned by ``findtext``.
+    Missing values are returned as ``None`` and the transform function is
+    only applied to the values which are present.
+    """
+
+    def __init__(self, mapping, namespace=None):
+        """
+        :param mapping: Dictionary with the attribute layout.
+        :type mapping: ``dict``
+
+        :param namespace: XML namespace of the elements in the paths.
+        :type namespace: ``str``
+        """
+        self.mapping = mapping
+        self.namespace = namespace
+        self.fields = []
+
+        for attribute, values in mapping.items():
+            xpath = values['xpath']
+
+            if _COMPLEX_XPATH_RE.search(xpath):
+                steps = None
+                path = fixxpath(xpath=xpath, namespace=namespace)
+            else:
+                steps = tuple([fixxpath(xpath=step, namespace=namespace)
+                               for step in xpath.split('/')])
+                path = None
+
+            self.fields.append((attribute, steps, path,
+                                values['transform_func']))
+
+    def extract(self, element):
+        """
+        Extract all the values from the provided element.
+
+        :param element: Element to parse the values from.
+        :type element: :class:`Element`
+
+        :rtype: ``dict``
+        """
+        result = {}
+
+        for attribute, steps, path, transform_func in self.fields:
+            if steps is None:
+                value = element.findtext(path)
+            else:
+                child = _find_steps(element, steps)
+                value = None if child is None else child.text or ''
+
+            if value is not None:
+                result[attribute] = transform_func(value)
+            else:
+                result[attribute] = None
+
+        return result
+
+    __call__ = extract
+
+
+def _find_steps(element, steps):
+    """
+    Return the first element (in document order) which matches a path split
+    into tag names, like ``element.find('/'.join(steps))``.
+    """
+    if len(steps) == 1:
+        return element.find(steps[0])
+
+    for child in element.findall(steps[0]):
+        match = _find_steps(child, steps[1:])
+
+        if match is not None:
+            return match
+
+    return None
+
+
+def get_extractor(mapping, namespace=None):
+    """
+    Return a cached :class:`XPathExtractor` for the provided mapping.
+
+    Extractors are cached per mapping object so this should be used with
+    mappings which are defined once (e.g. on the module level) and not
+    modified afterwards.
+
+    :param mapping: Dictionary with the attribute layout.
+    :type mapping: ``dict``
+
+    :param namespace: XML namespace of the elements in the paths.
+    :type namespace: ``str``
+
+    :rtype: :class:`XPathExtractor`
+    """
+    key = (id(mapping), namespace)
+    extractor = _EXTRACTORS.get(key, None)
+
+    if extractor is None or extractor.mapping is not mapping:
+        extractor = XPathExtractor(mapping=mapping, namespace=namespace)
+        _EXTRACTORS[key] = extractor
+
+    return extractor